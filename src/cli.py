@@ -0,0 +1,184 @@
+"""
+Racing analysis command line.
+
+Installed as the ``racing`` console script (see pyproject.toml).
+
+Usage:
+    racing backfill-features --start 2020-01-01 --workers 32
+    racing backfill-features --partition-by venue --resume
+    racing backfill-races --start 2015-01-01 --end 2024-12-31 --venue flemington
+    racing build-training-set data/training/features.parquet --start 2018-01-01
+"""
+
+from __future__ import annotations
+
+import logging
+
+import click
+
+from src.data.backfill import BackfillRunner
+from src.data.etl_pipeline import RacingETL
+from src.features.asof import AsOfFeatureBuilder
+from src.features.backfill import PARTITION_SCHEMES, FeatureBackfill
+
+
+@click.group()
+@click.option("--verbose", "-v", is_flag=True, help="Enable debug logging.")
+def main(verbose: bool) -> None:
+    """Racing analysis command line."""
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO)
+
+
+@main.command("backfill-features")
+@click.option("--db-path", default="data/racing.duckdb", show_default=True)
+@click.option(
+    "--store-path",
+    default=None,
+    help="Feature store root (default: FEATURE_STORE_PATH setting).",
+)
+@click.option(
+    "--start", type=click.DateTime(["%Y-%m-%d"]), help="First race date (inclusive)."
+)
+@click.option(
+    "--end", type=click.DateTime(["%Y-%m-%d"]), help="Last race date (inclusive)."
+)
+@click.option(
+    "--partition-by",
+    type=click.Choice(PARTITION_SCHEMES),
+    default="month",
+    show_default=True,
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes (default: CPU count, 1 = in-process).",
+)
+@click.option(
+    "--resume", is_flag=True, help="Continue an interrupted backfill run."
+)
+@click.option("--no-progress", is_flag=True, help="Hide the progress bar.")
+@click.option(
+    "--pedigree",
+    is_flag=True,
+    help="Fill pedigree features from current progeny totals (not point-in-time).",
+)
+def backfill_features(
+    db_path,
+    store_path,
+    start,
+    end,
+    partition_by,
+    workers,
+    resume,
+    no_progress,
+    pedigree,
+) -> None:
+    """Recompute the feature store for historical races in parallel."""
+    backfill = FeatureBackfill(
+        store_path=store_path,
+        db_path=db_path,
+        workers=workers,
+        partition_by=partition_by,
+        pedigree=pedigree,
+    )
+    summary = backfill.run(
+        start_date=start.date() if start else None,
+        end_date=end.date() if end else None,
+        resume=resume,
+        progress=not no_progress,
+    )
+
+    click.echo(
+        f"Backfilled {summary.rows} rows for {summary.races} races "
+        f"({summary.partitions} partitions, {summary.skipped} resumed)"
+    )
+    for error in summary.errors:
+        click.echo(f"  ✗ {error}", err=True)
+
+    if summary.errors:
+        raise SystemExit(1)
+
+
+@main.command("backfill-races")
+@click.option("--db-path", default="data/racing.duckdb", show_default=True)
+@click.option(
+    "--start",
+    type=click.DateTime(["%Y-%m-%d"]),
+    required=True,
+    help="First race date (inclusive).",
+)
+@click.option(
+    "--end",
+    type=click.DateTime(["%Y-%m-%d"]),
+    help="Last race date (inclusive, default: --start).",
+)
+@click.option(
+    "--venue", "venues", multiple=True, help="Only this venue name (repeatable)."
+)
+@click.option(
+    "--concurrency", type=click.IntRange(min=1), default=8, show_default=True
+)
+@click.option(
+    "--window-days", type=click.IntRange(min=1), default=7, show_default=True
+)
+@click.option(
+    "--max-attempts", type=click.IntRange(min=1), default=3, show_default=True
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=None,
+    help="Requests per second (default: SCRAPE_RATE_LIMIT setting).",
+)
+def backfill_races(
+    db_path, start, end, venues, concurrency, window_days, max_attempts, rate_limit
+) -> None:
+    """Scrape and load historical meetings, resuming from the ingest journal."""
+    with RacingETL(db_path) as etl:
+        runner = BackfillRunner(
+            etl,
+            concurrency=concurrency,
+            window_days=window_days,
+            max_attempts=max_attempts,
+            rate_limit=rate_limit,
+        )
+        report = runner.run(
+            start.date(), end.date() if end else None, venues=list(venues) or None
+        )
+
+    click.echo(report.format())
+    if report.failed_races:
+        click.echo(
+            f"  ✗ {report.failed_races} races failed (see ingest_journal)", err=True
+        )
+        raise SystemExit(1)
+
+
+@main.command("build-training-set")
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--db-path", default="data/racing.duckdb", show_default=True)
+@click.option(
+    "--start", type=click.DateTime(["%Y-%m-%d"]), help="First race date to emit."
+)
+@click.option(
+    "--end", type=click.DateTime(["%Y-%m-%d"]), help="Last race date to emit."
+)
+@click.option(
+    "--pedigree",
+    is_flag=True,
+    help="Fill pedigree features from current progeny totals (not point-in-time).",
+)
+def build_training_set(output, db_path, start, end, pedigree) -> None:
+    """Write point-in-time features for historical runs to OUTPUT (Parquet)."""
+    builder = AsOfFeatureBuilder(db_path=db_path, pedigree=pedigree)
+    rows = builder.build(
+        output,
+        start_date=start.date() if start else None,
+        end_date=end.date() if end else None,
+    )
+    click.echo(f"Wrote {rows} feature rows to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+"""
+Resumable historical backfill for RacingETL.
+
+RacingETL.ingest_meetings() walks a date range one request at a time and
+keeps no record of what it has loaded, so a multi-year backfill that dies
+halfway has to be restarted by hand. BackfillRunner journals every race it
+plans in ingest_journal (see schema.sql) and works through the range in
+windows of days:
+
+1. Plan: meeting lists for days without journal rows are fetched
+   concurrently and every listed race is journaled as 'pending'
+2. Fetch: meetings with pending races (or failed races with attempts left)
+   are fetched concurrently through a rate-limited AsyncScraper
+3. Load: a single writer thread loads each meeting with
+   RacingETL.load_race_cards() and marks its races 'done' or 'failed'
+
+Every database write (plans, loads, journal updates) runs on the writer
+thread in arrival order, so DuckDB only ever sees one writer while the
+fetches overlap. A race is marked done only after its meeting's load has
+committed; a crash between the two reloads the meeting on resume, which
+the idempotent upserts make harmless. Re-running a range skips done races
+and retries failed ones until they reach max_attempts.
+
+Plans cover every venue listed for a day, so a backfill restricted to some
+venues can later be widened without listing those days again. Past days
+listed without any meetings get an empty-day marker row (EMPTY_DAY_VENUE,
+race number 0) so they are not listed again either.
+
+Usage:
+    from src.data.backfill import BackfillRunner
+
+    with RacingETL(db_path) as etl:
+        runner = BackfillRunner(etl, concurrency=8)
+        report = runner.run("2015-01-01", "2024-12-31", venues=["flemington"])
+        print(report.format())
+
+    racing backfill-races --start 2015-01-01 --end 2024-12-31
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+from pydantic import ValidationError
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.data.ingest_benchmark import format_stages, stage_summary
+from src.data.models import ScrapedRaceCard
+from src.data.scrapers.async_client import AsyncScraper
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+JOURNAL_COLUMNS = (
+    "venue",
+    "date",
+    "race_number",
+    "race_id",
+    "status",
+    "attempts",
+    "error",
+    "updated_at",
+)
+
+# Journal marker for a past day whose meeting list was empty
+EMPTY_DAY_VENUE = ""
+EMPTY_DAY_RACE_NUMBER = 0
+
+# Planned races never overwrite an existing journal row
+JOURNAL_PLAN_SQL = """
+    INSERT INTO ingest_journal ({columns})
+    SELECT {columns} FROM _journal_rows
+    ON CONFLICT (venue, date, race_number) DO NOTHING
+"""
+
+# Load outcomes replace the status and add to the attempt count
+JOURNAL_RESULT_SQL = """
+    INSERT INTO ingest_journal ({columns})
+    SELECT {columns} FROM _journal_rows
+    ON CONFLICT (venue, date, race_number) DO UPDATE SET
+        race_id = coalesce(excluded.race_id, race_id),
+        status = excluded.status,
+        attempts = attempts + excluded.attempts,
+        error = excluded.error,
+        updated_at = excluded.updated_at
+"""
+
+# Meeting outcome per race: (race_id, status, error)
+Outcome = tuple[str | None, str, str | None]
+
+
+@dataclass
+class BackfillReport:
+    """Progress, throughput and per-stage timings of one backfill run."""
+
+    days_listed: int = 0
+    failed_days: int = 0
+    meetings: int = 0
+    failed_meetings: int = 0
+    races: int = 0
+    failed_races: int = 0
+    skipped_races: int = 0
+    runs: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+    stages: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started (until it finished)."""
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def races_per_sec(self) -> float:
+        """Races loaded per wall-clock second."""
+        return self.races / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        """Counts, throughput plus count/p50/p99/total seconds per stage."""
+        return {
+            "days_listed": self.days_listed,
+            "failed_days": self.failed_days,
+            "meetings": self.meetings,
+            "failed_meetings": self.failed_meetings,
+            "races": self.races,
+            "failed_races": self.failed_races,
+            "skipped_races": self.skipped_races,
+            "runs": self.runs,
+            "elapsed_s": round(self.elapsed, 4),
+            "races_per_sec": round(self.races_per_sec, 2),
+            "stages": stage_summary(self.stages),
+        }
+
+    def format(self) -> str:
+        """Human-readable report."""
+        summary = self.summary()
+        lines = [
+            f"Days:     {summary['days_listed']} listed "
+            f"({summary['failed_days']} failed)",
+            f"Meetings: {summary['meetings']} ({summary['failed_meetings']} failed)",
+            f"Races:    {summary['races']} loaded, {summary['failed_races']} failed, "
+            f"{summary['skipped_races']} skipped ({summary['runs']} runs)",
+            f"Elapsed:  {summary['elapsed_s']:.3f}s "
+            f"({summary['races_per_sec']:.1f} races/sec)",
+            "",
+            *format_stages(summary["stages"]),
+        ]
+        return "\n".join(lines)
+
+
+class BackfillRunner:
+    """
+    Journaled, resumable backfill over a date range and venues.
+
+    Fetches run concurrently on an event loop; loads and journal updates
+    run on one writer thread fed through a bounded queue, which also
+    applies backpressure when the database falls behind the network.
+    """
+
+    def __init__(
+        self,
+        etl: RacingETL,
+        concurrency: int = 8,
+        window_days: int = 7,
+        max_attempts: int = 3,
+        queue_size: int = 64,
+        run_hooks: bool = True,
+        rate_limit: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize backfill runner.
+
+        Args:
+            etl: Pipeline whose meeting scraper and writer connection are used
+            concurrency: Meeting lists/meetings fetched at once
+            window_days: Days planned and fetched per window (bounds the
+                listing work lost to a crash)
+            max_attempts: Loads tried per race across runs before it is
+                left failed
+            queue_size: Fetched meetings waiting for the writer
+            run_hooks: Run the pipeline's post-ingest hooks for loaded races
+            rate_limit: Requests per second (default:
+                settings.scrape_rate_limit)
+            transport: httpx transport override (tests, local stand-ins)
+        """
+        if window_days < 1:
+            raise ValueError(f"window_days must be at least 1, got {window_days}")
+
+        self.etl = etl
+        self.scraper = etl.meeting_scraper
+        self.concurrency = concurrency
+        self.window_days = window_days
+        self.max_attempts = max_attempts
+        self.queue_size = queue_size
+        self.run_hooks = run_hooks
+        self.rate_limit = rate_limit
+        self.transport = transport
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """The pipeline's read-write connection manager."""
+        return self.etl.connections
+
+    def run(
+        self,
+        start_date: date | str,
+        end_date: date | str | None = None,
+        venues: list[str] | None = None,
+    ) -> BackfillReport:
+        """
+        Backfill every meeting in a date range, skipping journaled work.
+
+        Args:
+            start_date: First date
+            end_date: Last date, inclusive (default: start_date)
+            venues: Only load these venue names (default: all venues)
+
+        Returns:
+            BackfillReport for this run
+        """
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        end_date = end_date or start_date
+        if end_date < start_date:
+            raise ValueError(f"end_date {end_date} is before start_date {start_date}")
+        wanted = {v.lower() for v in venues} if venues else None
+
+        report = BackfillReport()
+        asyncio.run(self._run(start_date, end_date, wanted, report))
+        report.finished_at = time.perf_counter()
+
+        logger.info(
+            f"✓ Backfill {start_date} to {end_date}: {report.races} races loaded, "
+            f"{report.failed_races} failed, {report.skipped_races} skipped "
+            f"in {report.elapsed:.1f}s ({report.races_per_sec:.1f} races/sec)"
+        )
+        return report
+
+    def journal_summary(
+        self, start_date: date | str | None = None, end_date: date | str | None = None
+    ) -> dict[str, int]:
+        """
+        Journaled races per status.
+
+        Args:
+            start_date: First date (default: no lower bound)
+            end_date: Last date, inclusive (default: no upper bound)
+
+        Returns:
+            dict of status -> races (pending, done, failed)
+        """
+        rows = (
+            self.connections.cursor()
+            .execute(
+                """
+                SELECT status, COUNT(*)
+                FROM ingest_journal
+                WHERE (CAST(? AS DATE) IS NULL OR date >= ?)
+                  AND (CAST(? AS DATE) IS NULL OR date <= ?)
+                  AND race_number <> ?
+                GROUP BY status
+                """,
+                [start_date, start_date, end_date, end_date, EMPTY_DAY_RACE_NUMBER],
+            )
+            .fetchall()
+        )
+        return {"pending": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    # ------------------------------------------------------------------------
+    # Fetching (event loop)
+    # ------------------------------------------------------------------------
+
+    async def _run(
+        self,
+        start_date: date,
+        end_date: date,
+        wanted: set[str] | None,
+        report: BackfillReport,
+    ) -> None:
+        """Plan and fetch window by window while the writer thread loads."""
+        jobs: queue.Queue[Callable[[], None] | None] = queue.Queue(self.queue_size)
+        writer = threading.Thread(
+            target=self._writer, args=(jobs,), name="backfill-writer", daemon=True
+        )
+        writer.start()
+
+        try:
+            async with AsyncScraper(
+                rate_limit=self.rate_limit,
+                max_concurrency=self.concurrency,
+                transport=self.transport,
+            ) as client:
+                window_start = start_date
+                while window_start <= end_date:
+                    window_end = min(
+                        window_start + timedelta(days=self.window_days - 1), end_date
+                    )
+                    meetings = await self._plan(
+                        window_start, window_end, wanted, client, jobs, report
+                    )
+                    await self._fetch(meetings, client, jobs, report)
+                    window_start = window_end + timedelta(days=1)
+        finally:
+            # Loads already fetched are finished before returning
+            await asyncio.to_thread(jobs.put, None)
+            await asyncio.to_thread(writer.join)
+
+    async def _plan(
+        self,
+        start_date: date,
+        end_date: date,
+        wanted: set[str] | None,
+        client: AsyncScraper,
+        jobs: queue.Queue,
+        report: BackfillReport,
+    ) -> dict[tuple[str, date], list[int]]:
+        """
+        Journal unplanned days of a window; returns races to load per meeting.
+
+        Journaled days are read before new plans are queued, so the two
+        never overlap.
+        """
+        journal = (
+            self.connections.cursor()
+            .execute(
+                """
+                SELECT venue, date, race_number, status, attempts
+                FROM ingest_journal
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date, venue, race_number
+                """,
+                [start_date, end_date],
+            )
+            .fetchall()
+        )
+
+        meetings: dict[tuple[str, date], list[int]] = defaultdict(list)
+        planned_days = set()
+        for venue, race_date, race_number, status, attempts in journal:
+            planned_days.add(race_date)
+            if race_number == EMPTY_DAY_RACE_NUMBER or (wanted and venue not in wanted):
+                continue
+            if status == "pending" or (
+                status == "failed" and attempts < self.max_attempts
+            ):
+                meetings[(venue, race_date)].append(race_number)
+            else:
+                report.skipped_races += 1
+
+        days = [
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+        ]
+        days = [day for day in days if day not in planned_days]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def list_day(race_date: date) -> list[dict] | None:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    listed = await self.scraper.get_meetings_by_date_async(
+                        race_date, client
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to list meetings for {race_date}: {e}")
+                    report.failed_days += 1
+                    return None
+                report.stages["list"].append(time.perf_counter() - started)
+                report.days_listed += 1
+                return listed
+
+        now = datetime.now()
+        today = date.today()
+        plan = []
+        for race_date, listed in zip(
+            days, await asyncio.gather(*(list_day(day) for day in days))
+        ):
+            day_plan = []
+            for meeting in listed or []:
+                venue = str(meeting.get("venueName", "")).lower()
+                race_numbers = sorted(
+                    {
+                        int(race["raceNumber"])
+                        for race in meeting.get("races") or []
+                        if race.get("raceNumber")
+                    }
+                )
+                if not venue or not race_numbers:
+                    continue
+                day_plan += [
+                    (venue, race_date, number, None, "pending", 0, None, now)
+                    for number in race_numbers
+                ]
+                if not wanted or venue in wanted:
+                    meetings[(venue, race_date)].extend(race_numbers)
+
+            # A past day listed without races will not gain any: mark it planned
+            if listed is not None and not day_plan and race_date < today:
+                day_plan.append(
+                    (
+                        EMPTY_DAY_VENUE,
+                        race_date,
+                        EMPTY_DAY_RACE_NUMBER,
+                        None,
+                        "done",
+                        0,
+                        None,
+                        now,
+                    )
+                )
+            plan += day_plan
+
+        if plan:
+            await asyncio.to_thread(
+                jobs.put, partial(self._write_journal, JOURNAL_PLAN_SQL, plan)
+            )
+        return dict(sorted(meetings.items(), key=lambda item: item[0][::-1]))
+
+    async def _fetch(
+        self,
+        meetings: dict[tuple[str, date], list[int]],
+        client: AsyncScraper,
+        jobs: queue.Queue,
+        report: BackfillReport,
+    ) -> None:
+        """Fetch meetings concurrently and queue each one for loading."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(venue: str, race_date: date, race_numbers: list[int]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                (result,) = await self.scraper.scrape_meetings_async(
+                    [(venue, race_date)], client
+                )
+                report.stages["fetch"].append(time.perf_counter() - started)
+            load = partial(
+                self._load_meeting, venue, race_date, race_numbers, result, report
+            )
+            await asyncio.to_thread(jobs.put, load)
+
+        await asyncio.gather(
+            *(
+                fetch(venue, race_date, race_numbers)
+                for (venue, race_date), race_numbers in meetings.items()
+            )
+        )
+
+    # ------------------------------------------------------------------------
+    # Loading (writer thread)
+    # ------------------------------------------------------------------------
+
+    def _writer(self, jobs: queue.Queue) -> None:
+        """Run write jobs in arrival order until the None sentinel."""
+        while (job := jobs.get()) is not None:
+            try:
+                job()
+            except Exception as e:
+                # The journal is unchanged, so the work is retried on resume
+                logger.error(f"Backfill write failed: {e}", exc_info=True)
+
+    def _load_meeting(
+        self,
+        venue: str,
+        race_date: date,
+        race_numbers: list[int],
+        result: list[ScrapedRaceCard] | Exception,
+        report: BackfillReport,
+    ) -> None:
+        """Load a fetched meeting's planned races and journal their outcomes."""
+        started = time.perf_counter()
+        meeting = f"{venue} {race_date.isoformat()}"
+
+        if isinstance(result, Exception):
+            logger.error(f"Failed to fetch {meeting}: {result}")
+            outcomes: dict[int, Outcome] = {
+                number: (None, "failed", f"Fetch error: {result}")
+                for number in race_numbers
+            }
+        else:
+            outcomes = {
+                number: (None, "failed", "Race missing from meeting")
+                for number in race_numbers
+            }
+            race_cards = []
+            # Races already done are in the meeting too: leave them alone
+            for card in (c for c in result if c.race.race_number in outcomes):
+                race = card.race
+                try:
+                    race_cards.append(card.to_race_card())
+                except ValidationError as e:
+                    logger.error(f"Validation error for {race.race_id}: {e}")
+                    outcomes[race.race_number] = (
+                        race.race_id,
+                        "failed",
+                        f"Validation error: {str(e)}",
+                    )
+
+            metrics = self.etl.load_race_cards(race_cards, run_hooks=self.run_hooks)
+            if metrics["status"] == "success":
+                status, error = "done", None
+                report.runs += metrics["inserted"].get("runs", 0)
+            else:
+                status, error = "failed", "; ".join(metrics["errors"])
+            for card in race_cards:
+                outcomes[card.race.race_number] = (card.race.race_id, status, error)
+
+        now = datetime.now()
+        self._write_journal(
+            JOURNAL_RESULT_SQL,
+            [
+                (venue, race_date, number, race_id, status, 1, error, now)
+                for number, (race_id, status, error) in sorted(outcomes.items())
+            ],
+        )
+
+        loaded = sum(status == "done" for _, status, _ in outcomes.values())
+        report.meetings += 1
+        report.races += loaded
+        report.failed_races += len(outcomes) - loaded
+        if loaded < len(outcomes):
+            report.failed_meetings += 1
+        report.stages["db_write"].append(time.perf_counter() - started)
+
+        if report.meetings % 100 == 0:
+            logger.info(
+                f"Backfill progress: {report.meetings} meetings, {report.races} "
+                f"races ({report.races_per_sec:.1f} races/sec)"
+            )
+
+    def _write_journal(self, sql: str, rows: list[tuple]) -> None:
+        """Write journal rows with one set-based statement."""
+        batch = pa.Table.from_pylist([dict(zip(JOURNAL_COLUMNS, row)) for row in rows])
+        with self.connections.write_transaction() as con:
+            con.register("_journal_rows", batch)
+            try:
+                con.execute(sql.format(columns=", ".join(JOURNAL_COLUMNS)))
+            finally:
+                con.unregister("_journal_rows")
+
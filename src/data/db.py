@@ -0,0 +1,313 @@
+"""
+Shared DuckDB connection management.
+
+Opening a DuckDB file is not free: every ``duckdb.connect`` call attaches the
+database, replays the WAL and starts with a cold buffer cache. The feature
+engines used to do this inside every public method, so a single race card
+opened and closed dozens of connections.
+
+This module keeps one long-lived database instance per file and hands out:
+- A cursor per thread for reads (cursors share the instance and its cache)
+- A single shared writer cursor, serialized with a lock, for ETL loads
+
+Usage:
+    from src.data.db import get_connection_manager
+
+    connections = get_connection_manager("data/racing.duckdb")
+    rows = connections.cursor().execute("SELECT COUNT(*) FROM races").fetchone()
+
+    with get_connection_manager(db_path, read_only=False).write_transaction() as con:
+        con.execute("INSERT INTO races ...")
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDBConnectionManager:
+    """
+    Long-lived DuckDB connection with per-thread read cursors.
+
+    One manager owns one database instance. Read cursors are created lazily
+    per thread via ``connection.cursor()`` so concurrent readers never share
+    a cursor, while all of them share DuckDB's buffer cache. Writes go through
+    a single writer cursor guarded by a lock, which matches DuckDB's
+    single-writer model.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        read_only: bool = True,
+        threads: int | None = None,
+        memory_limit: str | None = None,
+    ):
+        """
+        Initialize connection manager (the database is opened lazily).
+
+        Args:
+            db_path: Path to DuckDB database
+            read_only: Open the database read-only (no writer available)
+            threads: DuckDB worker threads (default: DuckDB's choice)
+            memory_limit: DuckDB memory limit, e.g. "4GB" (default: DuckDB's choice)
+        """
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self.threads = threads
+        self.memory_limit = memory_limit
+
+        self._connection: duckdb.DuckDBPyConnection | None = None
+        self._writer: duckdb.DuckDBPyConnection | None = None
+        self._cursors: dict[threading.Thread, duckdb.DuckDBPyConnection] = {}
+        self._generation = 0
+        self._reopening = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._write_lock = threading.RLock()
+
+    @property
+    def config(self) -> dict[str, str | int]:
+        """DuckDB configuration passed to ``duckdb.connect``."""
+        config: dict[str, str | int] = {}
+        if self.threads:
+            config["threads"] = self.threads
+        if self.memory_limit:
+            config["memory_limit"] = self.memory_limit
+        return config
+
+    @property
+    def connection(self) -> duckdb.DuckDBPyConnection:
+        """Root connection (opened on first use)."""
+        if self._connection is None:
+            with self._lock:
+                self._connect()
+        return self._connection
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        """Open the root connection if needed (caller holds the lock)."""
+        if self._connection is None:
+            self._connection = duckdb.connect(
+                str(self.db_path), read_only=self.read_only, config=self.config
+            )
+            logger.info(
+                f"Opened DuckDB connection: {self.db_path} "
+                f"(read_only={self.read_only}, config={self.config})"
+            )
+        return self._connection
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """
+        Get the calling thread's read cursor.
+
+        The cursor is owned by the manager and stays open between calls;
+        callers must not close it. After a ``reopen()`` the thread's next
+        call releases its old cursor and returns a new one.
+        """
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is not None and self._local.generation == self._generation:
+            return cursor
+
+        with self._released:
+            self._release(threading.current_thread())
+            self._released.wait_for(lambda: not self._reopening)
+            self._prune()
+
+            cursor = self._connect().cursor()
+            self._cursors[threading.current_thread()] = cursor
+            self._local.cursor = cursor
+            self._local.generation = self._generation
+        return cursor
+
+    def _release(self, thread: threading.Thread) -> None:
+        """Close a thread's registered cursor (caller holds the lock)."""
+        cursor = self._cursors.pop(thread, None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception as e:
+                logger.debug(f"Error closing cursor: {e}")
+            self._released.notify_all()
+
+    def _prune(self) -> None:
+        """Close cursors of threads that have finished (caller holds the lock)."""
+        for thread in [t for t in self._cursors if not t.is_alive()]:
+            self._release(thread)
+
+    def writer(self) -> duckdb.DuckDBPyConnection:
+        """
+        Get the shared writer cursor.
+
+        Prefer ``write_transaction()``, which also holds the write lock.
+        """
+        if self.read_only:
+            raise RuntimeError(
+                f"Connection manager for {self.db_path} is read-only; "
+                "use get_connection_manager(db_path, read_only=False) for writes"
+            )
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = self._connect().cursor()
+        return self._writer
+
+    @contextmanager
+    def write_transaction(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Run a block inside a transaction on the shared writer.
+
+        Commits on success, rolls back and re-raises on error.
+        """
+        with self._write_lock:
+            con = self.writer()
+            con.begin()
+            try:
+                yield con
+            except Exception:
+                con.rollback()
+                raise
+            else:
+                con.commit()
+
+    def close(self) -> None:
+        """Close all cursors and the root connection."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        """Close everything and invalidate cached cursors (caller holds the lock)."""
+        for thread in list(self._cursors):
+            self._release(thread)
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+        # Cached per-thread cursors are now stale
+        self._generation += 1
+
+    def reopen(self, read_only: bool, timeout: float = 10.0) -> None:
+        """
+        Close and reopen the database with a different access mode.
+
+        DuckDB cursors die with their root connection, so other threads'
+        cursors are not closed under them: the reopen waits (after any open
+        write transaction) until each thread has released its cursor by
+        calling ``cursor()`` again, or has finished. New cursors are held
+        back until the database is reopened.
+
+        Args:
+            read_only: New access mode
+            timeout: Seconds to wait for other threads before closing their
+                cursors anyway
+        """
+        with self._write_lock, self._released:
+            self._generation += 1
+            self._reopening = True
+            self._release(threading.current_thread())
+            try:
+                deadline = time.monotonic() + timeout
+                while True:
+                    # Finished threads never call back, so poll for them
+                    self._prune()
+                    remaining = deadline - time.monotonic()
+                    if not self._cursors:
+                        break
+                    if remaining <= 0:
+                        logger.warning(
+                            f"Reopening {self.db_path} with {len(self._cursors)} "
+                            f"cursor(s) still held by other threads after {timeout}s"
+                        )
+                        break
+                    self._released.wait(min(remaining, 0.1))
+                self._close()
+                self.read_only = read_only
+            finally:
+                self._reopening = False
+                self._released.notify_all()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+# Process-wide registry: one manager per database file
+_managers: dict[str, DuckDBConnectionManager] = {}
+_registry_lock = threading.Lock()
+
+
+def get_connection_manager(
+    db_path: str | Path,
+    read_only: bool = True,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+) -> DuckDBConnectionManager:
+    """
+    Get the process-wide connection manager for a database file.
+
+    DuckDB refuses to open the same file twice in one process with different
+    settings, so a single manager is shared per resolved path. A read-write
+    request upgrades an existing read-only manager (read-write managers also
+    serve reads). ``threads`` and ``memory_limit`` only apply when the
+    manager is created.
+
+    Args:
+        db_path: Path to DuckDB database
+        read_only: Whether the caller only needs read access
+        threads: DuckDB worker threads (default: ``settings.db_threads``)
+        memory_limit: DuckDB memory limit (default: ``settings.db_memory_limit``)
+
+    Returns:
+        Shared DuckDBConnectionManager
+    """
+    key = str(Path(db_path).resolve())
+
+    with _registry_lock:
+        manager = _managers.get(key)
+
+        if manager is not None and manager.read_only and not read_only:
+            logger.info(f"Upgrading connection manager to read-write: {db_path}")
+            manager.reopen(read_only=False)
+
+        if manager is None:
+            if threads is None or memory_limit is None:
+                from src.utils.config import settings
+
+                threads = threads or settings.db_threads
+                memory_limit = memory_limit or settings.db_memory_limit
+
+            manager = DuckDBConnectionManager(
+                db_path,
+                read_only=read_only,
+                threads=threads,
+                memory_limit=memory_limit,
+            )
+            _managers[key] = manager
+
+        return manager
+
+
+def close_all_connections() -> None:
+    """Close every registered connection manager (e.g. on shutdown or fork)."""
+    with _registry_lock:
+        for manager in _managers.values():
+            manager.close()
+        _managers.clear()
@@ -11,29 +11,202 @@ Features:
 - Data quality monitoring
 - Logging and metrics
 - Idempotent operations (safe re-runs)
+- Set-based upserts: each table is loaded with one INSERT ... SELECT ...
+  ON CONFLICT DO UPDATE from a registered Arrow table, per race or per
+  batch of races
+- Change detection for master data: horses, jockeys and trainers whose
+  content hash matches entity_hashes are skipped, not rewritten
 
 Usage:
     from src.data.etl_pipeline import RacingETL
 
     etl = RacingETL()
     etl.ingest_race("FLE", "2025-11-12", race_number=1)
+
+    # Whole meetings: one request and one transaction per meeting
+    etl.ingest_meeting("flemington", "2025-11-12")
+    etl.ingest_meetings("2025-11-01", "2025-11-12")
+
+    # Resumable, journaled multi-year backfills: see src/data/backfill.py
+
+    # Historical backfill: many scraped cards, one upsert per table
+    etl.load_race_cards(race_cards, stewards_reports=reports)
+
+    # Live prices: ticks buffered and flushed to market_odds in batches
+    with etl.odds_stream(batch_size=5000, flush_interval=0.25) as stream:
+        stream.push_many(ticks)
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+from collections.abc import Callable
 from datetime import date, datetime
+from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import duckdb
+import pyarrow as pa
 from pydantic import ValidationError
 
-from src.data.models import RaceCard
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.data.models import MarketOdds, RaceCard, ScrapedRaceCard, StewardsReport
+from src.data.odds_stream import OddsStreamWriter
 from src.data.scrapers import MarketOddsCollector, RacingComScraper, StewardsScraper
+from src.data.scrapers.racing_com_graphql import RacingComGraphQLScraper
+
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
+    from src.features.store import FeatureStore
 
 logger = logging.getLogger(__name__)
 
 
+# Upserted columns per table (primary key first)
+UPSERT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "races": (
+        "race_id",
+        "date",
+        "venue",
+        "venue_name",
+        "race_number",
+        "race_name",
+        "distance",
+        "track_condition",
+        "track_type",
+        "rail_position",
+        "weather",
+        "class_level",
+        "prize_money",
+        "race_time",
+        "actual_start_time",
+        "field_size",
+        "race_type",
+        "age_restriction",
+        "sex_restriction",
+        "scraped_at",
+        "data_source",
+        "is_complete",
+    ),
+    "horses": (
+        "horse_id",
+        "name",
+        "foaling_date",
+        "age",
+        "sex",
+        "color",
+        "sire",
+        "sire_id",
+        "dam",
+        "dam_id",
+        "dam_sire",
+        "breeder",
+        "country",
+        "owner",
+        "created_at",
+        "updated_at",
+    ),
+    "jockeys": (
+        "jockey_id",
+        "name",
+        "active_since",
+        "apprentice",
+        "claim_weight",
+        "created_at",
+        "updated_at",
+    ),
+    "trainers": (
+        "trainer_id",
+        "name",
+        "stable_location",
+        "state",
+        "active_since",
+        "created_at",
+        "updated_at",
+    ),
+    "runs": (
+        "run_id",
+        "race_id",
+        "horse_id",
+        "jockey_id",
+        "trainer_id",
+        "barrier",
+        "weight_carried",
+        "handicap_weight",
+        "weight_penalty",
+        "emergency",
+        "scratched",
+        "scratched_time",
+        "late_scratching",
+        "runner_number",
+        "saddle_cloth",
+        "starting_price_win",
+        "starting_price_place",
+        "created_at",
+    ),
+    "gear": (
+        "gear_id",
+        "run_id",
+        "gear_type",
+        "gear_code",
+        "first_time",
+        "removed",
+        "change_type",
+        "previous_gear",
+    ),
+    "stewards": (
+        "steward_id",
+        "race_id",
+        "run_id",
+        "report_type",
+        "report_text",
+        "incident_description",
+        "action_taken",
+        "horses_involved",
+        "jockeys_involved",
+        "severity",
+        "outcome",
+        "published_at",
+        "scraped_at",
+    ),
+    "market_odds": (
+        "odds_id",
+        "run_id",
+        "race_id",
+        "timestamp",
+        "source",
+        "odds_type",
+        "odds_decimal",
+        "odds_fractional",
+        "odds_american",
+        "volume",
+        "market_percentage",
+        "rank",
+    ),
+}
+
+# Columns written on insert only (a reload keeps the original row's value)
+INSERT_ONLY_COLUMNS = frozenset({"created_at"})
+
+# Columns reloads are expected to change (late rider swaps, scratchings)
+RELOADED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "runs": ("jockey_id", "trainer_id", "scratched"),
+}
+
+# Master-data tables written only when a row's content changes, and the
+# columns hashed to detect it (upserted columns minus key and timestamps)
+HASHED_COLUMNS: dict[str, tuple[str, ...]] = {
+    table: tuple(
+        column
+        for column in UPSERT_COLUMNS[table][1:]
+        if column not in ("created_at", "updated_at")
+    )
+    for table in ("horses", "jockeys", "trainers")
+}
+
+
 class RacingETL:
     """
     ETL pipeline for racing data.
@@ -44,25 +217,58 @@ class RacingETL:
     - Load: Insert into DuckDB with conflict resolution
     """
 
-    def __init__(self, db_path: str | Path = "data/racing.duckdb"):
+    def __init__(
+        self,
+        db_path: str | Path = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        feature_store: FeatureStore | None = None,
+        post_ingest_hooks: list[Callable[[str], object]] | None = None,
+        http_cache: ResponseCache | None = None,
+    ):
         """
         Initialize ETL pipeline.
 
         Args:
             db_path: Path to DuckDB database
+            connections: Read-write connection manager (default: process-wide
+                manager for db_path); all loads go through its single writer
+            feature_store: Feature store refreshed after each successful ingest
+            post_ingest_hooks: Callables run with the race_id after each
+                successful ingest (after the feature store update)
+            http_cache: Response cache shared by all scrapers (re-ingests
+                replay stored pages instead of re-downloading them)
         """
         self.db_path = Path(db_path)
         if not self.db_path.exists():
             raise FileNotFoundError(
                 f"Database not found: {db_path}. Run init_db.py first."
             )
+        self._connections = connections
+
+        # In-process mirror of entity_hashes for rows this pipeline has seen
+        self._entity_hashes: dict[tuple[str, str], str] = {}
+        # Per table: columns this database cannot update in place
+        self._non_updatable: dict[str, frozenset[str]] = {}
 
-        self.race_scraper = RacingComScraper()
-        self.stewards_scraper = StewardsScraper()
-        self.odds_collector = MarketOddsCollector()
+        self.post_ingest_hooks: list[Callable[[str], object]] = []
+        if feature_store is not None:
+            self.post_ingest_hooks.append(feature_store.update_race)
+        self.post_ingest_hooks.extend(post_ingest_hooks or [])
+
+        self.race_scraper = RacingComScraper(cache=http_cache)
+        self.meeting_scraper = RacingComGraphQLScraper(cache=http_cache)
+        self.stewards_scraper = StewardsScraper(cache=http_cache)
+        self.odds_collector = MarketOddsCollector(cache=http_cache)
 
         logger.info(f"ETL pipeline initialized with database: {db_path}")
 
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared read-write connection manager."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path, read_only=False)
+        return self._connections
+
     def ingest_race(self, venue: str, race_date: date | str, race_number: int) -> dict:
         """
         Ingest complete race data.
@@ -135,56 +341,57 @@ class RacingETL:
             # LOAD: Insert into database
             logger.info(f"Loading data for {race_id}")
 
-            con = duckdb.connect(str(self.db_path))
             try:
-                # Insert race
-                self._insert_race(con, race_card.race)
-                metrics["inserted"]["race"] = 1
-
-                # Insert master data (horses, jockeys, trainers)
-                self._insert_horses(con, race_card.horses)
-                metrics["inserted"]["horses"] = len(race_card.horses)
-
-                self._insert_jockeys(con, race_card.jockeys)
-                metrics["inserted"]["jockeys"] = len(race_card.jockeys)
-
-                self._insert_trainers(con, race_card.trainers)
-                metrics["inserted"]["trainers"] = len(race_card.trainers)
-
-                # Insert runs
-                self._insert_runs(con, race_card.runs)
-                metrics["inserted"]["runs"] = len(race_card.runs)
-
-                # Insert gear
-                if race_card.gear:
-                    self._insert_gear(con, race_card.gear)
-                    metrics["inserted"]["gear"] = len(race_card.gear)
-
-                # Insert stewards reports
-                if stewards_reports:
-                    self._insert_stewards(con, stewards_reports)
-                    metrics["inserted"]["stewards"] = len(stewards_reports)
-
-                # Insert odds (temporarily skip to avoid FK constraint - will fix in Week 2)
-                # TODO: Week 2 - Integrate odds with actual run_ids from race card
-                # if odds_data:
-                #     self._insert_odds(con, odds_data)
-                #     metrics["inserted"]["odds"] = len(odds_data)
-                metrics["inserted"]["odds"] = 0  # Placeholder
-
-                con.commit()
+                with self.connections.write_transaction() as con:
+                    # Insert race
+                    self._insert_race(con, race_card.race)
+                    metrics["inserted"]["race"] = 1
+
+                    # Insert master data (horses, jockeys, trainers)
+                    self._insert_horses(con, race_card.horses)
+                    metrics["inserted"]["horses"] = len(race_card.horses)
+
+                    self._insert_jockeys(con, race_card.jockeys)
+                    metrics["inserted"]["jockeys"] = len(race_card.jockeys)
+
+                    self._insert_trainers(con, race_card.trainers)
+                    metrics["inserted"]["trainers"] = len(race_card.trainers)
+
+                    # Insert runs
+                    self._insert_runs(con, race_card.runs)
+                    metrics["inserted"]["runs"] = len(race_card.runs)
+
+                    # Insert gear
+                    if race_card.gear:
+                        self._insert_gear(con, race_card.gear)
+                        metrics["inserted"]["gear"] = len(race_card.gear)
+
+                    # Insert stewards reports
+                    if stewards_reports:
+                        self._insert_stewards(con, stewards_reports)
+                        metrics["inserted"]["stewards"] = len(stewards_reports)
+
+                    # Insert odds (temporarily skip to avoid FK constraint -
+                    # will fix in Week 2)
+                    # TODO: Week 2 - Integrate odds with actual run_ids from race card
+                    # if odds_data:
+                    #     self._insert_odds(con, odds_data)
+                    #     metrics["inserted"]["odds"] = len(odds_data)
+                    metrics["inserted"]["odds"] = 0  # Placeholder
+
                 metrics["status"] = "success"
                 logger.info(f"Successfully ingested {race_id}")
 
             except Exception as e:
+                # write_transaction() has already rolled back
+                self._entity_hashes.clear()
                 logger.error(f"Database error: {e}", exc_info=True)
-                con.rollback()
                 metrics["errors"].append(f"Database error: {str(e)}")
                 metrics["status"] = "failed"
                 raise
 
-            finally:
-                con.close()
+            # POST-INGEST: Derived data (feature store etc.) after commit
+            self._run_post_ingest_hooks(race_id, metrics)
 
         except Exception as e:
             logger.error(f"ETL failed for {race_id}: {e}", exc_info=True)
@@ -193,232 +400,409 @@ class RacingETL:
 
         return metrics
 
-    def _insert_race(self, con: duckdb.DuckDBPyConnection, race) -> None:
-        """Insert race (with conflict resolution)."""
-        con.execute(
-            """
-            INSERT OR REPLACE INTO races (
-                race_id, date, venue, venue_name, race_number, race_name,
-                distance, track_condition, track_type, rail_position, weather,
-                class_level, prize_money, race_time, actual_start_time,
-                field_size, race_type, age_restriction, sex_restriction,
-                scraped_at, data_source, is_complete
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            [
-                race.race_id,
-                race.date,
-                race.venue,
-                race.venue_name,
-                race.race_number,
-                race.race_name,
-                race.distance,
-                race.track_condition,
-                race.track_type,
-                race.rail_position,
-                race.weather,
-                race.class_level,
-                race.prize_money,
-                race.race_time,
-                race.actual_start_time,
-                race.field_size,
-                race.race_type,
-                race.age_restriction,
-                race.sex_restriction,
-                race.scraped_at,
-                race.data_source,
-                race.is_complete,
-            ],
+    def ingest_meeting(self, venue: str, race_date: date | str) -> dict:
+        """
+        Ingest every race of a meeting from one GraphQL request.
+
+        The meeting is fetched once and all of its race cards are loaded in a
+        single transaction via load_race_cards(). Stewards reports and odds
+        are per race and are not collected here.
+
+        Args:
+            venue: Venue name (e.g., 'flemington', 'randwick')
+            race_date: Race date
+
+        Returns:
+            dict with ingestion metrics (see load_race_cards)
+        """
+        try:
+            scraped = self.meeting_scraper.scrape_meeting(venue, race_date)
+        except Exception as e:
+            logger.error(f"ETL failed for {venue} {race_date}: {e}", exc_info=True)
+            return {
+                "race_ids": [],
+                "status": "failed",
+                "inserted": {},
+                "errors": [str(e)],
+            }
+
+        return self._load_scraped_cards(scraped)
+
+    def ingest_meetings(
+        self,
+        start_date: date | str,
+        end_date: date | str | None = None,
+        venues: list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Ingest every meeting across all venues for a date range.
+
+        One request per meeting (plus one meeting list per day); each meeting
+        is loaded in its own transaction so a failure loses only that meeting.
+
+        Args:
+            start_date: First date
+            end_date: Last date, inclusive (default: start_date)
+            venues: Only these venue names (default: all venues)
+
+        Returns:
+            List of per-meeting metrics (see load_race_cards)
+        """
+        results = []
+        for venue, race_date, scraped in self.meeting_scraper.scrape_meetings(
+            start_date, end_date, venues=venues
+        ):
+            metrics = self._load_scraped_cards(scraped)
+            metrics["meeting"] = f"{venue} {race_date.isoformat()}"
+            results.append(metrics)
+
+        loaded = sum(len(m["race_ids"]) for m in results if m["status"] == "success")
+        logger.info(f"✓ Ingested {loaded} races from {len(results)} meetings")
+        return results
+
+    def _load_scraped_cards(self, scraped: list[ScrapedRaceCard]) -> dict:
+        """Resolve ids for scraped cards and load them in one transaction."""
+        race_cards, errors = [], []
+        for card in scraped:
+            try:
+                race_cards.append(card.to_race_card())
+            except ValidationError as e:
+                logger.error(f"Validation error for {card.race.race_id}: {e}")
+                errors.append(f"Validation error ({card.race.race_id}): {str(e)}")
+
+        metrics = self.load_race_cards(race_cards)
+        metrics["errors"] = errors + metrics["errors"]
+        return metrics
+
+    def odds_stream(self, **kwargs) -> OddsStreamWriter:
+        """
+        Streaming market odds writer sharing this pipeline's writer connection.
+
+        Args:
+            **kwargs: Passed to OddsStreamWriter (batch_size, flush_interval,
+                capacity, overflow)
+
+        Returns:
+            OddsStreamWriter (not started: use it as a context manager)
+        """
+        return OddsStreamWriter(self.db_path, connections=self.connections, **kwargs)
+
+    def _run_post_ingest_hooks(self, race_id: str, metrics: dict) -> None:
+        """
+        Run post-ingest hooks for a committed race.
+
+        Hook failures are recorded in metrics but never fail the ingest:
+        the raw data is already committed and derived data can be rebuilt.
+        """
+        for hook in self.post_ingest_hooks:
+            hook_name = getattr(hook, "__qualname__", repr(hook))
+            try:
+                hook(race_id)
+            except Exception as e:
+                logger.error(
+                    f"Post-ingest hook {hook_name} failed for {race_id}: {e}",
+                    exc_info=True,
+                )
+                metrics["errors"].append(f"Post-ingest hook {hook_name}: {str(e)}")
+
+    # ------------------------------------------------------------------------
+    # Set-based loads
+    # ------------------------------------------------------------------------
+
+    def load_race_cards(
+        self,
+        race_cards: list[RaceCard],
+        stewards_reports: list[StewardsReport] | None = None,
+        odds: list[MarketOdds] | None = None,
+        run_hooks: bool = True,
+    ) -> dict:
+        """
+        Load many already-scraped race cards in one transaction.
+
+        Each table gets a single set-based upsert from an Arrow table
+        registered with DuckDB, so a historical backfill pays statement
+        overhead per table rather than per row.
+
+        Args:
+            race_cards: Race cards to load
+            stewards_reports: Stewards reports for these races
+            odds: Market odds for these races
+            run_hooks: Run post-ingest hooks for every loaded race after commit
+
+        Returns:
+            dict with race_ids, status, inserted row counts and errors
+        """
+        metrics = {
+            "race_ids": [card.race.race_id for card in race_cards],
+            "status": "started",
+            "inserted": {},
+            "errors": [],
+        }
+
+        try:
+            with self.connections.write_transaction() as con:
+                metrics["inserted"] = self._load_tables(
+                    con,
+                    races=[card.race for card in race_cards],
+                    horses=[h for card in race_cards for h in card.horses],
+                    jockeys=[j for card in race_cards for j in card.jockeys],
+                    trainers=[t for card in race_cards for t in card.trainers],
+                    runs=[r for card in race_cards for r in card.runs],
+                    gear=[g for card in race_cards for g in card.gear or []],
+                    stewards=stewards_reports or [],
+                    odds=odds or [],
+                )
+        except Exception as e:
+            # write_transaction() has already rolled back
+            self._entity_hashes.clear()
+            logger.error(f"Bulk load failed: {e}", exc_info=True)
+            metrics["errors"].append(f"Database error: {str(e)}")
+            metrics["status"] = "failed"
+            return metrics
+
+        metrics["status"] = "success"
+        logger.info(
+            f"✓ Loaded {len(race_cards)} race cards "
+            f"({metrics['inserted'].get('runs', 0)} runs)"
         )
 
-    def _insert_horses(self, con: duckdb.DuckDBPyConnection, horses: list) -> None:
-        """Insert horses (upsert - update if exists)."""
-        for horse in horses:
-            con.execute(
-                """
-                INSERT OR REPLACE INTO horses (
-                    horse_id, name, foaling_date, age, sex, color,
-                    sire, sire_id, dam, dam_id, dam_sire, breeder, country, owner,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    horse.horse_id,
-                    horse.name,
-                    horse.foaling_date,
-                    horse.age,
-                    horse.sex,
-                    horse.color,
-                    horse.sire,
-                    horse.sire_id,
-                    horse.dam,
-                    horse.dam_id,
-                    horse.dam_sire,
-                    horse.breeder,
-                    horse.country,
-                    horse.owner,
-                    horse.created_at,
-                    datetime.now(),  # Update timestamp
-                ],
-            )
+        if run_hooks:
+            for race_id in metrics["race_ids"]:
+                self._run_post_ingest_hooks(race_id, metrics)
+
+        return metrics
+
+    def _load_tables(
+        self, con: duckdb.DuckDBPyConnection, **models: list
+    ) -> dict[str, int]:
+        """Upsert model lists in foreign-key order; returns rows per table."""
+        loaders = {
+            "races": self._insert_races,
+            "horses": self._insert_horses,
+            "jockeys": self._insert_jockeys,
+            "trainers": self._insert_trainers,
+            "runs": self._insert_runs,
+            "gear": self._insert_gear,
+            "stewards": self._insert_stewards,
+            "odds": self._insert_odds,
+        }
+        inserted = {}
+        for name, loader in loaders.items():
+            if models.get(name):
+                inserted[name] = loader(con, models[name])
+        return inserted
+
+    def _upsert(
+        self, con: duckdb.DuckDBPyConnection, table: str, rows: list[dict]
+    ) -> int:
+        """
+        Upsert rows into a table with one INSERT ... ON CONFLICT DO UPDATE.
 
-    def _insert_jockeys(self, con: duckdb.DuckDBPyConnection, jockeys: list) -> None:
-        """Insert jockeys (upsert)."""
-        for jockey in jockeys:
+        Rows sharing a primary key (e.g. a jockey on several cards) are
+        collapsed to the last one, matching sequential per-row upserts.
+        Existing rows are updated in place (INSERT OR REPLACE would also
+        rewrite the key, which DuckDB refuses for referenced rows), except
+        for insert-only columns and the columns _non_updatable_columns() reports.
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        columns = UPSERT_COLUMNS[table]
+        unique = list({row[columns[0]]: row for row in rows}.values())
+        batch = pa.Table.from_pylist(unique)
+
+        view = f"_bulk_{table}"
+        column_list = ", ".join(columns)
+        fixed = self._non_updatable_columns(con, table) | INSERT_ONLY_COLUMNS
+        updates = ", ".join(
+            f"{column} = excluded.{column}"
+            for column in columns[1:]
+            if column not in fixed
+        )
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        con.register(view, batch)
+        try:
             con.execute(
-                """
-                INSERT OR REPLACE INTO jockeys (
-                    jockey_id, name, active_since, apprentice, claim_weight,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    jockey.jockey_id,
-                    jockey.name,
-                    jockey.active_since,
-                    jockey.apprentice,
-                    jockey.claim_weight,
-                    jockey.created_at,
-                    datetime.now(),
-                ],
+                f"INSERT INTO {table} ({column_list}) "
+                f"SELECT {column_list} FROM {view} "
+                f"ON CONFLICT ({columns[0]}) {conflict}"
             )
+        finally:
+            con.unregister(view)
 
-    def _insert_trainers(self, con: duckdb.DuckDBPyConnection, trainers: list) -> None:
-        """Insert trainers (upsert)."""
-        for trainer in trainers:
+        return len(unique)
+
+    def _non_updatable_columns(
+        self, con: duckdb.DuckDBPyConnection, table: str
+    ) -> frozenset[str]:
+        """
+        Columns of a table that upserts must leave at their first-loaded value.
+
+        DuckDB rewrites an update of an indexed or foreign-key column as
+        delete + insert, which fails for rows other tables reference (even
+        when the referencing rows are deleted in the same transaction). For
+        tables that are referenced, those columns are read from the catalog
+        so databases created from an older schema (with indexes on mutable
+        run columns) degrade to skipping the update instead of failing.
+        """
+        if table not in self._non_updatable:
+            referenced = con.execute(
+                "SELECT 1 FROM duckdb_constraints() "
+                "WHERE constraint_type = 'FOREIGN KEY' AND referenced_table = ? "
+                "LIMIT 1",
+                [table],
+            ).fetchone()
+            fixed: set[str] = set()
+            if referenced:
+                for (columns,) in con.execute(
+                    "SELECT constraint_column_names FROM duckdb_constraints() "
+                    "WHERE table_name = ? AND constraint_type = 'FOREIGN KEY'",
+                    [table],
+                ).fetchall():
+                    fixed.update(columns)
+                for (expressions,) in con.execute(
+                    "SELECT expressions FROM duckdb_indexes() WHERE table_name = ?",
+                    [table],
+                ).fetchall():
+                    fixed.update(e.strip() for e in expressions.strip("[]").split(","))
+
+            stale = fixed & set(RELOADED_COLUMNS.get(table, ()))
+            if stale:
+                logger.warning(
+                    f"{table}.{', '.join(sorted(stale))} cannot be updated in "
+                    "place (database predates the current schema); reloads "
+                    "keep first-loaded values until it is rebuilt"
+                )
+            self._non_updatable[table] = frozenset(fixed)
+        return self._non_updatable[table]
+
+    def _upsert_changed(
+        self, con: duckdb.DuckDBPyConnection, table: str, rows: list[dict]
+    ) -> int:
+        """
+        Upsert only the master-data rows whose content changed.
+
+        Each row's hash is compared with the one recorded in entity_hashes,
+        which is mirrored in-process so entities seen earlier in a session
+        (the same jockey on every card of a backfill) need no lookup.
+        Unchanged rows are not rewritten at all; changed rows are upserted
+        and their new hashes recorded in the same transaction.
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        key = UPSERT_COLUMNS[table][0]
+        hashes = {row[key]: _content_hash(table, row) for row in rows}
+        unseen = [
+            entity_id
+            for entity_id in hashes
+            if (table, entity_id) not in self._entity_hashes
+        ]
+        if unseen:
+            self._entity_hashes.update(self._stored_hashes(con, table, unseen))
+
+        changed = {
+            entity_id: content_hash
+            for entity_id, content_hash in hashes.items()
+            if self._entity_hashes.get((table, entity_id)) != content_hash
+        }
+        if not changed:
+            return 0
+
+        written = self._upsert(con, table, [r for r in rows if r[key] in changed])
+        batch = pa.table(
+            {
+                "entity": pa.array([table] * len(changed), pa.string()),
+                "entity_id": pa.array(list(changed), pa.string()),
+                "content_hash": pa.array(list(changed.values()), pa.string()),
+                "updated_at": pa.array([datetime.now()] * len(changed)),
+            }
+        )
+        con.register("_entity_hashes", batch)
+        try:
             con.execute(
-                """
-                INSERT OR REPLACE INTO trainers (
-                    trainer_id, name, stable_location, state, active_since,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    trainer.trainer_id,
-                    trainer.name,
-                    trainer.stable_location,
-                    trainer.state,
-                    trainer.active_since,
-                    trainer.created_at,
-                    datetime.now(),
-                ],
+                "INSERT INTO entity_hashes "
+                "SELECT entity, entity_id, content_hash, updated_at "
+                "FROM _entity_hashes "
+                "ON CONFLICT (entity, entity_id) DO UPDATE SET "
+                "content_hash = excluded.content_hash, updated_at = excluded.updated_at"
             )
+        finally:
+            con.unregister("_entity_hashes")
+
+        self._entity_hashes.update(
+            {(table, entity_id): h for entity_id, h in changed.items()}
+        )
+        return written
+
+    def _stored_hashes(
+        self, con: duckdb.DuckDBPyConnection, table: str, entity_ids: list[str]
+    ) -> dict[tuple[str, str], str]:
+        """Recorded content hashes for some entities of a table."""
+        con.register("_hash_keys", pa.table({"entity_id": entity_ids}))
+        try:
+            stored = con.execute(
+                "SELECT h.entity_id, h.content_hash FROM entity_hashes h "
+                "JOIN _hash_keys k ON h.entity_id = k.entity_id "
+                "WHERE h.entity = ?",
+                [table],
+            ).fetchall()
+        finally:
+            con.unregister("_hash_keys")
+        return {(table, entity_id): content_hash for entity_id, content_hash in stored}
+
+    def _insert_race(self, con: duckdb.DuckDBPyConnection, race) -> None:
+        """Insert race (with conflict resolution)."""
+        self._insert_races(con, [race])
+
+    def _insert_races(self, con: duckdb.DuckDBPyConnection, races: list) -> int:
+        """Insert races (upsert)."""
+        return self._upsert(con, "races", _rows(races, "races"))
+
+    def _insert_horses(self, con: duckdb.DuckDBPyConnection, horses: list) -> int:
+        """Insert horses (upsert - only new or changed horses are written)."""
+        return self._upsert_changed(
+            con, "horses", _rows(horses, "horses", updated_at=datetime.now())
+        )
 
-    def _insert_runs(self, con: duckdb.DuckDBPyConnection, runs: list) -> None:
+    def _insert_jockeys(self, con: duckdb.DuckDBPyConnection, jockeys: list) -> int:
+        """Insert jockeys (upsert - only new or changed jockeys are written)."""
+        return self._upsert_changed(
+            con, "jockeys", _rows(jockeys, "jockeys", updated_at=datetime.now())
+        )
+
+    def _insert_trainers(self, con: duckdb.DuckDBPyConnection, trainers: list) -> int:
+        """Insert trainers (upsert - only new or changed trainers are written)."""
+        return self._upsert_changed(
+            con, "trainers", _rows(trainers, "trainers", updated_at=datetime.now())
+        )
+
+    def _insert_runs(self, con: duckdb.DuckDBPyConnection, runs: list) -> int:
         """Insert runs."""
-        for run in runs:
-            con.execute(
-                """
-                INSERT OR REPLACE INTO runs (
-                    run_id, race_id, horse_id, jockey_id, trainer_id,
-                    barrier, weight_carried, handicap_weight, weight_penalty,
-                    emergency, scratched, scratched_time, late_scratching,
-                    runner_number, saddle_cloth, starting_price_win, starting_price_place,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    run.run_id,
-                    run.race_id,
-                    run.horse_id,
-                    run.jockey_id,
-                    run.trainer_id,
-                    run.barrier,
-                    run.weight_carried,
-                    run.handicap_weight,
-                    run.weight_penalty,
-                    run.emergency,
-                    run.scratched,
-                    run.scratched_time,
-                    run.late_scratching,
-                    run.runner_number,
-                    run.saddle_cloth,
-                    run.starting_price_win,
-                    run.starting_price_place,
-                    run.created_at,
-                ],
-            )
+        return self._upsert(con, "runs", _rows(runs, "runs"))
 
-    def _insert_gear(self, con: duckdb.DuckDBPyConnection, gear_list: list) -> None:
+    def _insert_gear(self, con: duckdb.DuckDBPyConnection, gear_list: list) -> int:
         """Insert gear."""
-        for gear in gear_list:
-            con.execute(
-                """
-                INSERT OR REPLACE INTO gear (
-                    gear_id, run_id, gear_type, gear_code, first_time,
-                    removed, change_type, previous_gear
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    gear.gear_id,
-                    gear.run_id,
-                    gear.gear_type,
-                    gear.gear_code,
-                    gear.first_time,
-                    gear.removed,
-                    gear.change_type,
-                    gear.previous_gear,
-                ],
-            )
+        return self._upsert(con, "gear", _rows(gear_list, "gear"))
 
-    def _insert_stewards(self, con: duckdb.DuckDBPyConnection, reports: list) -> None:
+    def _insert_stewards(self, con: duckdb.DuckDBPyConnection, reports: list) -> int:
         """Insert stewards reports."""
-        for report in reports:
-            # Keep lists as-is for DuckDB arrays
-            horses_list = report.horses_involved if report.horses_involved else None
-            jockeys_list = report.jockeys_involved if report.jockeys_involved else None
-
-            con.execute(
-                """
-                INSERT OR REPLACE INTO stewards (
-                    steward_id, race_id, run_id, report_type, report_text,
-                    incident_description, action_taken, horses_involved,
-                    jockeys_involved, severity, outcome, published_at, scraped_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    report.steward_id,
-                    report.race_id,
-                    report.run_id,
-                    report.report_type,
-                    report.report_text,
-                    report.incident_description,
-                    report.action_taken,
-                    horses_list,
-                    jockeys_list,
-                    report.severity,
-                    report.outcome,
-                    report.published_at,
-                    report.scraped_at,
-                ],
-            )
-
-    def _insert_odds(self, con: duckdb.DuckDBPyConnection, odds_list: list) -> None:
+        rows = _rows(reports, "stewards")
+        for row in rows:
+            # Keep lists as-is for DuckDB arrays (empty lists stored as NULL)
+            row["horses_involved"] = row["horses_involved"] or None
+            row["jockeys_involved"] = row["jockeys_involved"] or None
+        return self._upsert(con, "stewards", rows)
+
+    def _insert_odds(self, con: duckdb.DuckDBPyConnection, odds_list: list) -> int:
         """Insert market odds."""
-        for odds in odds_list:
-            con.execute(
-                """
-                INSERT OR REPLACE INTO market_odds (
-                    odds_id, run_id, race_id, timestamp, source, odds_type,
-                    odds_decimal, odds_fractional, odds_american,
-                    volume, market_percentage, rank
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                [
-                    odds.odds_id,
-                    odds.run_id,
-                    odds.race_id,
-                    odds.timestamp,
-                    odds.source,
-                    odds.odds_type,
-                    odds.odds_decimal,
-                    odds.odds_fractional,
-                    odds.odds_american,
-                    odds.volume,
-                    odds.market_percentage,
-                    odds.rank,
-                ],
-            )
+        return self._upsert(con, "market_odds", _rows(odds_list, "market_odds"))
 
     def get_data_quality_report(self) -> dict:
         """
@@ -427,50 +811,47 @@ class RacingETL:
         Returns:
             dict with quality metrics
         """
-        con = duckdb.connect(str(self.db_path), read_only=True)
-
-        try:
-            # Count incomplete races
-            incomplete_races = con.execute(
-                "SELECT COUNT(*) FROM v_incomplete_races"
-            ).fetchone()[0]
-
-            # Count incomplete runs
-            incomplete_runs = con.execute(
-                "SELECT COUNT(*) FROM v_incomplete_runs"
-            ).fetchone()[0]
-
-            # Total races
-            total_races = con.execute("SELECT COUNT(*) FROM races").fetchone()[0]
-
-            # Total runs
-            total_runs = con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
-
-            report = {
-                "total_races": total_races,
-                "incomplete_races": incomplete_races,
-                "race_completeness": (
-                    (total_races - incomplete_races) / total_races * 100
-                    if total_races > 0
-                    else 0
-                ),
-                "total_runs": total_runs,
-                "incomplete_runs": incomplete_runs,
-                "run_completeness": (
-                    (total_runs - incomplete_runs) / total_runs * 100
-                    if total_runs > 0
-                    else 0
-                ),
-            }
-
-            return report
+        con = self.connections.cursor()
+
+        # Count incomplete races
+        incomplete_races = con.execute(
+            "SELECT COUNT(*) FROM v_incomplete_races"
+        ).fetchone()[0]
+
+        # Count incomplete runs
+        incomplete_runs = con.execute(
+            "SELECT COUNT(*) FROM v_incomplete_runs"
+        ).fetchone()[0]
+
+        # Total races
+        total_races = con.execute("SELECT COUNT(*) FROM races").fetchone()[0]
+
+        # Total runs
+        total_runs = con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+        report = {
+            "total_races": total_races,
+            "incomplete_races": incomplete_races,
+            "race_completeness": (
+                (total_races - incomplete_races) / total_races * 100
+                if total_races > 0
+                else 0
+            ),
+            "total_runs": total_runs,
+            "incomplete_runs": incomplete_runs,
+            "run_completeness": (
+                (total_runs - incomplete_runs) / total_runs * 100
+                if total_runs > 0
+                else 0
+            ),
+        }
 
-        finally:
-            con.close()
+        return report
 
     def close(self):
         """Cleanup resources."""
         self.race_scraper.close()
+        self.meeting_scraper.close()
         self.stewards_scraper.close()
         self.odds_collector.close()
 
@@ -483,6 +864,25 @@ class RacingETL:
         self.close()
 
 
+def _content_hash(table: str, row: dict) -> str:
+    """Digest of a master-data row's hashed columns."""
+    content = repr([row[column] for column in HASHED_COLUMNS[table]])
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _rows(models: list, table: str, **overrides) -> list[dict]:
+    """Upsert rows for a table from models (enums stored as their values)."""
+    columns = UPSERT_COLUMNS[table]
+    rows = []
+    for model in models:
+        row = {}
+        for column in columns:
+            value = overrides[column] if column in overrides else getattr(model, column)
+            row[column] = value.value if isinstance(value, Enum) else value
+        rows.append(row)
+    return rows
+
+
 # Example usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,287 @@
+"""
+Local stand-in for an exchange price stream.
+
+Generates random-walk win prices for a set of concurrent synthetic markets,
+one producer thread per market, so the streaming odds pipeline can be
+exercised and benchmarked without an exchange connection. Each market
+update moves a few runners' prices (like an exchange market change
+message) and is delivered to a sink as one list of PriceTicks.
+
+Usage:
+    from src.data.fake_price_feed import FakePriceFeed
+    from src.data.odds_stream import OddsStreamWriter
+
+    feed = FakePriceFeed(markets=20, updates_per_sec=100)
+    feed.seed_database(connections)          # races/horses/runs for the ticks
+    with OddsStreamWriter(db_path, connections=connections) as stream:
+        feed.run(stream.push_many, duration=10)
+
+    python -m src.data.fake_price_feed --markets 20 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+
+from src.data.db import DuckDBConnectionManager
+from src.data.init_db import create_database
+from src.data.odds_stream import OddsStreamWriter, PriceTick
+
+logger = logging.getLogger(__name__)
+
+
+class FakePriceFeed:
+    """Random-walk prices for concurrent synthetic markets."""
+
+    def __init__(
+        self,
+        markets: int = 20,
+        runners: int = 12,
+        updates_per_sec: float = 50.0,
+        runners_per_update: int = 4,
+        race_date: date = date(2025, 1, 1),
+        seed: int = 0,
+    ):
+        """
+        Initialize feed.
+
+        Args:
+            markets: Concurrent markets (one producer thread each)
+            runners: Runners per market (max 24)
+            updates_per_sec: Market updates per second per market
+                (0: as fast as the sink accepts them)
+            runners_per_update: Runners whose price moves per update
+            race_date: Date of the synthetic races
+            seed: Seed for prices and volumes
+        """
+        runners = min(runners, 24)
+        self.updates_per_sec = updates_per_sec
+        self.runners_per_update = min(runners_per_update, runners)
+        self.seed = seed
+
+        self.race_ids = [
+            f"FEED-{race_date.isoformat()}-R{market}"
+            for market in range(1, markets + 1)
+        ]
+        self.run_ids = {
+            race_id: [f"{race_id}-H{runner}" for runner in range(1, runners + 1)]
+            for race_id in self.race_ids
+        }
+        self.race_date = race_date
+
+    def seed_database(self, connections: DuckDBConnectionManager) -> None:
+        """Insert the races, horses and runs the feed's ticks refer to."""
+        races = [
+            (race_id, self.race_date, "FEED", number, 1200, datetime.now(), "fake")
+            for number, race_id in enumerate(self.race_ids, start=1)
+        ]
+        runs = [
+            (run_id, race_id, run_id, barrier)
+            for race_id, run_ids in self.run_ids.items()
+            for barrier, run_id in enumerate(run_ids, start=1)
+        ]
+        with connections.write_transaction() as con:
+            con.executemany(
+                "INSERT OR IGNORE INTO races (race_id, date, venue, race_number, "
+                "distance, scraped_at, data_source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                races,
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO horses (horse_id, name) VALUES (?, ?)",
+                [(run_id, run_id) for run_id, *_ in runs],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO runs (run_id, race_id, horse_id, barrier) "
+                "VALUES (?, ?, ?, ?)",
+                runs,
+            )
+        logger.info(f"Seeded {len(races)} fake markets ({len(runs)} runners)")
+
+    def run(
+        self,
+        sink: Callable[[list[PriceTick]], object],
+        duration: float | None = None,
+        updates: int | None = None,
+    ) -> int:
+        """
+        Produce ticks from every market concurrently until done.
+
+        Args:
+            sink: Called with each market update's ticks (e.g.
+                OddsStreamWriter.push_many; blocking applies backpressure)
+            duration: Seconds to run
+            updates: Updates per market (stops at whichever limit comes first)
+
+        Returns:
+            Ticks produced
+        """
+        if duration is None and updates is None:
+            raise ValueError("Pass duration or updates")
+
+        deadline = None if duration is None else time.monotonic() + duration
+        produced = [0] * len(self.race_ids)
+        threads = [
+            threading.Thread(
+                target=self._market,
+                args=(i, race_id, sink, deadline, updates, produced),
+                name=f"fake-feed-{i}",
+                daemon=True,
+            )
+            for i, race_id in enumerate(self.race_ids)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(produced)
+
+    def _market(
+        self,
+        index: int,
+        race_id: str,
+        sink: Callable[[list[PriceTick]], object],
+        deadline: float | None,
+        updates: int | None,
+        produced: list[int],
+    ) -> None:
+        """One market's producer loop."""
+        rng = random.Random(f"{self.seed}-{race_id}")
+        run_ids = self.run_ids[race_id]
+        prices = {run_id: rng.uniform(2.0, 40.0) for run_id in run_ids}
+        interval = 1 / self.updates_per_sec if self.updates_per_sec else 0.0
+        next_update = time.monotonic()
+
+        count = 0
+        while updates is None or count < updates:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+            now = datetime.now()
+            ticks = []
+            for run_id in rng.sample(run_ids, self.runners_per_update):
+                price = prices[run_id] * math.exp(rng.gauss(0, 0.02))
+                prices[run_id] = price = min(max(price, 1.01), 1000.0)
+                ticks.append(
+                    PriceTick(
+                        run_id=run_id,
+                        race_id=race_id,
+                        timestamp=now,
+                        odds_decimal=round(price, 2),
+                        volume=round(rng.uniform(0, 5000), 2),
+                    )
+                )
+            sink(ticks)
+            produced[index] += len(ticks)
+            count += 1
+
+            if interval:
+                next_update += interval
+                time.sleep(max(0.0, next_update - time.monotonic()))
+
+
+def run_stream_benchmark(
+    markets: int = 20,
+    runners: int = 12,
+    updates_per_sec: float = 0.0,
+    duration: float = 5.0,
+    batch_size: int = 5000,
+    flush_interval: float = 0.25,
+    capacity: int = 100_000,
+    overflow: str = "block",
+    db_path: str | Path | None = None,
+) -> dict:
+    """
+    Stream the fake feed into a throwaway database and measure throughput.
+
+    Args:
+        markets: Concurrent markets
+        runners: Runners per market
+        updates_per_sec: Updates per second per market (0: unthrottled)
+        duration: Seconds to produce for
+        batch_size: Writer batch size
+        flush_interval: Writer flush interval in seconds
+        capacity: Ring buffer capacity
+        overflow: Ring buffer overflow policy
+        db_path: Database to create, must not exist (default: temporary file)
+
+    Returns:
+        Stream metrics plus produced, elapsed_s, ticks_per_sec and rows
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(db_path or Path(tmp) / "odds_stream.duckdb")
+        create_database(db_path)
+        connections = DuckDBConnectionManager(db_path, read_only=False)
+
+        feed = FakePriceFeed(markets, runners, updates_per_sec)
+        feed.seed_database(connections)
+
+        stream = OddsStreamWriter(
+            connections=connections,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            capacity=capacity,
+            overflow=overflow,
+        )
+        started = time.perf_counter()
+        with stream:
+            produced = feed.run(stream.push_many, duration=duration)
+        elapsed = time.perf_counter() - started
+        metrics = stream.metrics.snapshot()
+
+        rows = connections.cursor().execute("SELECT COUNT(*) FROM market_odds")
+        metrics["rows"] = rows.fetchone()[0]
+        connections.close()
+
+    metrics["produced"] = produced
+    metrics["elapsed_s"] = round(elapsed, 4)
+    metrics["ticks_per_sec"] = round(metrics["written"] / elapsed, 1)
+    logger.info(
+        f"✓ Odds stream: {metrics['written']} ticks in {elapsed:.2f}s "
+        f"({metrics['ticks_per_sec']:.0f} ticks/sec)"
+    )
+    return metrics
+
+
+def main() -> int:
+    """Run the streaming benchmark and print its metrics."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming odds ingestion")
+    parser.add_argument("--markets", type=int, default=20)
+    parser.add_argument("--runners", type=int, default=12)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Updates/sec per market (0: max)"
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--flush-ms", type=float, default=250.0)
+    parser.add_argument("--capacity", type=int, default=100_000)
+    parser.add_argument("--overflow", choices=("block", "drop_oldest"), default="block")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    metrics = run_stream_benchmark(
+        markets=args.markets,
+        runners=args.runners,
+        updates_per_sec=args.rate,
+        duration=args.duration,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_ms / 1000,
+        capacity=args.capacity,
+        overflow=args.overflow,
+    )
+    print(json.dumps(metrics, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
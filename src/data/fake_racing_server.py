@@ -0,0 +1,328 @@
+"""
+Local stand-in for racing.com (GraphQL API and form pages).
+
+Serves recorded payloads from the repository root and synthetic meetings so
+ingestion can be exercised and benchmarked without touching the live site:
+
+- POST /graphql, GetMeetingByDate: the recorded graphql_working_response.json
+  for its date (2025-11-14), synthetic meeting lists for any other date
+- POST /graphql, GetMeetingByVenue: the recorded meeting when one matches,
+  otherwise a deterministic synthetic meeting with full race entries
+- GET /form/{date}/{venue}: the recorded racing_com_sample.html
+
+Latency (fixed plus uniform jitter) and a random 503 error rate are
+configurable. The server runs on a background thread on an ephemeral port.
+
+Usage:
+    from src.data.fake_racing_server import FakeRacingServer
+
+    with FakeRacingServer(latency=0.05, error_rate=0.01) as server:
+        scraper = RacingComGraphQLScraper(delay_between_requests=0)
+        scraper.GRAPHQL_URL = server.graphql_url
+        cards = scraper.scrape_meeting("flemington", "2025-01-01")
+
+    python -m src.data.fake_racing_server --port 8765 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RECORDED_DIR = Path(__file__).parents[2]
+RECORDED_GRAPHQL = "graphql_working_response.json"
+RECORDED_HTML = "racing_com_sample.html"
+
+DEFAULT_VENUES = (
+    "flemington",
+    "caulfield",
+    "moonee-valley",
+    "randwick",
+    "rosehill",
+    "eagle-farm",
+)
+
+JOCKEYS = [f"Jockey {chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(60)]
+TRAINERS = [f"Trainer {chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(80)]
+DISTANCES = (1000, 1100, 1200, 1400, 1600, 2000, 2400)
+CLASSES = ("Maiden", "BM58", "BM64", "BM70", "BM78", "Group 3")
+
+
+class FakeRacingServer:
+    """Threaded HTTP server emulating the racing.com endpoints."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        races_per_meeting: int = 8,
+        runners_per_race: int = 12,
+        venues: tuple[str, ...] = DEFAULT_VENUES,
+        seed: int = 0,
+        port: int = 0,
+        recorded_dir: str | Path = RECORDED_DIR,
+    ):
+        """
+        Initialize server (call start() or use as a context manager).
+
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra uniform random latency, 0 to jitter seconds
+            error_rate: Probability of answering 503
+            races_per_meeting: Races in each synthetic meeting
+            runners_per_race: Runners in each synthetic race (max 24)
+            venues: Venues in synthetic meeting lists
+            seed: Seed for synthetic data and injected errors
+            port: Port to bind (default: any free port)
+            recorded_dir: Directory holding the recorded payloads
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.races_per_meeting = races_per_meeting
+        self.runners_per_race = min(runners_per_race, 24)
+        self.venues = venues
+        self.seed = seed
+        self.requests: Counter[str] = Counter()
+
+        recorded_dir = Path(recorded_dir)
+        recorded = json.loads((recorded_dir / RECORDED_GRAPHQL).read_text())
+        self.recorded_meetings: list[dict] = recorded["data"]["GetMeetingByDate"]
+        self.recorded_date = self.recorded_meetings[0]["date"]
+        self.form_html = (recorded_dir / RECORDED_HTML).read_bytes()
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL (stands in for https://www.racing.com)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def graphql_url(self) -> str:
+        """GraphQL endpoint URL."""
+        return f"{self.url}/graphql"
+
+    def start(self) -> FakeRacingServer:
+        """Serve on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-racing-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Fake racing.com serving on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+    # ------------------------------------------------------------------------
+    # Payloads
+    # ------------------------------------------------------------------------
+
+    def meetings(self, date_str: str) -> list[dict]:
+        """Meeting list for a date (recorded or synthetic, without entries)."""
+        if date_str == self.recorded_date:
+            return self.recorded_meetings
+        return [
+            {
+                **self.meeting(venue, date_str),
+                "races": [
+                    {"raceNumber": n, "name": f"Race {n}"}
+                    for n in range(1, self.races_per_meeting + 1)
+                ],
+            }
+            for venue in self.venues
+        ]
+
+    def meeting(self, venue_name: str, date_str: str) -> dict:
+        """Full meeting for a venue and date (recorded or synthetic)."""
+        if date_str == self.recorded_date:
+            recorded = next(
+                (m for m in self.recorded_meetings if m["venueName"] == venue_name),
+                None,
+            )
+            if recorded is not None:
+                return recorded
+
+        rng = random.Random(f"{self.seed}-{venue_name}-{date_str}")
+        return {
+            "id": f"{venue_name}-{date_str}",
+            "venueName": venue_name,
+            "venueCode": venue_name.replace("-", "")[:3].upper(),
+            "date": date_str,
+            "track": "Turf",
+            "trackCondition": rng.choice(["Good 4", "Soft 5", "Soft 6", "Heavy 8"]),
+            "railPosition": "True",
+            "weather": "Fine",
+            "state": "VIC",
+            "country": "AUS",
+            "races": [
+                self._race(rng, venue_name, number)
+                for number in range(1, self.races_per_meeting + 1)
+            ],
+        }
+
+    def _race(self, rng: random.Random, venue_name: str, number: int) -> dict:
+        """Synthetic race with full entries."""
+        barriers = rng.sample(range(1, 25), self.runners_per_race)
+        horses = rng.sample(range(5000), self.runners_per_race)
+        return {
+            "id": f"{venue_name}-{number}",
+            "raceNumber": number,
+            "name": f"{venue_name.title()} Race {number}",
+            "distance": f"{rng.choice(DISTANCES)}m",
+            "class": rng.choice(CLASSES),
+            "status": "Acceptances",
+            "raceEntries": [
+                {
+                    "barrierNumber": barrier,
+                    "weight": f"{rng.randrange(108, 121) / 2:.1f}",
+                    "handicapRating": rng.randrange(50, 100),
+                    "gearList": "Blinkers" if rng.random() < 0.1 else None,
+                    "gearChanges": None,
+                    "gearHasChanges": False,
+                    "emergency": False,
+                    "emergencyNumber": None,
+                    "horse": {
+                        "name": f"{venue_name.title()} Runner {horse}",
+                        "sex": rng.choice(["Gelding", "Mare", "Colt", "Filly"]),
+                        "age": rng.randrange(2, 9),
+                        "colour": rng.choice(["Bay", "Brown", "Chestnut", "Grey"]),
+                    },
+                    "jockey": {"name": rng.choice(JOCKEYS)},
+                    "trainer": {"name": rng.choice(TRAINERS)},
+                }
+                for barrier, horse in zip(barriers, horses)
+            ],
+        }
+
+    def graphql(self, body: dict) -> dict:
+        """Answer a GraphQL request body."""
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+        if "GetMeetingByVenue" in query:
+            meeting = self.meeting(variables.get("venueName", ""), variables["date"])
+            return {"data": {"GetMeetingByVenue": meeting}}
+        if "GetMeetingByDate" in query:
+            return {"data": {"GetMeetingByDate": self.meetings(variables["date"])}}
+        return {"errors": [{"message": "Unsupported query"}]}
+
+    def _delay_or_fail(self) -> bool:
+        """Apply latency; True when this request should fail."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the owning FakeRacingServer."""
+
+    server: Any
+
+    def do_POST(self) -> None:
+        """GraphQL endpoint."""
+        fake: FakeRacingServer = self.server.fake
+        fake.requests["graphql"] += 1
+        if fake._delay_or_fail():
+            return self._send(503, b'{"message": "Service Unavailable"}')
+        if self.path.rstrip("/") != "/graphql":
+            return self._send(404, b'{"message": "Not Found"}')
+
+        try:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            payload = fake.graphql(body)
+        except (KeyError, TypeError, ValueError) as e:
+            payload = {"errors": [{"message": f"Bad request: {e}"}]}
+        self._send(200, json.dumps(payload).encode())
+
+    def do_GET(self) -> None:
+        """Form pages."""
+        fake: FakeRacingServer = self.server.fake
+        fake.requests["form"] += 1
+        if fake._delay_or_fail():
+            return self._send(503, b"Service Unavailable", "text/plain")
+        if not self.path.startswith("/form/"):
+            return self._send(404, b"Not Found", "text/plain")
+        self._send(200, fake.form_html, "text/html; charset=utf-8")
+
+    def _send(
+        self, status: int, body: bytes, content_type: str = "application/json"
+    ) -> None:
+        """Write a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Route access logs to the module logger."""
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def main() -> int:
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Local racing.com stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--races", type=int, default=8, help="Races per meeting")
+    parser.add_argument("--runners", type=int, default=12, help="Runners per race")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    server = FakeRacingServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        races_per_meeting=args.races,
+        runners_per_race=args.runners,
+        port=args.port,
+    )
+    with server:
+        logger.info(f"GraphQL endpoint: {server.graphql_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    logger.info(f"Served {dict(server.requests)}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
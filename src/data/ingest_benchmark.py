@@ -0,0 +1,259 @@
+"""
+End-to-end ingestion benchmark against the local racing.com stand-in.
+
+Drives RacingETL's meeting path (GraphQL fetch -> parse -> id resolution ->
+set-based load) against FakeRacingServer and a throwaway DuckDB database,
+timing each stage per meeting. Run it before race day to catch ingestion
+regressions without touching the live site.
+
+Stages (one sample per meeting):
+    fetch:    GraphQL request and response decoding
+    parse:    GraphQL payload -> ScrapedRaceCard models
+    convert:  ScrapedRaceCard -> RaceCard (name -> id resolution)
+    db_write: RacingETL.load_race_cards (one transaction per meeting)
+    form:     Form page fetch + HTML parse (with --form-pages)
+
+Usage:
+    from src.data.ingest_benchmark import run_benchmark
+
+    report = run_benchmark(meetings=24, latency=0.02)
+    print(report.format())
+
+    python -m src.data.ingest_benchmark --meetings 24 --latency 0.02 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.data.fake_racing_server import DEFAULT_VENUES, FakeRacingServer
+from src.data.init_db import create_database
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkReport:
+    """Throughput and per-stage timings of one benchmark run."""
+
+    meetings: int = 0
+    failed_meetings: int = 0
+    races: int = 0
+    runs: int = 0
+    elapsed: float = 0.0
+    stages: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+
+    @property
+    def races_per_sec(self) -> float:
+        """Races loaded per wall-clock second."""
+        return self.races / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        """Throughput plus count/p50/p99/total seconds per stage."""
+        return {
+            "meetings": self.meetings,
+            "failed_meetings": self.failed_meetings,
+            "races": self.races,
+            "runs": self.runs,
+            "elapsed_s": round(self.elapsed, 4),
+            "races_per_sec": round(self.races_per_sec, 2),
+            "stages": stage_summary(self.stages),
+        }
+
+    def format(self) -> str:
+        """Human-readable report."""
+        summary = self.summary()
+        lines = [
+            f"Meetings: {summary['meetings']} ({summary['failed_meetings']} failed)",
+            f"Races:    {summary['races']} ({summary['runs']} runs)",
+            f"Elapsed:  {summary['elapsed_s']:.3f}s "
+            f"({summary['races_per_sec']:.1f} races/sec)",
+            "",
+            *format_stages(summary["stages"]),
+        ]
+        return "\n".join(lines)
+
+
+def stage_summary(stages: dict[str, list[float]]) -> dict[str, dict]:
+    """Count, p50/p99 milliseconds and total seconds per stage with samples."""
+    return {
+        stage: {
+            "count": len(samples),
+            "p50_ms": round(float(np.percentile(samples, 50)) * 1000, 3),
+            "p99_ms": round(float(np.percentile(samples, 99)) * 1000, 3),
+            "total_s": round(sum(samples), 4),
+        }
+        for stage, samples in stages.items()
+        if samples
+    }
+
+
+def format_stages(summary: dict[str, dict]) -> list[str]:
+    """Table lines (header first) for a stage_summary() result."""
+    lines = [f"{'stage':<10} {'count':>6} {'p50 ms':>10} {'p99 ms':>10} {'total s':>9}"]
+    for stage, timing in summary.items():
+        lines.append(
+            f"{stage:<10} {timing['count']:>6} {timing['p50_ms']:>10.2f} "
+            f"{timing['p99_ms']:>10.2f} {timing['total_s']:>9.3f}"
+        )
+    return lines
+
+
+def run_benchmark(
+    meetings: int = 12,
+    races_per_meeting: int = 8,
+    runners_per_race: int = 12,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    form_pages: int = 0,
+    start_date: date = date(2025, 1, 1),
+    db_path: str | Path | None = None,
+    seed: int = 0,
+) -> BenchmarkReport:
+    """
+    Ingest synthetic meetings from the local stand-in and time every stage.
+
+    Meetings cycle through the stand-in's venues, one day per full cycle.
+
+    Args:
+        meetings: Meetings to ingest
+        races_per_meeting: Races per synthetic meeting
+        runners_per_race: Runners per synthetic race
+        latency: Server latency per request in seconds
+        jitter: Extra uniform random server latency in seconds
+        error_rate: Probability of a 503 per request (failed meetings are
+            counted, not retried)
+        form_pages: Form pages to fetch and parse with RacingComScraper
+        start_date: First race date (must not be in the future)
+        db_path: Database to create, must not exist (default: temporary file)
+        seed: Seed for synthetic data and injected errors
+
+    Returns:
+        BenchmarkReport
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(db_path or Path(tmp) / "benchmark.duckdb")
+        create_database(db_path)
+        connections = DuckDBConnectionManager(db_path, read_only=False)
+
+        server = FakeRacingServer(
+            latency=latency,
+            jitter=jitter,
+            error_rate=error_rate,
+            races_per_meeting=races_per_meeting,
+            runners_per_race=runners_per_race,
+            seed=seed,
+        )
+        with server, RacingETL(db_path, connections=connections) as etl:
+            scraper = etl.meeting_scraper
+            scraper.GRAPHQL_URL = server.graphql_url
+            scraper.delay = 0
+            etl.race_scraper.BASE_URL = server.url
+            etl.race_scraper.delay = 0
+
+            report = _ingest(etl, meetings, start_date)
+            for i in range(form_pages):
+                started = time.perf_counter()
+                etl.race_scraper.scrape_race("FLE", start_date, i % 8 + 1)
+                report.stages["form"].append(time.perf_counter() - started)
+
+        connections.close()
+
+    logger.info(
+        f"✓ Benchmark: {report.races} races in {report.elapsed:.2f}s "
+        f"({report.races_per_sec:.1f} races/sec)"
+    )
+    return report
+
+
+def _ingest(etl: RacingETL, meetings: int, start_date: date) -> BenchmarkReport:
+    """Run the meeting ingest path stage by stage."""
+    scraper = etl.meeting_scraper
+    report = BenchmarkReport()
+    started = time.perf_counter()
+
+    for i in range(meetings):
+        venue = DEFAULT_VENUES[i % len(DEFAULT_VENUES)]
+        race_date = start_date + timedelta(days=i // len(DEFAULT_VENUES))
+        report.meetings += 1
+
+        clock = time.perf_counter()
+        try:
+            meeting = scraper._fetch_meeting(venue, race_date.isoformat())
+        except Exception as e:
+            logger.warning(f"Meeting {venue} {race_date} failed: {e}")
+            report.failed_meetings += 1
+            continue
+        clock = _lap(report, "fetch", clock)
+
+        scraped = scraper._parse_meeting(meeting, race_date, venue)
+        clock = _lap(report, "parse", clock)
+
+        race_cards = [card.to_race_card() for card in scraped]
+        clock = _lap(report, "convert", clock)
+
+        metrics = etl.load_race_cards(race_cards, run_hooks=False)
+        _lap(report, "db_write", clock)
+
+        if metrics["status"] != "success":
+            report.failed_meetings += 1
+            continue
+        report.races += len(race_cards)
+        report.runs += metrics["inserted"].get("runs", 0)
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _lap(report: BenchmarkReport, stage: str, since: float) -> float:
+    """Record the time since `since` for a stage; returns the new clock."""
+    now = time.perf_counter()
+    report.stages[stage].append(now - since)
+    return now
+
+
+def main() -> int:
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description="Benchmark meeting ingestion")
+    parser.add_argument("--meetings", type=int, default=12)
+    parser.add_argument("--races", type=int, default=8, help="Races per meeting")
+    parser.add_argument("--runners", type=int, default=12, help="Runners per race")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--form-pages", type=int, default=0)
+    parser.add_argument("--db-path", type=Path, default=None)
+    parser.add_argument("--json", action="store_true", help="Print JSON summary")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_benchmark(
+        meetings=args.meetings,
+        races_per_meeting=args.races,
+        runners_per_race=args.runners,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        form_pages=args.form_pages,
+        db_path=args.db_path,
+    )
+    print(json.dumps(report.summary(), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
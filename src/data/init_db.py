@@ -133,6 +133,11 @@ def verify_schema(con: duckdb.DuckDBPyConnection | None = None) -> dict:
             "market_odds",
             "stewards",
             "gear",
+            "progeny_stats",
+            "progeny_distance_stats",
+            "person_daily_stats",
+            "ingest_journal",
+            "entity_hashes",
         }
 
         # Expected views
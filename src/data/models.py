@@ -3,15 +3,30 @@ Pydantic models for racing data validation.
 
 These models ensure data quality and type safety when ingesting racing data.
 All models validate against the DuckDB schema in schema.sql.
+
+Bulk construction:
+    build_models() validates a whole list of rows in one pydantic-core call
+    and completeness_scores() scores many race cards column-wise.
+
+Usage:
+    from src.data.models import build_models, completeness_scores
+
+    runs = build_models(ScrapedRun, rows)
+    scores = completeness_scores(race_cards)
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import Enum
+from functools import cache
+from typing import ClassVar, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 
 # ============================================================================
 # ENUMS FOR VALIDATION
@@ -293,6 +308,9 @@ class Gear(BaseModel):
 # BATCH MODELS FOR BULK OPERATIONS
 # ============================================================================
 
+# Race fields counted towards race card completeness
+RACE_CRITICAL_FIELDS = ("distance", "track_condition", "class_level", "field_size")
+
 
 class RaceCard(BaseModel):
     """Complete race card (race + runs + horses + jockeys + trainers)"""
@@ -304,22 +322,24 @@ class RaceCard(BaseModel):
     trainers: list[Trainer]
     gear: list[Gear] | None = None
 
+    # Fields counted by validate_completeness() and completeness_scores()
+    race_critical_fields: ClassVar[tuple[str, ...]] = RACE_CRITICAL_FIELDS
+    run_critical_fields: ClassVar[tuple[str, ...]] = ("barrier", "weight_carried")
+
     def validate_completeness(self) -> float:
         """Calculate data completeness percentage"""
         total_fields = 0
         filled_fields = 0
 
         # Check race critical fields
-        race_critical = ["distance", "track_condition", "class_level", "field_size"]
-        for field in race_critical:
+        for field in self.race_critical_fields:
             total_fields += 1
             if getattr(self.race, field) is not None:
                 filled_fields += 1
 
         # Check runs critical fields
-        runs_critical = ["barrier", "weight_carried"]
         for run in self.runs:
-            for field in runs_critical:
+            for field in self.run_critical_fields:
                 total_fields += 1
                 if getattr(run, field) is not None:
                     filled_fields += 1
@@ -522,24 +542,170 @@ class ScrapedRaceCard(BaseModel):
     trainers: list[ScrapedTrainer]
     gear: list[ScrapedGear] | None = None
 
+    # Fields counted by validate_completeness() and completeness_scores()
+    race_critical_fields: ClassVar[tuple[str, ...]] = RACE_CRITICAL_FIELDS
+    run_critical_fields: ClassVar[tuple[str, ...]] = ("barrier", "weight")
+
     def validate_completeness(self) -> float:
         """Calculate data completeness percentage"""
         total_fields = 0
         filled_fields = 0
 
         # Check race critical fields
-        race_critical = ["distance", "track_condition", "class_level", "field_size"]
-        for field in race_critical:
+        for field in self.race_critical_fields:
             total_fields += 1
             if getattr(self.race, field) is not None:
                 filled_fields += 1
 
         # Check runs critical fields
-        runs_critical = ["barrier", "weight"]
         for run in self.runs:
-            for field in runs_critical:
+            for field in self.run_critical_fields:
                 total_fields += 1
                 if getattr(run, field) is not None:
                     filled_fields += 1
 
         return (filled_fields / total_fields * 100) if total_fields > 0 else 0.0
+
+    def to_race_card(self) -> RaceCard:
+        """
+        Resolve scraped names to ids for loading into the database.
+
+        Ids are derived from names (e.g. "J-JAMIE-KAH") so the same person
+        maps to the same row across races and re-runs. Runs without a
+        barrier (unplaced emergencies) are dropped, with their gear. Each
+        table's models are validated as one batch (see build_models()).
+        """
+        horses = {h.name: h for h in self.horses}
+        run_rows, jockeys, trainers = [], {}, {}
+        for scraped in self.runs:
+            if scraped.barrier is None:
+                continue
+            horse_id = _name_id("H", scraped.horse_name)
+            jockey_id = _name_id("J", scraped.jockey_name)
+            trainer_id = _name_id("T", scraped.trainer_name)
+            jockeys.setdefault(
+                jockey_id, {"jockey_id": jockey_id, "name": scraped.jockey_name}
+            )
+            trainers.setdefault(
+                trainer_id, {"trainer_id": trainer_id, "name": scraped.trainer_name}
+            )
+            run_rows.append(
+                {
+                    "run_id": f"{self.race.race_id}-{horse_id}",
+                    "race_id": self.race.race_id,
+                    "horse_id": horse_id,
+                    "jockey_id": jockey_id,
+                    "trainer_id": trainer_id,
+                    "barrier": scraped.barrier,
+                    "weight_carried": scraped.weight,
+                    "emergency": scraped.emergency,
+                    "scratched": scraped.scratched,
+                }
+            )
+
+        run_ids = {row["horse_id"]: row["run_id"] for row in run_rows}
+        horse_rows = [
+            {"horse_id": horse_id, **scraped.model_dump(exclude_none=True)}
+            for scraped in horses.values()
+            if (horse_id := _name_id("H", scraped.name)) in run_ids
+        ]
+        gear_rows = [
+            {
+                "gear_id": f"G-{run_ids[horse_id]}",
+                "run_id": run_ids[horse_id],
+                "gear_type": gear.gear_type,
+                "gear_code": gear.gear_description,
+                "first_time": gear.is_first_time,
+                "change_type": "changed" if gear.gear_changes else None,
+            }
+            for gear in self.gear or []
+            if (horse_id := _name_id("H", gear.horse_name)) in run_ids
+        ]
+
+        return RaceCard(
+            race=self.race,
+            runs=build_models(Run, run_rows),
+            horses=build_models(Horse, horse_rows),
+            jockeys=build_models(Jockey, list(jockeys.values())),
+            trainers=build_models(Trainer, list(trainers.values())),
+            gear=build_models(Gear, gear_rows),
+        )
+
+
+def _name_id(prefix: str, name: str) -> str:
+    """Stable id from a display name (e.g. "J-JAMIE-KAH")."""
+    slug = re.sub(r"[^A-Z0-9]+", "-", name.upper()).strip("-")
+    return f"{prefix}-{slug}"[:50]
+
+
+# ============================================================================
+# BULK CONSTRUCTION
+# ============================================================================
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def build_models(model: type[ModelT], rows: list[dict]) -> list[ModelT]:
+    """
+    Validate many rows into models of one type.
+
+    The rows go through a cached TypeAdapter as a single list: one call into
+    pydantic-core for the batch instead of one ``__init__`` per model, with
+    the same constraints and field validators.
+
+    Args:
+        model: Model class
+        rows: Field values per model
+
+    Returns:
+        Models in row order
+
+    Raises:
+        ValidationError: Any row fails validation
+    """
+    return _list_adapter(model).validate_python(rows)
+
+
+@cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """List validator for a model (schema built once per model)."""
+    return TypeAdapter(list[model])
+
+
+def completeness_scores(cards: Sequence[RaceCard | ScrapedRaceCard]) -> np.ndarray:
+    """
+    Data completeness percentage of many race cards at once.
+
+    Same score as validate_completeness(), but each critical field becomes
+    one presence mask across every card (runs flattened) and is counted
+    with numpy, rather than tallied card by card and run by run.
+
+    Args:
+        cards: Race cards of a single type
+
+    Returns:
+        Completeness percentage per card, in input order
+    """
+    if not cards:
+        return np.zeros(0)
+
+    race_fields = cards[0].race_critical_fields
+    run_fields = cards[0].run_critical_fields
+    run_counts = np.fromiter((len(card.runs) for card in cards), np.int64, len(cards))
+    run_cards = np.repeat(np.arange(len(cards)), run_counts)
+    total_runs = int(run_counts.sum())
+
+    filled = np.zeros(len(cards))
+    for field in race_fields:
+        filled += np.fromiter(
+            (getattr(card.race, field) is not None for card in cards), bool, len(cards)
+        )
+    for field in run_fields:
+        present = np.fromiter(
+            (getattr(run, field) is not None for card in cards for run in card.runs),
+            bool,
+            total_runs,
+        )
+        filled += np.bincount(run_cards, present, minlength=len(cards))
+
+    return filled / (len(race_fields) + len(run_fields) * run_counts) * 100
@@ -0,0 +1,465 @@
+"""
+Compressed odds history with pre-built OHLC/VWAP rollups.
+
+market_odds keeps every price snapshot as a full row; this module archives
+a race's ticks into compact Parquet files (and can prune them from the
+table) so odds-movement features and exchange-replay backtests scan a
+fraction of the data.
+
+Storage layout (Parquet, zstd, hive-partitioned by race date):
+    {odds_history_path}/ticks/race_date=2025-11-12/FLE-2025-11-12-R1.parquet
+    {odds_history_path}/ohlc_1s/race_date=2025-11-12/FLE-2025-11-12-R1.parquet
+    {odds_history_path}/ohlc_10s/...
+    {odds_history_path}/ohlc_1m/...
+
+Tick files are sorted by run (then market and time) and store prices and
+volumes as integer hundredths with DELTA_BINARY_PACKED encoding, so each
+run's price path is stored as small deltas; ids are dictionary-encoded.
+
+Rollups hold open/high/low/close, VWAP (mean price for buckets without
+volume), volume and tick count per run, market and bucket. read() picks the
+coarsest stored resolution that evenly divides the requested interval and
+re-aggregates from it, so a 1-minute chart never touches the ticks.
+
+Usage:
+    from src.data.odds_history import OddsHistoryStore
+
+    history = OddsHistoryStore()
+    history.archive_date("2025-11-12", prune=True)     # market_odds -> Parquet
+    ticks = history.read(race_id="FLE-2025-11-12-R1")  # full resolution
+    bars = history.read(run_ids=run_ids, interval=timedelta(minutes=5))
+
+    python -m src.data.odds_history --date 2025-11-12 --prune
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+# Rollup levels, finest first: name -> bucket width in seconds
+RESOLUTIONS = {"ohlc_1s": 1, "ohlc_10s": 10, "ohlc_1m": 60}
+TICKS = "ticks"
+
+# Identifies a tick within a race (market_odds has one row per key)
+TICK_KEY = ("run_id", "odds_type", "source", "timestamp")
+
+TICK_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.string()),
+        ("race_id", pa.string()),
+        ("odds_type", pa.string()),
+        ("source", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+        ("price_x100", pa.int32()),
+        ("volume_x100", pa.int64()),
+        ("rank", pa.int32()),
+    ]
+)
+
+# Parquet layout of tick files
+TICK_DICTIONARY_COLUMNS = ["run_id", "race_id", "odds_type", "source"]
+TICK_DELTA_COLUMNS = {
+    "timestamp": "DELTA_BINARY_PACKED",
+    "price_x100": "DELTA_BINARY_PACKED",
+    "volume_x100": "DELTA_BINARY_PACKED",
+    "rank": "DELTA_BINARY_PACKED",
+}
+
+# OHLC aggregation over tick rows ({relation}, {micros}, {where})
+TICK_OHLC_SQL = """
+    SELECT
+        run_id,
+        race_id,
+        odds_type,
+        source,
+        time_bucket(INTERVAL '{micros} microseconds', timestamp) AS bucket,
+        arg_min(price_x100, timestamp) / 100.0 AS open,
+        max(price_x100) / 100.0 AS high,
+        min(price_x100) / 100.0 AS low,
+        arg_max(price_x100, timestamp) / 100.0 AS close,
+        coalesce(
+            sum(price_x100 * volume_x100) / nullif(sum(volume_x100), 0),
+            avg(price_x100)
+        ) / 100.0 AS vwap,
+        sum(volume_x100) / 100.0 AS volume,
+        count(*) AS ticks
+    FROM {relation}
+    {where}
+    GROUP BY ALL
+    ORDER BY run_id, odds_type, source, bucket
+"""
+
+# OHLC re-aggregation over a finer rollup ({relation}, {micros}, {where})
+ROLLUP_OHLC_SQL = """
+    SELECT
+        run_id,
+        race_id,
+        odds_type,
+        source,
+        time_bucket(INTERVAL '{micros} microseconds', bucket) AS bucket,
+        arg_min(open, bucket) AS open,
+        max(high) AS high,
+        min(low) AS low,
+        arg_max(close, bucket) AS close,
+        coalesce(
+            sum(vwap * volume) / nullif(sum(volume), 0),
+            sum(vwap * ticks) / sum(ticks)
+        ) AS vwap,
+        sum(volume) AS volume,
+        CAST(sum(ticks) AS BIGINT) AS ticks
+    FROM {relation}
+    {where}
+    GROUP BY ALL
+    ORDER BY run_id, odds_type, source, bucket
+"""
+
+
+class OddsHistoryStore:
+    """
+    Date-partitioned Parquet archive of market odds ticks and rollups.
+
+    Archiving reads market_odds through the shared connection manager;
+    reads go through DuckDB's Parquet scanner with partition pruning.
+    """
+
+    def __init__(
+        self,
+        store_path: str | Path | None = None,
+        db_path: str | Path = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        compression_level: int = 9,
+    ):
+        """
+        Initialize odds history store.
+
+        Args:
+            store_path: Root directory (default: settings.odds_history_path)
+            db_path: Path to DuckDB database
+            connections: Shared connection manager (default: process-wide
+                manager; read-write when pruning)
+            compression_level: zstd level for tick files
+        """
+        if store_path is None:
+            from src.utils.config import settings
+
+            store_path = settings.odds_history_path
+
+        self.store_path = Path(store_path)
+        self.db_path = Path(db_path)
+        self.compression_level = compression_level
+        self._connections = connections
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    # ------------------------------------------------------------------------
+    # Archiving
+    # ------------------------------------------------------------------------
+
+    def archive_race(self, race_id: str, prune: bool = False) -> int:
+        """
+        Archive a race's market_odds ticks and rebuild its rollups.
+
+        Ticks already archived for the race are kept (re-archiving after
+        more ticks arrive merges them), so pruning is safe to repeat.
+
+        Args:
+            race_id: Race identifier
+            prune: Delete the archived rows from market_odds (in the same
+                transaction that read them)
+
+        Returns:
+            Number of ticks in the race's archive
+        """
+        if not prune:
+            return self._archive(self.connections.cursor(), race_id, prune=False)
+
+        connections = self.connections
+        if connections.read_only:
+            connections = get_connection_manager(self.db_path, read_only=False)
+        with connections.write_transaction() as con:
+            return self._archive(con, race_id, prune=True)
+
+    def archive_date(self, race_date: date | str, prune: bool = False) -> int:
+        """
+        Archive every race on a date that has market_odds rows.
+
+        Args:
+            race_date: Race date
+            prune: Delete archived rows from market_odds
+
+        Returns:
+            Number of ticks archived across races
+        """
+        if isinstance(race_date, str):
+            race_date = date.fromisoformat(race_date)
+
+        race_ids = [
+            row[0]
+            for row in self.connections.cursor()
+            .execute(
+                """
+                SELECT DISTINCT m.race_id
+                FROM market_odds m
+                JOIN races r ON r.race_id = m.race_id
+                WHERE r.date = ?
+                ORDER BY m.race_id
+                """,
+                [race_date],
+            )
+            .fetchall()
+        ]
+
+        total = 0
+        for race_id in race_ids:
+            try:
+                total += self.archive_race(race_id, prune=prune)
+            except Exception as e:
+                logger.error(f"Failed to archive odds for {race_id}: {e}")
+
+        logger.info(f"✓ Archived {total} odds ticks for {len(race_ids)} races")
+        return total
+
+    def _archive(
+        self, con: duckdb.DuckDBPyConnection, race_id: str, prune: bool
+    ) -> int:
+        """Write a race's tick and rollup files from market_odds."""
+        row = con.execute(
+            "SELECT date FROM races WHERE race_id = ?", [race_id]
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Race not found: {race_id}")
+        race_date = row[0]
+
+        new = con.execute(
+            """
+            SELECT
+                run_id,
+                race_id,
+                odds_type,
+                source,
+                timestamp,
+                CAST(round(odds_decimal * 100) AS INTEGER) AS price_x100,
+                CAST(round(volume * 100) AS BIGINT) AS volume_x100,
+                rank
+            FROM market_odds
+            WHERE race_id = ? AND odds_decimal IS NOT NULL
+            """,
+            [race_id],
+        ).to_arrow_table()
+
+        path = self.race_file(TICKS, race_id, race_date)
+        ticks = self._merge(con, path, new.cast(TICK_SCHEMA))
+        if ticks.num_rows == 0:
+            return 0
+
+        self._write(path, ticks, tick_file=True)
+        con.register("_odds_ticks", ticks)
+        try:
+            for level, seconds in RESOLUTIONS.items():
+                rollup = con.execute(
+                    TICK_OHLC_SQL.format(
+                        relation="_odds_ticks", micros=seconds * 1_000_000, where=""
+                    )
+                ).to_arrow_table()
+                self._write(self.race_file(level, race_id, race_date), rollup)
+        finally:
+            con.unregister("_odds_ticks")
+
+        if prune:
+            con.execute("DELETE FROM market_odds WHERE race_id = ?", [race_id])
+
+        logger.info(
+            f"✓ Archived {ticks.num_rows} odds ticks for {race_id} "
+            f"({new.num_rows} new{', pruned' if prune else ''})"
+        )
+        return ticks.num_rows
+
+    def _merge(
+        self, con: duckdb.DuckDBPyConnection, path: Path, new: pa.Table
+    ) -> pa.Table:
+        """Archived ticks plus new ones (new rows win), sorted per run."""
+        key = ", ".join(TICK_KEY)
+        query = "SELECT * FROM _odds_new"
+        if path.exists():
+            con.register("_odds_old", pq.read_table(path, schema=TICK_SCHEMA))
+            query += (
+                " UNION ALL SELECT * FROM _odds_old"
+                f" ANTI JOIN _odds_new USING ({key})"
+            )
+
+        con.register("_odds_new", new)
+        try:
+            merged = con.execute(
+                f"SELECT * FROM ({query}) ORDER BY {key}"
+            ).to_arrow_table()
+        finally:
+            con.unregister("_odds_new")
+            if path.exists():
+                con.unregister("_odds_old")
+        return merged.cast(TICK_SCHEMA)
+
+    def _write(self, path: Path, table: pa.Table, tick_file: bool = False) -> None:
+        """Write a partition file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".parquet.tmp")
+
+        if tick_file:
+            pq.write_table(
+                table,
+                tmp_path,
+                compression="zstd",
+                compression_level=self.compression_level,
+                use_dictionary=TICK_DICTIONARY_COLUMNS,
+                column_encoding=TICK_DELTA_COLUMNS,
+            )
+        else:
+            pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)  # Atomic swap: readers never see partial files
+
+    def race_file(self, level: str, race_id: str, race_date: date) -> Path:
+        """Partition file holding one race at one resolution."""
+        partition = self.store_path / level / f"race_date={race_date.isoformat()}"
+        return partition / f"{race_id}.parquet"
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def choose_resolution(interval: timedelta | float | None) -> str:
+        """
+        Coarsest stored level whose buckets evenly divide the interval.
+
+        Args:
+            interval: Requested bar width (None: raw ticks)
+
+        Returns:
+            A RESOLUTIONS key, or TICKS
+        """
+        if interval is None:
+            return TICKS
+        micros = _micros(interval)
+
+        level = TICKS
+        for name, seconds in RESOLUTIONS.items():
+            if micros % (seconds * 1_000_000) == 0:
+                level = name
+        return level
+
+    def read(
+        self,
+        race_id: str | None = None,
+        run_ids: list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        interval: timedelta | float | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read odds history for a race or runs, as ticks or OHLC bars.
+
+        Args:
+            race_id: Race to read (one file per level)
+            run_ids: Runs to read (across all partitions in the time range)
+            start: First tick/bucket time (inclusive)
+            end: Last tick/bucket time (exclusive)
+            interval: Bar width (timedelta or seconds); None for raw ticks
+
+        Returns:
+            Ticks (run_id, race_id, odds_type, source, timestamp,
+            odds_decimal, volume, rank) or bars (run_id, race_id, odds_type,
+            source, bucket, open, high, low, close, vwap, volume, ticks)
+        """
+        if race_id is None and not run_ids:
+            raise ValueError("Pass race_id or run_ids")
+
+        level = self.choose_resolution(interval)
+        time_column = "timestamp" if level == TICKS else "bucket"
+        pattern = f"race_date=*/{race_id or '*'}.parquet"
+        if not any((self.store_path / level).glob(pattern)):
+            logger.warning(f"No odds history for {race_id or run_ids} at {level}")
+            return pd.DataFrame()
+
+        conditions, params = [], [str(self.store_path / level / pattern)]
+        if run_ids:
+            conditions.append("run_id IN (SELECT UNNEST(?))")
+            params.append(list(run_ids))
+        if start is not None:
+            # Markets trade before race day, never after: prune older partitions
+            conditions.append("CAST(race_date AS DATE) >= ?")
+            conditions.append(f"{time_column} >= ?")
+            params += [start.date(), start]
+        if end is not None:
+            conditions.append(f"{time_column} < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        relation = "read_parquet(?, hive_partitioning = true)"
+
+        if interval is None:
+            query = f"""
+                SELECT
+                    run_id, race_id, odds_type, source, timestamp,
+                    price_x100 / 100.0 AS odds_decimal,
+                    volume_x100 / 100.0 AS volume,
+                    rank
+                FROM {relation}
+                {where}
+                ORDER BY {', '.join(TICK_KEY)}
+            """
+        else:
+            template = TICK_OHLC_SQL if level == TICKS else ROLLUP_OHLC_SQL
+            query = template.format(
+                relation=relation, micros=_micros(interval), where=where
+            )
+
+        logger.debug(f"Reading odds history at {level} for interval {interval}")
+        return self.connections.cursor().execute(query, params).df()
+
+
+def _micros(interval: timedelta | float) -> int:
+    """Interval in whole microseconds."""
+    if isinstance(interval, timedelta):
+        interval = interval.total_seconds()
+    micros = round(interval * 1_000_000)
+    if micros <= 0:
+        raise ValueError(f"interval must be positive, got {interval}")
+    return micros
+
+
+def main() -> int:
+    """Archive market odds for all races on a date."""
+    parser = argparse.ArgumentParser(description="Archive market odds history")
+    parser.add_argument("--date", required=True, help="Race date (YYYY-MM-DD)")
+    parser.add_argument("--db-path", default="data/racing.duckdb")
+    parser.add_argument(
+        "--prune", action="store_true", help="Delete archived rows from market_odds"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    history = OddsHistoryStore(db_path=args.db_path)
+    history.archive_date(args.date, prune=args.prune)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
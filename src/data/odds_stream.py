@@ -0,0 +1,485 @@
+"""
+Streaming market odds ingestion.
+
+Price ticks flow producer -> TickRingBuffer -> OddsStreamWriter -> market_odds:
+- Producers (exchange stream handlers, the fake price feed) push ticks into
+  a bounded in-memory ring buffer and never touch the database
+- One writer thread drains the buffer and loads columnar (Arrow) batches
+  into market_odds every batch_size ticks or flush_interval seconds,
+  whichever comes first, through the connection manager's single writer
+
+When the buffer is full, producers either wait for the writer
+(overflow="block", the default: backpressure reaches the feed) or overwrite
+the oldest ticks (overflow="drop_oldest", for feeds that must never stall).
+Waits, drops, buffer depth and flush latency are all in the stream metrics.
+
+Ticks must reference runs already loaded (market_odds has foreign keys to
+runs and races). Ticks outside market_odds' CHECK constraints are rejected
+before the insert; a batch that still fails (e.g. an unknown run_id) is
+bisected and retried so only the offending ticks are lost.
+
+Usage:
+    from src.data.odds_stream import OddsStreamWriter, PriceTick
+
+    with OddsStreamWriter(db_path, batch_size=5000, flush_interval=0.25) as stream:
+        stream.push(PriceTick(run_id, race_id, datetime.now(), 3.45))
+        stream.push_many(PriceTick.from_odds(odds) for odds in collected)
+        stream.metrics.snapshot()        # depth, drops, producer waits, flushes
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import pyarrow as pa
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+if TYPE_CHECKING:
+    from src.data.models import MarketOdds
+
+logger = logging.getLogger(__name__)
+
+
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+# market_odds CHECK constraints (see schema.sql), applied before inserting
+ODDS_TYPES = ("win", "place")
+MIN_ODDS = 1.01
+MAX_ODDS = 1000.0
+
+# market_odds columns written by the stream, with their Arrow types
+STREAM_SCHEMA = pa.schema(
+    [
+        ("odds_id", pa.string()),
+        ("run_id", pa.string()),
+        ("race_id", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+        ("odds_decimal", pa.float64()),
+        ("odds_type", pa.string()),
+        ("source", pa.string()),
+        ("volume", pa.float64()),
+        ("rank", pa.int32()),
+    ]
+)
+
+
+class PriceTick(NamedTuple):
+    """One price update for a runner (a plain tuple: cheap to buffer)."""
+
+    run_id: str
+    race_id: str
+    timestamp: datetime
+    odds_decimal: float
+    odds_type: str = "win"
+    source: str = "betfair"
+    volume: float | None = None
+    rank: int | None = None
+
+    @property
+    def odds_id(self) -> str:
+        """market_odds primary key (one row per runner, market and instant)."""
+        return (
+            f"ODDS-{self.run_id}-{self.source}-{self.odds_type}-"
+            f"{self.timestamp.isoformat()}"
+        )
+
+    @classmethod
+    def from_odds(cls, odds: MarketOdds) -> PriceTick:
+        """Tick from a collected MarketOdds model."""
+        return cls(
+            run_id=odds.run_id,
+            race_id=odds.race_id,
+            timestamp=odds.timestamp,
+            odds_decimal=float(odds.odds_decimal),
+            odds_type=odds.odds_type.value,
+            source=odds.source,
+            volume=None if odds.volume is None else float(odds.volume),
+            rank=odds.rank,
+        )
+
+
+@dataclass
+class StreamMetrics:
+    """Counters shared by the buffer (producer side) and the writer."""
+
+    pushed: int = 0
+    dropped: int = 0
+    producer_waits: int = 0
+    producer_wait_seconds: float = 0.0
+    depth: int = 0
+    max_depth: int = 0
+    written: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    failed_ticks: int = 0
+    flush_seconds: float = 0.0
+    max_flush_seconds: float = 0.0
+
+    def snapshot(self) -> dict:
+        """Point-in-time copy of the counters."""
+        return asdict(self)
+
+
+class TickRingBuffer:
+    """
+    Bounded, thread-safe FIFO of price ticks over a preallocated ring.
+
+    Any number of producer threads push; one consumer drains in batches.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        overflow: str = "block",
+        metrics: StreamMetrics | None = None,
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Maximum buffered ticks
+            overflow: "block" (producers wait for space) or "drop_oldest"
+                (oldest ticks are overwritten)
+            metrics: Counters to update (default: a new StreamMetrics)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}"
+            )
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.metrics = metrics or StreamMetrics()
+
+        self._slots: list[PriceTick | None] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._wanted = 1  # ticks the consumer is waiting for
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        """Buffered ticks."""
+        return self._size
+
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+
+    def put(self, tick: PriceTick, timeout: float | None = None) -> None:
+        """Append one tick (see put_many)."""
+        self.put_many((tick,), timeout)
+
+    def put_many(
+        self, ticks: Iterable[PriceTick], timeout: float | None = None
+    ) -> None:
+        """
+        Append ticks under a single lock acquisition.
+
+        Args:
+            ticks: Ticks in arrival order
+            timeout: Seconds to wait for space when blocking (default: forever)
+
+        Raises:
+            queue.Full: No space within the timeout (overflow="block")
+            RuntimeError: The buffer is closed
+        """
+        metrics = self.metrics
+        with self._lock:
+            for tick in ticks:
+                if self._closed:
+                    raise RuntimeError("Odds stream buffer is closed")
+                if self._size == self.capacity:
+                    if self.overflow == "drop_oldest":
+                        self._slots[self._head] = None
+                        self._head = (self._head + 1) % self.capacity
+                        self._size -= 1
+                        metrics.dropped += 1
+                    else:
+                        self._wait_for_space(timeout)
+
+                self._slots[(self._head + self._size) % self.capacity] = tick
+                self._size += 1
+                metrics.pushed += 1
+
+            metrics.depth = self._size
+            metrics.max_depth = max(metrics.max_depth, self._size)
+            if self._size >= self._wanted:
+                self._not_empty.notify()
+
+    def drain(
+        self, max_items: int, min_items: int = 1, timeout: float | None = None
+    ) -> list[PriceTick]:
+        """
+        Remove up to max_items of the oldest ticks.
+
+        Waits until min_items are buffered, the timeout expires or the
+        buffer is closed, then returns whatever is there (possibly nothing).
+
+        Args:
+            max_items: Largest batch to return
+            min_items: Ticks worth waking up for
+            timeout: Seconds to wait for min_items (default: forever)
+
+        Returns:
+            Ticks in arrival order
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._wanted = min(max(min_items, 1), self.capacity)
+            while self._size < self._wanted and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+            count = min(self._size, max_items)
+            head, end = self._head, self._head + count
+            if end <= self.capacity:
+                batch = self._slots[head:end]
+                self._slots[head:end] = [None] * count
+            else:
+                wrapped = end - self.capacity
+                batch = self._slots[head:] + self._slots[:wrapped]
+                self._slots[head:] = [None] * (self.capacity - head)
+                self._slots[:wrapped] = [None] * wrapped
+
+            self._head = end % self.capacity
+            self._size -= count
+            self.metrics.depth = self._size
+            self._wanted = 1
+            if count:
+                self._not_full.notify_all()
+            return batch
+
+    def close(self) -> None:
+        """Reject new ticks and wake all waiters (buffered ticks stay drainable)."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def _wait_for_space(self, timeout: float | None) -> None:
+        """Block a producer until the consumer frees a slot (lock held)."""
+        started = time.monotonic()
+        self.metrics.producer_waits += 1
+        self.metrics.max_depth = self.capacity
+        self._not_empty.notify()  # a full buffer is always worth draining
+        try:
+            while self._size == self.capacity and not self._closed:
+                remaining = (
+                    None if timeout is None else timeout - (time.monotonic() - started)
+                )
+                if remaining is not None and remaining <= 0:
+                    raise queue.Full(f"Odds stream buffer full ({self.capacity} ticks)")
+                self._not_full.wait(remaining)
+        finally:
+            self.metrics.producer_wait_seconds += time.monotonic() - started
+        if self._closed:
+            raise RuntimeError("Odds stream buffer is closed")
+
+
+class OddsStreamWriter:
+    """
+    Background writer flushing buffered ticks to market_odds in batches.
+
+    Producers call push()/push_many() from any thread; a single writer
+    thread turns each drained batch into one Arrow table and one
+    INSERT OR REPLACE ... SELECT on the shared writer connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        batch_size: int = 5000,
+        flush_interval: float = 0.25,
+        capacity: int = 100_000,
+        overflow: str = "block",
+    ):
+        """
+        Initialize writer (call start() or use as a context manager).
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Read-write connection manager (default: process-wide
+                manager for db_path)
+            batch_size: Flush once this many ticks are buffered
+            flush_interval: Flush at least this often (seconds) while ticks
+                are buffered
+            capacity: Ring buffer size in ticks
+            overflow: Full-buffer policy, "block" or "drop_oldest"
+        """
+        self.db_path = Path(db_path)
+        self._connections = connections
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.metrics = StreamMetrics()
+        self.buffer = TickRingBuffer(capacity, overflow, self.metrics)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared read-write connection manager."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path, read_only=False)
+        return self._connections
+
+    def push(self, tick: PriceTick, timeout: float | None = None) -> None:
+        """Queue one tick for writing."""
+        self.buffer.put(tick, timeout)
+
+    def push_many(
+        self, ticks: Iterable[PriceTick], timeout: float | None = None
+    ) -> None:
+        """Queue ticks for writing (one lock acquisition per call)."""
+        self.buffer.put_many(ticks, timeout)
+
+    def start(self) -> OddsStreamWriter:
+        """Start the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="odds-stream-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Odds stream started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s, "
+            f"capacity={self.buffer.capacity}, overflow={self.buffer.overflow})"
+        )
+        return self
+
+    def stop(self) -> dict:
+        """
+        Stop accepting ticks, flush everything buffered and stop the thread.
+
+        Returns:
+            Final metrics snapshot
+        """
+        self.buffer.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        metrics = self.metrics.snapshot()
+        logger.info(
+            f"✓ Odds stream stopped: {metrics['written']} ticks written in "
+            f"{metrics['batches']} batches ({metrics['dropped']} dropped, "
+            f"{metrics['failed_ticks']} failed)"
+        )
+        return metrics
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+    # ------------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        """Drain and write until closed and empty."""
+        while True:
+            batch = self.buffer.drain(
+                self.batch_size, min_items=self.batch_size, timeout=self.flush_interval
+            )
+            if batch:
+                self._write(batch)
+            elif self.buffer.closed:
+                return
+
+    def _write(self, batch: list[PriceTick]) -> None:
+        """Load one batch; failures are counted and logged, never raised."""
+        started = time.perf_counter()
+
+        valid = [tick for tick in batch if _within_checks(tick)]
+        if len(valid) < len(batch):
+            logger.warning(
+                f"Rejected {len(batch) - len(valid)} odds ticks outside the "
+                "market_odds constraints"
+            )
+        written = self._insert(valid) if valid else 0
+
+        failed = len(batch) - written
+        if failed:
+            self.metrics.failed_batches += 1
+            self.metrics.failed_ticks += failed
+        if written:
+            elapsed = time.perf_counter() - started
+            self.metrics.written += written
+            self.metrics.batches += 1
+            self.metrics.flush_seconds += elapsed
+            self.metrics.max_flush_seconds = max(
+                self.metrics.max_flush_seconds, elapsed
+            )
+
+    def _insert(self, ticks: list[PriceTick]) -> int:
+        """
+        Insert ticks in one transaction, bisecting on failure.
+
+        Halves are retried in order (later ticks still replace earlier ones),
+        so a bad tick costs itself rather than its batch.
+
+        Returns:
+            Ticks written
+        """
+        columns = ", ".join(STREAM_SCHEMA.names)
+        try:
+            table = _odds_table(ticks)
+            with self.connections.write_transaction() as con:
+                con.register("_stream_odds", table)
+                try:
+                    con.execute(
+                        f"INSERT OR REPLACE INTO market_odds ({columns}) "
+                        f"SELECT {columns} FROM _stream_odds"
+                    )
+                finally:
+                    con.unregister("_stream_odds")
+        except Exception as e:
+            if len(ticks) == 1:
+                logger.error(f"Odds tick {ticks[0].odds_id} failed: {e}")
+                return 0
+            middle = len(ticks) // 2
+            return self._insert(ticks[:middle]) + self._insert(ticks[middle:])
+        return len(ticks)
+
+
+def _within_checks(tick: PriceTick) -> bool:
+    """Whether a tick satisfies market_odds' CHECK and NOT NULL constraints."""
+    return (
+        tick.odds_type in ODDS_TYPES
+        and tick.odds_decimal is not None
+        and MIN_ODDS <= tick.odds_decimal <= MAX_ODDS
+        and bool(tick.run_id and tick.race_id and tick.source)
+        and tick.timestamp is not None
+    )
+
+
+def _odds_table(batch: list[PriceTick]) -> pa.Table:
+    """Columnar batch for market_odds (last tick wins per odds_id)."""
+    odds_ids = [tick.odds_id for tick in batch]
+    if len(set(odds_ids)) != len(odds_ids):
+        latest = {odds_id: i for i, odds_id in enumerate(odds_ids)}
+        batch = [batch[i] for i in sorted(latest.values())]
+        odds_ids = [tick.odds_id for tick in batch]
+
+    columns = [odds_ids, *zip(*batch)]
+    return pa.Table.from_pydict(dict(zip(STREAM_SCHEMA.names, columns)), STREAM_SCHEMA)
@@ -83,8 +83,8 @@ CREATE TABLE IF NOT EXISTS runs (
     run_id VARCHAR PRIMARY KEY,               -- Unique identifier (race_id + runner number)
     race_id VARCHAR NOT NULL,                 -- FK to races
     horse_id VARCHAR NOT NULL,                -- FK to horses
-    jockey_id VARCHAR,                        -- FK to jockeys
-    trainer_id VARCHAR,                       -- FK to trainers
+    jockey_id VARCHAR,                        -- Jockey (changes with late rider swaps)
+    trainer_id VARCHAR,                       -- Trainer
     barrier INTEGER NOT NULL,                 -- Barrier draw (1-24)
     weight_carried DECIMAL(4,1),              -- Weight in kg (e.g., 58.5)
     handicap_weight DECIMAL(4,1),             -- Allocated handicap weight
@@ -100,8 +100,9 @@ CREATE TABLE IF NOT EXISTS runs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (race_id) REFERENCES races(race_id),
     FOREIGN KEY (horse_id) REFERENCES horses(horse_id),
-    FOREIGN KEY (jockey_id) REFERENCES jockeys(jockey_id),
-    FOREIGN KEY (trainer_id) REFERENCES trainers(trainer_id),
+    -- No FKs on jockey_id/trainer_id: DuckDB cannot update a constrained or
+    -- indexed column of a row other tables reference, and reloads must apply
+    -- rider changes. RacingETL loads jockeys and trainers before runs.
     CONSTRAINT runs_barrier_check CHECK (barrier >= 1 AND barrier <= 24),
     CONSTRAINT runs_weight_check CHECK (weight_carried >= 48.0 AND weight_carried <= 72.0)
 );
@@ -196,6 +197,91 @@ CREATE TABLE IF NOT EXISTS gear (
     ))
 );
 
+-- ============================================================================
+-- DERIVED AGGREGATE TABLES (rebuilt from core tables, safe to truncate)
+-- ============================================================================
+
+-- Progeny aggregates: one row per parent (sire, dam or dam's sire)
+-- Refreshed by src/features/pedigree_aggregates.py
+CREATE TABLE IF NOT EXISTS progeny_stats (
+    parent_role VARCHAR NOT NULL,             -- 'sire', 'dam', 'dam_sire'
+    parent_name VARCHAR NOT NULL,             -- Parent name as stored on horses
+    progeny INTEGER NOT NULL,                 -- Horses by this parent in the database
+    runners INTEGER NOT NULL,                 -- Progeny with at least one result
+    winners INTEGER NOT NULL,                 -- Progeny with at least one win
+    stakes_winners INTEGER NOT NULL,          -- Progeny that won a Group/Listed race
+    g1_winners INTEGER NOT NULL,              -- Progeny that won a Group 1
+    starts INTEGER NOT NULL,                  -- Total results
+    wins INTEGER NOT NULL,                    -- Total wins
+    prize_money DECIMAL(14,2),                -- Total prize money won
+    win_prize_money DECIMAL(14,2),            -- Prize money from wins only
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (parent_role, parent_name)
+);
+
+-- Progeny results by exact distance and surface (for suitability windows)
+CREATE TABLE IF NOT EXISTS progeny_distance_stats (
+    parent_role VARCHAR NOT NULL,             -- 'sire', 'dam', 'dam_sire'
+    parent_name VARCHAR NOT NULL,             -- Parent name as stored on horses
+    distance INTEGER NOT NULL,                -- Race distance (meters)
+    track_type VARCHAR NOT NULL,              -- Lower-cased surface ('unknown' if missing)
+    starts INTEGER NOT NULL,                  -- Results at this distance/surface
+    wins INTEGER NOT NULL,                    -- Wins
+    top3 INTEGER NOT NULL,                    -- Top-3 finishes
+    PRIMARY KEY (parent_role, parent_name, distance, track_type)
+);
+
+-- Jockey/trainer daily counts with running totals per (person, venue,
+-- distance range), so any date window is the difference of two prefix rows
+-- Refreshed by src/data/stats_cube.py
+CREATE TABLE IF NOT EXISTS person_daily_stats (
+    person_role VARCHAR NOT NULL,             -- 'jockey' or 'trainer'
+    person_id VARCHAR NOT NULL,               -- jockey_id or trainer_id
+    venue VARCHAR NOT NULL,                   -- Track code
+    distance_range VARCHAR NOT NULL,          -- 'sprint', 'mile', 'middle', 'long', 'staying'
+    date DATE NOT NULL,                       -- Race date
+    rides INTEGER NOT NULL,                   -- Rides (runners) with a result
+    wins INTEGER NOT NULL,                    -- Wins
+    places INTEGER NOT NULL,                  -- Top-3 finishes
+    competitive_rides INTEGER NOT NULL,       -- Finishes in the top half of the field
+    competitive_wins INTEGER NOT NULL,        -- Wins among competitive rides
+    cum_rides BIGINT,                         -- Running totals up to and including date
+    cum_wins BIGINT,
+    cum_places BIGINT,
+    cum_competitive_rides BIGINT,
+    cum_competitive_wins BIGINT,
+    PRIMARY KEY (person_role, person_id, venue, distance_range, date)
+);
+
+-- ============================================================================
+-- INGESTION BOOKKEEPING
+-- ============================================================================
+
+-- Ingest journal: one row per race a historical backfill has planned
+-- Maintained by src/data/backfill.py (resumed backfills skip 'done' races)
+CREATE TABLE IF NOT EXISTS ingest_journal (
+    venue VARCHAR NOT NULL,                   -- Venue name (e.g., 'flemington')
+    date DATE NOT NULL,                       -- Race date
+    race_number INTEGER NOT NULL,             -- Race number from the meeting list (0 = empty-day marker)
+    race_id VARCHAR,                          -- Loaded race (set once scraped)
+    status VARCHAR NOT NULL,                  -- 'pending', 'done', 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,      -- Load attempts so far
+    error VARCHAR,                            -- Last failure
+    updated_at TIMESTAMP NOT NULL,            -- Last status change
+    PRIMARY KEY (venue, date, race_number),
+    CONSTRAINT journal_status_check CHECK (status IN ('pending', 'done', 'failed'))
+);
+
+-- Entity hashes: content hash of each master-data row as last loaded
+-- Maintained by src/data/etl_pipeline.py (unchanged horses, jockeys and trainers are not rewritten)
+CREATE TABLE IF NOT EXISTS entity_hashes (
+    entity VARCHAR NOT NULL,                  -- Table name ('horses', 'jockeys', 'trainers')
+    entity_id VARCHAR NOT NULL,               -- Primary key in that table
+    content_hash VARCHAR NOT NULL,            -- Digest of the loaded columns (timestamps excluded)
+    updated_at TIMESTAMP NOT NULL,            -- Last content change
+    PRIMARY KEY (entity, entity_id)
+);
+
 -- ============================================================================
 -- INDEXES FOR QUERY PERFORMANCE
 -- ============================================================================
@@ -209,9 +295,10 @@ CREATE INDEX IF NOT EXISTS idx_races_class ON races(class_level);
 -- Runs indexes
 CREATE INDEX IF NOT EXISTS idx_runs_race_id ON runs(race_id);
 CREATE INDEX IF NOT EXISTS idx_runs_horse_id ON runs(horse_id);
-CREATE INDEX IF NOT EXISTS idx_runs_jockey_id ON runs(jockey_id);
-CREATE INDEX IF NOT EXISTS idx_runs_trainer_id ON runs(trainer_id);
-CREATE INDEX IF NOT EXISTS idx_runs_scratched ON runs(scratched);
+-- Mutable columns are not indexed (reloads update them in place)
+DROP INDEX IF EXISTS idx_runs_jockey_id;
+DROP INDEX IF EXISTS idx_runs_trainer_id;
+DROP INDEX IF EXISTS idx_runs_scratched;
 
 -- Results indexes
 CREATE INDEX IF NOT EXISTS idx_results_run_id ON results(run_id);
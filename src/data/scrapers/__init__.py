@@ -11,10 +11,14 @@ Available scrapers:
 - WeatherAPI: Track weather metrics (BOM/Weatherzone)
 - TABOddsScraper: Fixed odds bookmaker markets
 - RacingFormScraper: Historical form with sectional times
+- AsyncScraper: Concurrent per-host rate-limited HTTP client (httpx)
+- ResponseCache: On-disk HTTP response cache shared by the scrapers
 """
 
+from src.data.scrapers.async_client import AsyncScraper
 from src.data.scrapers.barrier_trials import BarrierTrialScraper
 from src.data.scrapers.form_scraper import RacingFormScraper
+from src.data.scrapers.http_cache import ResponseCache
 from src.data.scrapers.jockey_stats import JockeyStatsBuilder
 from src.data.scrapers.market_odds import MarketOddsCollector
 from src.data.scrapers.racing_com import RacingComScraper
@@ -33,4 +37,6 @@ __all__ = [
     "WeatherAPI",
     "TABOddsScraper",
     "RacingFormScraper",
+    "AsyncScraper",
+    "ResponseCache",
 ]
@@ -0,0 +1,274 @@
+"""
+Async HTTP client for concurrent, rate-limited scraping.
+
+The blocking scrapers serialize every request behind time.sleep(delay), so
+a backfill spends most of its time idle. AsyncScraper runs many fetches
+concurrently on one httpx.AsyncClient while a token bucket per host keeps
+each site within its requests/second budget, and retries transient
+failures (connection errors, 429, 5xx) with exponential backoff.
+
+Settings:
+    SCRAPE_RATE_LIMIT: Requests per second per host (default: 2)
+    SCRAPE_MAX_RETRIES: Retries after the first attempt (default: 3)
+    SCRAPE_TIMEOUT: Request timeout in seconds (default: 30)
+
+Usage:
+    from src.data.scrapers.async_client import AsyncScraper
+
+    async with AsyncScraper() as client:
+        responses = await client.fetch_all(urls)
+
+    # Tests: any httpx transport, e.g. httpx.MockTransport(handler)
+    async with AsyncScraper(rate_limit=100, transport=transport) as client:
+        response = await client.get("https://racing.test/form")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Iterable
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+# Status codes worth retrying (rate limited or server-side failures)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for one host.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() waits until a token is available. Waiters are served in
+    arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: max(1, rate))
+            clock: Monotonic clock in seconds
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AsyncScraper:
+    """
+    Concurrent HTTP client with per-host rate limits and retries.
+
+    One TokenBucket is kept per host, so fetches to different sites do not
+    throttle each other. Every attempt (including retries) takes a token.
+    """
+
+    def __init__(
+        self,
+        rate_limit: float | None = None,
+        max_retries: int | None = None,
+        timeout: float | None = None,
+        max_concurrency: int = 16,
+        backoff: float = 0.5,
+        headers: dict[str, str] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        """
+        Initialize client.
+
+        Args:
+            rate_limit: Requests per second per host (default:
+                settings.scrape_rate_limit)
+            max_retries: Retries after the first attempt (default:
+                settings.scrape_max_retries)
+            timeout: Request timeout in seconds (default:
+                settings.scrape_timeout)
+            max_concurrency: Maximum requests in flight across all hosts
+            backoff: Base delay in seconds for exponential backoff
+            headers: Default request headers (default: settings.user_agent)
+            transport: httpx transport override (tests, local stand-ins)
+            cache: HTTP response cache in front of the transport (cache hits
+                skip the rate limit)
+        """
+        from src.utils.config import settings
+
+        self.rate_limit = rate_limit or settings.scrape_rate_limit
+        self.max_retries = (
+            settings.scrape_max_retries if max_retries is None else max_retries
+        )
+        self.backoff = backoff
+        self.buckets: dict[str, TokenBucket] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+        if cache is not None:
+            transport = cache.transport(transport)
+        self.client = httpx.AsyncClient(
+            headers=headers or {"User-Agent": settings.user_agent},
+            timeout=timeout or settings.scrape_timeout,
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request within the host's rate limit, retrying transient errors.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to httpx.AsyncClient.request (json, params, ...)
+
+        Returns:
+            Successful response
+
+        Raises:
+            httpx.HTTPStatusError: Non-retryable status, or retries exhausted
+            httpx.TransportError: Connection failures after retries exhausted
+        """
+        bucket = self._bucket(url)
+        request = self.client.build_request(method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            if not self._cached(request):
+                await bucket.acquire()
+            try:
+                async with self._semaphore:
+                    response = await self.client.send(request)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"{method} {url} failed: {e}")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {url} failed ({e}); retry in {delay:.2f}s")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+                delay = _retry_after(response) or self._backoff(attempt)
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}; "
+                    f"retry in {delay:.2f}s"
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET a URL (see request())."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST to a URL (see request())."""
+        return await self.request("POST", url, **kwargs)
+
+    async def fetch_all(
+        self, urls: Iterable[str], **kwargs: Any
+    ) -> list[httpx.Response | Exception]:
+        """
+        GET many URLs concurrently.
+
+        Failures are returned in place rather than raised, so one bad page
+        does not cancel the rest of a backfill.
+
+        Args:
+            urls: URLs to fetch
+            **kwargs: Passed to every request
+
+        Returns:
+            Response or exception per URL, in input order
+        """
+        return await asyncio.gather(
+            *(self.get(url, **kwargs) for url in urls), return_exceptions=True
+        )
+
+    def _cached(self, request: httpx.Request) -> bool:
+        """Whether the cache will answer a request without the network."""
+        if self.cache is None:
+            return False
+        from src.data.scrapers.http_cache import CACHE_ENTRY_EXTENSION
+
+        key = self.cache.key(request.method, str(request.url), request.content)
+        entry = self.cache.get(key)
+        # Handed to CachingTransport, so a hit is read and decompressed once
+        request.extensions[CACHE_ENTRY_EXTENSION] = entry
+        return entry is not None and self.cache.is_fresh(entry)
+
+    def _bucket(self, url: str) -> TokenBucket:
+        """Token bucket for the URL's host."""
+        host = httpx.URL(url).host
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate_limit)
+        return self.buckets[host]
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for a failed attempt."""
+        return self.backoff * 2**attempt * random.uniform(0.5, 1.0)
+
+    async def aclose(self) -> None:
+        """Close the underlying client."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Delay requested by a Retry-After header (seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,464 @@
+"""
+On-disk HTTP response cache shared by the scrapers.
+
+Responses are stored under settings.cache_dir keyed by a SHA-256
+fingerprint of the request (method, URL and body, so each GraphQL query is
+its own entry). Each entry is one zlib-compressed file holding a JSON
+metadata line followed by the body.
+
+Freshness:
+    - Entries younger than the TTL are served without touching the network
+    - Stale entries with an ETag/Last-Modified are revalidated with a
+      conditional request; a 304 re-serves the stored body
+    - Replay-only mode serves whatever is cached regardless of age and
+      fails on a miss, so re-running ETL after a parser fix never goes to
+      the network
+
+What is stored:
+    - Successful GET/POST responses (CACHEABLE_METHODS/CACHEABLE_STATUSES)
+    - Not responses marked Cache-Control: no-store; no-cache entries are
+      stored but always revalidated
+    - Not responses the should_store veto rejects (by default GraphQL
+      bodies carrying "errors", which arrive with status 200)
+
+The cache is bounded: once the stored (compressed) size exceeds max_bytes
+the least recently used entries are evicted. File mtimes record last use.
+
+Usage:
+    from src.data.scrapers.http_cache import ResponseCache
+
+    cache = ResponseCache()                        # settings.cache_dir / cache_ttl
+    scraper = RacingComScraper(cache=cache)        # requests sessions
+    client = AsyncScraper(cache=cache)             # httpx (async)
+
+    replay = ResponseCache(replay_only=True)       # offline re-ingest
+    etl = RacingETL(http_cache=replay)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+
+# Methods and statuses worth storing (POST for GraphQL queries)
+CACHEABLE_METHODS = frozenset({"GET", "POST"})
+CACHEABLE_STATUSES = frozenset({200, 203, 300, 301, 308, 410})
+
+# Headers describing the wire encoding; stored bodies are already decoded
+HOP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# httpx request extension holding an entry the caller already looked up
+# (None for a miss), so CachingTransport does not read it from disk again
+CACHE_ENTRY_EXTENSION = "response_cache_entry"
+
+
+class CacheMiss(requests.ConnectionError):
+    """
+    Raised in replay-only mode for a request with no cached response.
+
+    Not an httpx.TransportError, so AsyncScraper does not retry it.
+    """
+
+
+@dataclass
+class CachedResponse:
+    """Stored response."""
+
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def cache_control(self) -> set[str]:
+        """Cache-Control directives (lower-cased, arguments dropped)."""
+        value = next(
+            (v for k, v in self.headers.items() if k.lower() == "cache-control"), ""
+        )
+        return {
+            directive.split("=", 1)[0].strip().lower()
+            for directive in value.split(",")
+            if directive.strip()
+        }
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidation."""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        validators = {}
+        if "etag" in headers:
+            validators["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            validators["If-Modified-Since"] = headers["last-modified"]
+        return validators
+
+
+def graphql_success(entry: CachedResponse) -> bool:
+    """
+    Default should_store veto: reject GraphQL error payloads.
+
+    GraphQL servers report failed queries as 200 responses whose JSON body
+    has an "errors" member; caching them would replay the failure.
+    """
+    if b'"errors"' not in entry.body:
+        return True
+    try:
+        payload = json.loads(entry.body)
+    except ValueError:
+        return True
+    return not (isinstance(payload, dict) and payload.get("errors"))
+
+
+class ResponseCache:
+    """
+    Size-bounded, compressed HTTP response store.
+
+    Thread-safe within a process; concurrent processes sharing a directory
+    may evict each other's entries but never read partial files.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        replay_only: bool | None = None,
+        compression_level: int = 6,
+        should_store: Callable[[CachedResponse], bool] | None = graphql_success,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Cache root (default: settings.cache_dir / "http")
+            ttl: Seconds an entry is served without revalidation
+                (default: settings.cache_ttl)
+            max_bytes: Compressed size bound (default:
+                settings.http_cache_max_mb)
+            replay_only: Serve only cached responses (default:
+                settings.http_cache_replay)
+            compression_level: zlib level (1 fastest - 9 smallest)
+            should_store: Veto called with each cacheable response before it
+                is stored (default: reject GraphQL error bodies; None stores
+                every cacheable response)
+        """
+        from src.utils.config import settings
+
+        self.root = Path(cache_dir or Path(settings.cache_dir) / "http")
+        self.ttl = settings.cache_ttl if ttl is None else ttl
+        if max_bytes is None:
+            max_bytes = settings.http_cache_max_mb * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.replay_only = (
+            settings.http_cache_replay if replay_only is None else replay_only
+        )
+        self.compression_level = compression_level
+        self.should_store = should_store
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._size: int | None = None  # computed on first store
+
+    # ------------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def key(method: str, url: str, body: bytes | str | None = None) -> str:
+        """Fingerprint of a request."""
+        digest = hashlib.sha256(f"{method.upper()} {url}\n".encode())
+        if body:
+            digest.update(body.encode() if isinstance(body, str) else body)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Stored response for a key (marks it recently used)."""
+        path = self._path(key)
+        try:
+            raw = zlib.decompress(path.read_bytes())
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        meta, _, body = raw.partition(b"\n")
+        return CachedResponse(body=body, **json.loads(meta))
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        body: bytes,
+        stored_at: float | None = None,
+    ) -> CachedResponse:
+        """Store a response, evicting least recently used entries if needed."""
+        entry = CachedResponse(
+            url=url,
+            status_code=status_code,
+            headers={k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS},
+            body=body,
+            stored_at=time.time() if stored_at is None else stored_at,
+        )
+        meta = json.dumps(
+            {
+                "url": entry.url,
+                "status_code": entry.status_code,
+                "headers": entry.headers,
+                "stored_at": entry.stored_at,
+            }
+        ).encode()
+        data = zlib.compress(meta + b"\n" + body, self.compression_level)
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with self._lock:
+            size = self._current_size()
+            previous = path.stat().st_size if path.exists() else 0
+            tmp.write_bytes(data)
+            os.replace(tmp, path)  # readers never see partial entries
+            self._size = size - previous + len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return entry
+
+    def store(
+        self,
+        key: str,
+        method: str,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> bool:
+        """
+        Store a fetched response if it may be cached.
+
+        Returns:
+            Whether the response was stored
+        """
+        if method not in CACHEABLE_METHODS or status_code not in CACHEABLE_STATUSES:
+            return False
+        entry = CachedResponse(url, status_code, headers, body, time.time())
+        if "no-store" in entry.cache_control:
+            return False
+        if self.should_store is not None and not self.should_store(entry):
+            logger.debug(f"Not caching vetoed response for {url}")
+            return False
+        self.put(key, url, status_code, headers, body, entry.stored_at)
+        return True
+
+    def refresh(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Restart an entry's TTL after a 304 Not Modified."""
+        return self.put(key, entry.url, entry.status_code, entry.headers, entry.body)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether an entry can be served without revalidation."""
+        if self.replay_only:
+            return True
+        if "no-cache" in entry.cache_control:
+            return False
+        return time.time() - entry.stored_at < self.ttl
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Compressed bytes on disk."""
+        with self._lock:
+            return self._current_size()
+
+    # ------------------------------------------------------------------------
+    # Session integration
+    # ------------------------------------------------------------------------
+
+    def install(self, session: requests.Session) -> requests.Session:
+        """Route a requests session's HTTP(S) traffic through the cache."""
+        adapter = CachingAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def transport(
+        self, transport: httpx.AsyncBaseTransport | None = None
+    ) -> CachingTransport:
+        """httpx transport serving from the cache (for AsyncScraper)."""
+        return CachingTransport(self, transport)
+
+    # ------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        """Entry file (two-character fan-out directories)."""
+        return self.root / key[:2] / key
+
+    def _entries(self) -> list[Path]:
+        """Every entry file."""
+        return [p for p in self.root.glob("??/*") if p.suffix != ".tmp"]
+
+    def _current_size(self) -> int:
+        """Total entry size (scans the directory once per process)."""
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until within max_bytes."""
+        entries = sorted(
+            ((p.stat(), p) for p in self._entries()), key=lambda e: e[0].st_mtime
+        )
+        evicted = 0
+        for stat, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= stat.st_size
+            evicted += 1
+        logger.info(f"Evicted {evicted} cached responses ({self._size} bytes kept)")
+
+
+class CachingAdapter(HTTPAdapter):
+    """requests transport adapter backed by a ResponseCache."""
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        """
+        Initialize adapter.
+
+        Args:
+            cache: Response cache
+            **kwargs: Passed to HTTPAdapter (pool sizes, retries)
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Serve from the cache, revalidate, or fetch and store."""
+        key = self.cache.key(request.method, request.url, request.body)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(request, entry)
+        if self.cache.replay_only:
+            raise CacheMiss(f"Not cached: {request.method} {request.url}")
+
+        if entry is not None:
+            request.headers.update(entry.validators)
+
+        response = super().send(request, **kwargs)
+        if entry is not None and response.status_code == 304:
+            return self._cached_response(request, self.cache.refresh(key, entry))
+        self.cache.store(
+            key,
+            request.method,
+            request.url,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+        )
+        return response
+
+    @staticmethod
+    def _cached_response(
+        request: requests.PreparedRequest, entry: CachedResponse
+    ) -> requests.Response:
+        """requests.Response for a stored entry."""
+        response = requests.Response()
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.url
+        response.request = request
+        response.reason = HTTPStatus(entry.status_code).phrase
+        return response
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx async transport backed by a ResponseCache."""
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            cache: Response cache
+            transport: Transport used on a miss (default: network)
+        """
+        self.cache = cache
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Serve from the cache, revalidate, or fetch and store."""
+        url = str(request.url)
+        key = self.cache.key(request.method, url, await request.aread())
+        if CACHE_ENTRY_EXTENSION in request.extensions:
+            entry = request.extensions[CACHE_ENTRY_EXTENSION]
+        else:
+            entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(request, entry)
+        if self.cache.replay_only:
+            raise CacheMiss(f"Not cached: {request.method} {url}")
+
+        if entry is not None:
+            request.headers.update(entry.validators)
+
+        response = await self.transport.handle_async_request(request)
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            return self._cached_response(request, self.cache.refresh(key, entry))
+
+        body = await response.aread()
+        self.cache.store(
+            key, request.method, url, response.status_code, dict(response.headers), body
+        )
+        return response
+
+    @staticmethod
+    def _cached_response(
+        request: httpx.Request, entry: CachedResponse
+    ) -> httpx.Response:
+        """httpx.Response for a stored entry."""
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
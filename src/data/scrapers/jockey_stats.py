@@ -13,6 +13,13 @@ Usage:
     builder = JockeyStatsBuilder(db_connection)
     stats = builder.calculate_jockey_stats("JOCKEY123", lookback_days=365)
     trainer_stats = builder.calculate_trainer_stats("TRAINER456", lookback_days=180)
+
+    # Every active jockey/trainer in three grouped queries each
+    all_jockeys = builder.calculate_jockey_stats_bulk(lookback_days=365)
+    all_trainers = builder.calculate_trainer_stats_bulk(lookback_days=365)
+
+    # Bulk counts from the maintained daily cube (src/data/stats_cube.py)
+    builder = JockeyStatsBuilder(db_path, cube=StatsCube(db_path))
 """
 
 from __future__ import annotations
@@ -20,7 +27,7 @@ from __future__ import annotations
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 try:
     import duckdb
@@ -29,9 +36,34 @@ except ImportError:
 
 from src.data.models import JockeyStat, TrainerStat
 
+if TYPE_CHECKING:
+    from src.data.db import DuckDBConnectionManager
+    from src.data.stats_cube import StatsCube
+
 logger = logging.getLogger(__name__)
 
 
+# Recent-form window (days) for recent_win_rate
+RECENT_FORM_DAYS = 14
+
+# Minimum rides for venue and trainer/jockey combination breakdowns
+MIN_BREAKDOWN_RIDES = 5
+
+# Distance range buckets (same as _calculate_distance_stats)
+DISTANCE_RANGE_SQL = """
+    CASE
+        WHEN race.distance <= 1200 THEN 'sprint'
+        WHEN race.distance <= 1600 THEN 'mile'
+        WHEN race.distance <= 2000 THEN 'middle'
+        WHEN race.distance <= 2400 THEN 'long'
+        ELSE 'staying'
+    END
+"""
+
+# Grouped counts for a person with no rides in the period
+_EMPTY_COUNTS = (0, 0, 0, 0, 0, 0, 0)
+
+
 class JockeyStatsBuilder:
     """
     Calculate jockey and trainer statistics from database.
@@ -43,29 +75,47 @@ class JockeyStatsBuilder:
     SQL aggregation is reliable and efficient.
     """
 
-    def __init__(self, db_path: str = "racing.db"):
+    def __init__(
+        self,
+        db_path: str = "racing.db",
+        connections: DuckDBConnectionManager | None = None,
+        cube: StatsCube | None = None,
+    ):
         """
         Initialize stats builder.
 
         Args:
             db_path: Path to DuckDB database
+            connections: Shared connection manager to borrow a cursor from
+                (default: the read-only process-wide manager for db_path)
+            cube: Maintained daily aggregate cube; when given, bulk overall,
+                venue and distance counts come from its prefix rows instead of
+                rescanning results
         """
         self.db_path = db_path
+        self.connections = connections
+        self.cube = cube
         self.conn: duckdb.DuckDBPyConnection | None = None
 
         logger.info(f"Initialized JockeyStatsBuilder (db={db_path})")
 
     def __enter__(self):
-        """Context manager entry - open database connection."""
-        if duckdb is None:
-            raise ImportError("duckdb package required for stats builder")
-        self.conn = duckdb.connect(self.db_path)
+        """Context manager entry - borrow a read cursor."""
+        connections = self.connections
+        if connections is None:
+            if duckdb is None:
+                raise ImportError("duckdb package required for stats builder")
+            from src.data.db import get_connection_manager
+
+            # Read-only, shared with every other reader of this file
+            connections = get_connection_manager(self.db_path)
+        # The manager owns the thread's cursor, so a reopen can wait for it
+        self.conn = connections.cursor()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Context manager exit - hand the cursor back (the manager owns it)."""
+        self.conn = None
 
     def calculate_jockey_stats(
         self,
@@ -160,7 +210,7 @@ class JockeyStatsBuilder:
         )
 
         # Get recent form (last 14 days)
-        recent_cutoff = stat_date - timedelta(days=14)
+        recent_cutoff = stat_date - timedelta(days=RECENT_FORM_DAYS)
         recent_query = """
             SELECT
                 COUNT(*) as recent_rides,
@@ -311,7 +361,7 @@ class JockeyStatsBuilder:
         )
 
         # Recent form
-        recent_cutoff = stat_date - timedelta(days=14)
+        recent_cutoff = stat_date - timedelta(days=RECENT_FORM_DAYS)
         recent_query = """
             SELECT
                 COUNT(*) as recent_runners,
@@ -539,7 +589,10 @@ class JockeyStatsBuilder:
         lookback_days: int = 365,
     ) -> list[JockeyStat]:
         """
-        Calculate stats for multiple jockeys efficiently.
+        Calculate stats for multiple jockeys, one jockey at a time.
+
+        Failures are isolated per jockey. For many jockeys prefer
+        calculate_jockey_stats_bulk(), which uses grouped queries.
 
         Args:
             jockey_ids: List of jockey IDs to process
@@ -547,8 +600,6 @@ class JockeyStatsBuilder:
 
         Returns:
             List of JockeyStat models
-
-        CONFIDENCE: HIGH - batch processing is efficient
         """
         stats = []
 
@@ -568,7 +619,10 @@ class JockeyStatsBuilder:
         lookback_days: int = 365,
     ) -> list[TrainerStat]:
         """
-        Calculate stats for multiple trainers efficiently.
+        Calculate stats for multiple trainers, one trainer at a time.
+
+        Failures are isolated per trainer. For many trainers prefer
+        calculate_trainer_stats_bulk(), which uses grouped queries.
 
         Args:
             trainer_ids: List of trainer IDs to process
@@ -588,3 +642,346 @@ class JockeyStatsBuilder:
                 continue
 
         return stats
+
+    # ------------------------------------------------------------------------
+    # Grouped (bulk) statistics
+    # ------------------------------------------------------------------------
+
+    def calculate_jockey_stats_bulk(
+        self,
+        jockey_ids: list[str] | None = None,
+        lookback_days: int = 365,
+        stat_date: date | None = None,
+    ) -> dict[str, JockeyStat]:
+        """
+        Calculate statistics for many jockeys in three grouped queries.
+
+        Same metrics as calculate_jockey_stats(): overall, strike rate and
+        recent form come from one conditional-aggregation query, venue and
+        distance breakdowns from one GROUP BY each. With a cube, all three
+        come from one prefix-row query against person_daily_stats.
+
+        Args:
+            jockey_ids: Jockeys to include (default: every jockey with a
+                ride in the lookback period)
+            lookback_days: Lookback period
+            stat_date: Date to calculate stats as of (default: today)
+
+        Returns:
+            Dict mapping jockey_id to JockeyStat (requested jockeys without
+            rides get zero statistics)
+        """
+        stat_date = stat_date or date.today()
+        cutoff_date = stat_date - timedelta(days=lookback_days)
+
+        if self.cube is not None:
+            overall, venues, distances = self.cube.window_counts(
+                "jockey", jockey_ids, cutoff_date, stat_date
+            )
+        else:
+            overall = self._grouped_overall_stats(
+                "jockey_id", jockey_ids, cutoff_date, stat_date
+            )
+            venues = self._grouped_breakdown(
+                "jockey_id", "race.venue", jockey_ids, cutoff_date, stat_date
+            )
+            distances = self._grouped_breakdown(
+                "jockey_id",
+                DISTANCE_RANGE_SQL,
+                jockey_ids,
+                cutoff_date,
+                stat_date,
+                min_rides=1,
+            )
+
+        stats = {}
+        for jockey_id in overall if jockey_ids is None else jockey_ids:
+            counts = overall.get(jockey_id, _EMPTY_COUNTS)
+            rates = _rates(counts)
+            venue_stats = venues.get(jockey_id, {})
+
+            stats[jockey_id] = JockeyStat(
+                jockey_id=jockey_id,
+                stat_date=stat_date,
+                lookback_days=lookback_days,
+                total_rides=counts[0],
+                total_wins=counts[1],
+                total_places=counts[2],
+                win_rate=rates[0],
+                place_rate=rates[1],
+                strike_rate=rates[2],
+                recent_rides=counts[5],
+                recent_wins=counts[6],
+                recent_win_rate=rates[3],
+                venue_stats=venue_stats,
+                distance_stats=distances.get(jockey_id, {}),
+                specialist_venues=_specialist_venues(venue_stats, rates[0]),
+            )
+
+        logger.info(f"✓ Calculated jockey stats for {len(stats)} jockeys (bulk)")
+        return stats
+
+    def calculate_trainer_stats_bulk(
+        self,
+        trainer_ids: list[str] | None = None,
+        lookback_days: int = 365,
+        stat_date: date | None = None,
+    ) -> dict[str, TrainerStat]:
+        """
+        Calculate statistics for many trainers in three grouped queries.
+
+        Same metrics as calculate_trainer_stats(), including trainer/jockey
+        combinations (always queried from results; the cube has no jockey
+        dimension).
+
+        Args:
+            trainer_ids: Trainers to include (default: every trainer with a
+                runner in the lookback period)
+            lookback_days: Lookback period
+            stat_date: Date to calculate stats as of (default: today)
+
+        Returns:
+            Dict mapping trainer_id to TrainerStat (requested trainers without
+            runners get zero statistics)
+        """
+        stat_date = stat_date or date.today()
+        cutoff_date = stat_date - timedelta(days=lookback_days)
+
+        if self.cube is not None:
+            overall, venues, _ = self.cube.window_counts(
+                "trainer", trainer_ids, cutoff_date, stat_date
+            )
+        else:
+            overall = self._grouped_overall_stats(
+                "trainer_id", trainer_ids, cutoff_date, stat_date
+            )
+            venues = self._grouped_breakdown(
+                "trainer_id", "race.venue", trainer_ids, cutoff_date, stat_date
+            )
+        combos = self._grouped_jockey_combos(trainer_ids, cutoff_date, stat_date)
+
+        stats = {}
+        for trainer_id in overall if trainer_ids is None else trainer_ids:
+            counts = overall.get(trainer_id, _EMPTY_COUNTS)
+            rates = _rates(counts)
+            venue_stats = venues.get(trainer_id, {})
+
+            stats[trainer_id] = TrainerStat(
+                trainer_id=trainer_id,
+                stat_date=stat_date,
+                lookback_days=lookback_days,
+                total_runners=counts[0],
+                total_wins=counts[1],
+                total_places=counts[2],
+                win_rate=rates[0],
+                place_rate=rates[1],
+                strike_rate=rates[2],
+                recent_runners=counts[5],
+                recent_wins=counts[6],
+                recent_win_rate=rates[3],
+                jockey_combos=combos.get(trainer_id, {}),
+                venue_stats=venue_stats,
+                specialist_venues=_specialist_venues(venue_stats, rates[0]),
+            )
+
+        logger.info(f"✓ Calculated trainer stats for {len(stats)} trainers (bulk)")
+        return stats
+
+    def _person_filter(
+        self, id_field: str, person_ids: list[str] | None
+    ) -> tuple[str, list]:
+        """SQL condition and parameters restricting runs to some people."""
+        if person_ids is None:
+            return f"r.{id_field} IS NOT NULL", []
+        return f"r.{id_field} IN (SELECT UNNEST(?))", [list(person_ids)]
+
+    def _grouped_overall_stats(
+        self,
+        id_field: str,
+        person_ids: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, tuple[int, ...]]:
+        """
+        Overall, strike-rate and recent-form counts per person in one query.
+
+        Returns:
+            Dict mapping person_id to (rides, wins, places, competitive_rides,
+            competitive_wins, recent_rides, recent_wins)
+        """
+        if not self.conn:
+            raise RuntimeError("Database not connected. Use context manager.")
+        if person_ids is not None and not person_ids:
+            return {}
+
+        recent_cutoff = end_date - timedelta(days=RECENT_FORM_DAYS)
+        person_filter, person_params = self._person_filter(id_field, person_ids)
+
+        query = f"""
+            WITH rides AS (
+                SELECT
+                    r.{id_field} AS person_id,
+                    res.finish_position,
+                    race.date >= ? AS in_period,
+                    race.date >= ? AS is_recent,
+                    res.finish_position <= (race.field_size / 2.0) AS competitive
+                FROM runs r
+                JOIN results res ON res.run_id = r.run_id
+                JOIN races race ON race.race_id = r.race_id
+                WHERE {person_filter}
+                  AND r.scratched = FALSE
+                  AND race.date BETWEEN ? AND ?
+            )
+            SELECT
+                person_id,
+                COUNT(*) FILTER (WHERE in_period),
+                COUNT(*) FILTER (WHERE in_period AND finish_position = 1),
+                COUNT(*) FILTER (WHERE in_period AND finish_position <= 3),
+                COUNT(*) FILTER (WHERE in_period AND competitive),
+                COUNT(*) FILTER (
+                    WHERE in_period AND competitive AND finish_position = 1
+                ),
+                COUNT(*) FILTER (WHERE is_recent),
+                COUNT(*) FILTER (WHERE is_recent AND finish_position = 1)
+            FROM rides
+            GROUP BY person_id
+        """
+
+        # Recent form may reach back further than a short lookback period
+        params = [
+            start_date,
+            recent_cutoff,
+            *person_params,
+            min(start_date, recent_cutoff),
+            end_date,
+        ]
+        rows = self.conn.execute(query, params).fetchall()
+
+        return {row[0]: tuple(count or 0 for count in row[1:]) for row in rows}
+
+    def _grouped_breakdown(
+        self,
+        id_field: str,
+        group_expr: str,
+        person_ids: list[str] | None,
+        start_date: date,
+        end_date: date,
+        min_rides: int = MIN_BREAKDOWN_RIDES,
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        Rides/wins per person and group (venue or distance range).
+
+        Returns:
+            Dict mapping person_id to {group: {rides, wins, win_rate}}
+        """
+        if person_ids is not None and not person_ids:
+            return {}
+
+        person_filter, person_params = self._person_filter(id_field, person_ids)
+
+        query = f"""
+            SELECT
+                r.{id_field},
+                {group_expr} AS breakdown,
+                COUNT(*) as rides,
+                SUM(CASE WHEN res.finish_position = 1 THEN 1 ELSE 0 END) as wins
+            FROM runs r
+            JOIN results res ON res.run_id = r.run_id
+            JOIN races race ON race.race_id = r.race_id
+            WHERE {person_filter}
+              AND r.scratched = FALSE
+              AND race.date BETWEEN ? AND ?
+            GROUP BY r.{id_field}, breakdown
+            HAVING COUNT(*) >= ?
+        """
+
+        rows = self.conn.execute(
+            query, [*person_params, start_date, end_date, min_rides]
+        ).fetchall()
+
+        breakdowns: dict[str, dict[str, dict[str, Any]]] = {}
+        for person_id, group, rides, wins in rows:
+            breakdowns.setdefault(person_id, {})[group] = {
+                "rides": rides,
+                "wins": wins,
+                "win_rate": wins / rides if rides > 0 else 0.0,
+            }
+
+        return breakdowns
+
+    def _grouped_jockey_combos(
+        self,
+        trainer_ids: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        Trainer/jockey combination statistics for many trainers at once.
+
+        Returns:
+            Dict mapping trainer_id to _calculate_jockey_combos() output
+        """
+        if trainer_ids is not None and not trainer_ids:
+            return {}
+
+        person_filter, person_params = self._person_filter("trainer_id", trainer_ids)
+
+        query = f"""
+            SELECT
+                r.trainer_id,
+                r.jockey_id,
+                j.name as jockey_name,
+                COUNT(*) as rides,
+                SUM(CASE WHEN res.finish_position = 1 THEN 1 ELSE 0 END) as wins
+            FROM runs r
+            JOIN results res ON res.run_id = r.run_id
+            JOIN races race ON race.race_id = r.race_id
+            LEFT JOIN jockeys j ON j.jockey_id = r.jockey_id
+            WHERE {person_filter}
+              AND r.scratched = FALSE
+              AND race.date BETWEEN ? AND ?
+            GROUP BY r.trainer_id, r.jockey_id, j.name
+            HAVING COUNT(*) >= ?
+            ORDER BY r.trainer_id, wins DESC
+        """
+
+        rows = self.conn.execute(
+            query, [*person_params, start_date, end_date, MIN_BREAKDOWN_RIDES]
+        ).fetchall()
+
+        combos: dict[str, dict[str, dict[str, Any]]] = {}
+        for trainer_id, jockey_id, jockey_name, rides, wins in rows:
+            combos.setdefault(trainer_id, {})[jockey_id] = {
+                "name": jockey_name,
+                "rides": rides,
+                "wins": wins,
+                "win_rate": wins / rides if rides > 0 else 0.0,
+            }
+
+        return combos
+
+
+def _rates(counts: tuple[int, ...]) -> tuple[Decimal, Decimal, Decimal, Decimal]:
+    """(win, place, strike, recent win) rates from grouped counts."""
+    rides, wins, places, competitive, competitive_wins, recent, recent_wins = counts
+
+    def ratio(numerator: int, denominator: int) -> Decimal:
+        return (
+            Decimal(numerator) / Decimal(denominator) if denominator > 0 else Decimal(0)
+        )
+
+    return (
+        ratio(wins, rides),
+        ratio(places, rides),
+        ratio(competitive_wins, competitive),
+        ratio(recent_wins, recent),
+    )
+
+
+def _specialist_venues(venue_stats: dict[str, dict], win_rate: Decimal) -> list[str]:
+    """Venues where the win rate beats the overall win rate."""
+    return [
+        venue
+        for venue, stats in venue_stats.items()
+        if stats.get("win_rate", 0) > float(win_rate)
+    ]
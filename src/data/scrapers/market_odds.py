@@ -20,11 +20,15 @@ from __future__ import annotations
 import logging
 from datetime import date, datetime
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
 import requests
 
 from src.data.models import MarketOdds, OddsType
 
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,10 +46,17 @@ class MarketOddsCollector:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
 
-    def __init__(self):
-        """Initialize odds collector."""
+    def __init__(self, cache: ResponseCache | None = None):
+        """
+        Initialize odds collector.
+
+        Args:
+            cache: HTTP response cache for the session (default: no caching)
+        """
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        if cache is not None:
+            cache.install(self.session)
 
     def collect_starting_prices(
         self, venue: str, race_date: date | str, race_number: int
@@ -20,7 +20,7 @@ import logging
 import time
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
 from bs4 import BeautifulSoup
@@ -38,6 +38,9 @@ from src.data.models import (
     Trainer,
 )
 
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,16 +61,21 @@ class RacingComScraper:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
 
-    def __init__(self, delay_between_requests: float = 1.0):
+    def __init__(
+        self, delay_between_requests: float = 1.0, cache: ResponseCache | None = None
+    ):
         """
         Initialize scraper.
 
         Args:
             delay_between_requests: Delay in seconds between requests (be polite!)
+            cache: HTTP response cache for the session (default: no caching)
         """
         self.delay = delay_between_requests
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        if cache is not None:
+            cache.install(self.session)
 
     def scrape_race(
         self, venue: str, race_date: date | str, race_number: int
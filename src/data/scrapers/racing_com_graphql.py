@@ -18,15 +18,24 @@ Usage:
 
     scraper = RacingComGraphQLScraper()
     race_card = scraper.scrape_race("flemington", "2025-11-14", race_number=1)
+
+    # Whole meeting from one request
+    race_cards = scraper.scrape_meeting("flemington", "2025-11-14")
+
+    # Many meetings concurrently within the per-host rate limit
+    async with AsyncScraper() as client:
+        results = await scraper.scrape_meetings_async(meetings, client)
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from datetime import date, datetime
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
 
@@ -41,8 +50,14 @@ from src.data.models import (
     ScrapedTrainer,
     SexType,
     TrackType,
+    build_models,
+    completeness_scores,
 )
 
+if TYPE_CHECKING:
+    from src.data.scrapers.async_client import AsyncScraper
+    from src.data.scrapers.http_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -120,16 +135,46 @@ class RacingComGraphQLScraper:
     }
     """
 
-    def __init__(self, delay_between_requests: float = 0.5):
+    # GraphQL query for the meeting list of a date
+    MEETINGS_QUERY = """
+    query GetMeetings($date: String!) {
+      GetMeetingByDate(date: $date) {
+        id
+        venueName
+        venueCode
+        date
+        track
+        trackCondition
+        railPosition
+        weather
+        state
+        country
+        racesCount
+        races {
+          raceNumber
+          name
+          distance
+          status
+        }
+      }
+    }
+    """
+
+    def __init__(
+        self, delay_between_requests: float = 0.5, cache: ResponseCache | None = None
+    ):
         """
         Initialize GraphQL scraper.
 
         Args:
             delay_between_requests: Delay in seconds between requests (be polite!)
+            cache: HTTP response cache for the session (default: no caching)
         """
         self.delay = delay_between_requests
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        if cache is not None:
+            cache.install(self.session)
 
     def scrape_race(
         self, venue: str, race_date: date | str, race_number: int
@@ -137,6 +182,9 @@ class RacingComGraphQLScraper:
         """
         Scrape a complete race card from Racing.com GraphQL API.
 
+        Fetches the whole meeting; use scrape_meeting() when loading more
+        than one race from the same meeting.
+
         Args:
             venue: Venue name (e.g., 'flemington', 'randwick', 'caulfield')
             race_date: Race date (YYYY-MM-DD or date object)
@@ -158,85 +206,226 @@ class RacingComGraphQLScraper:
 
         logger.info(f"Scraping {venue_name} {date_str} R{race_number} via GraphQL")
 
+        meeting = self._fetch_meeting(venue_name, date_str)
+
         try:
-            # Execute GraphQL query with rate limiting
-            time.sleep(self.delay)
+            # Filter for our specific race number
+            race_data = next(
+                (r for r in meeting["races"] if r.get("raceNumber") == race_number),
+                None,
+            )
+            if not race_data:
+                raise ValueError(
+                    f"Race {race_number} not found at {venue_name} on {date_str}"
+                )
 
-            response = self.session.post(
+            race_card = self._build_race_card(
+                meeting, race_data, race_date, venue_name
+            )
+            self._mark_complete([race_card])
+            return race_card
+
+        except Exception as e:
+            logger.error(f"Error parsing GraphQL response: {e}", exc_info=True)
+            raise
+
+    def scrape_meeting(
+        self, venue: str, race_date: date | str
+    ) -> list[ScrapedRaceCard]:
+        """
+        Scrape every race card of a meeting from a single GraphQL request.
+
+        GetMeetingByVenue returns the whole meeting, so this costs one
+        request (and one rate-limit delay) regardless of the number of races.
+        Races that fail to parse are logged and skipped.
+
+        Args:
+            venue: Venue name (e.g., 'flemington', 'randwick', 'caulfield')
+            race_date: Race date (YYYY-MM-DD or date object)
+
+        Returns:
+            Race cards ordered by race number
+
+        Example:
+            >>> scraper = RacingComGraphQLScraper()
+            >>> cards = scraper.scrape_meeting("flemington", "2025-11-14")
+            >>> print(f"{len(cards)} races")
+        """
+        if isinstance(race_date, str):
+            race_date = date.fromisoformat(race_date)
+
+        venue_name = venue.lower()
+        date_str = race_date.isoformat()
+
+        logger.info(f"Scraping {venue_name} {date_str} meeting via GraphQL")
+
+        meeting = self._fetch_meeting(venue_name, date_str)
+        return self._parse_meeting(meeting, race_date, venue_name)
+
+    def scrape_meetings(
+        self,
+        start_date: date | str,
+        end_date: date | str | None = None,
+        venues: list[str] | None = None,
+    ) -> Iterator[tuple[str, date, list[ScrapedRaceCard]]]:
+        """
+        Scrape every meeting in a date range, one request per meeting.
+
+        Venues for each day come from get_meetings_by_date(); meetings that
+        fail are logged and skipped so one bad venue does not stop a backfill.
+
+        Args:
+            start_date: First date (YYYY-MM-DD or date object)
+            end_date: Last date, inclusive (default: start_date)
+            venues: Only these venue names (default: all venues)
+
+        Yields:
+            (venue_name, race_date, race_cards) per meeting
+        """
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        end_date = end_date or start_date
+        wanted = {v.lower() for v in venues} if venues else None
+
+        race_date = start_date
+        while race_date <= end_date:
+            for meeting in self.get_meetings_by_date(race_date):
+                venue_name = str(meeting.get("venueName", "")).lower()
+                if not venue_name or (wanted and venue_name not in wanted):
+                    continue
+                try:
+                    yield venue_name, race_date, self.scrape_meeting(
+                        venue_name, race_date
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to scrape {venue_name} {race_date.isoformat()}: {e}"
+                    )
+            race_date += timedelta(days=1)
+
+    async def scrape_meetings_async(
+        self,
+        meetings: Iterable[tuple[str, date | str]],
+        client: AsyncScraper,
+    ) -> list[list[ScrapedRaceCard] | Exception]:
+        """
+        Scrape many meetings concurrently through an AsyncScraper.
+
+        The client's per-host token bucket replaces the fixed delay, so a
+        backfill runs at the configured rate limit instead of one request
+        per delay. Failures are returned in place of the meeting's cards.
+
+        Args:
+            meetings: (venue name, race date) pairs
+            client: Rate-limited async HTTP client
+
+        Returns:
+            Race cards (or the exception raised) per meeting, in input order
+
+        Example:
+            >>> async with AsyncScraper() as client:
+            ...     results = await scraper.scrape_meetings_async(
+            ...         [("flemington", "2025-11-14"), ("randwick", "2025-11-14")],
+            ...         client,
+            ...     )
+        """
+
+        async def scrape(venue: str, race_date: date | str) -> list[ScrapedRaceCard]:
+            if isinstance(race_date, str):
+                race_date = date.fromisoformat(race_date)
+            venue_name = venue.lower()
+            date_str = race_date.isoformat()
+
+            response = await client.post(
                 self.GRAPHQL_URL,
                 json={
                     "query": self.RACE_QUERY,
                     "variables": {"venueName": venue_name, "date": date_str},
                 },
-                timeout=15,
+                headers=self.HEADERS,
             )
-            response.raise_for_status()
+            meeting = self._meeting_from_payload(response.json(), venue_name, date_str)
+            return self._parse_meeting(meeting, race_date, venue_name)
 
-            data = response.json()
+        return await asyncio.gather(
+            *(scrape(venue, race_date) for venue, race_date in meetings),
+            return_exceptions=True,
+        )
 
-            # Check for GraphQL errors
-            if "errors" in data:
-                error_msgs = [e.get("message", str(e)) for e in data["errors"]]
-                logger.error(f"GraphQL errors: {', '.join(error_msgs)}")
-                raise ValueError(f"GraphQL query failed: {error_msgs}")
+    async def get_meetings_by_date_async(
+        self, race_date: date | str, client: AsyncScraper
+    ) -> list[dict]:
+        """
+        Get all race meetings for a date through an AsyncScraper.
 
-            # Extract meeting and race data
-            meeting = data.get("data", {}).get("GetMeetingByVenue")
-            if not meeting:
-                raise ValueError(f"No meeting found for {venue_name} on {date_str}")
+        Unlike get_meetings_by_date(), failures are raised rather than
+        returned as an empty list, so callers can tell a failed request from
+        a day without racing.
 
-            # Handle case where API returns a list
-            if isinstance(meeting, list):
-                if not meeting:
-                    raise ValueError(f"No meeting found for {venue_name} on {date_str}")
-                meeting = meeting[
-                    0
-                ]  # Take first meeting (usually the main one, not trials)
+        Args:
+            race_date: Date to query (YYYY-MM-DD or date object)
+            client: Rate-limited async HTTP client
 
-            races = meeting.get("races", [])
-            if not races:
-                raise ValueError(f"No races found at {venue_name} on {date_str}")
+        Returns:
+            List of meeting dictionaries (see get_meetings_by_date)
 
-            # Filter for our specific race number
-            race_data = next(
-                (r for r in races if r.get("raceNumber") == race_number), None
-            )
-            if not race_data:
-                raise ValueError(
-                    f"Race {race_number} not found at {venue_name} on {date_str}"
-                )
+        Raises:
+            ValueError: GraphQL errors in the response
+        """
+        if isinstance(race_date, str):
+            race_date = date.fromisoformat(race_date)
 
-            # Build race ID
-            venue_code = meeting.get("venueCode", venue_name.upper()[:3])
-            race_id = f"{venue_code}-{date_str}-R{race_number}"
+        response = await client.post(
+            self.GRAPHQL_URL,
+            json={
+                "query": self.MEETINGS_QUERY,
+                "variables": {"date": race_date.isoformat()},
+            },
+            headers=self.HEADERS,
+        )
+        data = response.json()
 
-            race = self._parse_race(
-                meeting, race_data, race_id, race_date, race_number, venue_code
-            )
-            horses, jockeys, trainers, runs, gear = self._parse_entries(
-                race_data.get("raceEntries", []), race_id
-            )
+        if "errors" in data:
+            error_msgs = [e.get("message", str(e)) for e in data["errors"]]
+            raise ValueError(f"GraphQL query failed: {error_msgs}")
 
-            # Build race card
-            race_card = ScrapedRaceCard(
-                race=race,
-                runs=runs,
-                horses=horses,
-                jockeys=jockeys,
-                trainers=trainers,
-                gear=gear,
-            )
+        meetings = data.get("data", {}).get("GetMeetingByDate") or []
+        if isinstance(meetings, dict):
+            meetings = [meetings]
+        return meetings
 
-            # Update completeness
-            completeness = race_card.validate_completeness()
-            race.is_complete = completeness >= 80.0
+    def close(self):
+        """Close session."""
+        self.session.close()
 
-            logger.info(
-                f"✅ Scraped {len(race_card.runs)} runners from {race_id} "
-                f"(completeness: {completeness:.1f}%)"
+    def _fetch_meeting(self, venue_name: str, date_str: str) -> dict:
+        """
+        Fetch one meeting (with all races and entries) from the GraphQL API.
+
+        Args:
+            venue_name: Lower-case venue name
+            date_str: Race date (YYYY-MM-DD)
+
+        Returns:
+            Meeting dictionary with a non-empty races list
+        """
+        try:
+            # Execute GraphQL query with rate limiting
+            time.sleep(self.delay)
+
+            response = self.session.post(
+                self.GRAPHQL_URL,
+                json={
+                    "query": self.RACE_QUERY,
+                    "variables": {"venueName": venue_name, "date": date_str},
+                },
+                timeout=15,
             )
+            response.raise_for_status()
 
-            return race_card
+            return self._meeting_from_payload(response.json(), venue_name, date_str)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to query GraphQL API: {e}")
@@ -245,6 +434,120 @@ class RacingComGraphQLScraper:
             logger.error(f"Error parsing GraphQL response: {e}", exc_info=True)
             raise
 
+    def _meeting_from_payload(self, data: dict, venue_name: str, date_str: str) -> dict:
+        """
+        Extract the meeting from a GetMeetingByVenue response body.
+
+        Raises:
+            ValueError: GraphQL errors, or no meeting/races in the response
+        """
+        # Check for GraphQL errors
+        if "errors" in data:
+            error_msgs = [e.get("message", str(e)) for e in data["errors"]]
+            logger.error(f"GraphQL errors: {', '.join(error_msgs)}")
+            raise ValueError(f"GraphQL query failed: {error_msgs}")
+
+        # Extract meeting data
+        meeting = data.get("data", {}).get("GetMeetingByVenue")
+        if not meeting:
+            raise ValueError(f"No meeting found for {venue_name} on {date_str}")
+
+        # Handle case where API returns a list
+        if isinstance(meeting, list):
+            # Take first meeting (usually the main one, not trials)
+            meeting = meeting[0]
+
+        if not meeting.get("races"):
+            raise ValueError(f"No races found at {venue_name} on {date_str}")
+
+        return meeting
+
+    def _parse_meeting(
+        self, meeting: dict, race_date: date, venue_name: str
+    ) -> list[ScrapedRaceCard]:
+        """
+        Build race cards for every race of a fetched meeting.
+
+        Races that fail to parse are logged and skipped.
+
+        Args:
+            meeting: Meeting data from GraphQL
+            race_date: Race date
+            venue_name: Lower-case venue name
+
+        Returns:
+            Race cards ordered by race number
+        """
+        race_cards = []
+        for race_data in sorted(
+            meeting["races"], key=lambda r: self._parse_int(r.get("raceNumber")) or 0
+        ):
+            try:
+                race_cards.append(
+                    self._build_race_card(meeting, race_data, race_date, venue_name)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Skipping R{race_data.get('raceNumber')} at {venue_name} "
+                    f"on {race_date.isoformat()}: {e}"
+                )
+        self._mark_complete(race_cards)
+
+        logger.info(
+            f"✅ Scraped {len(race_cards)}/{len(meeting['races'])} races "
+            f"from {venue_name} {race_date.isoformat()}"
+        )
+        return race_cards
+
+    def _build_race_card(
+        self, meeting: dict, race_data: dict, race_date: date, venue_name: str
+    ) -> ScrapedRaceCard:
+        """
+        Build a race card for one race of a fetched meeting.
+
+        Args:
+            meeting: Meeting data from GraphQL
+            race_data: Race data from GraphQL
+            race_date: Race date
+            venue_name: Lower-case venue name (fallback venue code)
+
+        Returns:
+            ScrapedRaceCard (completeness flag not yet set)
+        """
+        race_number = race_data.get("raceNumber")
+
+        # Build race ID
+        venue_code = meeting.get("venueCode", venue_name.upper()[:3])
+        race_id = f"{venue_code}-{race_date.isoformat()}-R{race_number}"
+
+        race = self._parse_race(
+            meeting, race_data, race_id, race_date, race_number, venue_code
+        )
+        horses, jockeys, trainers, runs, gear = self._parse_entries(
+            race_data.get("raceEntries", []), race_id
+        )
+
+        # Build race card
+        return ScrapedRaceCard(
+            race=race,
+            runs=runs,
+            horses=horses,
+            jockeys=jockeys,
+            trainers=trainers,
+            gear=gear,
+        )
+
+    def _mark_complete(self, race_cards: list[ScrapedRaceCard]) -> None:
+        """Set each race's completeness flag, scoring all cards together."""
+        for race_card, completeness in zip(
+            race_cards, completeness_scores(race_cards)
+        ):
+            race_card.race.is_complete = bool(completeness >= 80.0)
+            logger.info(
+                f"✅ Scraped {len(race_card.runs)} runners from "
+                f"{race_card.race.race_id} (completeness: {completeness:.1f}%)"
+            )
+
     def _parse_race(
         self,
         meeting: dict,
@@ -316,6 +619,9 @@ class RacingComGraphQLScraper:
         """
         Parse race entries into model instances.
 
+        Entries are collected as plain rows and each model type is validated
+        as one batch (see build_models()).
+
         Args:
             entries: List of race entry data from GraphQL
             race_id: Race ID
@@ -349,50 +655,45 @@ class RacingComGraphQLScraper:
             elif sex_str in ["F", "FILLY"]:
                 sex = SexType.FILLY
 
-            horse = ScrapedHorse(
-                name=horse_name,
-                age=self._parse_int(horse_data.get("age")),
-                sex=sex,
-                color=horse_data.get("colour"),
-                sire=horse_data.get("sire"),
-                dam=horse_data.get("dam"),
+            horses.append(
+                {
+                    "name": horse_name,
+                    "age": self._parse_int(horse_data.get("age")),
+                    "sex": sex,
+                    "color": horse_data.get("colour"),
+                    "sire": horse_data.get("sire"),
+                    "dam": horse_data.get("dam"),
+                }
             )
-            horses.append(horse)
 
             # Parse jockey
             jockey_data = entry.get("jockey") or {}
             jockey_name = jockey_data.get("name") or jockey_data.get(
                 "surname", "Unknown"
             )
-
-            jockey = ScrapedJockey(name=jockey_name)
-            jockeys.append(jockey)
+            jockeys.append({"name": jockey_name})
 
             # Parse trainer
             trainer_data = entry.get("trainer") or {}
             trainer_name = trainer_data.get("name") or trainer_data.get(
                 "surname", "Unknown"
             )
-
-            trainer = ScrapedTrainer(name=trainer_name)
-            trainers.append(trainer)
+            trainers.append({"name": trainer_name})
 
             # Parse run
-            barrier = self._parse_int(entry.get("barrierNumber"))
-            weight = self._parse_decimal(entry.get("weight"))
-
-            run = ScrapedRun(
-                race_id=race_id,
-                horse_name=horse_name,
-                jockey_name=jockey_name,
-                trainer_name=trainer_name,
-                barrier=barrier,
-                weight=weight,
-                handicap_rating=self._parse_int(entry.get("handicapRating")),
-                emergency=entry.get("emergency", False),
-                emergency_number=self._parse_int(entry.get("emergencyNumber")),
+            runs.append(
+                {
+                    "race_id": race_id,
+                    "horse_name": horse_name,
+                    "jockey_name": jockey_name,
+                    "trainer_name": trainer_name,
+                    "barrier": self._parse_int(entry.get("barrierNumber")),
+                    "weight": self._parse_decimal(entry.get("weight")),
+                    "handicap_rating": self._parse_int(entry.get("handicapRating")),
+                    "emergency": entry.get("emergency", False),
+                    "emergency_number": self._parse_int(entry.get("emergencyNumber")),
+                }
             )
-            runs.append(run)
 
             # Parse gear
             if entry.get("gearList"):
@@ -406,17 +707,24 @@ class RacingComGraphQLScraper:
                 gear_changes = entry.get("gearChanges", "")
                 has_changes = entry.get("gearHasChanges", False)
 
-                gear = ScrapedGear(
-                    race_id=race_id,
-                    horse_name=horse_name,
-                    gear_type=self._parse_gear_type(gear_str),
-                    gear_description=gear_str,
-                    is_first_time=has_changes,
-                    gear_changes=gear_changes if has_changes else None,
+                gear_list.append(
+                    {
+                        "race_id": race_id,
+                        "horse_name": horse_name,
+                        "gear_type": self._parse_gear_type(gear_str),
+                        "gear_description": gear_str,
+                        "is_first_time": has_changes,
+                        "gear_changes": gear_changes if has_changes else None,
+                    }
                 )
-                gear_list.append(gear)
 
-        return horses, jockeys, trainers, runs, gear_list
+        return (
+            build_models(ScrapedHorse, horses),
+            build_models(ScrapedJockey, jockeys),
+            build_models(ScrapedTrainer, trainers),
+            build_models(ScrapedRun, runs),
+            build_models(ScrapedGear, gear_list),
+        )
 
     def _parse_distance(self, distance_str: str | int | None) -> int | None:
         """Parse distance string/int to meters."""
@@ -493,36 +801,12 @@ class RacingComGraphQLScraper:
 
         date_str = race_date.isoformat()
 
-        query = """
-        query GetMeetings($date: String!) {
-          GetMeetingByDate(date: $date) {
-            id
-            venueName
-            venueCode
-            date
-            track
-            trackCondition
-            railPosition
-            weather
-            state
-            country
-            racesCount
-            races {
-              raceNumber
-              name
-              distance
-              status
-            }
-          }
-        }
-        """
-
         try:
             time.sleep(self.delay)
 
             response = self.session.post(
                 self.GRAPHQL_URL,
-                json={"query": query, "variables": {"date": date_str}},
+                json={"query": self.MEETINGS_QUERY, "variables": {"date": date_str}},
                 timeout=15,
             )
             response.raise_for_status()
@@ -18,11 +18,15 @@ from __future__ import annotations
 
 import logging
 from datetime import date, datetime
+from typing import TYPE_CHECKING
 
 import requests
 
 from src.data.models import ReportType, StewardsReport
 
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,10 +47,17 @@ class StewardsScraper:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
 
-    def __init__(self):
-        """Initialize stewards scraper."""
+    def __init__(self, cache: ResponseCache | None = None):
+        """
+        Initialize stewards scraper.
+
+        Args:
+            cache: HTTP response cache for the session (default: no caching)
+        """
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        if cache is not None:
+            cache.install(self.session)
 
     def scrape_race_reports(
         self, venue: str, race_date: date | str, race_number: int
@@ -12,21 +12,34 @@ Usage:
 
     parser = StewardsReportParser()
     report_data = parser.parse_pdf_report(pdf_path)
+
+    # A season of reports across all cores, text cached by file hash
+    reports = parser.parse_pdf_reports("data/raw/stewards/2024")
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import json
 import logging
+import os
 import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pdfplumber
 import requests
 from PyPDF2 import PdfReader
 
 from src.data.models import ReportType, StewardsReport
+from src.data.scrapers.stewards_text import StewardsTextExtractor
+
+if TYPE_CHECKING:
+    from src.data.scrapers.http_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -56,16 +69,31 @@ class StewardsReportParser:
         "Accept": "application/pdf,text/html,application/xhtml+xml",
     }
 
-    def __init__(self, delay_between_requests: float = 2.0):
+    # Below this pdfplumber confidence, PyPDF2 is tried as well
+    FALLBACK_CONFIDENCE = 0.3
+
+    def __init__(
+        self,
+        delay_between_requests: float = 2.0,
+        cache: ResponseCache | None = None,
+        text_cache_dir: str | Path | None = None,
+    ):
         """
         Initialize stewards report parser.
 
         Args:
             delay_between_requests: Delay between PDF downloads (be polite!)
+            cache: HTTP response cache for PDF downloads (default: no caching)
+            text_cache_dir: Cache extracted text here, keyed by file hash
+                (default: no caching for parse_pdf_report, settings.cache_dir
+                / "stewards_text" for parse_pdf_reports)
         """
         self.delay = delay_between_requests
+        self.text_cache_dir = Path(text_cache_dir) if text_cache_dir else None
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        if cache is not None:
+            cache.install(self.session)
 
     def parse_pdf_report(self, pdf_path: str | Path) -> dict[str, Any]:
         """
@@ -94,6 +122,70 @@ class StewardsReportParser:
             >>> data = parser.parse_pdf_report("flemington_2024-11-05.pdf")
             >>> print(f"Found {len(data['incidents'])} incidents")
         """
+        return self._parse(pdf_path, self.text_cache_dir)
+
+    def parse_pdf_reports(
+        self,
+        pdf_paths: str | Path | Iterable[str | Path],
+        max_workers: int | None = None,
+        text_cache_dir: str | Path | None = None,
+    ) -> dict[Path, dict[str, Any]]:
+        """
+        Parse many stewards report PDFs in a process pool.
+
+        Text extraction is CPU-bound, so each PDF is parsed in a worker
+        process. Extracted text is cached by file hash: re-running after a
+        change to _parse_structured_data skips pdfplumber/PyPDF2 entirely.
+
+        Args:
+            pdf_paths: Directory (all *.pdf files, recursively) or PDF paths
+            max_workers: Worker processes (default: CPU count; 1 parses in
+                this process)
+            text_cache_dir: Extracted-text cache (default: the parser's
+                text_cache_dir, else settings.cache_dir / "stewards_text")
+
+        Returns:
+            Dict mapping each PDF path to its parse_pdf_report() result
+            (failures carry an "error" key)
+        """
+        if isinstance(pdf_paths, (str, Path)) and Path(pdf_paths).is_dir():
+            paths = sorted(Path(pdf_paths).rglob("*.pdf"))
+        elif isinstance(pdf_paths, (str, Path)):
+            paths = [Path(pdf_paths)]
+        else:
+            paths = [Path(p) for p in pdf_paths]
+
+        cache_dir = text_cache_dir or self.text_cache_dir or _default_text_cache_dir()
+        max_workers = min(max_workers or os.cpu_count() or 1, len(paths) or 1)
+
+        logger.info(f"Parsing {len(paths)} stewards reports ({max_workers} workers)")
+
+        if max_workers == 1:
+            results = [self._parse_safely(path, cache_dir) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(
+                    pool.map(
+                        _parse_in_worker,
+                        paths,
+                        [cache_dir] * len(paths),
+                        chunksize=max(1, len(paths) // (max_workers * 4)),
+                    )
+                )
+
+        failed = sum(1 for result in results if "error" in result)
+        logger.info(f"✓ Parsed {len(paths) - failed}/{len(paths)} stewards reports")
+        return dict(zip(paths, results))
+
+    def _parse_safely(self, pdf_path: Path, cache_dir: Path | None) -> dict[str, Any]:
+        """_parse() with a missing file reported as an error result."""
+        try:
+            return self._parse(pdf_path, cache_dir)
+        except FileNotFoundError as e:
+            return {"error": str(e), "confidence": 0.0, "raw_text": ""}
+
+    def _parse(self, pdf_path: str | Path, cache_dir: Path | None) -> dict[str, Any]:
+        """Parse one PDF, using the extracted-text cache when given."""
         pdf_path = Path(pdf_path)
 
         if not pdf_path.exists():
@@ -102,16 +194,7 @@ class StewardsReportParser:
         logger.info(f"Parsing stewards report: {pdf_path.name}")
 
         try:
-            # Primary extraction: pdfplumber (better for complex layouts)
-            extracted_data = self._extract_with_pdfplumber(pdf_path)
-
-            # If primary fails, try PyPDF2 fallback
-            if extracted_data.get("confidence", 0) < 0.3:
-                logger.warning("Low confidence from pdfplumber, trying PyPDF2 fallback")
-                fallback_data = self._extract_with_pypdf2(pdf_path)
-                extracted_data = self._merge_extraction_results(
-                    extracted_data, fallback_data
-                )
+            extracted_data = self._extract_text(pdf_path, cache_dir)
 
             # Parse structured data from raw text
             parsed_data = self._parse_structured_data(extracted_data["raw_text"])
@@ -133,6 +216,44 @@ class StewardsReportParser:
                 "raw_text": "",
             }
 
+    def _extract_text(self, pdf_path: Path, cache_dir: Path | None) -> dict[str, Any]:
+        """
+        Extract raw text, falling back to PyPDF2 only on low confidence.
+
+        Successful extractions are cached under cache_dir by file hash.
+        """
+        cache_path = None
+        if cache_dir is not None:
+            digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+            cache_path = Path(cache_dir) / digest[:2] / f"{digest}.json.gz"
+            try:
+                with gzip.open(cache_path, "rt", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable text cache {cache_path}: {e}")
+
+        # Primary extraction: pdfplumber (better for complex layouts)
+        extracted_data = self._extract_with_pdfplumber(pdf_path)
+
+        # If primary fails, try PyPDF2 fallback
+        if extracted_data.get("confidence", 0) < self.FALLBACK_CONFIDENCE:
+            logger.warning("Low confidence from pdfplumber, trying PyPDF2 fallback")
+            fallback_data = self._extract_with_pypdf2(pdf_path)
+            extracted_data = self._merge_extraction_results(
+                extracted_data, fallback_data
+            )
+
+        if cache_path is not None and "error" not in extracted_data:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(extracted_data, f)
+            os.replace(tmp, cache_path)
+
+        return extracted_data
+
     def _extract_with_pdfplumber(self, pdf_path: Path) -> dict[str, Any]:
         """
         Extract text using pdfplumber (primary method).
@@ -283,135 +404,10 @@ class StewardsReportParser:
         - Track condition
 
         CONFIDENCE: MEDIUM - regex-based extraction is brittle
-        but works well for standardized reports
+        but works well for standardized reports. Each field is read from a
+        single line (see StewardsTextExtractor).
         """
-        parsed = {
-            "venue": None,
-            "date": None,
-            "vet_checks": [],
-            "track_bias": None,
-            "incidents": [],
-            "rail_position": None,
-            "track_condition": None,
-            "weather": None,
-        }
-
-        # Extract venue (CONFIDENCE: HIGH for standard formats)
-        venue_patterns = [
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:Race\s*)?(?:Meeting|Races?)",
-            r"Venue:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
-        ]
-        for pattern in venue_patterns:
-            match = re.search(pattern, text)
-            if match:
-                parsed["venue"] = match.group(1).strip()
-                break
-
-        # Extract date (CONFIDENCE: HIGH for standard formats)
-        date_patterns = [
-            r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})",
-            r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})",
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD
-                        parsed["date"] = date(
-                            int(groups[0]), int(groups[1]), int(groups[2])
-                        )
-                    else:  # DD-MM-YYYY
-                        parsed["date"] = date(
-                            int(groups[2]), int(groups[1]), int(groups[0])
-                        )
-                    break
-                except (ValueError, IndexError):
-                    continue
-
-        # Extract vet checks (CONFIDENCE: MEDIUM - format varies)
-        vet_patterns = [
-            r"(?:vet|veterinary).*?scratched.*?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:was\s+)?scratched.*?vet",
-        ]
-        for pattern in vet_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                horse_name = match.group(1).strip()
-                parsed["vet_checks"].append({
-                    "horse": horse_name,
-                    "reason": "vet check",
-                    "confidence": 0.6,  # Medium confidence for regex extraction
-                })
-
-        # Extract track bias (CONFIDENCE: LOW - subjective language)
-        bias_patterns = [
-            r"track.*?(?:bias|favour(?:ing|ed)).*?([a-z\s]+)",
-            r"(?:inside|outside|leaders|on-pace).*?advantag",
-        ]
-        for pattern in bias_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Extract surrounding context (50 chars)
-                start = max(0, match.start() - 25)
-                end = min(len(text), match.end() + 25)
-                parsed["track_bias"] = text[start:end].strip()
-                break
-
-        # Extract rail position (CONFIDENCE: HIGH for standard formats)
-        rail_patterns = [
-            r"[Rr]ail.*?([+\-]?\d+m|[Tt]rue)",
-            r"[Rr]ail\s+[Pp]osition.*?([+\-]?\d+m|[Tt]rue)",
-        ]
-        for pattern in rail_patterns:
-            match = re.search(pattern, text)
-            if match:
-                parsed["rail_position"] = match.group(1).strip()
-                break
-
-        # Extract track condition (CONFIDENCE: HIGH)
-        condition_patterns = [
-            r"[Tt]rack\s+[Cc]ondition:?\s*([A-Za-z0-9\s]+)",
-            r"going:?\s*([A-Za-z0-9\s]+)",
-        ]
-        for pattern in condition_patterns:
-            match = re.search(pattern, text)
-            if match:
-                condition = match.group(1).strip()
-                # Validate it looks like a track condition
-                if re.match(r"^(Good|Heavy|Soft|Firm).*\d*$", condition, re.IGNORECASE):
-                    parsed["track_condition"] = condition
-                    break
-
-        # Extract incidents (CONFIDENCE: MEDIUM)
-        # Look for race-specific incidents
-        incident_patterns = [
-            r"[Rr]ace\s+(\d+).*?(fell|interference|checked|bumped|protest|inquiry)",
-            r"(fell|interference|checked|bumped).*?[Rr]ace\s+(\d+)",
-        ]
-        for pattern in incident_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                incident_text = text[
-                    max(0, match.start() - 50):min(len(text), match.end() + 100)
-                ].strip()
-                parsed["incidents"].append({
-                    "description": incident_text,
-                    "confidence": 0.5,  # Medium confidence
-                })
-
-        # Extract weather (CONFIDENCE: MEDIUM)
-        weather_patterns = [
-            r"[Ww]eather:?\s*([A-Za-z\s]+)",
-            r"conditions:?\s*([A-Za-z\s]+)",
-        ]
-        for pattern in weather_patterns:
-            match = re.search(pattern, text)
-            if match:
-                weather = match.group(1).strip()
-                if len(weather) < 50:  # Sanity check
-                    parsed["weather"] = weather
-                    break
-
-        return parsed
+        return StewardsTextExtractor(text).extract()
 
     def download_and_parse_report(
         self,
@@ -510,3 +506,22 @@ class StewardsReportParser:
             reports.append(report)
 
         return reports
+
+
+# Parser reused by each worker process of parse_pdf_reports()
+_worker_parser: StewardsReportParser | None = None
+
+
+def _parse_in_worker(pdf_path: Path, cache_dir: Path | None) -> dict[str, Any]:
+    """Process-pool entry point for parse_pdf_reports()."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = StewardsReportParser(delay_between_requests=0)
+    return _worker_parser._parse_safely(pdf_path, cache_dir)
+
+
+def _default_text_cache_dir() -> Path:
+    """Default extracted-text cache inside the cache directory."""
+    from src.utils.config import settings
+
+    return Path(settings.cache_dir) / "stewards_text"
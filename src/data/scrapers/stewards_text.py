@@ -0,0 +1,238 @@
+"""
+Single-pass field extraction for stewards report text.
+
+Stewards reports are line oriented: every field the parser looks for
+(venue, date, rail, track condition, weather, bias, vet scratchings,
+incidents) sits on one line. Rather than running every field pattern over
+the whole document, StewardsTextExtractor indexes the lines that can hold
+each field by keyword (str.find over an ASCII-lowercased copy, far cheaper
+than a case-insensitive regex alternation), then runs the precompiled field
+patterns only over those lines (via pattern.search pos/endpos, so offsets
+stay absolute and no line copies are made).
+
+Field values never span lines: a "Track Condition:" capture stops at the
+end of its line instead of swallowing the next heading.
+
+Usage:
+    from src.data.scrapers.stewards_text import StewardsTextExtractor
+
+    fields = StewardsTextExtractor(raw_text).extract()
+    fields["rail_position"], fields["incidents"]
+"""
+
+from __future__ import annotations
+
+import re
+import string
+from bisect import bisect_right
+from datetime import date
+from typing import Any
+
+# Keywords marking the lines each field family can appear on (any hit is a
+# superset, the field patterns decide)
+TRIGGERS = {
+    "vet": ("scratched",),
+    "bias": ("bias", "favour", "advantag"),
+    "rail": ("rail",),
+    "conditions": ("condition", "going", "weather"),
+    "incident": ("fell", "interference", "checked", "bumped", "protest", "inquiry"),
+    "venue": ("meeting", "race", "venue"),
+}
+
+# Lowercases ASCII only, so offsets in the copy match the original text
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+NEWLINE = re.compile(r"\n")
+
+NAME = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)"
+
+VENUE_PATTERNS = (
+    re.compile(NAME + r"\s+(?:Race\s*)?(?:Meeting|Races?)"),
+    re.compile(r"Venue:\s*" + NAME),
+)
+DATE_PATTERNS = (
+    re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})"),  # DD-MM-YYYY
+    re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})"),  # YYYY-MM-DD
+)
+VET_PATTERNS = (
+    re.compile(r"(?:vet|veterinary).*?scratched.*?" + NAME, re.IGNORECASE),
+    re.compile(NAME + r"\s+(?:was\s+)?scratched.*?vet", re.IGNORECASE),
+)
+BIAS_PATTERNS = (
+    re.compile(r"track.*?(?:bias|favour(?:ing|ed)).*?([a-z\s]+)", re.IGNORECASE),
+    re.compile(r"(?:inside|outside|leaders|on-pace).*?advantag", re.IGNORECASE),
+)
+RAIL_PATTERN = re.compile(r"[Rr]ail.*?([+\-]?\d+m|[Tt]rue)")
+CONDITION_PATTERNS = (
+    re.compile(r"[Tt]rack\s+[Cc]ondition:?\s*([A-Za-z0-9\s]+)"),
+    re.compile(r"going:?\s*([A-Za-z0-9\s]+)"),
+)
+VALID_CONDITION = re.compile(r"^(Good|Heavy|Soft|Firm).*\d*$", re.IGNORECASE)
+INCIDENT_PATTERNS = (
+    re.compile(
+        r"[Rr]ace\s+(\d+).*?(fell|interference|checked|bumped|protest|inquiry)",
+        re.IGNORECASE,
+    ),
+    re.compile(r"(fell|interference|checked|bumped).*?[Rr]ace\s+(\d+)", re.IGNORECASE),
+)
+WEATHER_PATTERNS = (
+    re.compile(r"[Ww]eather:?\s*([A-Za-z\s]+)"),
+    re.compile(r"conditions:?\s*([A-Za-z\s]+)"),
+)
+
+
+class StewardsTextExtractor:
+    """Precompiled, line-oriented extractor for stewards report fields."""
+
+    def __init__(self, text: str):
+        """
+        Index a report's lines (one pass over the text).
+
+        Args:
+            text: Raw report text
+        """
+        self._text = text
+        self._starts = [0] + [m.end() for m in NEWLINE.finditer(text)]
+        self._lines = self._candidate_lines()
+
+    def extract(self) -> dict[str, Any]:
+        """
+        Extract structured fields.
+
+        Returns:
+            Dict with venue, date, vet_checks, track_bias, incidents,
+            rail_position, track_condition and weather
+        """
+        return {
+            "venue": self._first_group(VENUE_PATTERNS, "venue"),
+            "date": self._date(),
+            "vet_checks": self._vet_checks(),
+            "track_bias": self._track_bias(),
+            "incidents": self._incidents(),
+            "rail_position": self._first_group((RAIL_PATTERN,), "rail"),
+            "track_condition": self._track_condition(),
+            "weather": self._weather(),
+        }
+
+    # ------------------------------------------------------------------------
+    # Line index
+    # ------------------------------------------------------------------------
+
+    def _candidate_lines(self) -> dict[str, list[int]]:
+        """Line numbers holding each field family's keywords, in order."""
+        lowered = self._text.translate(ASCII_LOWER)
+        lines = {}
+        for family, keywords in TRIGGERS.items():
+            found = set()
+            for keyword in keywords:
+                pos = lowered.find(keyword)
+                while pos != -1:
+                    line = bisect_right(self._starts, pos) - 1
+                    found.add(line)
+                    # Skip the rest of a line already known to match
+                    pos = lowered.find(keyword, self._span(line)[1])
+            lines[family] = sorted(found)
+        return lines
+
+    def _span(self, line: int) -> tuple[int, int]:
+        """Start and end offsets of a line (excluding its newline)."""
+        start = self._starts[line]
+        if line + 1 < len(self._starts):
+            return start, self._starts[line + 1] - 1
+        return start, len(self._text)
+
+    def _search(self, pattern: re.Pattern, family: str) -> re.Match | None:
+        """First match of a pattern on the family's candidate lines."""
+        for line in self._lines[family]:
+            match = pattern.search(self._text, *self._span(line))
+            if match:
+                return match
+        return None
+
+    def _finditer(self, pattern: re.Pattern, family: str):
+        """Every match of a pattern on the family's candidate lines."""
+        for line in self._lines[family]:
+            yield from pattern.finditer(self._text, *self._span(line))
+
+    def _context(self, match: re.Match, before: int, after: int) -> str:
+        """Text surrounding a match."""
+        start = max(0, match.start() - before)
+        return self._text[start : match.end() + after].strip()
+
+    # ------------------------------------------------------------------------
+    # Fields
+    # ------------------------------------------------------------------------
+
+    def _first_group(self, patterns: tuple[re.Pattern, ...], family: str) -> str | None:
+        """First capture of the first pattern that matches."""
+        for pattern in patterns:
+            match = self._search(pattern, family)
+            if match:
+                return match.group(1).strip()
+        return None
+
+    def _date(self) -> date | None:
+        """Meeting date (CONFIDENCE: HIGH for standard formats)."""
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(self._text)  # digits only, never spans lines
+            if match:
+                groups = match.groups()
+                try:
+                    if len(groups[0]) == 4:  # YYYY-MM-DD
+                        return date(int(groups[0]), int(groups[1]), int(groups[2]))
+                    return date(int(groups[2]), int(groups[1]), int(groups[0]))
+                except ValueError:
+                    continue
+        return None
+
+    def _vet_checks(self) -> list[dict]:
+        """Vet scratchings (CONFIDENCE: MEDIUM - format varies)."""
+        return [
+            {
+                "horse": match.group(1).strip(),
+                "reason": "vet check",
+                "confidence": 0.6,  # Medium confidence for regex extraction
+            }
+            for pattern in VET_PATTERNS
+            for match in self._finditer(pattern, "vet")
+        ]
+
+    def _track_bias(self) -> str | None:
+        """Track bias context (CONFIDENCE: LOW - subjective language)."""
+        for pattern in BIAS_PATTERNS:
+            match = self._search(pattern, "bias")
+            if match:
+                return self._context(match, 25, 25)
+        return None
+
+    def _incidents(self) -> list[dict]:
+        """Race incidents (CONFIDENCE: MEDIUM)."""
+        return [
+            {
+                "description": self._context(match, 50, 100),
+                "confidence": 0.5,  # Medium confidence
+            }
+            for pattern in INCIDENT_PATTERNS
+            for match in self._finditer(pattern, "incident")
+        ]
+
+    def _track_condition(self) -> str | None:
+        """Track condition (CONFIDENCE: HIGH)."""
+        for pattern in CONDITION_PATTERNS:
+            match = self._search(pattern, "conditions")
+            if match:
+                condition = match.group(1).strip()
+                # Validate it looks like a track condition
+                if VALID_CONDITION.match(condition):
+                    return condition
+        return None
+
+    def _weather(self) -> str | None:
+        """Weather (CONFIDENCE: MEDIUM)."""
+        for pattern in WEATHER_PATTERNS:
+            match = self._search(pattern, "conditions")
+            if match:
+                weather = match.group(1).strip()
+                if len(weather) < 50:  # Sanity check
+                    return weather
+        return None
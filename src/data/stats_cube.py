@@ -0,0 +1,503 @@
+"""
+Daily jockey/trainer aggregate cube with prefix sums.
+
+JockeyStatsBuilder rescans runs ⋈ results ⋈ races for every distinct
+lookback window (the 14-day recent form included). This module maintains
+person_daily_stats instead (see schema.sql): one row per person, venue,
+distance range and race date with rides, wins, places and competitive
+counts, plus running totals of each. The counts for any window
+[start, end] are then
+
+    prefix(end) - prefix(start - 1 day)
+
+where prefix(d) is the running total on the last row dated <= d, so a
+window costs two prefix rows per (venue, distance range) cell regardless
+of its length.
+
+Refreshes are incremental at race-day granularity: after a race lands its
+date is recounted and running totals are recomputed for the people who
+rode or trained on that date.
+
+Usage:
+    from src.data.stats_cube import StatsCube
+
+    cube = StatsCube()
+    cube.refresh()                         # full rebuild
+    cube.refresh(["FLE-2025-11-12-R1"])    # race days of these races
+
+    etl = RacingETL(post_ingest_hooks=[cube.update_race])
+
+    # JockeyStatsBuilder bulk stats read the cube instead of raw results
+    with JockeyStatsBuilder(db_path, cube=cube) as builder:
+        stats = builder.calculate_jockey_stats_bulk(lookback_days=90)
+
+    # In-memory prefix arrays for many arbitrary windows
+    index = cube.prefix_index("jockey")
+    rides, wins, places, _, _ = index.counts("J1", start, end)
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.data.scrapers.jockey_stats import (
+    DISTANCE_RANGE_SQL,
+    MIN_BREAKDOWN_RIDES,
+    RECENT_FORM_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+PERSON_ROLES = ("jockey", "trainer")
+
+# Counted columns, in the order of JockeyStatsBuilder's grouped counts
+MEASURES = ("rides", "wins", "places", "competitive_rides", "competitive_wins")
+
+# One row per (person_role, person_id, run) for declared runners
+RIDES_CTE = """
+    rides AS (
+        SELECT 'jockey' AS person_role, r.jockey_id AS person_id,
+               r.run_id, r.race_id
+        FROM runs r
+        WHERE r.jockey_id IS NOT NULL AND r.scratched = FALSE
+        UNION ALL
+        SELECT 'trainer', r.trainer_id, r.run_id, r.race_id
+        FROM runs r
+        WHERE r.trainer_id IS NOT NULL AND r.scratched = FALSE
+    )
+"""
+
+
+class StatsCube:
+    """
+    Builds, refreshes and queries the person_daily_stats cube.
+
+    All writes go through the shared read-write connection manager in a
+    single transaction per refresh.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """
+        Initialize cube.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Read-write connection manager (default: process-wide)
+        """
+        self.db_path = db_path
+        self._connections = connections
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared read-write connection manager."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path, read_only=False)
+        return self._connections
+
+    # ------------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------------
+
+    def refresh(self, race_ids: list[str] | None = None) -> int:
+        """
+        Recount daily rows and recompute running totals.
+
+        Args:
+            race_ids: Only recount the race days of these races
+                (default: rebuild everything)
+
+        Returns:
+            Number of people whose running totals were recomputed
+        """
+        with self.connections.write_transaction() as con:
+            con.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS _cube_targets "
+                "(person_role VARCHAR, person_id VARCHAR)"
+            )
+            con.execute("DELETE FROM _cube_targets")
+
+            if race_ids is None:
+                con.execute("DELETE FROM person_daily_stats")
+                date_filter, params = "", []
+            else:
+                date_filter = (
+                    "AND race.date IN (SELECT date FROM races "
+                    "WHERE race_id IN (SELECT UNNEST(?)))"
+                )
+                params = [list(race_ids)]
+
+                # People who drop off a recounted day need new totals too
+                con.execute(
+                    """
+                    INSERT INTO _cube_targets
+                    SELECT DISTINCT person_role, person_id
+                    FROM person_daily_stats
+                    WHERE date IN (
+                        SELECT date FROM races WHERE race_id IN (SELECT UNNEST(?))
+                    )
+                    """,
+                    params,
+                )
+                con.execute(
+                    """
+                    DELETE FROM person_daily_stats
+                    WHERE date IN (
+                        SELECT date FROM races WHERE race_id IN (SELECT UNNEST(?))
+                    )
+                    """,
+                    params,
+                )
+
+            con.execute(
+                f"""
+                INSERT INTO person_daily_stats (
+                    person_role, person_id, venue, distance_range, date,
+                    {", ".join(MEASURES)}
+                )
+                WITH {RIDES_CTE}
+                SELECT
+                    p.person_role,
+                    p.person_id,
+                    race.venue,
+                    {DISTANCE_RANGE_SQL},
+                    race.date,
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE res.finish_position = 1),
+                    COUNT(*) FILTER (WHERE res.finish_position <= 3),
+                    COUNT(*) FILTER (
+                        WHERE res.finish_position <= race.field_size / 2.0
+                    ),
+                    COUNT(*) FILTER (
+                        WHERE res.finish_position <= race.field_size / 2.0
+                          AND res.finish_position = 1
+                    )
+                FROM rides p
+                JOIN results res ON res.run_id = p.run_id
+                JOIN races race ON race.race_id = p.race_id
+                WHERE TRUE {date_filter}
+                GROUP BY ALL
+                """,
+                params,
+            )
+
+            if race_ids is None:
+                con.execute(
+                    """
+                    INSERT INTO _cube_targets
+                    SELECT DISTINCT person_role, person_id FROM person_daily_stats
+                    """
+                )
+            else:
+                con.execute(
+                    """
+                    INSERT INTO _cube_targets
+                    SELECT DISTINCT person_role, person_id
+                    FROM person_daily_stats
+                    WHERE date IN (
+                        SELECT date FROM races WHERE race_id IN (SELECT UNNEST(?))
+                    )
+                    """,
+                    params,
+                )
+
+            running_totals = ", ".join(
+                f"SUM(d.{m}) OVER cell AS cum_{m}" for m in MEASURES
+            )
+            con.execute(
+                f"""
+                UPDATE person_daily_stats AS s
+                SET {", ".join(f"cum_{m} = c.cum_{m}" for m in MEASURES)}
+                FROM (
+                    SELECT
+                        d.person_role, d.person_id, d.venue, d.distance_range,
+                        d.date,
+                        {running_totals}
+                    FROM person_daily_stats d
+                    WHERE EXISTS (
+                        SELECT 1 FROM _cube_targets t
+                        WHERE t.person_role = d.person_role
+                          AND t.person_id = d.person_id
+                    )
+                    WINDOW cell AS (
+                        PARTITION BY d.person_role, d.person_id, d.venue,
+                                     d.distance_range
+                        ORDER BY d.date
+                    )
+                ) c
+                WHERE s.person_role = c.person_role
+                  AND s.person_id = c.person_id
+                  AND s.venue = c.venue
+                  AND s.distance_range = c.distance_range
+                  AND s.date = c.date
+                """
+            )
+
+            refreshed = con.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT * FROM _cube_targets)"
+            ).fetchone()[0]
+
+        logger.info(f"✓ Refreshed stats cube running totals for {refreshed} people")
+        return refreshed
+
+    def update_race(self, race_id: str) -> int:
+        """Recount one race's day (post-ingest hook)."""
+        return self.refresh([race_id])
+
+    # ------------------------------------------------------------------------
+    # Window queries
+    # ------------------------------------------------------------------------
+
+    def window_counts(
+        self,
+        role: str,
+        person_ids: list[str] | None,
+        start_date: date,
+        end_date: date,
+        min_venue_rides: int = MIN_BREAKDOWN_RIDES,
+    ) -> tuple[dict[str, tuple[int, ...]], dict[str, dict], dict[str, dict]]:
+        """
+        Window counts per person from prefix-row differences.
+
+        Matches JockeyStatsBuilder's grouped queries: the period is
+        [start_date, end_date] and recent form is the RECENT_FORM_DAYS
+        before end_date (inclusive), which may reach back past start_date.
+
+        Args:
+            role: "jockey" or "trainer"
+            person_ids: People to include (default: everyone with a ride in
+                the period or recent-form window)
+            start_date: First date of the period (inclusive)
+            end_date: Last date of the period (inclusive)
+            min_venue_rides: Minimum rides for a venue breakdown entry
+
+        Returns:
+            (overall, venues, distances): overall maps person_id to (rides,
+            wins, places, competitive_rides, competitive_wins, recent_rides,
+            recent_wins); venues and distances map person_id to
+            {group: {rides, wins, win_rate}}
+        """
+        if role not in PERSON_ROLES:
+            raise ValueError(f"role must be one of {PERSON_ROLES}, got {role}")
+        if person_ids is not None and not person_ids:
+            return {}, {}, {}
+
+        recent_start = end_date - timedelta(days=RECENT_FORM_DAYS)
+
+        def window(column: str, first: str) -> str:
+            return (
+                f"COALESCE(arg_max(s.cum_{column}, s.date) "
+                f"FILTER (WHERE s.date <= b.period_end), 0) - "
+                f"COALESCE(arg_max(s.cum_{column}, s.date) "
+                f"FILTER (WHERE s.date < b.{first}), 0)"
+            )
+
+        columns = [window(m, "period_start") for m in MEASURES]
+        columns += [window(m, "recent_start") for m in ("rides", "wins")]
+
+        if person_ids is None:
+            person_filter, person_params = "TRUE", []
+        else:
+            person_filter = "s.person_id IN (SELECT UNNEST(?))"
+            person_params = [list(person_ids)]
+
+        query = f"""
+            WITH b AS (
+                SELECT ?::DATE AS period_start, ?::DATE AS period_end,
+                       ?::DATE AS recent_start
+            )
+            SELECT s.person_id, s.venue, s.distance_range, {", ".join(columns)}
+            FROM person_daily_stats s, b
+            WHERE s.person_role = ?
+              AND {person_filter}
+              AND s.date <= b.period_end
+            GROUP BY s.person_id, s.venue, s.distance_range
+            HAVING MAX(s.date) >= ?
+        """
+        rows = (
+            self.connections.cursor()
+            .execute(
+                query,
+                [
+                    start_date,
+                    end_date,
+                    recent_start,
+                    role,
+                    *person_params,
+                    min(start_date, recent_start),
+                ],
+            )
+            .fetchall()
+        )
+
+        overall: dict[str, list[int]] = {}
+        venues: dict[str, dict[str, list[int]]] = defaultdict(dict)
+        distances: dict[str, dict[str, list[int]]] = defaultdict(dict)
+        for person_id, venue, distance_range, *counts in rows:
+            totals = overall.setdefault(person_id, [0] * len(counts))
+            for i, count in enumerate(counts):
+                totals[i] += int(count)
+
+            rides, wins = int(counts[0]), int(counts[1])
+            if rides:
+                for groups, key in (
+                    (venues[person_id], venue),
+                    (distances[person_id], distance_range),
+                ):
+                    group = groups.setdefault(key, [0, 0])
+                    group[0] += rides
+                    group[1] += wins
+
+        return (
+            {person_id: tuple(counts) for person_id, counts in overall.items()},
+            _breakdowns(venues, min_venue_rides),
+            _breakdowns(distances, 1),
+        )
+
+    def prefix_index(
+        self, role: str, person_ids: list[str] | None = None
+    ) -> PrefixIndex:
+        """
+        Load per-person daily running totals into memory.
+
+        Args:
+            role: "jockey" or "trainer"
+            person_ids: People to load (default: everyone)
+
+        Returns:
+            PrefixIndex answering arbitrary windows without further queries
+        """
+        if role not in PERSON_ROLES:
+            raise ValueError(f"role must be one of {PERSON_ROLES}, got {role}")
+
+        if person_ids is None:
+            person_filter, person_params = "TRUE", []
+        else:
+            person_filter = "person_id IN (SELECT UNNEST(?))"
+            person_params = [list(person_ids)]
+
+        rows = (
+            self.connections.cursor()
+            .execute(
+                f"""
+                SELECT person_id, date, {", ".join(f"SUM({m})" for m in MEASURES)}
+                FROM person_daily_stats
+                WHERE person_role = ? AND {person_filter}
+                GROUP BY person_id, date
+                ORDER BY person_id, date
+                """,
+                [role, *person_params],
+            )
+            .fetchall()
+        )
+
+        days: dict[str, list[date]] = defaultdict(list)
+        counts: dict[str, list[tuple]] = defaultdict(list)
+        for person_id, day, *measures in rows:
+            days[person_id].append(day)
+            counts[person_id].append(measures)
+
+        index = PrefixIndex(role)
+        for person_id, person_days in days.items():
+            index.add(
+                person_id, person_days, np.array(counts[person_id], dtype=np.int64)
+            )
+
+        logger.info(f"✓ Loaded {role} prefix index for {len(days)} people")
+        return index
+
+
+class PrefixIndex:
+    """
+    In-memory per-person running totals for O(log n) window counts.
+
+    Each person keeps their sorted race dates and a cumulative count matrix
+    with a leading zero row, so a window is two binary searches and one
+    row difference.
+    """
+
+    def __init__(self, role: str):
+        """
+        Initialize empty index.
+
+        Args:
+            role: "jockey" or "trainer"
+        """
+        self.role = role
+        self._days: dict[str, list[date]] = {}
+        self._totals: dict[str, np.ndarray] = {}
+
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._days
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def add(self, person_id: str, days: list[date], counts: np.ndarray) -> None:
+        """
+        Add one person's daily counts.
+
+        Args:
+            person_id: Jockey or trainer identifier
+            days: Race dates in ascending order
+            counts: Array of shape (len(days), len(MEASURES))
+        """
+        totals = np.zeros((len(days) + 1, len(MEASURES)), dtype=np.int64)
+        np.cumsum(counts, axis=0, out=totals[1:])
+        self._days[person_id] = list(days)
+        self._totals[person_id] = totals
+
+    def counts(
+        self, person_id: str, start_date: date, end_date: date
+    ) -> tuple[int, ...]:
+        """
+        Counts over [start_date, end_date] (inclusive).
+
+        Returns:
+            (rides, wins, places, competitive_rides, competitive_wins),
+            all zero for unknown people
+        """
+        days = self._days.get(person_id)
+        if days is None:
+            return (0,) * len(MEASURES)
+
+        totals = self._totals[person_id]
+        window = totals[bisect_right(days, end_date)] - totals[
+            bisect_left(days, start_date)
+        ]
+        return tuple(int(count) for count in window)
+
+    def lookback(
+        self, person_id: str, stat_date: date, lookback_days: int
+    ) -> tuple[int, ...]:
+        """Counts over the lookback_days before stat_date (JockeyStat window)."""
+        return self.counts(
+            person_id, stat_date - timedelta(days=lookback_days), stat_date
+        )
+
+
+def _breakdowns(
+    groups: dict[str, dict[str, list[int]]], min_rides: int
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """{person: {group: [rides, wins]}} -> JockeyStatsBuilder breakdown dicts."""
+    breakdowns: dict[str, dict[str, dict[str, Any]]] = {}
+    for person_id, person_groups in groups.items():
+        for group, (rides, wins) in person_groups.items():
+            if rides >= min_rides:
+                breakdowns.setdefault(person_id, {})[group] = {
+                    "rides": rides,
+                    "wins": wins,
+                    "win_rate": wins / rides if rides > 0 else 0.0,
+                }
+    return breakdowns
@@ -16,6 +16,7 @@ from prometheus_client import generate_latest
 from pydantic import BaseModel, Field
 
 from src.deployment.model_registry import ModelRegistry
+from src.features.store import FeatureStore
 from src.monitoring.alerting import AlertManager
 from src.monitoring.performance_tracker import PerformanceTracker
 
@@ -24,8 +25,13 @@ from src.monitoring.performance_tracker import PerformanceTracker
 class PredictionRequest(BaseModel):
     """Request model for predictions."""
 
-    features: list[float] = Field(..., description="Feature vector for prediction")
+    features: list[float] | None = Field(
+        None, description="Feature vector for prediction"
+    )
     race_id: str | None = Field(None, description="Race identifier")
+    run_id: str | None = Field(
+        None, description="Run identifier (loads features from the feature store)"
+    )
 
 
 class PredictionResponse(BaseModel):
@@ -63,6 +69,7 @@ model_metadata = None
 model_registry = None
 performance_tracker = None
 alert_manager = None
+feature_store = None
 start_time = time.time()
 
 
@@ -71,10 +78,12 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     # Startup
     global model, model_metadata, model_registry, performance_tracker, alert_manager
+    global feature_store
 
     model_registry = ModelRegistry()
     performance_tracker = PerformanceTracker()
     alert_manager = AlertManager()
+    feature_store = FeatureStore()
 
     try:
         model, model_metadata = model_registry.get_active_model()
@@ -130,7 +139,8 @@ async def predict(request: PredictionRequest):
     Make a prediction.
 
     Args:
-        request: Prediction request with features
+        request: Prediction request with features (or a run_id whose
+            precomputed features are read from the feature store)
 
     Returns:
         Prediction response with probability and metadata
@@ -138,8 +148,23 @@ async def predict(request: PredictionRequest):
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
+    if request.features is not None:
+        vector = request.features
+    elif request.run_id is not None:
+        vector = None
+        if feature_store is not None:
+            vector = feature_store.get_feature_vector(request.run_id)
+        if vector is None:
+            raise HTTPException(
+                status_code=404, detail=f"No stored features for run {request.run_id}"
+            )
+    else:
+        raise HTTPException(
+            status_code=422, detail="Either features or run_id is required"
+        )
+
     # Convert features to numpy array
-    features = np.array(request.features).reshape(1, -1)
+    features = np.array(vector).reshape(1, -1)
 
     # Time prediction
     start = time.time()
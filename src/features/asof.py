@@ -0,0 +1,487 @@
+"""
+Point-in-time (as-of) feature builder for training sets.
+
+FeatureStore computes each race's features with per-field history queries,
+which is right for upcoming races but means one set of queries per
+historical race when building a training set. This builder instead walks
+every run in date order once, keeping rolling per-horse, per-jockey and
+per-trainer state, and emits for each runner the features it had *before*
+its race:
+
+- Race day D only sees results from days before D (same-day races never
+  leak into each other), matching FormHistoryLoader(before=race_date)
+- Jockey/trainer rates cover the lookback window ending the day before D
+  (wins / rides with a result, recent = last 14 days)
+- Speed, class and sectional form reuse the engine formulas
+  (SpeedRatingsEngine.calculate_ratings_bulk,
+  ClassRatingsEngine.calculate_class_scores_bulk,
+  SectionalAnalyzer.analyze_sectionals_bulk and _summarize_profiles)
+
+Pedigree features are left empty by default: the progeny aggregates are
+current totals, not point-in-time, so pedigree=True leaks later results
+into earlier rows.
+
+Rows are streamed from DuckDB in Arrow batches and written to a single
+Parquet file (FEATURE_SCHEMA) one row group per batch, so memory stays flat
+however many runs are processed.
+
+Usage:
+    from src.features.asof import AsOfFeatureBuilder
+
+    builder = AsOfFeatureBuilder()
+    builder.build("data/training/features.parquet", start_date=date(2018, 1, 1))
+
+    racing build-training-set data/training/features.parquet --start 2018-01-01
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.features.class_ratings import ClassRatingsEngine
+from src.features.pedigree_analyzer import PedigreeAnalyzer
+from src.features.sectional_analyzer import SectionalAnalyzer, SectionalProfile
+from src.features.speed_ratings import SpeedRatingsEngine
+from src.features.store import FEATURE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+
+# Recent-form window used by JockeyStatsBuilder
+RECENT_DAYS = 14
+
+
+class RollingRate:
+    """
+    Win rate over a trailing window of days, updated one race day at a time.
+
+    Stores one (date, rides, wins) entry per day so eviction is cheap.
+    """
+
+    __slots__ = ("window_days", "days", "rides", "wins")
+
+    def __init__(self, window_days: int):
+        """
+        Initialize rolling rate.
+
+        Args:
+            window_days: Days before the as-of date included in the rate
+        """
+        self.window_days = window_days
+        self.days: deque[tuple[date, int, int]] = deque()
+        self.rides = 0
+        self.wins = 0
+
+    def add(self, day: date, rides: int, wins: int) -> None:
+        """Record a day's rides and wins (days must be added in order)."""
+        self.days.append((day, rides, wins))
+        self.rides += rides
+        self.wins += wins
+
+    def rate(self, as_of: date) -> float:
+        """Wins / rides for days in [as_of - window_days, as_of] (0 if none)."""
+        cutoff = as_of - timedelta(days=self.window_days)
+        while self.days and self.days[0][0] < cutoff:
+            _, rides, wins = self.days.popleft()
+            self.rides -= rides
+            self.wins -= wins
+        return self.wins / self.rides if self.rides else 0.0
+
+
+class HorseForm:
+    """A horse's last N rated starts, timed starts and sectional profiles."""
+
+    __slots__ = ("speed", "klass", "sectionals")
+
+    def __init__(self, last_n_starts: int):
+        """Initialize empty form with N-start windows."""
+        self.speed: deque[int] = deque(maxlen=last_n_starts)
+        self.klass: deque[int] = deque(maxlen=last_n_starts)
+        self.sectionals: deque[SectionalProfile] = deque(maxlen=last_n_starts)
+
+
+class AsOfFeatureBuilder:
+    """
+    Build leakage-free historical feature rows in one chronological pass.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        last_n_starts: int = 5,
+        stats_lookback_days: int = 365,
+        pedigree: bool = False,
+        batch_size: int = 100_000,
+    ):
+        """
+        Initialize builder.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Shared connection manager (default: process-wide manager)
+            last_n_starts: Starts used for form averages
+            stats_lookback_days: Lookback for jockey/trainer win rates
+            pedigree: Fill pedigree features from the current progeny
+                aggregates (not point-in-time: includes later results)
+            batch_size: Runs fetched from DuckDB per Arrow batch
+        """
+        self.db_path = db_path
+        self._connections = connections
+        self.last_n_starts = last_n_starts
+        self.stats_lookback_days = stats_lookback_days
+        self.pedigree = pedigree
+        self.batch_size = batch_size
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    def build(
+        self,
+        output_path: str | Path,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> int:
+        """
+        Write as-of features for every declared runner to a Parquet file.
+
+        History before start_date is still replayed to warm up the state.
+
+        Args:
+            output_path: Parquet file to write
+            start_date: First race date to emit (inclusive, default: all)
+            end_date: Last race date to emit (inclusive, default: all)
+
+        Returns:
+            Number of feature rows written
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_suffix(".parquet.tmp")
+
+        total = 0
+        with pq.ParquetWriter(tmp_path, FEATURE_SCHEMA, compression="zstd") as writer:
+            for rows in self.iter_batches(start_date, end_date):
+                writer.write_table(pa.Table.from_pylist(rows, schema=FEATURE_SCHEMA))
+                total += len(rows)
+                logger.debug(f"Wrote {total} as-of feature rows")
+        tmp_path.replace(output_path)
+
+        logger.info(f"✓ Wrote {total} as-of feature rows to {output_path}")
+        return total
+
+    def iter_batches(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Yield feature rows (FEATURE_SCHEMA dicts) in date order, per batch.
+
+        Args:
+            start_date: First race date to emit (inclusive)
+            end_date: Last race date to emit (inclusive)
+        """
+        speed_engine = SpeedRatingsEngine(self.db_path, connections=self.connections)
+        class_engine = ClassRatingsEngine(self.db_path, connections=self.connections)
+        sectional_analyzer = SectionalAnalyzer(
+            self.db_path, connections=self.connections
+        )
+        pedigree_analyzer = (
+            PedigreeAnalyzer(self.db_path, connections=self.connections)
+            if self.pedigree
+            else None
+        )
+
+        horses: dict[str, HorseForm] = defaultdict(
+            lambda: HorseForm(self.last_n_starts)
+        )
+        jockeys: dict[str, tuple[RollingRate, RollingRate]] = defaultdict(
+            self._new_rates
+        )
+        trainers: dict[str, tuple[RollingRate, RollingRate]] = defaultdict(
+            self._new_rates
+        )
+        pedigree_cache: dict[tuple, tuple[float, float, float]] = {}
+        computed_at = datetime.now()
+
+        for chunk in self._iter_days(end_date):
+            chunk = self._rate_chunk(chunk, speed_engine, class_engine)
+            profiles = self._profile_chunk(chunk, sectional_analyzer)
+            class_engine.clear_cache()
+
+            rows = []
+            for race_date, day in chunk.groupby("date", sort=False):
+                if start_date is None or race_date >= start_date:
+                    as_of = race_date - timedelta(days=1)
+                    for run in day[~day["scratched"]].itertuples(index=False):
+                        rows.append(
+                            self._feature_row(
+                                run,
+                                horses.get(run.horse_id),
+                                jockeys[run.jockey_id] if run.jockey_id else None,
+                                trainers[run.trainer_id] if run.trainer_id else None,
+                                as_of,
+                                sectional_analyzer,
+                                pedigree_analyzer,
+                                pedigree_cache,
+                                computed_at,
+                            )
+                        )
+
+                self._update_state(day, profiles, horses, jockeys, trainers)
+
+            if rows:
+                yield rows
+
+    # ------------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------------
+
+    def _iter_days(self, end_date: date | None) -> Iterator[pd.DataFrame]:
+        """Yield runs in date order, never splitting a race day across chunks."""
+        date_filter = "WHERE r.date <= ?" if end_date is not None else ""
+        reader = (
+            self.connections.cursor()
+            .execute(
+                f"""
+                SELECT
+                    run.run_id,
+                    run.race_id,
+                    run.horse_id,
+                    run.jockey_id,
+                    run.trainer_id,
+                    run.barrier,
+                    run.weight_carried,
+                    COALESCE(run.scratched, FALSE) AS scratched,
+                    r.date,
+                    r.distance,
+                    r.track_type,
+                    r.track_condition,
+                    r.class_level,
+                    r.prize_money,
+                    h.sire,
+                    h.dam,
+                    h.dam_sire,
+                    res.finish_position,
+                    res.race_time,
+                    res.sectional_600m,
+                    res.sectional_400m,
+                    res.sectional_200m,
+                    res.speed_rating,
+                    res.class_rating
+                FROM runs run
+                JOIN races r ON r.race_id = run.race_id
+                LEFT JOIN horses h ON h.horse_id = run.horse_id
+                LEFT JOIN results res ON res.run_id = run.run_id
+                {date_filter}
+                ORDER BY r.date, run.race_id, run.barrier
+                """,
+                [end_date] if end_date is not None else [],
+            )
+            .to_arrow_reader(self.batch_size)
+        )
+
+        pending: pd.DataFrame | None = None
+        for batch in reader:
+            frame = batch.to_pandas()
+            if pending is not None:
+                frame = pd.concat([pending, frame], ignore_index=True)
+            if frame.empty:
+                continue
+
+            # The last day may continue in the next batch
+            last_day = frame["date"] == frame["date"].iloc[-1]
+            pending = frame[last_day]
+            if not last_day.all():
+                yield frame[~last_day].reset_index(drop=True)
+
+        if pending is not None and not pending.empty:
+            yield pending.reset_index(drop=True)
+
+    def _rate_chunk(
+        self,
+        chunk: pd.DataFrame,
+        speed_engine: SpeedRatingsEngine,
+        class_engine: ClassRatingsEngine,
+    ) -> pd.DataFrame:
+        """Add speed/class rating columns for runs with results."""
+        # Speed: stored rating where present, otherwise one bulk pass
+        timed = chunk["race_time"].notna().to_numpy()
+        speed = chunk["speed_rating"].to_numpy(
+            dtype=np.float64, na_value=np.nan, copy=True
+        )
+        speed[~timed] = np.nan
+        missing = timed & np.isnan(speed)
+        if missing.any():
+            speed[missing] = speed_engine.calculate_ratings_bulk(chunk[missing])[
+                "final_rating"
+            ].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Class: stored rating where present, otherwise the engine's scoring
+        klass = chunk["class_rating"].to_numpy(
+            dtype=np.float64, na_value=np.nan, copy=True
+        )
+        missing = chunk["finish_position"].notna().to_numpy() & np.isnan(klass)
+        if missing.any():
+            klass[missing] = class_engine.calculate_class_scores_bulk(chunk[missing])
+
+        return chunk.assign(speed_value=speed, class_value=klass)
+
+    def _profile_chunk(
+        self, chunk: pd.DataFrame, sectional_analyzer: SectionalAnalyzer
+    ) -> dict[int, SectionalProfile]:
+        """Sectional profiles (no field percentiles) for runs with an L200 split."""
+        recorded = chunk[chunk["sectional_200m"].notna()]
+        if recorded.empty:
+            return {}
+
+        bulk = sectional_analyzer.analyze_sectionals_bulk(recorded)
+        return {
+            index: SectionalProfile(
+                horse_id=row.horse_id,
+                race_id=row.race_id,
+                distance=int(row.distance),
+                L600_time=_optional(row.L600_time),
+                L400_time=_optional(row.L400_time),
+                L200_time=_optional(row.L200_time),
+                L600_speed=_optional(row.L600_speed),
+                L400_speed=_optional(row.L400_speed),
+                L200_speed=_optional(row.L200_speed),
+                finish_speed_rating=int(row.finish_speed_rating),
+                pace_profile=row.pace_profile,
+                sectional_balance=float(row.sectional_balance),
+                L600_percentile=None,
+                L400_percentile=None,
+                L200_percentile=None,
+            )
+            for index, row in zip(bulk.index, bulk.itertuples(index=False))
+        }
+
+    # ------------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------------
+
+    def _new_rates(self) -> tuple[RollingRate, RollingRate]:
+        """(lookback, recent) rolling win rates for a jockey or trainer."""
+        return RollingRate(self.stats_lookback_days), RollingRate(RECENT_DAYS)
+
+    def _update_state(
+        self,
+        day: pd.DataFrame,
+        profiles: dict[int, SectionalProfile],
+        horses: dict[str, HorseForm],
+        jockeys: dict[str, tuple[RollingRate, RollingRate]],
+        trainers: dict[str, tuple[RollingRate, RollingRate]],
+    ) -> None:
+        """Fold one race day's results into the rolling state."""
+        finished = day[day["finish_position"].notna() & ~day["scratched"]]
+        if finished.empty:
+            return
+
+        race_date = finished["date"].iloc[0]
+
+        for index, run in zip(finished.index, finished.itertuples(index=False)):
+            form = horses[run.horse_id]
+            if not np.isnan(run.speed_value):
+                form.speed.append(int(run.speed_value))
+            form.klass.append(int(run.class_value))
+            if index in profiles:
+                form.sectionals.append(profiles[index])
+
+        won = finished["finish_position"] == 1
+        for column, rates in (("jockey_id", jockeys), ("trainer_id", trainers)):
+            counts = won.groupby(finished[column]).agg(["size", "sum"])
+            for entity_id, (rides, wins) in counts.iterrows():
+                for rate in rates[entity_id]:
+                    rate.add(race_date, int(rides), int(wins))
+
+    def _feature_row(
+        self,
+        run: Any,
+        form: HorseForm | None,
+        jockey: tuple[RollingRate, RollingRate] | None,
+        trainer: tuple[RollingRate, RollingRate] | None,
+        as_of: date,
+        sectional_analyzer: SectionalAnalyzer,
+        pedigree_analyzer: PedigreeAnalyzer | None,
+        pedigree_cache: dict[tuple, tuple[float, float, float]],
+        computed_at: datetime,
+    ) -> dict[str, Any]:
+        """Feature row for one runner from the state before its race day."""
+        speed = list(form.speed) if form else []
+        klass = list(form.klass) if form else []
+        sectional = sectional_analyzer._summarize_profiles(
+            list(form.sectionals) if form else []
+        )
+
+        pedigree = (None, None, None)
+        if pedigree_analyzer is not None:
+            surface = run.track_type or "turf"
+            key = (run.sire, run.dam, run.dam_sire, run.distance, surface)
+            if key not in pedigree_cache:
+                rating = pedigree_analyzer.rate_pedigree(
+                    run.horse_id,
+                    run.sire,
+                    run.dam,
+                    run.dam_sire,
+                    int(run.distance),
+                    surface,
+                )
+                pedigree_cache[key] = (
+                    float(rating.overall_pedigree_score),
+                    rating.distance_suitability,
+                    rating.surface_suitability,
+                )
+            pedigree = pedigree_cache[key]
+
+        return {
+            "run_id": run.run_id,
+            "race_id": run.race_id,
+            "horse_id": run.horse_id,
+            "jockey_id": run.jockey_id,
+            "trainer_id": run.trainer_id,
+            "distance": int(run.distance),
+            "barrier": _optional_int(run.barrier),
+            "weight_carried": _optional(run.weight_carried),
+            "speed_avg": float(statistics.mean(speed)) if speed else None,
+            "speed_best": float(max(speed)) if speed else None,
+            "speed_starts": len(speed),
+            "class_avg": float(statistics.mean(klass)) if klass else None,
+            "class_best": float(max(klass)) if klass else None,
+            "sectional_style": sectional["dominant_style"],
+            "finish_speed_avg": float(sectional["avg_finish_speed"]),
+            "sectional_balance_avg": float(sectional["avg_sectional_balance"]),
+            "pedigree_score": pedigree[0],
+            "distance_suitability": pedigree[1],
+            "surface_suitability": pedigree[2],
+            "jockey_win_rate": jockey[0].rate(as_of) if jockey else None,
+            "jockey_recent_win_rate": jockey[1].rate(as_of) if jockey else None,
+            "trainer_win_rate": trainer[0].rate(as_of) if trainer else None,
+            "trainer_recent_win_rate": trainer[1].rate(as_of) if trainer else None,
+            "computed_at": computed_at,
+        }
+
+
+def _optional(value: Any) -> float | None:
+    """Nullable numeric (NaN/None/Decimal) to float or None."""
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def _optional_int(value: Any) -> int | None:
+    """Nullable numeric to int or None."""
+    return None if value is None or pd.isna(value) else int(value)
@@ -0,0 +1,439 @@
+"""
+Parallel historical feature backfill.
+
+Recomputes the feature store for the whole race history (or a date range)
+after a rating formula changes. Races are split into partitions (one per
+month or per venue) and each partition runs the feature engines in its own
+worker process against a read-only DuckDB connection:
+
+    workers:  races -> FeatureStore.compute_race_features -> staging Parquet
+    parent:   staging Parquet -> per-race feature store files (atomic swaps)
+
+Only the parent process writes to the feature store. A JSON manifest
+records merged partitions so an interrupted run can be resumed; staged
+but unmerged partitions are merged on resume without being recomputed.
+Partitions with failed races are merged but not marked completed: the
+manifest keeps their failed race_ids and a resumed run retries only those.
+
+Pedigree features are left empty unless pedigree=True: the progeny
+aggregates are current totals, so backfilled rows would include results
+from after each race (see src/features/store.py).
+
+Staging layout:
+    {feature_store_path}/_backfill/manifest.json
+    {feature_store_path}/_backfill/staging/{partition}.parquet
+
+Usage:
+    from src.features.backfill import FeatureBackfill
+
+    backfill = FeatureBackfill(workers=32)
+    backfill.run(start_date=date(2020, 1, 1))
+    backfill.run(resume=True)
+
+    racing backfill-features --start 2020-01-01 --workers 32 --resume
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.features.store import FEATURE_SCHEMA, FeatureStore
+
+logger = logging.getLogger(__name__)
+
+
+PARTITION_SCHEMES = ("month", "venue")
+
+# Staging file schema metadata: JSON {race_id: error} of failed races
+FAILED_RACES_KEY = b"failed_races"
+
+
+@dataclass
+class BackfillPartition:
+    """
+    A unit of backfill work handled by one worker.
+
+    Attributes:
+        key: Partition name (e.g. "2025-11" or "FLE"), used for file names
+        race_ids: Races in the partition, in date order
+    """
+
+    key: str
+    race_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BackfillSummary:
+    """
+    Outcome of a backfill run.
+
+    Attributes:
+        partitions: Partitions in the plan
+        skipped: Partitions completed by an earlier run (resume)
+        races: Races written to the feature store
+        rows: Feature rows written
+        errors: Per-race or per-partition error messages
+    """
+
+    partitions: int = 0
+    skipped: int = 0
+    races: int = 0
+    rows: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class FeatureBackfill:
+    """
+    Recompute the feature store over many races with a process pool.
+
+    Each worker opens its own read-only connection manager (single DuckDB
+    thread, since parallelism comes from the processes) and writes one
+    staging file per partition; the parent merges staging files into the
+    feature store as workers finish.
+    """
+
+    def __init__(
+        self,
+        store_path: str | Path | None = None,
+        db_path: str = "data/racing.duckdb",
+        workers: int | None = None,
+        partition_by: str = "month",
+        connections: DuckDBConnectionManager | None = None,
+        pedigree: bool = False,
+    ):
+        """
+        Initialize backfill.
+
+        Args:
+            store_path: Feature store root (default: settings.feature_store_path)
+            db_path: Path to DuckDB database
+            workers: Worker processes (default: CPU count; 1 = run in-process)
+            partition_by: "month" or "venue"
+            connections: Connection manager for planning (default: process-wide)
+            pedigree: Fill pedigree features from the current progeny
+                aggregates (not point-in-time: includes later results)
+        """
+        if partition_by not in PARTITION_SCHEMES:
+            raise ValueError(
+                f"partition_by must be one of {PARTITION_SCHEMES}, got {partition_by}"
+            )
+
+        self.store = FeatureStore(
+            store_path, db_path, connections=connections, pedigree=pedigree
+        )
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.partition_by = partition_by
+        self._connections = connections
+
+        self.work_dir = self.store.store_path / "_backfill"
+        self.staging_dir = self.work_dir / "staging"
+        self.manifest_path = self.work_dir / "manifest.json"
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    # ------------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------------
+
+    def plan(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[BackfillPartition]:
+        """
+        Split races into partitions.
+
+        Args:
+            start_date: First race date (inclusive, default: earliest)
+            end_date: Last race date (inclusive, default: latest)
+
+        Returns:
+            Partitions ordered by key
+        """
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if self.partition_by == "venue":
+            key_expr = "venue"
+        else:
+            key_expr = "strftime(date, '%Y-%m')"
+        rows = (
+            self.connections.cursor()
+            .execute(
+                f"""
+                SELECT {key_expr} AS partition_key, race_id
+                FROM races
+                {where}
+                ORDER BY partition_key, date, race_id
+                """,
+                params,
+            )
+            .fetchall()
+        )
+
+        partitions: dict[str, BackfillPartition] = {}
+        for key, race_id in rows:
+            key = key or "unknown"
+            partitions.setdefault(key, BackfillPartition(key)).race_ids.append(race_id)
+
+        return list(partitions.values())
+
+    # ------------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------------
+
+    def run(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        resume: bool = False,
+        progress: bool = True,
+    ) -> BackfillSummary:
+        """
+        Recompute features for every race in range.
+
+        Args:
+            start_date: First race date (inclusive)
+            end_date: Last race date (inclusive)
+            resume: Skip partitions merged by a previous run and merge any
+                staged ones without recomputing them; otherwise start fresh
+            progress: Show a progress bar
+
+        Returns:
+            BackfillSummary
+        """
+        if not resume and self.work_dir.exists():
+            shutil.rmtree(self.work_dir)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self._load_manifest()
+        partitions = self.plan(start_date, end_date)
+        summary = BackfillSummary(partitions=len(partitions))
+
+        pending = []
+        for partition in partitions:
+            if partition.key in manifest["completed"]:
+                summary.skipped += 1
+            elif self._staging_file(partition.key).exists():
+                self._merge(partition.key, manifest, summary)
+            elif partition.key in manifest["failed"]:
+                # Merged with errors earlier: recompute only the failed races
+                failed = set(manifest["failed"][partition.key]["race_ids"])
+                partition.race_ids = [r for r in partition.race_ids if r in failed]
+                pending.append(partition)
+            else:
+                pending.append(partition)
+
+        logger.info(
+            f"Backfilling {sum(len(p.race_ids) for p in pending)} races in "
+            f"{len(pending)} partitions ({summary.skipped} already done, "
+            f"{self.workers} workers)"
+        )
+
+        bar = tqdm(
+            total=len(partitions),
+            initial=len(partitions) - len(pending),
+            unit="partition",
+            desc="backfill-features",
+            disable=not progress,
+        )
+
+        try:
+            for key, error in self._compute(pending):
+                if error:
+                    summary.errors.append(error)
+                self._merge(key, manifest, summary)
+                bar.update(1)
+        finally:
+            bar.close()
+
+        logger.info(
+            f"✓ Backfilled {summary.rows} feature rows for {summary.races} races "
+            f"({len(summary.errors)} errors)"
+        )
+        return summary
+
+    def _compute(self, partitions: list[BackfillPartition]):
+        """Yield (partition key, error or None) as partitions finish staging."""
+        args = [
+            (
+                self.db_path,
+                str(self._staging_file(p.key)),
+                p.race_ids,
+                self.store.last_n_starts,
+                self.store.stats_lookback_days,
+                self.store.pedigree,
+            )
+            for p in partitions
+        ]
+
+        if self.workers == 1:
+            for partition, arg in zip(partitions, args):
+                _stage_partition(*arg, self.connections)
+                yield partition.key, None
+            return
+
+        # Spawned workers never inherit the parent's open DuckDB handles
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.workers, mp_context=context) as executor:
+            futures = {
+                executor.submit(_stage_partition, *arg): partition.key
+                for partition, arg in zip(partitions, args)
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    future.result()
+                    yield key, None
+                except Exception as e:
+                    yield key, f"Partition {key}: {e}"
+
+    def _merge(self, key: str, manifest: dict, summary: BackfillSummary) -> None:
+        """
+        Write a staged partition into the feature store and record it.
+
+        The partition is marked completed only when none of its races
+        failed; otherwise its failed race_ids are kept for the next resume.
+        """
+        path = self._staging_file(key)
+        if not path.exists():
+            return  # Partition failed before staging - retried on resume
+
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        failures = json.loads(metadata.get(FAILED_RACES_KEY, b"{}"))
+
+        rows_by_race = defaultdict(list)
+        for row in table.to_pylist():
+            rows_by_race[row["race_id"]].append(row)
+
+        for race_id, rows in rows_by_race.items():
+            self.store.write_race(race_id, rows)
+
+        rows = sum(len(rows) for rows in rows_by_race.values())
+        summary.races += len(rows_by_race)
+        summary.rows += rows
+        summary.errors.extend(f"{race_id}: {e}" for race_id, e in failures.items())
+
+        # Rows merged by earlier attempts at this partition still count
+        rows += manifest["failed"].pop(key, {}).get("rows", 0)
+        if failures:
+            manifest["failed"][key] = {"rows": rows, "race_ids": list(failures)}
+        else:
+            manifest["completed"][key] = rows
+        self._save_manifest(manifest)
+        path.unlink()
+
+    # ------------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------------
+
+    def _staging_file(self, key: str) -> Path:
+        """Staging Parquet file for one partition."""
+        return self.staging_dir / f"{key}.parquet"
+
+    def _load_manifest(self) -> dict:
+        """
+        Progress of earlier runs (empty when starting fresh).
+
+        Returns:
+            {"completed": {key: rows}, "failed": {key: {"rows", "race_ids"}}}
+        """
+        manifest = {"completed": {}, "failed": {}}
+        if not self.manifest_path.exists():
+            return manifest
+        stored = json.loads(self.manifest_path.read_text())
+        if stored.get("partition_by") != self.partition_by:
+            logger.warning(
+                "Backfill manifest was written for a different partitioning; "
+                "starting over"
+            )
+            return manifest
+        manifest["completed"] = stored["completed"]
+        manifest["failed"] = stored.get("failed", {})
+        return manifest
+
+    def _save_manifest(self, manifest: dict) -> None:
+        """Persist completed and failed partitions atomically."""
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps({"partition_by": self.partition_by, **manifest}, indent=2)
+        )
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _stage_partition(
+    db_path: str,
+    staging_file: str,
+    race_ids: list[str],
+    last_n_starts: int,
+    stats_lookback_days: int,
+    pedigree: bool,
+    connections: DuckDBConnectionManager | None = None,
+) -> dict[str, str]:
+    """
+    Compute one partition's features and write them to a staging file.
+
+    Runs in a worker process with its own read-only connection manager
+    (or in-process with the caller's manager when one is passed). Failed
+    races are stored in the staging file's schema metadata, so the parent
+    sees them even when merging a partition staged by an earlier run.
+
+    Returns:
+        Error message per failed race_id
+    """
+    owns_connections = connections is None
+    if owns_connections:
+        connections = DuckDBConnectionManager(db_path, read_only=True, threads=1)
+
+    store = FeatureStore(
+        Path(staging_file).parent,
+        db_path,
+        connections=connections,
+        last_n_starts=last_n_starts,
+        stats_lookback_days=stats_lookback_days,
+        pedigree=pedigree,
+    )
+
+    rows, failures = [], {}
+    try:
+        for race_id in race_ids:
+            try:
+                rows.extend(store.compute_race_features(race_id))
+            except Exception as e:
+                failures[race_id] = str(e)
+    finally:
+        if owns_connections:
+            connections.close()
+
+    schema = FEATURE_SCHEMA.with_metadata({FAILED_RACES_KEY: json.dumps(failures)})
+    tmp_path = f"{staging_file}.tmp"
+    pq.write_table(
+        pa.Table.from_pylist(rows, schema=schema), tmp_path, compression="zstd"
+    )
+    os.replace(tmp_path, staging_file)
+    return failures
@@ -12,6 +12,12 @@ Usage:
 
     engine = ClassRatingsEngine()
     rating = engine.calculate_class_rating(race_id, horse_id)
+
+    # Whole card (or several races) in one query
+    ratings = engine.calculate_race_class_ratings(race_id)
+
+    # Vectorized scores for a frame of performances
+    scores = engine.calculate_class_scores_bulk(results_frame)
 """
 
 from __future__ import annotations
@@ -19,7 +25,11 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 
-import duckdb
+import numpy as np
+import pandas as pd
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.features.history import START_RANK, FormHistoryLoader, recent_starts
 
 logger = logging.getLogger(__name__)
 
@@ -70,9 +80,22 @@ class ClassRatingsEngine:
         "mdn": 60,
     }
 
-    def __init__(self, db_path: str = "data/racing.duckdb"):
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
         """Initialize class ratings engine."""
         self.db_path = db_path
+        self._connections = connections
+        self._field_quality_cache: dict[str, float] = {}
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
 
     def calculate_class_rating(self, race_id: str, horse_id: str) -> ClassRating:
         """
@@ -85,54 +108,156 @@ class ClassRatingsEngine:
         Returns:
             ClassRating object
         """
-        con = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            # Get race details
-            query = """
-                SELECT
-                    r.class_level,
-                    r.prize_money,
-                    r.field_size,
-                    res.finish_position
-                FROM results res
-                JOIN races r ON res.race_id = r.race_id
-                JOIN runs run ON res.run_id = run.run_id
-                WHERE r.race_id = ? AND run.horse_id = ?
-            """
-
-            row = con.execute(query, [race_id, horse_id]).fetchone()
-
-            if not row:
-                raise ValueError(f"No result found for {race_id} / {horse_id}")
-
-            class_level, prize_money, field_size, finish_pos = row
-
-            # Base class score
-            base_score = self._get_class_score(class_level)
-
-            # Prize money adjustment (+/- 5 points)
-            prize_adj = self._calculate_prize_adjustment(prize_money or 0)
-
-            # Field quality adjustment (+/- 5 points)
-            field_quality = self._calculate_field_quality(race_id)
-
-            # Final score
-            class_score = int(base_score + prize_adj + (field_quality * 5))
-            class_score = max(50, min(150, class_score))
-
-            return ClassRating(
-                horse_id=horse_id,
-                race_id=race_id,
-                race_class=class_level or "Unknown",
-                prize_money=prize_money or 0,
-                field_quality=field_quality,
-                class_score=class_score,
-                percentile=None,
+        con = self.connections.cursor()
+
+        # Get race details
+        query = """
+            SELECT
+                r.class_level,
+                r.prize_money,
+                r.field_size,
+                res.finish_position
+            FROM results res
+            JOIN races r ON res.race_id = r.race_id
+            JOIN runs run ON res.run_id = run.run_id
+            WHERE r.race_id = ? AND run.horse_id = ?
+        """
+
+        row = con.execute(query, [race_id, horse_id]).fetchone()
+
+        if not row:
+            raise ValueError(f"No result found for {race_id} / {horse_id}")
+
+        class_level, prize_money, field_size, finish_pos = row
+
+        return self._score_class(race_id, horse_id, class_level, prize_money)
+
+    def calculate_race_class_ratings(self, race_id: str) -> list[ClassRating]:
+        """
+        Calculate class ratings for every runner in a race with one query.
+
+        Args:
+            race_id: Race identifier
+
+        Returns:
+            List of ClassRating objects in barrier order
+        """
+        return self.calculate_class_ratings_for_races([race_id]).get(race_id, [])
+
+    def calculate_class_ratings_for_races(
+        self, race_ids: list[str]
+    ) -> dict[str, list[ClassRating]]:
+        """
+        Calculate class ratings for every runner in several races.
+
+        Class level and prize money for all runners come from a single
+        query; field quality is computed once per race and cached.
+
+        Args:
+            race_ids: Race identifiers
+
+        Returns:
+            Dict mapping race_id to ClassRating objects in barrier order
+            (races without runners are omitted)
+        """
+        if not race_ids:
+            return {}
+
+        con = self.connections.cursor()
+
+        query = """
+            SELECT
+                r.race_id,
+                run.horse_id,
+                r.class_level,
+                r.prize_money
+            FROM runs run
+            JOIN races r ON run.race_id = r.race_id
+            WHERE r.race_id IN (SELECT UNNEST(?))
+              AND run.scratched = FALSE
+            ORDER BY r.race_id, run.barrier
+        """
+
+        rows = con.execute(query, [list(race_ids)]).fetchall()
+
+        ratings: dict[str, list[ClassRating]] = {}
+        for race_id, horse_id, class_level, prize_money in rows:
+            ratings.setdefault(race_id, []).append(
+                self._score_class(race_id, horse_id, class_level, prize_money)
             )
 
-        finally:
-            con.close()
+        return ratings
+
+    def _score_class(
+        self,
+        race_id: str,
+        horse_id: str,
+        class_level: str | None,
+        prize_money: int | None,
+    ) -> ClassRating:
+        """Combine class level, prize money and field quality into a rating."""
+        # Base class score
+        base_score = self._get_class_score(class_level)
+
+        # Prize money adjustment (+/- 5 points)
+        prize_adj = self._calculate_prize_adjustment(prize_money or 0)
+
+        # Field quality adjustment (+/- 5 points), same for every runner
+        field_quality = self._get_field_quality(race_id)
+
+        # Final score
+        class_score = int(base_score + prize_adj + (field_quality * 5))
+        class_score = max(50, min(150, class_score))
+
+        return ClassRating(
+            horse_id=horse_id,
+            race_id=race_id,
+            race_class=class_level or "Unknown",
+            prize_money=prize_money or 0,
+            field_quality=field_quality,
+            class_score=class_score,
+            percentile=None,
+        )
+
+    def calculate_class_scores_bulk(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Class scores for a batch of performances (vectorized _score_class()).
+
+        Base scores are looked up once per distinct class level and field
+        quality once per race; the prize adjustment and clamp are array
+        operations. Scores match the per-runner path exactly.
+
+        Args:
+            frame: Columns race_id, class_level and prize_money (nulls allowed)
+
+        Returns:
+            int64 array of class scores (50-150) in frame order
+        """
+        # factorize() codes nulls as -1, which picks the trailing default
+        levels, level_names = pd.factorize(frame["class_level"])
+        base = np.array(
+            [self._get_class_score(level) for level in level_names]
+            + [self._get_class_score(None)],
+            dtype=np.float64,
+        )[levels]
+
+        prize = np.trunc(
+            frame["prize_money"].to_numpy(dtype=np.float64, na_value=0.0)
+        )
+        prize_adj = np.select(
+            [prize == 0, prize >= 1000000, prize <= 20000],
+            [0.0, 5.0, -5.0],
+            (prize / 100000 - 1) * 5,
+        )
+
+        races, race_ids = pd.factorize(frame["race_id"])
+        field_quality = np.array(
+            [self._get_field_quality(race_id) for race_id in race_ids],
+            dtype=np.float64,
+        )[races]
+
+        class_score = np.trunc(base + prize_adj + (field_quality * 5))
+        return np.clip(class_score, 50, 150).astype(np.int64)
 
     def _get_class_score(self, class_level: str | None) -> int:
         """Get base score for class level."""
@@ -195,6 +320,16 @@ class ClassRatingsEngine:
             ratio = prize_money / baseline
             return (ratio - 1) * 5
 
+    def _get_field_quality(self, race_id: str) -> float:
+        """Field quality for a race, memoized per race_id."""
+        if race_id not in self._field_quality_cache:
+            self._field_quality_cache[race_id] = self._calculate_field_quality(race_id)
+        return self._field_quality_cache[race_id]
+
+    def clear_cache(self) -> None:
+        """Forget memoized field quality (e.g. after results are re-ingested)."""
+        self._field_quality_cache.clear()
+
     def _calculate_field_quality(self, race_id: str) -> float:
         """
         Calculate field quality score (0-1).
@@ -210,49 +345,62 @@ class ClassRatingsEngine:
 
     def get_horse_average_class(self, horse_id: str, last_n_starts: int = 5) -> dict:
         """Get average class rating over recent starts."""
-        con = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            query = """
-                SELECT
-                    r.race_id,
-                    r.class_level,
-                    r.prize_money,
-                    r.date,
-                    res.class_rating
-                FROM results res
-                JOIN races r ON res.race_id = r.race_id
-                JOIN runs run ON res.run_id = run.run_id
-                WHERE run.horse_id = ?
-                ORDER BY r.date DESC
-                LIMIT ?
-            """
-
-            rows = con.execute(query, [horse_id, last_n_starts]).fetchall()
-
-            if not rows:
-                return {"average": None, "best": None, "starts": 0}
+        return self.get_average_classes([horse_id], last_n_starts)[horse_id]
+
+    def get_average_classes(
+        self,
+        horse_ids: list[str],
+        last_n_starts: int = 5,
+        history: pd.DataFrame | None = None,
+    ) -> dict[str, dict]:
+        """
+        Get average class ratings for many horses from one history frame.
+
+        Args:
+            horse_ids: Horse identifiers
+            last_n_starts: Number of recent starts to average
+            history: Frame from FormHistoryLoader.load() (loaded if omitted)
+
+        Returns:
+            Dict mapping horse_id to the get_horse_average_class() metrics
+        """
+        if history is None:
+            history = FormHistoryLoader(self.db_path, self.connections).load(
+                horse_ids, last_n_starts
+            )
+
+        import statistics
+
+        averages = {}
+        for horse_id in horse_ids:
+            starts = recent_starts(history, horse_id, START_RANK, last_n_starts)
+
+            if starts.empty:
+                averages[horse_id] = {"average": None, "best": None, "starts": 0}
+                continue
 
             ratings = []
-            for row in rows:
-                if row[4] is not None:
-                    ratings.append(row[4])
+            for row in starts.itertuples(index=False):
+                if pd.notna(row.class_rating):
+                    ratings.append(int(row.class_rating))
                 else:
-                    # Calculate on the fly
-                    rating = self.calculate_class_rating(row[0], horse_id)
+                    # Calculate on the fly from the race details already fetched
+                    rating = self._score_class(
+                        row.race_id,
+                        horse_id,
+                        row.class_level if pd.notna(row.class_level) else None,
+                        int(row.prize_money) if pd.notna(row.prize_money) else None,
+                    )
                     ratings.append(rating.class_score)
 
-            import statistics
-
-            return {
+            averages[horse_id] = {
                 "average": statistics.mean(ratings),
                 "best": max(ratings),
                 "worst": min(ratings),
                 "starts": len(ratings),
             }
 
-        finally:
-            con.close()
+        return averages
 
 
 # Example usage
@@ -0,0 +1,421 @@
+"""
+Sparse jockey combination index.
+
+JockeyStatsBuilder._calculate_jockey_combos runs a GROUP BY per trainer
+each time partner win rates are needed. This index holds rides and wins
+for every jockey x trainer and jockey x horse pairing as sparse CSR
+matrices (rows = jockeys, columns = partners), built once from the results
+table and updated incrementally as races are ingested, so a whole race
+card is answered with one vectorized fancy-index per matrix.
+
+Combinations:
+    jockey_trainer: jockey_id x trainer_id
+    jockey_horse:   jockey_id x horse_id
+
+Usage:
+    from src.features.combinations import CombinationIndex
+
+    index = CombinationIndex.build()
+    index.save()
+
+    index = CombinationIndex.load(db_path="data/racing.duckdb")
+    rides, wins = index.lookup("jockey_trainer", ["J1", "J2"], ["T1", "T1"])
+    features = index.race_card("FLE-2025-11-12-R1")  # run_id -> features
+
+    etl = RacingETL(post_ingest_hooks=[index.update_race])
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+# Combination name -> partner column on runs
+COMBINATIONS = {
+    "jockey_trainer": "trainer_id",
+    "jockey_horse": "horse_id",
+}
+
+
+class CombinationIndex:
+    """
+    Rides/wins counts for jockey x partner pairings as sparse matrices.
+
+    Identifiers are mapped to matrix positions by per-axis vocabularies that
+    grow as new jockeys, trainers and horses appear. Unknown pairings count
+    as zero rides.
+    """
+
+    def __init__(
+        self,
+        race_ids: set[str] | None = None,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """
+        Initialize empty index.
+
+        Args:
+            race_ids: Races already counted (makes update_race idempotent)
+            db_path: Database read by update_race() and race_card()
+            connections: Shared connection manager (default: process-wide
+                manager for db_path)
+        """
+        self.db_path = db_path
+        self._connections = connections
+        self.jockeys: dict[str, int] = {}
+        self.partners: dict[str, dict[str, int]] = {kind: {} for kind in COMBINATIONS}
+        self.rides: dict[str, sparse.csr_matrix] = {
+            kind: sparse.csr_matrix((0, 0), dtype=np.int32) for kind in COMBINATIONS
+        }
+        self.wins: dict[str, sparse.csr_matrix] = {
+            kind: sparse.csr_matrix((0, 0), dtype=np.int32) for kind in COMBINATIONS
+        }
+        self.race_ids: set[str] = set(race_ids or ())
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    # ------------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------------
+
+    def add(
+        self,
+        jockey_ids: Iterable[str],
+        partner_ids: dict[str, Iterable[str | None]],
+        won: Iterable[bool],
+    ) -> None:
+        """
+        Add rides to the index.
+
+        Args:
+            jockey_ids: Jockey of each ride
+            partner_ids: Combination name -> partner of each ride (None skips
+                the ride for that combination)
+            won: Whether each ride won
+        """
+        rows = _encode(self.jockeys, list(jockey_ids))
+        won = np.asarray(list(won), dtype=np.int32)
+        if rows.size == 0:
+            return
+
+        for kind in COMBINATIONS:
+            partners = list(partner_ids[kind])
+            known = np.array([p is not None for p in partners], dtype=bool)
+            cols = _encode(
+                self.partners[kind], [p for p in partners if p is not None]
+            )
+            shape = (len(self.jockeys), len(self.partners[kind]))
+
+            # Duplicate (row, col) pairs are summed by the COO -> CSR conversion
+            for matrices, values in (
+                (self.rides, np.ones(cols.size, dtype=np.int32)),
+                (self.wins, won[known]),
+            ):
+                delta = sparse.coo_matrix(
+                    (values, (rows[known], cols)), shape=shape
+                ).tocsr()
+                matrix = matrices[kind]
+                matrix.resize(shape)
+                matrices[kind] = matrix + delta
+
+    def update_race(
+        self, race_id: str, connections: DuckDBConnectionManager | None = None
+    ) -> int:
+        """
+        Add one race's results (post-ingest hook; races are counted once).
+
+        A race without results yet (card-only ingest) is not marked as
+        counted, so it is picked up when its results land.
+
+        Args:
+            race_id: Race identifier
+            connections: Connection manager (default: the index's)
+
+        Returns:
+            Number of rides added
+        """
+        if race_id in self.race_ids:
+            return 0
+
+        rides = _load_rides(connections or self.connections, race_id=race_id)
+        if not rides["jockey_id"]:
+            return 0
+
+        self.add(
+            rides["jockey_id"],
+            {kind: rides[column] for kind, column in COMBINATIONS.items()},
+            rides["won"],
+        )
+        self.race_ids.add(race_id)
+        return len(rides["jockey_id"])
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def lookup(
+        self, kind: str, jockey_ids: Iterable[str | None], partner_ids: Iterable[Any]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rides and wins for many (jockey, partner) pairs at once.
+
+        Args:
+            kind: Combination name ("jockey_trainer" or "jockey_horse")
+            jockey_ids: Jockey of each pair
+            partner_ids: Trainer or horse of each pair
+
+        Returns:
+            (rides, wins) integer arrays aligned with the input pairs
+        """
+        if kind not in COMBINATIONS:
+            raise ValueError(f"kind must be one of {tuple(COMBINATIONS)}, got {kind}")
+
+        rows = _positions(self.jockeys, jockey_ids)
+        cols = _positions(self.partners[kind], partner_ids)
+        if rows.size != cols.size:
+            raise ValueError("jockey_ids and partner_ids must be the same length")
+
+        rides = np.zeros(rows.size, dtype=np.int64)
+        wins = np.zeros(rows.size, dtype=np.int64)
+        known = (rows >= 0) & (cols >= 0)
+        if known.any():
+            rides[known] = self.rides[kind][rows[known], cols[known]].A1
+            wins[known] = self.wins[kind][rows[known], cols[known]].A1
+        return rides, wins
+
+    def race_card(
+        self, race_id: str, connections: DuckDBConnectionManager | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Combination features for every declared runner in a race.
+
+        Args:
+            race_id: Race identifier
+            connections: Connection manager (default: the index's)
+
+        Returns:
+            Dict mapping run_id to {kind}_rides, {kind}_wins and
+            {kind}_win_rate (None without history) for each combination
+        """
+        rows = (
+            (connections or self.connections)
+            .cursor()
+            .execute(
+                f"""
+                SELECT run_id, jockey_id, {", ".join(COMBINATIONS.values())}
+                FROM runs
+                WHERE race_id = ? AND scratched = FALSE
+                ORDER BY run_id
+                """,
+                [race_id],
+            )
+            .to_arrow_table()
+            .to_pydict()
+        )
+        run_ids = rows["run_id"]
+        features: dict[str, dict[str, Any]] = {run_id: {} for run_id in run_ids}
+
+        for kind, column in COMBINATIONS.items():
+            rides, wins = self.lookup(kind, rows["jockey_id"], rows[column])
+            for run_id, ride_count, win_count in zip(run_ids, rides, wins):
+                features[run_id].update(
+                    {
+                        f"{kind}_rides": int(ride_count),
+                        f"{kind}_wins": int(win_count),
+                        f"{kind}_win_rate": (
+                            float(win_count / ride_count) if ride_count else None
+                        ),
+                    }
+                )
+
+        return features
+
+    @property
+    def total(self) -> int:
+        """Number of rides in the index."""
+        return int(self.rides["jockey_trainer"].sum())
+
+    # ------------------------------------------------------------------------
+    # Build / persistence
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        before: date | None = None,
+    ) -> CombinationIndex:
+        """
+        Build the index from every result in the database.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Connection manager (default: process-wide manager)
+            before: Only count races before this date (point-in-time builds)
+
+        Returns:
+            Populated CombinationIndex
+        """
+        index = cls(db_path=db_path, connections=connections)
+        rides = _load_rides(index.connections, before=before)
+
+        index.race_ids = set(rides["race_id"])
+        index.add(
+            rides["jockey_id"],
+            {kind: rides[column] for kind, column in COMBINATIONS.items()},
+            rides["won"],
+        )
+
+        logger.info(
+            f"✓ Built combination index from {index.total} rides "
+            f"({len(index.jockeys)} jockeys, {len(index.race_ids)} races)"
+        )
+        return index
+
+    @staticmethod
+    def default_path() -> Path:
+        """Default index location inside the feature store directory."""
+        from src.utils.config import settings
+
+        return Path(settings.feature_store_path) / "combinations.npz"
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """Save vocabularies, COO triplets and counted race_ids to .npz."""
+        path = Path(path) if path else self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            "jockeys": _vocabulary_array(self.jockeys),
+            "race_ids": np.array(sorted(self.race_ids), dtype=str),
+        }
+        for kind in COMBINATIONS:
+            arrays[f"{kind}_partners"] = _vocabulary_array(self.partners[kind])
+            for measure, matrices in (("rides", self.rides), ("wins", self.wins)):
+                coo = matrices[kind].tocoo()
+                arrays[f"{kind}_{measure}_row"] = coo.row
+                arrays[f"{kind}_{measure}_col"] = coo.col
+                arrays[f"{kind}_{measure}_data"] = coo.data
+
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path | None = None,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ) -> CombinationIndex:
+        """
+        Load an index saved with save().
+
+        Args:
+            path: Index file (default: default_path())
+            db_path: Database read by update_race() and race_card()
+            connections: Shared connection manager (default: process-wide
+                manager for db_path)
+        """
+        path = Path(path) if path else cls.default_path()
+        with np.load(path) as data:
+            index = cls(
+                race_ids=set(data["race_ids"].tolist()),
+                db_path=db_path,
+                connections=connections,
+            )
+            index.jockeys = _vocabulary(data["jockeys"])
+            for kind in COMBINATIONS:
+                index.partners[kind] = _vocabulary(data[f"{kind}_partners"])
+                shape = (len(index.jockeys), len(index.partners[kind]))
+                for measure, matrices in (("rides", index.rides), ("wins", index.wins)):
+                    prefix = f"{kind}_{measure}"
+                    matrices[kind] = sparse.coo_matrix(
+                        (
+                            data[f"{prefix}_data"],
+                            (data[f"{prefix}_row"], data[f"{prefix}_col"]),
+                        ),
+                        shape=shape,
+                    ).tocsr()
+        return index
+
+
+def _encode(vocabulary: dict[str, int], ids: list[str]) -> np.ndarray:
+    """Matrix positions for ids, assigning new positions to unseen ids."""
+    return np.fromiter(
+        (vocabulary.setdefault(i, len(vocabulary)) for i in ids),
+        dtype=np.int64,
+        count=len(ids),
+    )
+
+
+def _positions(vocabulary: dict[str, int], ids: Iterable[Any]) -> np.ndarray:
+    """Matrix positions for ids (-1 for unknown or missing ids)."""
+    ids = list(ids)
+    return np.fromiter(
+        (vocabulary.get(i, -1) for i in ids), dtype=np.int64, count=len(ids)
+    )
+
+
+def _vocabulary_array(vocabulary: dict[str, int]) -> np.ndarray:
+    """Ids ordered by matrix position."""
+    return np.array(sorted(vocabulary, key=vocabulary.__getitem__), dtype=str)
+
+
+def _vocabulary(ids: np.ndarray) -> dict[str, int]:
+    """Inverse of _vocabulary_array()."""
+    return {i: position for position, i in enumerate(ids.tolist())}
+
+
+def _load_rides(
+    connections: DuckDBConnectionManager,
+    race_id: str | None = None,
+    before: date | None = None,
+) -> dict[str, list]:
+    """Declared rides with a result, as column lists."""
+    conditions, params = [], []
+    if race_id is not None:
+        conditions.append("r.race_id = ?")
+        params.append(race_id)
+    if before is not None:
+        conditions.append("race.date < ?")
+        params.append(before)
+    where = "".join(f" AND {condition}" for condition in conditions)
+
+    table = (
+        connections.cursor()
+        .execute(
+            f"""
+            SELECT
+                r.race_id,
+                r.jockey_id,
+                r.trainer_id,
+                r.horse_id,
+                COALESCE(res.finish_position = 1, FALSE) AS won
+            FROM runs r
+            JOIN results res ON res.run_id = r.run_id
+            JOIN races race ON race.race_id = r.race_id
+            WHERE r.scratched = FALSE
+              AND r.jockey_id IS NOT NULL{where}
+            """,
+            params,
+        )
+        .to_arrow_table()
+    )
+    return table.to_pydict()
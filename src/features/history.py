@@ -0,0 +1,192 @@
+"""
+Recent-form history loader shared by the feature engines.
+
+Speed, class and sectional form features each need a horse's last N starts,
+filtered slightly differently:
+- Speed: starts with a recorded race time
+- Class: all starts
+- Sectionals: starts with a recorded last-200m split
+
+Instead of one ``ORDER BY date DESC LIMIT ?`` query per horse per engine,
+this loader fetches every requested horse's recent starts in one windowed
+query and tags each row with its rank under all three filters, so the
+engines can slice the same frame.
+
+Usage:
+    from src.features.history import FormHistoryLoader
+
+    loader = FormHistoryLoader()
+    history = loader.load(["H1001", "H1002"], last_n_starts=5)
+
+    speed = SpeedRatingsEngine().get_average_ratings(horse_ids, history=history)
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+import pandas as pd
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+# Rank column used by each kind of form feature
+START_RANK = "start_rank"
+TIMED_RANK = "timed_rank"
+SECTIONAL_RANK = "sectional_rank"
+
+HISTORY_COLUMNS = [
+    "horse_id",
+    "race_id",
+    "date",
+    "distance",
+    "track_condition",
+    "class_level",
+    "prize_money",
+    "finish_position",
+    "race_time",
+    "sectional_600m",
+    "sectional_400m",
+    "sectional_200m",
+    "speed_rating",
+    "class_rating",
+    START_RANK,
+    TIMED_RANK,
+    SECTIONAL_RANK,
+]
+
+
+class FormHistoryLoader:
+    """
+    Load the last N starts for many horses in a single query.
+
+    Rows are ranked newest-first per horse with ROW_NUMBER() three times
+    (all starts, timed starts, starts with sectionals); a row is returned
+    if it falls inside the last N under any of the three.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """
+        Initialize history loader.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Shared connection manager (default: process-wide manager)
+        """
+        self.db_path = db_path
+        self._connections = connections
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    def load(
+        self,
+        horse_ids: list[str],
+        last_n_starts: int = 5,
+        before: date | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load recent starts for a set of horses.
+
+        Args:
+            horse_ids: Horse identifiers (e.g. every runner on a card)
+            last_n_starts: Starts to keep per horse under each filter
+            before: Only use races strictly before this date (point-in-time
+                features for an upcoming race); default: all races
+
+        Returns:
+            DataFrame with HISTORY_COLUMNS, newest start first per horse.
+            Rank columns are NULL for rows outside that filter.
+        """
+        if not horse_ids:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        con = self.connections.cursor()
+
+        date_filter = "AND r.date < ?" if before is not None else ""
+        query = f"""
+            WITH starts AS (
+                SELECT
+                    run.horse_id,
+                    r.race_id,
+                    r.date,
+                    r.distance,
+                    r.track_condition,
+                    r.class_level,
+                    r.prize_money,
+                    res.finish_position,
+                    res.race_time,
+                    res.sectional_600m,
+                    res.sectional_400m,
+                    res.sectional_200m,
+                    res.speed_rating,
+                    res.class_rating,
+                    ROW_NUMBER() OVER recent AS {START_RANK},
+                    CASE WHEN res.race_time IS NOT NULL THEN ROW_NUMBER() OVER (
+                        PARTITION BY run.horse_id, res.race_time IS NULL
+                        ORDER BY r.date DESC, r.race_id DESC
+                    ) END AS {TIMED_RANK},
+                    CASE WHEN res.sectional_200m IS NOT NULL THEN ROW_NUMBER() OVER (
+                        PARTITION BY run.horse_id, res.sectional_200m IS NULL
+                        ORDER BY r.date DESC, r.race_id DESC
+                    ) END AS {SECTIONAL_RANK}
+                FROM results res
+                JOIN races r ON res.race_id = r.race_id
+                JOIN runs run ON res.run_id = run.run_id
+                WHERE run.horse_id IN (SELECT UNNEST(?))
+                  {date_filter}
+                WINDOW recent AS (
+                    PARTITION BY run.horse_id
+                    ORDER BY r.date DESC, r.race_id DESC
+                )
+            )
+            SELECT *
+            FROM starts
+            WHERE {START_RANK} <= ?
+               OR {TIMED_RANK} <= ?
+               OR {SECTIONAL_RANK} <= ?
+            ORDER BY horse_id, {START_RANK}
+        """
+
+        params: list = [list(horse_ids)]
+        if before is not None:
+            params.append(before)
+        params.extend([last_n_starts] * 3)
+
+        history = con.execute(query, params).df()
+        logger.debug(
+            f"Loaded {len(history)} history rows for {len(horse_ids)} horses"
+        )
+        return history
+
+
+def recent_starts(
+    history: pd.DataFrame, horse_id: str, rank_column: str, last_n_starts: int
+) -> pd.DataFrame:
+    """
+    Slice one horse's last N starts under a given filter.
+
+    Args:
+        history: Frame from FormHistoryLoader.load()
+        horse_id: Horse identifier
+        rank_column: START_RANK, TIMED_RANK or SECTIONAL_RANK
+        last_n_starts: Number of starts to keep
+
+    Returns:
+        Matching rows, newest first
+    """
+    rows = history[
+        (history["horse_id"] == horse_id) & (history[rank_column] <= last_n_starts)
+    ]
+    return rows.sort_values(rank_column)
@@ -0,0 +1,217 @@
+"""
+Materialized progeny aggregates for pedigree analysis.
+
+PedigreeAnalyzer used to aggregate every progeny result of a sire/dam each
+time a horse was analysed, so popular sires were re-aggregated hundreds of
+times per race day. This module maintains two derived tables instead
+(see schema.sql):
+
+- progeny_stats: progeny, runners, winners, stakes/G1 winners, prize money
+  per (parent_role, parent_name)
+- progeny_distance_stats: starts/wins/top-3 per parent, exact distance and
+  surface, so suitability windows can be summed from a handful of rows
+
+Refreshes are incremental at parent granularity: after a race lands, only
+the sires, dams and dam's sires of its runners are recomputed.
+
+Usage:
+    from src.features.pedigree_aggregates import ProgenyAggregates
+
+    aggregates = ProgenyAggregates()
+    aggregates.refresh()                         # full rebuild
+    aggregates.refresh(["FLE-2025-11-12-R1"])    # parents of these runners
+
+    etl = RacingETL(post_ingest_hooks=[aggregates.update_race])
+"""
+
+from __future__ import annotations
+
+import logging
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+
+PARENT_ROLES = ("sire", "dam", "dam_sire")
+
+# Class-level patterns (races.class_level, e.g. 'G1', 'Group 2', 'Listed')
+G1_CONDITION = (
+    "(UPPER(class_level) IN ('G1', 'GROUP 1') "
+    "OR UPPER(class_level) LIKE 'GROUP 1 %')"
+)
+STAKES_CONDITION = (
+    "(regexp_matches(UPPER(class_level), '^(G[123]|GROUP [123])') "
+    "OR UPPER(class_level) LIKE '%LISTED%')"
+)
+
+# One row per (parent_role, parent_name, horse_id)
+PARENTS_CTE = """
+    parents AS (
+        SELECT 'sire' AS parent_role, sire AS parent_name, horse_id
+        FROM horses WHERE sire IS NOT NULL
+        UNION ALL
+        SELECT 'dam', dam, horse_id
+        FROM horses WHERE dam IS NOT NULL
+        UNION ALL
+        SELECT 'dam_sire', dam_sire, horse_id
+        FROM horses WHERE dam_sire IS NOT NULL
+    )
+"""
+
+
+class ProgenyAggregates:
+    """
+    Builds and refreshes the progeny aggregate tables.
+
+    All writes go through the shared read-write connection manager in a
+    single transaction per refresh.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """
+        Initialize aggregate builder.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Read-write connection manager (default: process-wide)
+        """
+        self.db_path = db_path
+        self._connections = connections
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared read-write connection manager."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path, read_only=False)
+        return self._connections
+
+    def refresh(self, race_ids: list[str] | None = None) -> int:
+        """
+        Recompute aggregates.
+
+        Args:
+            race_ids: Only refresh parents of runners in these races
+                (default: rebuild everything)
+
+        Returns:
+            Number of parents refreshed
+        """
+        with self.connections.write_transaction() as con:
+            con.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS _progeny_targets "
+                "(parent_role VARCHAR, parent_name VARCHAR)"
+            )
+            con.execute("DELETE FROM _progeny_targets")
+
+            if race_ids is None:
+                con.execute(
+                    f"""
+                    INSERT INTO _progeny_targets
+                    WITH {PARENTS_CTE}
+                    SELECT DISTINCT parent_role, parent_name FROM parents
+                    """
+                )
+                con.execute("DELETE FROM progeny_stats")
+                con.execute("DELETE FROM progeny_distance_stats")
+            else:
+                con.execute(
+                    f"""
+                    INSERT INTO _progeny_targets
+                    WITH {PARENTS_CTE}
+                    SELECT DISTINCT p.parent_role, p.parent_name
+                    FROM parents p
+                    JOIN runs ru ON ru.horse_id = p.horse_id
+                    WHERE ru.race_id IN (SELECT UNNEST(?))
+                    """,
+                    [list(race_ids)],
+                )
+                for table in ("progeny_stats", "progeny_distance_stats"):
+                    con.execute(
+                        f"""
+                        DELETE FROM {table}
+                        USING _progeny_targets t
+                        WHERE {table}.parent_role = t.parent_role
+                          AND {table}.parent_name = t.parent_name
+                        """
+                    )
+
+            con.execute(
+                f"""
+                INSERT INTO progeny_stats (
+                    parent_role, parent_name, progeny, runners, winners,
+                    stakes_winners, g1_winners, starts, wins, prize_money,
+                    win_prize_money, updated_at
+                )
+                WITH {PARENTS_CTE},
+                starts AS (
+                    SELECT p.parent_role, p.parent_name, p.horse_id,
+                           r.result_id, r.finish_position, r.prize_money,
+                           ra.class_level
+                    FROM parents p
+                    JOIN _progeny_targets t
+                      ON t.parent_role = p.parent_role
+                     AND t.parent_name = p.parent_name
+                    LEFT JOIN runs ru ON ru.horse_id = p.horse_id
+                    LEFT JOIN results r ON r.run_id = ru.run_id
+                    LEFT JOIN races ra ON ra.race_id = r.race_id
+                )
+                SELECT
+                    parent_role,
+                    parent_name,
+                    COUNT(DISTINCT horse_id),
+                    COUNT(DISTINCT CASE WHEN result_id IS NOT NULL
+                                        THEN horse_id END),
+                    COUNT(DISTINCT CASE WHEN finish_position = 1 THEN horse_id END),
+                    COUNT(DISTINCT CASE WHEN finish_position = 1
+                                         AND {STAKES_CONDITION} THEN horse_id END),
+                    COUNT(DISTINCT CASE WHEN finish_position = 1
+                                         AND {G1_CONDITION} THEN horse_id END),
+                    COUNT(result_id),
+                    COUNT(CASE WHEN finish_position = 1 THEN 1 END),
+                    COALESCE(SUM(prize_money), 0),
+                    COALESCE(SUM(CASE WHEN finish_position = 1
+                                      THEN prize_money END), 0),
+                    CURRENT_TIMESTAMP
+                FROM starts
+                GROUP BY parent_role, parent_name
+                """
+            )
+
+            con.execute(
+                f"""
+                INSERT INTO progeny_distance_stats
+                WITH {PARENTS_CTE}
+                SELECT
+                    p.parent_role,
+                    p.parent_name,
+                    ra.distance,
+                    COALESCE(LOWER(ra.track_type), 'unknown'),
+                    COUNT(*),
+                    COUNT(CASE WHEN r.finish_position = 1 THEN 1 END),
+                    COUNT(CASE WHEN r.finish_position <= 3 THEN 1 END)
+                FROM parents p
+                JOIN _progeny_targets t
+                  ON t.parent_role = p.parent_role
+                 AND t.parent_name = p.parent_name
+                JOIN runs ru ON ru.horse_id = p.horse_id
+                JOIN results r ON r.run_id = ru.run_id
+                JOIN races ra ON ra.race_id = r.race_id
+                GROUP BY ALL
+                """
+            )
+
+            refreshed = con.execute(
+                "SELECT COUNT(*) FROM _progeny_targets"
+            ).fetchone()[0]
+
+        logger.info(f"✓ Refreshed progeny aggregates for {refreshed} parents")
+        return refreshed
+
+    def update_race(self, race_id: str) -> int:
+        """Refresh parents of one race's runners (post-ingest hook)."""
+        return self.refresh([race_id])
@@ -13,6 +13,10 @@ Based on progeny statistics:
 - Average earnings
 - Distance range performance
 
+Progeny statistics are read from the materialized aggregate tables
+maintained by src.features.pedigree_aggregates, so analysing a horse is a
+set of dictionary lookups rather than a progeny aggregation per parent.
+
 Author: Racing Analysis System
 Date: November 2025
 """
@@ -23,7 +27,7 @@ import logging
 from dataclasses import dataclass
 from typing import Optional
 
-import duckdb
+from src.data.db import DuckDBConnectionManager, get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -73,9 +77,25 @@ class PedigreeAnalyzer:
     MILE_MAX = 1600
     MIDDLE_MAX = 2000
 
-    def __init__(self, db_path: str = "data/racing.duckdb"):
-        """Initialize analyzer with database connection."""
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """Initialize analyzer with a shared database connection manager."""
         self.db_path = db_path
+        self._connections = connections
+
+        # Progeny aggregates, loaded once from the materialized tables
+        self._progeny_stats: dict[tuple[str, str], dict] | None = None
+        self._progeny_distances: dict[tuple[str, str], list[tuple]] = {}
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
 
     def analyze_pedigree(
         self,
@@ -94,67 +114,87 @@ class PedigreeAnalyzer:
         Returns:
             PedigreeRating with quality scores and suitability
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = self.connections.cursor()
 
-        try:
-            # Get horse pedigree
-            query = """
-                SELECT sire, dam, dam_sire
-                FROM horses
-                WHERE horse_id = ?
-            """
-
-            result = conn.execute(query, [horse_id]).fetchone()
-
-            if not result:
-                logger.warning(f"Horse {horse_id} not found in database")
-                return self._default_rating(horse_id, race_distance)
-
-            sire, dam, dam_sire = result
-
-            # Rate each component
-            sire_rating = self._rate_stallion(sire, conn)
-            dam_rating = self._rate_broodmare(dam, conn)
-            dam_sire_rating = self._rate_stallion(dam_sire, conn)
-
-            # Calculate distance suitability
-            distance_category = self._classify_distance(race_distance)
-            distance_suitability = self._calculate_distance_suitability(
-                sire, race_distance, conn
-            )
+        # Get horse pedigree
+        query = """
+            SELECT sire, dam, dam_sire
+            FROM horses
+            WHERE horse_id = ?
+        """
 
-            # Calculate surface suitability
-            surface_suitability = self._calculate_surface_suitability(
-                sire, race_surface, conn
-            )
+        result = conn.execute(query, [horse_id]).fetchone()
 
-            # Calculate overall pedigree score
-            # Weighted: Sire 50%, Dam sire 30%, Dam 20%
-            overall_score = int(
-                sire_rating * 0.50 + dam_sire_rating * 0.30 + dam_rating * 0.20
-            )
+        if not result:
+            logger.warning(f"Horse {horse_id} not found in database")
+            return self._default_rating(horse_id, race_distance)
 
-            # Adjust for suitability
-            suitability_factor = (distance_suitability + surface_suitability) / 200
-            overall_score = int(overall_score * (0.8 + suitability_factor * 0.4))
-            overall_score = max(0, min(150, overall_score))
-
-            return PedigreeRating(
-                horse_id=horse_id,
-                sire=sire or "Unknown",
-                dam=dam or "Unknown",
-                dam_sire=dam_sire or "Unknown",
-                sire_rating=sire_rating,
-                dam_rating=dam_rating,
-                dam_sire_rating=dam_sire_rating,
-                distance_suitability=distance_suitability,
-                surface_suitability=surface_suitability,
-                overall_pedigree_score=overall_score,
-                distance_category=distance_category,
-            )
+        sire, dam, dam_sire = result
+        return self.rate_pedigree(
+            horse_id, sire, dam, dam_sire, race_distance, race_surface
+        )
 
-        finally:
-            conn.close()
+    def rate_pedigree(
+        self,
+        horse_id: str,
+        sire: str | None,
+        dam: str | None,
+        dam_sire: str | None,
+        race_distance: int,
+        race_surface: str = "turf",
+    ) -> PedigreeRating:
+        """
+        Rate a pedigree whose parents are already known (no database query).
+
+        Args:
+            horse_id: Horse identifier
+            sire: Sire name
+            dam: Dam name
+            dam_sire: Dam's sire name
+            race_distance: Race distance in meters
+            race_surface: Race surface type (turf/synthetic)
+
+        Returns:
+            PedigreeRating with quality scores and suitability
+        """
+        # Rate each component (lookups into the progeny aggregates)
+        sire_rating = self._rate_stallion(sire)
+        dam_rating = self._rate_broodmare(dam)
+        dam_sire_rating = self._rate_stallion(dam_sire)
+
+        # Calculate distance suitability
+        distance_category = self._classify_distance(race_distance)
+        distance_suitability = self._calculate_distance_suitability(
+            sire, race_distance
+        )
+
+        # Calculate surface suitability
+        surface_suitability = self._calculate_surface_suitability(sire, race_surface)
+
+        # Calculate overall pedigree score
+        # Weighted: Sire 50%, Dam sire 30%, Dam 20%
+        overall_score = int(
+            sire_rating * 0.50 + dam_sire_rating * 0.30 + dam_rating * 0.20
+        )
+
+        # Adjust for suitability
+        suitability_factor = (distance_suitability + surface_suitability) / 200
+        overall_score = int(overall_score * (0.8 + suitability_factor * 0.4))
+        overall_score = max(0, min(150, overall_score))
+
+        return PedigreeRating(
+            horse_id=horse_id,
+            sire=sire or "Unknown",
+            dam=dam or "Unknown",
+            dam_sire=dam_sire or "Unknown",
+            sire_rating=sire_rating,
+            dam_rating=dam_rating,
+            dam_sire_rating=dam_sire_rating,
+            distance_suitability=distance_suitability,
+            surface_suitability=surface_suitability,
+            overall_pedigree_score=overall_score,
+            distance_category=distance_category,
+        )
 
     def get_sire_statistics(self, sire_name: str) -> dict:
         """
@@ -172,55 +212,101 @@ class PedigreeAnalyzer:
                 - avg_earnings: Average earnings per runner
                 - best_distance: Most successful distance range
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            # Get progeny performance
-            query = """
-                SELECT
-                    COUNT(DISTINCT h.horse_id) as progeny_count,
-                    COUNT(DISTINCT CASE WHEN r.finish_position = 1 THEN h.horse_id END) as winners,
-                    COUNT(DISTINCT CASE WHEN ra.race_class LIKE '%G%' OR ra.race_class LIKE '%Listed%'
-                                   THEN h.horse_id END) as stakes_winners,
-                    AVG(r.prize_money) as avg_earnings
-                FROM horses h
-                LEFT JOIN results r ON h.horse_id = r.horse_id
-                LEFT JOIN races ra ON r.race_id = ra.race_id
-                WHERE h.sire = ?
-            """
-
-            result = conn.execute(query, [sire_name]).fetchone()
-
-            if not result or result[0] == 0:
-                return {
-                    "progeny_count": 0,
-                    "winners": 0,
-                    "win_rate": 0.0,
-                    "stakes_winners": 0,
-                    "avg_earnings": 0,
-                    "best_distance": "unknown",
-                }
-
-            progeny_count, winners, stakes_winners, avg_earnings = result
-
-            win_rate = (winners / progeny_count * 100) if progeny_count > 0 else 0
-
-            # Find best distance range
-            best_distance = self._find_best_distance_range(sire_name, conn)
+        stats = self._get_progeny_stats("sire", sire_name)
 
+        if not stats or stats["progeny"] == 0:
             return {
-                "progeny_count": progeny_count,
-                "winners": winners or 0,
-                "win_rate": round(win_rate, 1),
-                "stakes_winners": stakes_winners or 0,
-                "avg_earnings": int(avg_earnings or 0),
-                "best_distance": best_distance,
+                "progeny_count": 0,
+                "winners": 0,
+                "win_rate": 0.0,
+                "stakes_winners": 0,
+                "avg_earnings": 0,
+                "best_distance": "unknown",
             }
 
-        finally:
-            conn.close()
+        progeny_count = stats["progeny"]
+        win_rate = stats["winners"] / progeny_count * 100
+        avg_earnings = stats["prize_money"] / stats["starts"] if stats["starts"] else 0
+
+        return {
+            "progeny_count": progeny_count,
+            "winners": stats["winners"],
+            "win_rate": round(win_rate, 1),
+            "stakes_winners": stats["stakes_winners"],
+            "avg_earnings": int(avg_earnings),
+            "best_distance": self._find_best_distance_range(sire_name),
+        }
+
+    def reload(self) -> None:
+        """Drop cached progeny aggregates (next lookup reloads them)."""
+        self._progeny_stats = None
+        self._progeny_distances = {}
 
-    def _rate_stallion(self, sire_name: str, conn) -> int:
+    def _load_progeny_aggregates(self) -> None:
+        """Load both progeny aggregate tables into dict lookups."""
+        conn = self.connections.cursor()
+
+        try:
+            stats_rows = conn.execute(
+                """
+                SELECT parent_role, parent_name, progeny, runners, winners,
+                       stakes_winners, g1_winners, starts, wins, prize_money,
+                       win_prize_money
+                FROM progeny_stats
+                """
+            ).fetchall()
+            distance_rows = conn.execute(
+                """
+                SELECT parent_role, parent_name, distance, track_type,
+                       starts, wins, top3
+                FROM progeny_distance_stats
+                """
+            ).fetchall()
+        except Exception as e:
+            logger.warning(
+                f"Progeny aggregates unavailable ({e}); run "
+                "ProgenyAggregates().refresh() to build them"
+            )
+            stats_rows, distance_rows = [], []
+
+        columns = (
+            "progeny",
+            "runners",
+            "winners",
+            "stakes_winners",
+            "g1_winners",
+            "starts",
+            "wins",
+            "prize_money",
+            "win_prize_money",
+        )
+        self._progeny_stats = {
+            (row[0], row[1]): dict(zip(columns, row[2:])) for row in stats_rows
+        }
+
+        self._progeny_distances = {}
+        for role, name, distance, track_type, starts, wins, top3 in distance_rows:
+            self._progeny_distances.setdefault((role, name), []).append(
+                (distance, track_type, starts, wins, top3)
+            )
+
+        logger.info(f"Loaded progeny aggregates for {len(self._progeny_stats)} parents")
+
+    def _get_progeny_stats(self, role: str, parent_name: str | None) -> dict | None:
+        """Aggregate row for a parent, or None if no progeny are recorded."""
+        if not parent_name:
+            return None
+        if self._progeny_stats is None:
+            self._load_progeny_aggregates()
+        return self._progeny_stats.get((role, parent_name))
+
+    def _get_progeny_distances(self, role: str, parent_name: str) -> list[tuple]:
+        """(distance, track_type, starts, wins, top3) rows for a parent."""
+        if self._progeny_stats is None:
+            self._load_progeny_aggregates()
+        return self._progeny_distances.get((role, parent_name), [])
+
+    def _rate_stallion(self, sire_name: str) -> int:
         """
         Rate stallion quality based on progeny performance.
 
@@ -234,7 +320,6 @@ class PedigreeAnalyzer:
 
         Args:
             sire_name: Stallion name
-            conn: Database connection
 
         Returns:
             Sire rating (0-150)
@@ -242,39 +327,25 @@ class PedigreeAnalyzer:
         if not sire_name:
             return 70  # Neutral for unknown
 
-        query = """
-            SELECT
-                COUNT(DISTINCT h.horse_id) as progeny,
-                COUNT(DISTINCT CASE WHEN r.finish_position = 1 THEN h.horse_id END) as winners,
-                COUNT(DISTINCT CASE WHEN ra.race_class LIKE '%G1%' OR ra.race_class LIKE '%Group 1%'
-                               THEN h.horse_id END) as g1_winners,
-                COUNT(DISTINCT CASE WHEN ra.race_class LIKE '%G%' OR ra.race_class LIKE '%Listed%'
-                               THEN h.horse_id END) as stakes_winners,
-                AVG(CASE WHEN r.finish_position = 1 THEN r.prize_money END) as avg_win_prizemoney
-            FROM horses h
-            LEFT JOIN results r ON h.horse_id = r.horse_id
-            LEFT JOIN races ra ON r.race_id = ra.race_id
-            WHERE h.sire = ?
-        """
-
-        result = conn.execute(query, [sire_name]).fetchone()
+        stats = self._get_progeny_stats("sire", sire_name)
 
-        if not result or result[0] == 0:
+        if not stats or stats["progeny"] == 0:
             return 70  # Default neutral rating
 
-        progeny, winners, g1_winners, stakes_winners, avg_prizemoney = result
-
         # Calculate base rating from win rate
-        win_rate = winners / progeny if progeny > 0 else 0
+        win_rate = stats["winners"] / stats["progeny"]
         base_rating = 60 + int(win_rate * 100)  # 0% = 60, 100% = 160 (capped later)
 
         # Adjust for quality of winners
-        if g1_winners and g1_winners > 0:
+        if stats["g1_winners"] > 0:
             base_rating += 30  # Elite sire bonus
-        elif stakes_winners and stakes_winners > 0:
+        elif stats["stakes_winners"] > 0:
             base_rating += 15  # Stakes sire bonus
 
         # Adjust for prize money (indicator of class)
+        avg_prizemoney = (
+            stats["win_prize_money"] / stats["wins"] if stats["wins"] else None
+        )
         if avg_prizemoney and avg_prizemoney > 100000:
             base_rating += 10
         elif avg_prizemoney and avg_prizemoney > 50000:
@@ -282,7 +353,7 @@ class PedigreeAnalyzer:
 
         return max(50, min(150, base_rating))
 
-    def _rate_broodmare(self, dam_name: str, conn) -> int:
+    def _rate_broodmare(self, dam_name: str) -> int:
         """
         Rate broodmare quality based on produce record.
 
@@ -290,7 +361,6 @@ class PedigreeAnalyzer:
 
         Args:
             dam_name: Broodmare name
-            conn: Database connection
 
         Returns:
             Dam rating (0-150)
@@ -298,36 +368,24 @@ class PedigreeAnalyzer:
         if not dam_name:
             return 70  # Neutral for unknown
 
-        query = """
-            SELECT
-                COUNT(DISTINCT h.horse_id) as foals,
-                COUNT(DISTINCT CASE WHEN r.finish_position = 1 THEN h.horse_id END) as winners,
-                COUNT(DISTINCT CASE WHEN ra.race_class LIKE '%G%' OR ra.race_class LIKE '%Listed%'
-                               THEN h.horse_id END) as stakes_winners
-            FROM horses h
-            LEFT JOIN results r ON h.horse_id = r.horse_id
-            LEFT JOIN races ra ON r.race_id = ra.race_id
-            WHERE h.dam = ?
-        """
-
-        result = conn.execute(query, [dam_name]).fetchone()
+        stats = self._get_progeny_stats("dam", dam_name)
 
-        if not result or result[0] == 0:
+        if not stats or stats["progeny"] == 0:
             return 70  # Default neutral
 
-        foals, winners, stakes_winners = result
+        foals, winners = stats["progeny"], stats["winners"]
 
         # Simpler rating for dams (smaller samples)
-        if stakes_winners and stakes_winners > 0:
+        if stats["stakes_winners"] > 0:
             return 130  # Produced stakes winner
-        elif winners and winners > 0:
-            win_rate = winners / foals if foals > 0 else 0
+        elif winners > 0:
+            win_rate = winners / foals
             return 80 + int(win_rate * 50)
         else:
             return 65  # No winners yet
 
     def _calculate_distance_suitability(
-        self, sire_name: str, race_distance: int, conn
+        self, sire_name: str, race_distance: int
     ) -> float:
         """
         Calculate suitability for specific race distance.
@@ -337,7 +395,6 @@ class PedigreeAnalyzer:
         Args:
             sire_name: Stallion name
             race_distance: Target race distance
-            conn: Database connection
 
         Returns:
             Suitability percentage (0-100)
@@ -349,24 +406,19 @@ class PedigreeAnalyzer:
         min_dist = race_distance - 200
         max_dist = race_distance + 200
 
-        query = """
-            SELECT
-                COUNT(*) as races,
-                AVG(CASE WHEN r.finish_position <= 3 THEN 1.0 ELSE 0.0 END) as top3_rate
-            FROM horses h
-            JOIN results r ON h.horse_id = r.horse_id
-            JOIN races ra ON r.race_id = ra.race_id
-            WHERE h.sire = ?
-                AND ra.distance BETWEEN ? AND ?
-        """
+        races = top3 = 0
+        for distance, _, starts, _, placed in self._get_progeny_distances(
+            "sire", sire_name
+        ):
+            if min_dist <= distance <= max_dist:
+                races += starts
+                top3 += placed
 
-        result = conn.execute(query, [sire_name, min_dist, max_dist]).fetchone()
-
-        if not result or result[0] < 5:
+        if races < 5:
             # Insufficient data - use distance category matching
-            return self._estimate_distance_suitability(sire_name, race_distance, conn)
+            return self._estimate_distance_suitability(sire_name, race_distance)
 
-        races, top3_rate = result
+        top3_rate = top3 / races
 
         # Convert top-3 rate to suitability percentage
         # 33% top-3 rate = average (50% suitability)
@@ -381,11 +433,11 @@ class PedigreeAnalyzer:
         return round(min(100, suitability), 1)
 
     def _estimate_distance_suitability(
-        self, sire_name: str, race_distance: int, conn
+        self, sire_name: str, race_distance: int
     ) -> float:
         """Estimate suitability when insufficient data at specific distance."""
         # Get sire's overall best distance range
-        best_range = self._find_best_distance_range(sire_name, conn)
+        best_range = self._find_best_distance_range(sire_name)
 
         race_category = self._classify_distance(race_distance)
 
@@ -398,7 +450,7 @@ class PedigreeAnalyzer:
             return 40.0  # Mismatch
 
     def _calculate_surface_suitability(
-        self, sire_name: str, race_surface: str, conn
+        self, sire_name: str, race_surface: str
     ) -> float:
         """
         Calculate suitability for race surface.
@@ -406,7 +458,6 @@ class PedigreeAnalyzer:
         Args:
             sire_name: Stallion name
             race_surface: Surface type (turf/synthetic)
-            conn: Database connection
 
         Returns:
             Suitability percentage (0-100)
@@ -419,55 +470,42 @@ class PedigreeAnalyzer:
             return 85.0  # Most sires suit turf
 
         # For synthetic, check actual performance
-        query = """
-            SELECT
-                COUNT(*) as races,
-                AVG(CASE WHEN r.finish_position <= 3 THEN 1.0 ELSE 0.0 END) as top3_rate
-            FROM horses h
-            JOIN results r ON h.horse_id = r.horse_id
-            JOIN races ra ON r.race_id = ra.race_id
-            WHERE h.sire = ?
-                AND LOWER(ra.track_type) = ?
-        """
-
-        result = conn.execute(query, [sire_name, race_surface.lower()]).fetchone()
-
-        if not result or result[0] < 3:
+        races = top3 = 0
+        for _, track_type, starts, _, placed in self._get_progeny_distances(
+            "sire", sire_name
+        ):
+            if track_type == race_surface.lower():
+                races += starts
+                top3 += placed
+
+        if races < 3:
             return 60.0  # Neutral for synthetic with limited data
 
-        races, top3_rate = result
-
         # Convert to suitability
-        suitability = top3_rate * 200
+        suitability = top3 / races * 200
         return round(min(100, suitability), 1)
 
-    def _find_best_distance_range(self, sire_name: str, conn) -> str:
+    def _find_best_distance_range(self, sire_name: str) -> str:
         """Find the distance range where sire's progeny perform best."""
-        query = """
-            SELECT
-                CASE
-                    WHEN ra.distance <= 1200 THEN 'sprint'
-                    WHEN ra.distance <= 1600 THEN 'mile'
-                    WHEN ra.distance <= 2000 THEN 'middle'
-                    ELSE 'staying'
-                END as distance_cat,
-                COUNT(*) as races,
-                AVG(CASE WHEN r.finish_position = 1 THEN 1.0 ELSE 0.0 END) as win_rate
-            FROM horses h
-            JOIN results r ON h.horse_id = r.horse_id
-            JOIN races ra ON r.race_id = ra.race_id
-            WHERE h.sire = ?
-            GROUP BY distance_cat
-            ORDER BY win_rate DESC
-            LIMIT 1
-        """
+        categories: dict[str, list[int]] = {}
+        for distance, _, starts, wins, _ in self._get_progeny_distances(
+            "sire", sire_name
+        ):
+            totals = categories.setdefault(self._classify_distance(distance), [0, 0])
+            totals[0] += starts
+            totals[1] += wins
+
+        if not categories:
+            return "unknown"
 
-        result = conn.execute(query, [sire_name]).fetchone()
+        best_category, (races, wins) = max(
+            categories.items(), key=lambda item: item[1][1] / item[1][0]
+        )
 
-        if not result or result[1] < 3:
+        if races < 3:
             return "unknown"
 
-        return result[0]
+        return best_category
 
     def _classify_distance(self, distance: int) -> str:
         """Classify distance into category."""
@@ -0,0 +1,356 @@
+"""
+Population percentile index for speed ratings.
+
+Speed ratings are integers clamped to 0-150, so an exact fixed-bin CDF per
+(distance band, track-condition bucket) is only 151 counters per cell. The
+index is built once from the results table, updated incrementally as races
+are ingested, and answers "what share of comparable performances rated at
+or below X" with an array lookup, cheap enough for the prediction hot path.
+
+Cells:
+    Distance bands: sprint (<=1200m), mile (<=1600m), middle (<=2000m), staying
+    Condition buckets: firm, good, soft, heavy (unknown -> good)
+
+Usage:
+    from src.features.percentiles import SpeedPercentileIndex
+
+    index = SpeedPercentileIndex.build()
+    index.save()
+
+    index = SpeedPercentileIndex.load(db_path="data/racing.duckdb")
+    index.percentile(distance=1200, track_condition="Soft 7", rating=104)
+
+    # Keep current as races land, and fill SpeedRating.population_percentile
+    etl = RacingETL(post_ingest_hooks=[index.update_race])
+    engine = SpeedRatingsEngine(percentile_index=index)
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+
+if TYPE_CHECKING:
+    from src.features.speed_ratings import SpeedRatingsEngine
+
+logger = logging.getLogger(__name__)
+
+
+MAX_RATING = 150
+
+# Upper bounds (inclusive) of each distance band; last band is open-ended
+DISTANCE_BAND_LIMITS = (1200, 1600, 2000)
+DISTANCE_BANDS = ("sprint", "mile", "middle", "staying")
+
+CONDITION_BUCKETS = ("firm", "good", "soft", "heavy")
+DEFAULT_CONDITION_BUCKET = "good"
+
+
+def distance_band(distances: Any) -> np.ndarray:
+    """Distance band index for each distance (0 = sprint ... 3 = staying)."""
+    return np.searchsorted(
+        DISTANCE_BAND_LIMITS, np.asarray(distances, dtype=np.float64), side="left"
+    )
+
+
+def condition_bucket(conditions: Any) -> np.ndarray:
+    """Condition bucket index for each track condition string."""
+    codes, uniques = pd.factorize(pd.Series(conditions, dtype=object))
+    lookup = np.array([_bucket_index(u) for u in uniques] + [_bucket_index(None)])
+    # factorize marks missing values as -1, which picks the trailing default
+    return lookup[codes]
+
+
+def _bucket_index(condition: str | None) -> int:
+    """Bucket index for one condition (first word, e.g. "Soft 7" -> soft)."""
+    if isinstance(condition, str) and condition.strip():
+        word = condition.strip().split()[0].lower()
+        if word in CONDITION_BUCKETS:
+            return CONDITION_BUCKETS.index(word)
+    return CONDITION_BUCKETS.index(DEFAULT_CONDITION_BUCKET)
+
+
+class SpeedPercentileIndex:
+    """
+    Fixed-bin CDF of speed ratings per distance band and condition bucket.
+
+    Percentile = share of the cell's population rated at or below the given
+    rating (0-100). Cells with no history return None.
+    """
+
+    def __init__(
+        self,
+        counts: np.ndarray | None = None,
+        race_ids: set[str] | None = None,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            counts: Rating counts, shape (bands, buckets, MAX_RATING + 1)
+            race_ids: Races already counted (makes update_race idempotent)
+            db_path: Database read by update_race()
+            connections: Shared connection manager (default: process-wide
+                manager for db_path)
+        """
+        self.db_path = db_path
+        self._connections = connections
+        shape = (len(DISTANCE_BANDS), len(CONDITION_BUCKETS), MAX_RATING + 1)
+        if counts is None:
+            counts = np.zeros(shape, dtype=np.int64)
+        if counts.shape != shape:
+            raise ValueError(f"Expected counts of shape {shape}, got {counts.shape}")
+        self.counts = counts.astype(np.int64)
+
+        self.race_ids: set[str] = set(race_ids or ())
+        self._cdf: np.ndarray | None = None
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    # ------------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------------
+
+    def add(self, distances: Any, track_conditions: Any, ratings: Any) -> None:
+        """
+        Add rated performances to the population.
+
+        Args:
+            distances: Race distances in meters
+            track_conditions: Track condition strings
+            ratings: Final speed ratings (0-150)
+        """
+        ratings = np.clip(np.asarray(ratings, dtype=np.int64), 0, MAX_RATING)
+        if ratings.size == 0:
+            return
+
+        np.add.at(
+            self.counts,
+            (distance_band(distances), condition_bucket(track_conditions), ratings),
+            1,
+        )
+        self._cdf = None
+
+    def update_race(
+        self,
+        race_id: str,
+        engine: SpeedRatingsEngine | None = None,
+        connections: DuckDBConnectionManager | None = None,
+    ) -> int:
+        """
+        Add one race's results (post-ingest hook; races are counted once).
+
+        A race without timed results (e.g. a card ingested before the race
+        is run) is not marked as counted, so a later reload adds its results.
+
+        Args:
+            race_id: Race identifier
+            engine: Engine used to rate results without a stored rating
+            connections: Connection manager (default: the index's)
+
+        Returns:
+            Number of performances added
+        """
+        if race_id in self.race_ids:
+            return 0
+
+        connections = connections or self.connections
+        engine = engine or _default_engine(connections)
+        frame = _load_results(connections, engine, race_id)
+        if len(frame) > 0:
+            self.add(frame["distance"], frame["track_condition"], frame["rating"])
+            self.race_ids.add(race_id)
+        return len(frame)
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    @property
+    def cdf(self) -> np.ndarray:
+        """Cumulative share at or below each rating, per cell (NaN if empty)."""
+        if self._cdf is None:
+            cumulative = np.cumsum(self.counts, axis=-1, dtype=np.float64)
+            totals = cumulative[..., -1:]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self._cdf = np.where(totals > 0, cumulative / totals * 100, np.nan)
+        return self._cdf
+
+    def percentile(
+        self, distance: int, track_condition: str | None, rating: int
+    ) -> float | None:
+        """
+        Population percentile of one rating.
+
+        Args:
+            distance: Race distance in meters
+            track_condition: Track condition (e.g., "Good 4")
+            rating: Speed rating
+
+        Returns:
+            Percentile (0-100), or None if the cell has no history
+        """
+        value = self.cdf[
+            int(distance_band(distance)),
+            _bucket_index(track_condition),
+            int(min(max(rating, 0), MAX_RATING)),
+        ]
+        return None if np.isnan(value) else round(float(value), 1)
+
+    def percentiles(
+        self, distances: Any, track_conditions: Any, ratings: Any
+    ) -> np.ndarray:
+        """Vectorized percentile() (NaN where the cell has no history)."""
+        ratings = np.clip(np.asarray(ratings, dtype=np.int64), 0, MAX_RATING)
+        values = self.cdf[
+            distance_band(distances), condition_bucket(track_conditions), ratings
+        ]
+        return np.round(values, 1)
+
+    @property
+    def total(self) -> int:
+        """Number of performances in the index."""
+        return int(self.counts.sum())
+
+    # ------------------------------------------------------------------------
+    # Build / persistence
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        engine: SpeedRatingsEngine | None = None,
+    ) -> SpeedPercentileIndex:
+        """
+        Build the index from every timed result in the database.
+
+        Stored speed ratings are used where present; the rest are rated in
+        one bulk pass.
+
+        Args:
+            db_path: Path to DuckDB database
+            connections: Connection manager (default: process-wide manager)
+            engine: Engine for missing ratings (default: one sharing connections)
+
+        Returns:
+            Populated SpeedPercentileIndex
+        """
+        index = cls(db_path=db_path, connections=connections)
+        engine = engine or _default_engine(index.connections)
+        frame = _load_results(index.connections, engine)
+
+        index.race_ids = set(frame["race_id"])
+        index.add(frame["distance"], frame["track_condition"], frame["rating"])
+
+        logger.info(
+            f"✓ Built speed percentile index from {index.total} performances "
+            f"({len(index.race_ids)} races)"
+        )
+        return index
+
+    @staticmethod
+    def default_path() -> Path:
+        """Default index location inside the feature store directory."""
+        from src.utils.config import settings
+
+        return Path(settings.feature_store_path) / "speed_percentiles.npz"
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """Save counts and counted race_ids to a compressed .npz file."""
+        path = Path(path) if path else self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            counts=self.counts,
+            race_ids=np.array(sorted(self.race_ids), dtype=str),
+        )
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path | None = None,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ) -> SpeedPercentileIndex:
+        """
+        Load an index saved with save().
+
+        Args:
+            path: Index file (default: default_path())
+            db_path: Database read by update_race()
+            connections: Shared connection manager (default: process-wide
+                manager for db_path)
+        """
+        path = Path(path) if path else cls.default_path()
+        with np.load(path) as data:
+            return cls(
+                counts=data["counts"],
+                race_ids=set(data["race_ids"].tolist()),
+                db_path=db_path,
+                connections=connections,
+            )
+
+
+def _default_engine(connections: DuckDBConnectionManager) -> SpeedRatingsEngine:
+    """Speed engine without a percentile index (avoids recursion when rating)."""
+    from src.features.speed_ratings import SpeedRatingsEngine
+
+    return SpeedRatingsEngine(str(connections.db_path), connections=connections)
+
+
+def _load_results(
+    connections: DuckDBConnectionManager,
+    engine: SpeedRatingsEngine,
+    race_id: str | None = None,
+) -> pd.DataFrame:
+    """Timed results with a final rating column (stored or bulk-calculated)."""
+    race_filter = "AND r.race_id = ?" if race_id else ""
+    frame = (
+        connections.cursor()
+        .execute(
+            f"""
+            SELECT
+                r.race_id,
+                r.distance,
+                r.track_condition,
+                res.race_time,
+                res.sectional_600m,
+                res.sectional_400m,
+                res.sectional_200m,
+                res.speed_rating
+            FROM results res
+            JOIN races r ON res.race_id = r.race_id
+            WHERE res.race_time IS NOT NULL
+              {race_filter}
+            """,
+            [race_id] if race_id else [],
+        )
+        .df()
+    )
+
+    ratings = frame["speed_rating"].to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(ratings)
+    if missing.any():
+        ratings[missing] = engine.calculate_ratings_bulk(frame[missing])[
+            "final_rating"
+        ].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Unratable times (e.g. 0) are left out of the population
+    rated = ~np.isnan(ratings)
+    return frame[rated].assign(rating=ratings[rated].astype(np.int64))
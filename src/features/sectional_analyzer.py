@@ -8,6 +8,10 @@ Analyzes sectional times (L600, L400, L200) to:
 - Identify sectional balance (even vs sprint finish)
 - Compare relative sectional performance within field
 
+Field percentiles are computed for any number of races at once with a
+grouped rank (analyze_races_sectionals), so a historical backfill of every
+race's sectional profiles is a single vectorized pass.
+
 Author: Racing Analysis System
 Date: November 2025
 """
@@ -15,13 +19,44 @@ Date: November 2025
 from __future__ import annotations
 
 import logging
+import warnings
 from dataclasses import dataclass
 from typing import Optional
 
-import duckdb
+import numpy as np
+import pandas as pd
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.features.history import SECTIONAL_RANK, FormHistoryLoader, recent_starts
 
 logger = logging.getLogger(__name__)
 
+# Split name -> (results column, split length in meters)
+SECTIONAL_SPLITS = {
+    "L600": ("sectional_600m", 600),
+    "L400": ("sectional_400m", 400),
+    "L200": ("sectional_200m", 200),
+}
+
+# Columns of the frame returned by analyze_sectionals_bulk()
+PROFILE_COLUMNS = [
+    "race_id",
+    "horse_id",
+    "distance",
+    "L600_time",
+    "L400_time",
+    "L200_time",
+    "L600_speed",
+    "L400_speed",
+    "L200_speed",
+    "finish_speed_rating",
+    "pace_profile",
+    "sectional_balance",
+    "L600_percentile",
+    "L400_percentile",
+    "L200_percentile",
+]
+
 
 @dataclass
 class SectionalProfile:
@@ -74,9 +109,21 @@ class SectionalAnalyzer:
     - Measure pace balance (even vs late acceleration)
     """
 
-    def __init__(self, db_path: str = "data/racing.duckdb"):
-        """Initialize analyzer with database connection."""
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+    ):
+        """Initialize analyzer with a shared database connection manager."""
         self.db_path = db_path
+        self._connections = connections
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
 
     def analyze_sectionals(
         self,
@@ -150,77 +197,120 @@ class SectionalAnalyzer:
         Returns:
             List of SectionalProfile objects with percentiles
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            # Get all results with sectional times
-            query = """
-                SELECT
-                    r.race_id,
-                    r.horse_id,
-                    ra.distance,
-                    r.sectional_600m,
-                    r.sectional_400m,
-                    r.sectional_200m
-                FROM results r
-                JOIN races ra ON r.race_id = ra.race_id
-                WHERE r.race_id = ?
-                ORDER BY r.finish_position
-            """
-
-            results = conn.execute(query, [race_id]).fetchall()
-
-            if not results:
-                logger.warning(f"No results found for race {race_id}")
-                return []
-
-            profiles = []
-            L600_speeds = []
-            L400_speeds = []
-            L200_speeds = []
-
-            # First pass: calculate all profiles
-            for row in results:
-                race_id, horse_id, distance, L600, L400, L200 = row
-
-                profile = self.analyze_sectionals(
-                    race_id=race_id,
-                    horse_id=horse_id,
-                    distance=distance,
-                    L600_time=L600,
-                    L400_time=L400,
-                    L200_time=L200,
-                )
+        frame = self.analyze_races_sectionals([race_id])
+
+        if frame.empty:
+            logger.warning(f"No results found for race {race_id}")
+            return []
+
+        return [
+            SectionalProfile(
+                horse_id=row.horse_id,
+                race_id=row.race_id,
+                distance=int(row.distance),
+                L600_time=_optional_float(row.L600_time),
+                L400_time=_optional_float(row.L400_time),
+                L200_time=_optional_float(row.L200_time),
+                L600_speed=_optional_float(row.L600_speed),
+                L400_speed=_optional_float(row.L400_speed),
+                L200_speed=_optional_float(row.L200_speed),
+                finish_speed_rating=int(row.finish_speed_rating),
+                pace_profile=row.pace_profile,
+                sectional_balance=float(row.sectional_balance),
+                L600_percentile=_optional_float(row.L600_percentile),
+                L400_percentile=_optional_float(row.L400_percentile),
+                L200_percentile=_optional_float(row.L200_percentile),
+            )
+            for row in frame.itertuples(index=False)
+        ]
+
+    def analyze_races_sectionals(
+        self, race_ids: list[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Analyze sectionals for many races in one query and one vectorized pass.
 
-                profiles.append(profile)
-
-                # Collect speeds for percentile calculation
-                if profile.L600_speed:
-                    L600_speeds.append(profile.L600_speed)
-                if profile.L400_speed:
-                    L400_speeds.append(profile.L400_speed)
-                if profile.L200_speed:
-                    L200_speeds.append(profile.L200_speed)
-
-            # Second pass: assign percentiles
-            for profile in profiles:
-                if profile.L600_speed and L600_speeds:
-                    profile.L600_percentile = self._calculate_percentile(
-                        profile.L600_speed, L600_speeds
-                    )
-                if profile.L400_speed and L400_speeds:
-                    profile.L400_percentile = self._calculate_percentile(
-                        profile.L400_speed, L400_speeds
-                    )
-                if profile.L200_speed and L200_speeds:
-                    profile.L200_percentile = self._calculate_percentile(
-                        profile.L200_speed, L200_speeds
-                    )
-
-            return profiles
-
-        finally:
-            conn.close()
+        Args:
+            race_ids: Races to analyze (default: every race with results, i.e.
+                a full historical backfill)
+
+        Returns:
+            DataFrame with PROFILE_COLUMNS, ordered by race and finish position
+        """
+        if race_ids is not None and not race_ids:
+            return pd.DataFrame(columns=PROFILE_COLUMNS)
+
+        conn = self.connections.cursor()
+
+        race_filter = "WHERE r.race_id IN (SELECT UNNEST(?))" if race_ids else ""
+        query = f"""
+            SELECT
+                r.race_id,
+                run.horse_id,
+                ra.distance,
+                r.sectional_600m,
+                r.sectional_400m,
+                r.sectional_200m
+            FROM results r
+            JOIN races ra ON r.race_id = ra.race_id
+            JOIN runs run ON r.run_id = run.run_id
+            {race_filter}
+            ORDER BY r.race_id, r.finish_position
+        """
+
+        results = conn.execute(query, [list(race_ids)] if race_ids else []).df()
+        return self.analyze_sectionals_bulk(results)
+
+    def analyze_sectionals_bulk(self, results: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized analyze_sectionals() plus within-race field percentiles.
+
+        Uses the same thresholds, int truncation and rounding as the per-row
+        scoring; percentiles are ranked per race_id.
+
+        Args:
+            results: Frame with race_id, horse_id, distance and the
+                sectional_600m/400m/200m columns (null or 0 = not recorded)
+
+        Returns:
+            DataFrame with PROFILE_COLUMNS (same row order as the input)
+        """
+        frame = pd.DataFrame(
+            {
+                "race_id": results["race_id"].to_numpy(),
+                "horse_id": results["horse_id"].to_numpy(),
+                "distance": results["distance"].to_numpy(),
+            }
+        )
+
+        speeds = {}
+        for split, (column, meters) in SECTIONAL_SPLITS.items():
+            times = pd.to_numeric(results[column], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                speeds[split] = np.where(times > 0, meters / times, np.nan)
+            frame[f"{split}_time"] = times
+        for split, speed in speeds.items():
+            frame[f"{split}_speed"] = speed
+
+        distance = frame["distance"].to_numpy(dtype=np.float64)
+        frame["finish_speed_rating"] = _finish_speed_ratings(speeds["L200"], distance)
+        frame["pace_profile"] = _pace_profiles(
+            speeds["L600"], speeds["L400"], speeds["L200"]
+        )
+        frame["sectional_balance"] = _sectional_balances(
+            np.column_stack(list(speeds.values()))
+        )
+
+        percentiles = field_percentiles(
+            frame, [f"{split}_speed" for split in SECTIONAL_SPLITS]
+        )
+        for split in SECTIONAL_SPLITS:
+            frame[f"{split}_percentile"] = percentiles[f"{split}_speed"]
+
+        frame.index = results.index
+        return frame[PROFILE_COLUMNS]
 
     def get_horse_sectional_pattern(
         self, horse_id: str, last_n_starts: int = 5
@@ -239,80 +329,88 @@ class SectionalAnalyzer:
                 - consistency: Standard deviation of sectional balance
                 - starts_analyzed: Number of runs with sectional data
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            query = """
-                SELECT
-                    r.race_id,
-                    ra.distance,
-                    r.sectional_600m,
-                    r.sectional_400m,
-                    r.sectional_200m
-                FROM results r
-                JOIN races ra ON r.race_id = ra.race_id
-                WHERE r.horse_id = ?
-                    AND r.sectional_200m IS NOT NULL
-                ORDER BY ra.date DESC
-                LIMIT ?
-            """
-
-            results = conn.execute(query, [horse_id, last_n_starts]).fetchall()
-
-            if not results:
-                return {
-                    "dominant_style": "unknown",
-                    "avg_finish_speed": 0,
-                    "avg_sectional_balance": 0.0,
-                    "consistency": 0.0,
-                    "starts_analyzed": 0,
-                }
-
-            profiles = []
-            for row in results:
-                race_id, distance, L600, L400, L200 = row
-                profile = self.analyze_sectionals(
-                    race_id=race_id,
-                    horse_id=horse_id,
-                    distance=distance,
-                    L600_time=L600,
-                    L400_time=L400,
-                    L200_time=L200,
-                )
-                profiles.append(profile)
-
-            # Analyze patterns
-            pace_profiles = [p.pace_profile for p in profiles]
-            finish_speeds = [p.finish_speed_rating for p in profiles]
-            balances = [p.sectional_balance for p in profiles]
+        return self.get_sectional_patterns([horse_id], last_n_starts)[horse_id]
 
-            # Find dominant style (most common)
-            dominant_style = max(set(pace_profiles), key=pace_profiles.count)
+    def get_sectional_patterns(
+        self,
+        horse_ids: list[str],
+        last_n_starts: int = 5,
+        history: pd.DataFrame | None = None,
+    ) -> dict[str, dict]:
+        """
+        Identify running styles for many horses from one history frame.
 
-            # Calculate averages
-            avg_finish_speed = sum(finish_speeds) / len(finish_speeds)
-            avg_balance = sum(balances) / len(balances)
+        Args:
+            horse_ids: Horse identifiers
+            last_n_starts: Number of recent starts with sectionals to analyze
+            history: Frame from FormHistoryLoader.load() (loaded if omitted)
 
-            # Calculate consistency (lower = more consistent)
-            if len(balances) > 1:
-                mean_balance = sum(balances) / len(balances)
-                variance = sum((x - mean_balance) ** 2 for x in balances) / len(
-                    balances
+        Returns:
+            Dict mapping horse_id to the get_horse_sectional_pattern() statistics
+        """
+        if history is None:
+            history = FormHistoryLoader(self.db_path, self.connections).load(
+                horse_ids, last_n_starts
+            )
+
+        patterns = {}
+        for horse_id in horse_ids:
+            starts = recent_starts(history, horse_id, SECTIONAL_RANK, last_n_starts)
+            profiles = [
+                self.analyze_sectionals(
+                    race_id=row.race_id,
+                    horse_id=horse_id,
+                    distance=int(row.distance),
+                    L600_time=_optional_float(row.sectional_600m),
+                    L400_time=_optional_float(row.sectional_400m),
+                    L200_time=_optional_float(row.sectional_200m),
                 )
-                consistency = variance**0.5
-            else:
-                consistency = 0.0
+                for row in starts.itertuples(index=False)
+            ]
+            patterns[horse_id] = self._summarize_profiles(profiles)
 
+        return patterns
+
+    def _summarize_profiles(self, profiles: list[SectionalProfile]) -> dict:
+        """Aggregate a horse's recent sectional profiles into pattern statistics."""
+        if not profiles:
             return {
-                "dominant_style": dominant_style,
-                "avg_finish_speed": int(avg_finish_speed),
-                "avg_sectional_balance": round(avg_balance, 2),
-                "consistency": round(consistency, 2),
-                "starts_analyzed": len(profiles),
+                "dominant_style": "unknown",
+                "avg_finish_speed": 0,
+                "avg_sectional_balance": 0.0,
+                "consistency": 0.0,
+                "starts_analyzed": 0,
             }
 
-        finally:
-            conn.close()
+        # Analyze patterns
+        pace_profiles = [p.pace_profile for p in profiles]
+        finish_speeds = [p.finish_speed_rating for p in profiles]
+        balances = [p.sectional_balance for p in profiles]
+
+        # Find dominant style (most common)
+        dominant_style = max(set(pace_profiles), key=pace_profiles.count)
+
+        # Calculate averages
+        avg_finish_speed = sum(finish_speeds) / len(finish_speeds)
+        avg_balance = sum(balances) / len(balances)
+
+        # Calculate consistency (lower = more consistent)
+        if len(balances) > 1:
+            mean_balance = sum(balances) / len(balances)
+            variance = sum((x - mean_balance) ** 2 for x in balances) / len(
+                balances
+            )
+            consistency = variance**0.5
+        else:
+            consistency = 0.0
+
+        return {
+            "dominant_style": dominant_style,
+            "avg_finish_speed": int(avg_finish_speed),
+            "avg_sectional_balance": round(avg_balance, 2),
+            "consistency": round(consistency, 2),
+            "starts_analyzed": len(profiles),
+        }
 
     def _calculate_finish_speed_rating(
         self, L200_speed: Optional[float], distance: int
@@ -489,6 +587,96 @@ class SectionalAnalyzer:
         return round(percentile, 1)
 
 
+def field_percentiles(
+    frame: pd.DataFrame, columns: list[str], group_column: str = "race_id"
+) -> pd.DataFrame:
+    """
+    Percentile rank of each value within its group (0-100, higher = faster).
+
+    Grouped equivalent of SectionalAnalyzer._calculate_percentile(): ties
+    share the best rank, and only non-null values form the field.
+
+    Args:
+        frame: Frame containing group_column and the value columns
+        columns: Columns to rank (e.g. L600_speed, L400_speed, L200_speed)
+        group_column: Column identifying each field (default: race_id)
+
+    Returns:
+        DataFrame of percentiles with the same index and columns (NaN where
+        the value is missing)
+    """
+    grouped = frame.groupby(group_column, sort=False)[columns]
+    ranks = grouped.rank(method="min", ascending=False)
+    field_sizes = grouped.transform("count")
+    return ((field_sizes - ranks + 1) / field_sizes * 100).round(1)
+
+
+def _finish_speed_ratings(L200_speed: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    """Vectorized SectionalAnalyzer._calculate_finish_speed_rating()."""
+    conditions = [distance <= 1200, distance <= 1600]
+    baseline = np.select(conditions, [17.5, 17.0], 16.5)
+    exceptional = np.select(conditions, [19.0, 18.5], 18.0)
+
+    with np.errstate(invalid="ignore"):
+        above = 100 + np.trunc((L200_speed - baseline) / (exceptional - baseline) * 30)
+        below = 50 + np.trunc(L200_speed / baseline * 50)
+        rating = np.select(
+            [
+                np.isnan(L200_speed) | (L200_speed <= 0),
+                L200_speed >= exceptional,
+                L200_speed >= baseline,
+            ],
+            [50, 130, above],
+            below,
+        )
+    return np.clip(rating, 0, 150).astype(np.int64)
+
+
+def _pace_profiles(
+    L600_speed: np.ndarray, L400_speed: np.ndarray, L200_speed: np.ndarray
+) -> np.ndarray:
+    """Vectorized SectionalAnalyzer._classify_pace_profile()."""
+    with np.errstate(invalid="ignore"):
+        acceleration = (L200_speed - L400_speed) / L400_speed
+        early_pace = (L400_speed - L600_speed) / L600_speed
+        has_600 = ~np.isnan(L600_speed)
+
+        return np.select(
+            [
+                np.isnan(L400_speed) | np.isnan(L200_speed),
+                has_600 & (early_pace > 0.05) & (acceleration < -0.05),
+                acceleration > 0.20,
+                acceleration > 0.10,
+                np.abs(acceleration) <= 0.10,
+            ],
+            ["unknown", "leader", "closer", "mid-pack", "on-pace"],
+            "leader",
+        )
+
+
+def _sectional_balances(speeds: np.ndarray) -> np.ndarray:
+    """Vectorized SectionalAnalyzer._calculate_sectional_balance()."""
+    recorded = (~np.isnan(speeds)).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # Rows with no splits at all are neutral anyway
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_speed = np.nanmean(speeds, axis=1)
+        cv = np.nanstd(speeds, axis=1) / mean_speed
+
+    balance = np.select(
+        [recorded < 2, cv < 0.02, cv > 0.10],
+        [0.0, -1.0, 1.0],
+        (cv - 0.02) / 0.08 * 2 - 1,
+    )
+    return np.round(balance, 2)
+
+
+def _optional_float(value) -> Optional[float]:
+    """Convert a nullable numeric (NaN/None/Decimal) to float or None."""
+    return None if pd.isna(value) else float(value)
+
+
 if __name__ == "__main__":
     """Example usage of sectional analyzer."""
 
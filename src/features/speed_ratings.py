@@ -13,6 +13,9 @@ Usage:
 
     engine = SpeedRatingsEngine()
     rating = engine.calculate_speed_rating(race_result)
+
+    # Columnar batch (pyarrow.Table, DataFrame or dict of arrays)
+    ratings = engine.calculate_ratings_bulk(results_table)
 """
 
 from __future__ import annotations
@@ -23,7 +26,13 @@ from datetime import date
 from decimal import Decimal
 from typing import Any
 
-import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.features.history import TIMED_RANK, FormHistoryLoader
+from src.features.percentiles import SpeedPercentileIndex
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +50,7 @@ class SpeedRating:
     sectional_rating: float | None
     final_rating: int
     percentile: float | None
+    population_percentile: float | None = None
 
 
 class SpeedRatingsEngine:
@@ -82,14 +92,36 @@ class SpeedRatingsEngine:
         2400: 6.5,
     }
 
-    def __init__(self, db_path: str = "data/racing.duckdb"):
+    # Integer codes for track conditions in columnar batches (index into this tuple)
+    TRACK_CONDITION_CODES = tuple(TRACK_ADJUSTMENTS)
+
+    # Condition assumed when none is recorded
+    DEFAULT_TRACK_CONDITION = "good 4"
+
+    def __init__(
+        self,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        percentile_index: SpeedPercentileIndex | None = None,
+    ):
         """
         Initialize speed ratings engine.
 
         Args:
             db_path: Path to DuckDB database
+            connections: Shared connection manager (default: process-wide manager)
+            percentile_index: Population index used to fill population_percentile
         """
         self.db_path = db_path
+        self._connections = connections
+        self.percentile_index = percentile_index
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
 
     def calculate_speed_rating(
         self,
@@ -144,6 +176,12 @@ class SpeedRatingsEngine:
         # Clamp to 0-150
         final_rating = max(0, min(150, final_rating))
 
+        population_percentile = None
+        if self.percentile_index is not None:
+            population_percentile = self.percentile_index.percentile(
+                distance, track_condition, final_rating
+            )
+
         return SpeedRating(
             horse_id=horse_id,
             race_id=race_id,
@@ -153,8 +191,150 @@ class SpeedRatingsEngine:
             distance_adjustment=distance_adj,
             sectional_rating=sectional_rating,
             final_rating=final_rating,
-            percentile=None,  # Calculate separately with population data
+            percentile=None,  # Within-race rank, see calculate_race_ratings()
+            population_percentile=population_percentile,
+        )
+
+    def calculate_ratings_bulk(
+        self, batch: pa.Table | pd.DataFrame | dict[str, Any]
+    ) -> pd.DataFrame:
+        """
+        Calculate speed ratings for a columnar batch of performances.
+
+        Vectorized equivalent of calculate_speed_rating(): every step is a
+        NumPy array operation, so whole seasons can be rated in one call.
+        Results match the per-row path exactly (same arithmetic order, int
+        truncation and 0-150 clamp). Performances without a positive
+        race_time cannot be rated and get a null final_rating.
+
+        Expected columns:
+            race_time: Total race time in seconds
+            distance: Race distance in meters
+            track_condition: Condition string (e.g., "Good 4"), or
+                track_condition_code: Index into TRACK_CONDITION_CODES
+                (missing/unknown -> Good 4)
+            sectional_600m, sectional_400m, sectional_200m: Optional splits
+                (null or 0 = not recorded)
+
+        Args:
+            batch: pyarrow Table, pandas DataFrame or mapping of arrays
+
+        Returns:
+            DataFrame (same row order/index as a DataFrame input) with
+            base_speed, adjusted_speed, track_adjustment, distance_adjustment,
+            sectional_rating (NaN when no sectionals) and final_rating
+            (nullable Int64, <NA> when race_time is null or not positive),
+            plus population_percentile when a percentile index is configured
+        """
+        if isinstance(batch, pa.Table):
+            frame = batch.to_pandas()
+        elif isinstance(batch, pd.DataFrame):
+            frame = batch
+        else:
+            frame = pd.DataFrame(batch)
+
+        # Null and non-positive times propagate as NaN (unrated)
+        race_time = _float_column(frame, "race_time")
+        race_time = np.where(race_time > 0, race_time, np.nan)
+        distance = _float_column(frame, "distance")
+
+        # 1. Base speed (meters per second)
+        base_speed = distance / race_time
+
+        # 2. Track condition adjustment
+        track_adj = self._track_adjustments_bulk(frame)
+        adjusted_speed = base_speed * (1 / track_adj)
+
+        # 3. Distance adjustment against the closest par (ties -> shorter par)
+        par_distances = np.array(sorted(self.DISTANCE_PARS), dtype=np.float64)
+        par_values = np.array(
+            [self.DISTANCE_PARS[d] for d in sorted(self.DISTANCE_PARS)]
+        )
+        closest = np.abs(distance[:, None] - par_distances[None, :]).argmin(axis=1)
+        expected_time = (distance / 100) * par_values[closest]
+        distance_adj = ((expected_time - race_time) / expected_time) * 10
+
+        # 4. Sectional rating (only splits that are recorded and non-zero count)
+        sect_400 = _float_column(frame, "sectional_400m")
+        sect_200 = _float_column(frame, "sectional_200m")
+        has_600 = _recorded(_float_column(frame, "sectional_600m"))
+        has_400 = _recorded(sect_400)
+        has_200 = _recorded(sect_200)
+        has_sectionals = has_600 | has_400 | has_200
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rating_200 = ((200 / sect_200) / 16.67) * 100
+            rating_400 = ((400 / sect_400) / 16.67) * 100
+        sectional_rating = np.where(
+            has_200 & has_400, (rating_200 * 0.7) + (rating_400 * 0.3), rating_200
         )
+        sectional_rating = np.where(has_200, sectional_rating, 100.0)
+        sectional_rating = np.where(has_sectionals, sectional_rating, np.nan)
+
+        # 5. Normalize to 0-150 scale (100 = average), truncate like int()
+        raw_rating = (adjusted_speed / 16.67) * 100
+        final_rating = np.where(
+            has_sectionals,
+            (raw_rating * 0.7) + (sectional_rating * 0.3),
+            raw_rating + distance_adj,
+        )
+        final_rating = pd.array(np.clip(np.trunc(final_rating), 0, 150), dtype="Int64")
+
+        ratings = pd.DataFrame(
+            {
+                "base_speed": base_speed,
+                "adjusted_speed": adjusted_speed,
+                "track_adjustment": track_adj,
+                "distance_adjustment": distance_adj,
+                "sectional_rating": sectional_rating,
+                "final_rating": final_rating,
+            },
+            index=frame.index,
+        )
+
+        if self.percentile_index is not None:
+            percentiles = self.percentile_index.percentiles(
+                distance,
+                self._track_conditions_bulk(frame),
+                final_rating.to_numpy(dtype=np.int64, na_value=0),
+            )
+            ratings["population_percentile"] = np.where(
+                final_rating.isna(), np.nan, percentiles
+            )
+
+        return ratings
+
+    def _track_conditions_bulk(self, frame: pd.DataFrame) -> pd.Series:
+        """Track condition strings for a batch (decoding condition codes)."""
+        if "track_condition" in frame or "track_condition_code" not in frame:
+            return frame.get("track_condition", pd.Series(None, index=frame.index))
+
+        names = pd.Series(self.TRACK_CONDITION_CODES)
+        return frame["track_condition_code"].map(names)
+
+    def _track_adjustments_bulk(self, frame: pd.DataFrame) -> np.ndarray:
+        """Track adjustment multipliers for a batch (one lookup per distinct value)."""
+        default = self._get_track_adjustment(self.DEFAULT_TRACK_CONDITION)
+
+        if "track_condition_code" in frame:
+            lookup = np.array(
+                [self.TRACK_ADJUSTMENTS[c] for c in self.TRACK_CONDITION_CODES]
+            )
+            codes = _float_column(frame, "track_condition_code")
+            valid = (codes >= 0) & (codes < len(lookup))
+            safe_codes = np.where(valid, codes, 0).astype(np.int64)
+            return np.where(valid, lookup[safe_codes], default)
+
+        if "track_condition" not in frame:
+            return np.full(len(frame), default)
+
+        conditions = frame["track_condition"]
+        conditions = conditions.mask(
+            conditions.isna() | (conditions == ""), self.DEFAULT_TRACK_CONDITION
+        )
+        codes, uniques = pd.factorize(conditions)
+        lookup = np.array([self._get_track_adjustment(c) for c in uniques])
+        return lookup[codes]
 
     def calculate_race_ratings(self, race_id: str) -> list[SpeedRating]:
         """
@@ -166,79 +346,67 @@ class SpeedRatingsEngine:
         Returns:
             List of SpeedRating objects sorted by rating (descending)
         """
-        con = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            # Query race results with sectionals
-            query = """
-                SELECT
-                    r.race_id,
-                    r.distance,
-                    r.track_condition,
-                    res.horse_id,
-                    res.race_time,
-                    res.sectional_600m,
-                    res.sectional_400m,
-                    res.sectional_200m,
-                    res.finish_position
-                FROM results res
-                JOIN races r ON res.race_id = r.race_id
-                JOIN runs run ON res.run_id = run.run_id
-                WHERE r.race_id = ?
-                  AND res.race_time IS NOT NULL
-                ORDER BY res.finish_position
-            """
-
-            rows = con.execute(query, [race_id]).fetchall()
-
-            ratings = []
-            for row in rows:
-                (
-                    race_id,
-                    distance,
-                    track_condition,
-                    horse_id,
-                    race_time,
-                    sect_600,
-                    sect_400,
-                    sect_200,
-                    position,
-                ) = row
-
-                # Build sectional times dict
-                sectional_times = {}
-                if sect_600:
-                    sectional_times["600m"] = float(sect_600)
-                if sect_400:
-                    sectional_times["400m"] = float(sect_400)
-                if sect_200:
-                    sectional_times["200m"] = float(sect_200)
-
-                rating = self.calculate_speed_rating(
-                    race_id=race_id,
-                    horse_id=horse_id,
-                    race_time=float(race_time),
-                    distance=distance,
-                    track_condition=track_condition or "good 4",
-                    sectional_times=sectional_times if sectional_times else None,
-                )
-
-                ratings.append(rating)
-
-            # Calculate percentiles within race
-            if ratings:
-                sorted_ratings = sorted(
-                    ratings, key=lambda x: x.final_rating, reverse=True
-                )
-                for i, rating in enumerate(sorted_ratings):
-                    rating.percentile = (
-                        (len(sorted_ratings) - i) / len(sorted_ratings)
-                    ) * 100
-
-            return ratings
-
-        finally:
-            con.close()
+        con = self.connections.cursor()
+
+        # Query race results with sectionals
+        query = """
+            SELECT
+                r.race_id,
+                r.distance,
+                r.track_condition,
+                run.horse_id,
+                res.race_time,
+                res.sectional_600m,
+                res.sectional_400m,
+                res.sectional_200m,
+                res.finish_position
+            FROM results res
+            JOIN races r ON res.race_id = r.race_id
+            JOIN runs run ON res.run_id = run.run_id
+            WHERE r.race_id = ?
+              AND res.race_time IS NOT NULL
+            ORDER BY res.finish_position
+        """
+
+        frame = con.execute(query, [race_id]).df()
+        bulk = self.calculate_ratings_bulk(frame)
+
+        rated_rows = [
+            (row, rated)
+            for row, rated in zip(
+                frame.itertuples(index=False), bulk.itertuples(index=False)
+            )
+            if not pd.isna(rated.final_rating)
+        ]
+        ratings = [
+            SpeedRating(
+                horse_id=row.horse_id,
+                race_id=row.race_id,
+                base_speed=rated.base_speed,
+                adjusted_speed=rated.adjusted_speed,
+                track_adjustment=rated.track_adjustment,
+                distance_adjustment=rated.distance_adjustment,
+                sectional_rating=(
+                    None if np.isnan(rated.sectional_rating) else rated.sectional_rating
+                ),
+                final_rating=int(rated.final_rating),
+                percentile=None,
+                population_percentile=_optional(
+                    getattr(rated, "population_percentile", None)
+                ),
+            )
+            for row, rated in rated_rows
+        ]
+
+        # Calculate percentiles within race
+        if ratings:
+            sorted_ratings = sorted(ratings, key=lambda x: x.final_rating, reverse=True)
+            for i, rating in enumerate(sorted_ratings):
+                rating.percentile = (
+                    (len(sorted_ratings) - i) / len(sorted_ratings)
+                ) * 100
+
+        return ratings
 
     def _get_track_adjustment(self, track_condition: str) -> float:
         """Get track condition adjustment multiplier."""
@@ -320,79 +488,96 @@ class SpeedRatingsEngine:
         Returns:
             dict with average, best, and consistency metrics
         """
-        con = duckdb.connect(self.db_path, read_only=True)
-
-        try:
-            # Get recent results
-            query = """
-                SELECT
-                    r.race_id,
-                    r.distance,
-                    r.track_condition,
-                    r.date,
-                    res.race_time,
-                    res.sectional_600m,
-                    res.sectional_400m,
-                    res.sectional_200m,
-                    res.speed_rating
-                FROM results res
-                JOIN races r ON res.race_id = r.race_id
-                JOIN runs run ON res.run_id = run.run_id
-                WHERE run.horse_id = ?
-                  AND res.race_time IS NOT NULL
-                ORDER BY r.date DESC
-                LIMIT ?
-            """
-
-            rows = con.execute(query, [horse_id, last_n_starts]).fetchall()
-
-            if not rows:
-                return {
+        return self.get_average_ratings([horse_id], last_n_starts)[horse_id]
+
+    def get_average_ratings(
+        self,
+        horse_ids: list[str],
+        last_n_starts: int = 5,
+        history: pd.DataFrame | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get average speed ratings for many horses from one history frame.
+
+        Args:
+            horse_ids: Horse identifiers
+            last_n_starts: Number of recent timed starts to average
+            history: Frame from FormHistoryLoader.load() (loaded if omitted)
+
+        Returns:
+            Dict mapping horse_id to the get_horse_average_rating() metrics
+        """
+        if history is None:
+            history = FormHistoryLoader(self.db_path, self.connections).load(
+                horse_ids, last_n_starts
+            )
+
+        timed = history[history[TIMED_RANK] <= last_n_starts]
+
+        # Use stored rating if available, otherwise calculate (one bulk pass)
+        ratings = timed["speed_rating"].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(ratings)
+        if missing.any():
+            ratings[missing] = self.calculate_ratings_bulk(timed[missing])[
+                "final_rating"
+            ].to_numpy(dtype=np.float64, na_value=np.nan)
+        timed = (
+            timed.assign(rating=ratings)
+            .dropna(subset=["rating"])
+            .sort_values(["horse_id", TIMED_RANK])
+        )
+
+        import statistics
+
+        by_horse = {
+            horse_id: group["rating"].tolist()
+            for horse_id, group in timed.groupby("horse_id", sort=False)
+        }
+
+        averages = {}
+        for horse_id in horse_ids:
+            horse_ratings = by_horse.get(horse_id)
+            if not horse_ratings:
+                averages[horse_id] = {
                     "average": None,
                     "best": None,
                     "worst": None,
                     "std_dev": None,
                     "starts": 0,
                 }
-
-            ratings = []
-            for row in rows:
-                # Use stored rating if available, otherwise calculate
-                if row[8] is not None:
-                    ratings.append(row[8])
-                else:
-                    # Calculate on the fly
-                    sectional_times = {}
-                    if row[5]:
-                        sectional_times["600m"] = float(row[5])
-                    if row[6]:
-                        sectional_times["400m"] = float(row[6])
-                    if row[7]:
-                        sectional_times["200m"] = float(row[7])
-
-                    rating = self.calculate_speed_rating(
-                        race_id=row[0],
-                        horse_id=horse_id,
-                        race_time=float(row[4]),
-                        distance=row[1],
-                        track_condition=row[2] or "good 4",
-                        sectional_times=sectional_times if sectional_times else None,
-                    )
-                    ratings.append(rating.final_rating)
-
-            # Calculate statistics
-            import statistics
-
-            return {
-                "average": statistics.mean(ratings),
-                "best": max(ratings),
-                "worst": min(ratings),
-                "std_dev": statistics.stdev(ratings) if len(ratings) > 1 else 0,
-                "starts": len(ratings),
+                continue
+
+            averages[horse_id] = {
+                "average": statistics.mean(horse_ratings),
+                "best": max(horse_ratings),
+                "worst": min(horse_ratings),
+                "std_dev": (
+                    statistics.stdev(horse_ratings) if len(horse_ratings) > 1 else 0
+                ),
+                "starts": len(horse_ratings),
             }
 
-        finally:
-            con.close()
+        return averages
+
+def _float_column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as float64 array (nulls -> NaN, missing column -> all NaN)."""
+    if name not in frame:
+        return np.full(len(frame), np.nan)
+
+    column = frame[name]
+    if column.dtype == object:
+        column = pd.to_numeric(column, errors="coerce")
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _optional(value: float | None) -> float | None:
+    """Map NaN to None for dataclass fields."""
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def _recorded(values: np.ndarray) -> np.ndarray:
+    """Mask of recorded sectionals (the per-row path skips null and 0)."""
+    return ~np.isnan(values) & (values != 0)
 
 
 # Example usage
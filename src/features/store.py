@@ -0,0 +1,553 @@
+"""
+Persistent feature store for pre-race runner features.
+
+Materializes the output of the feature engines (speed, class, sectional,
+pedigree, jockey/trainer) once per run so that model training and the
+prediction API read precomputed vectors instead of re-running every engine
+query per runner.
+
+Storage layout (Parquet, hive-partitioned by race date):
+    {feature_store_path}/race_date=2025-11-12/FLE-2025-11-12-R1.parquet
+
+One file per race keeps writes idempotent (re-ingesting a race rewrites its
+file) and lets a single race be read with one file scan.
+
+Pedigree features come from the current progeny aggregates, which are
+all-time totals rather than point-in-time. By default they are filled only
+for races dated today or later (upcoming cards) and left empty for
+historical races, where they would include results from after the race;
+pass pedigree=True or pedigree=False to override.
+
+Usage:
+    from src.features.store import FeatureStore
+
+    store = FeatureStore()
+    store.update_race("FLE-2025-11-12-R1")
+    features = store.read_race("FLE-2025-11-12-R1")
+
+    python -m src.features.store --date=2025-11-12
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.db import DuckDBConnectionManager, get_connection_manager
+from src.data.scrapers.jockey_stats import JockeyStatsBuilder
+from src.features.class_ratings import ClassRatingsEngine
+from src.features.history import FormHistoryLoader
+from src.features.pedigree_analyzer import PedigreeAnalyzer
+from src.features.sectional_analyzer import SectionalAnalyzer
+from src.features.speed_ratings import SpeedRatingsEngine
+
+logger = logging.getLogger(__name__)
+
+
+# Numeric model inputs, in the order used to build feature vectors
+MODEL_FEATURES = [
+    "distance",
+    "barrier",
+    "weight_carried",
+    "speed_avg",
+    "speed_best",
+    "speed_starts",
+    "class_avg",
+    "class_best",
+    "finish_speed_avg",
+    "sectional_balance_avg",
+    "pedigree_score",
+    "distance_suitability",
+    "surface_suitability",
+    "jockey_win_rate",
+    "jockey_recent_win_rate",
+    "trainer_win_rate",
+    "trainer_recent_win_rate",
+]
+
+FEATURE_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.string()),
+        ("race_id", pa.string()),
+        ("horse_id", pa.string()),
+        ("jockey_id", pa.string()),
+        ("trainer_id", pa.string()),
+        ("distance", pa.int32()),
+        ("barrier", pa.int32()),
+        ("weight_carried", pa.float64()),
+        ("speed_avg", pa.float64()),
+        ("speed_best", pa.float64()),
+        ("speed_starts", pa.int32()),
+        ("class_avg", pa.float64()),
+        ("class_best", pa.float64()),
+        ("sectional_style", pa.string()),
+        ("finish_speed_avg", pa.float64()),
+        ("sectional_balance_avg", pa.float64()),
+        ("pedigree_score", pa.float64()),
+        ("distance_suitability", pa.float64()),
+        ("surface_suitability", pa.float64()),
+        ("jockey_win_rate", pa.float64()),
+        ("jockey_recent_win_rate", pa.float64()),
+        ("trainer_win_rate", pa.float64()),
+        ("trainer_recent_win_rate", pa.float64()),
+        ("computed_at", pa.timestamp("us")),
+    ]
+)
+
+
+class FeatureStore:
+    """
+    Columnar store of per-run features, partitioned by race date.
+
+    Feature computation reuses the existing engines through one shared
+    connection manager; reads go through DuckDB's Parquet scanner.
+    """
+
+    def __init__(
+        self,
+        store_path: str | Path | None = None,
+        db_path: str = "data/racing.duckdb",
+        connections: DuckDBConnectionManager | None = None,
+        last_n_starts: int = 5,
+        stats_lookback_days: int = 365,
+        pedigree_analyzer: PedigreeAnalyzer | None = None,
+        pedigree: bool | None = None,
+    ):
+        """
+        Initialize feature store.
+
+        Args:
+            store_path: Root directory (default: settings.feature_store_path)
+            db_path: Path to DuckDB database
+            connections: Shared connection manager (default: process-wide manager)
+            last_n_starts: Starts used for form averages
+            stats_lookback_days: Lookback for jockey/trainer statistics
+            pedigree_analyzer: Analyzer shared across races (default: one
+                created on first use and kept for the store's lifetime)
+            pedigree: Fill pedigree features from the current progeny
+                aggregates (default: only for races dated today or later,
+                since historical rows would include later results)
+        """
+        if store_path is None:
+            from src.utils.config import settings
+
+            store_path = settings.feature_store_path
+
+        self.store_path = Path(store_path)
+        self.db_path = db_path
+        self.last_n_starts = last_n_starts
+        self.stats_lookback_days = stats_lookback_days
+        self._connections = connections
+        self._pedigree_analyzer = pedigree_analyzer
+        self.pedigree = pedigree
+
+    @property
+    def connections(self) -> DuckDBConnectionManager:
+        """Shared connection manager (process-wide default if none injected)."""
+        if self._connections is None:
+            self._connections = get_connection_manager(self.db_path)
+        return self._connections
+
+    @property
+    def pedigree_analyzer(self) -> PedigreeAnalyzer:
+        """
+        Pedigree analyzer reused for every race.
+
+        Its progeny aggregates are loaded once, not once per race; call
+        pedigree_analyzer.reload() after refreshing the aggregate tables.
+        """
+        if self._pedigree_analyzer is None:
+            self._pedigree_analyzer = PedigreeAnalyzer(
+                self.db_path, connections=self.connections
+            )
+        return self._pedigree_analyzer
+
+    def fills_pedigree(self, race_date: date) -> bool:
+        """Whether pedigree features are filled for a race on race_date."""
+        if self.pedigree is None:
+            return race_date >= date.today()
+        return self.pedigree
+
+    # ------------------------------------------------------------------------
+    # Computation
+    # ------------------------------------------------------------------------
+
+    def compute_race_features(self, race_id: str) -> list[dict[str, Any]]:
+        """
+        Compute pre-race features for every declared runner in a race.
+
+        Args:
+            race_id: Race identifier
+
+        Returns:
+            List of feature rows (one per run), matching FEATURE_SCHEMA
+        """
+        con = self.connections.cursor()
+
+        query = """
+            SELECT
+                run.run_id,
+                run.horse_id,
+                run.jockey_id,
+                run.trainer_id,
+                run.barrier,
+                run.weight_carried,
+                r.distance,
+                r.track_type,
+                r.date
+            FROM runs run
+            JOIN races r ON r.race_id = run.race_id
+            WHERE run.race_id = ?
+              AND run.scratched = FALSE
+            ORDER BY run.barrier
+        """
+
+        runners = con.execute(query, [race_id]).fetchall()
+
+        if not runners:
+            logger.warning(f"No runners found for race {race_id}")
+            return []
+
+        speed_engine = SpeedRatingsEngine(self.db_path, connections=self.connections)
+        class_engine = ClassRatingsEngine(self.db_path, connections=self.connections)
+        sectional_analyzer = SectionalAnalyzer(
+            self.db_path, connections=self.connections
+        )
+
+        # Form history for the whole field in one query (races before this one)
+        horse_ids = [row[1] for row in runners]
+        race_date = runners[0][8]
+        pedigree_analyzer = (
+            self.pedigree_analyzer if self.fills_pedigree(race_date) else None
+        )
+        history = FormHistoryLoader(self.db_path, self.connections).load(
+            horse_ids, self.last_n_starts, before=race_date
+        )
+        speed_form = speed_engine.get_average_ratings(
+            horse_ids, self.last_n_starts, history=history
+        )
+        class_form = class_engine.get_average_classes(
+            horse_ids, self.last_n_starts, history=history
+        )
+        sectional_form = sectional_analyzer.get_sectional_patterns(
+            horse_ids, self.last_n_starts, history=history
+        )
+
+        jockey_ids = sorted({row[2] for row in runners if row[2]})
+        trainer_ids = sorted({row[3] for row in runners if row[3]})
+
+        # Stats windows are inclusive of stat_date: stop the day before the race
+        stats_date = race_date - timedelta(days=1)
+        with JockeyStatsBuilder(
+            str(self.db_path), connections=self.connections
+        ) as builder:
+            jockey_stats = builder.calculate_jockey_stats_bulk(
+                jockey_ids, self.stats_lookback_days, stat_date=stats_date
+            )
+            trainer_stats = builder.calculate_trainer_stats_bulk(
+                trainer_ids, self.stats_lookback_days, stat_date=stats_date
+            )
+
+        computed_at = datetime.now()
+        rows = []
+
+        for (
+            run_id,
+            horse_id,
+            jockey_id,
+            trainer_id,
+            barrier,
+            weight_carried,
+            distance,
+            track_type,
+            _,
+        ) in runners:
+            speed = speed_form[horse_id]
+            class_rating = class_form[horse_id]
+            sectional = sectional_form[horse_id]
+            pedigree = (
+                pedigree_analyzer.analyze_pedigree(
+                    horse_id, distance, track_type or "turf"
+                )
+                if pedigree_analyzer
+                else None
+            )
+            jockey = jockey_stats.get(jockey_id)
+            trainer = trainer_stats.get(trainer_id)
+
+            rows.append(
+                {
+                    "run_id": run_id,
+                    "race_id": race_id,
+                    "horse_id": horse_id,
+                    "jockey_id": jockey_id,
+                    "trainer_id": trainer_id,
+                    "distance": distance,
+                    "barrier": barrier,
+                    "weight_carried": _to_float(weight_carried),
+                    "speed_avg": _to_float(speed["average"]),
+                    "speed_best": _to_float(speed["best"]),
+                    "speed_starts": speed["starts"],
+                    "class_avg": _to_float(class_rating["average"]),
+                    "class_best": _to_float(class_rating["best"]),
+                    "sectional_style": sectional["dominant_style"],
+                    "finish_speed_avg": _to_float(sectional["avg_finish_speed"]),
+                    "sectional_balance_avg": _to_float(
+                        sectional["avg_sectional_balance"]
+                    ),
+                    "pedigree_score": (
+                        float(pedigree.overall_pedigree_score) if pedigree else None
+                    ),
+                    "distance_suitability": (
+                        pedigree.distance_suitability if pedigree else None
+                    ),
+                    "surface_suitability": (
+                        pedigree.surface_suitability if pedigree else None
+                    ),
+                    "jockey_win_rate": _to_float(jockey.win_rate if jockey else None),
+                    "jockey_recent_win_rate": _to_float(
+                        jockey.recent_win_rate if jockey else None
+                    ),
+                    "trainer_win_rate": _to_float(
+                        trainer.win_rate if trainer else None
+                    ),
+                    "trainer_recent_win_rate": _to_float(
+                        trainer.recent_win_rate if trainer else None
+                    ),
+                    "computed_at": computed_at,
+                }
+            )
+
+        return rows
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def race_file(self, race_id: str, race_date: date | None = None) -> Path:
+        """Partition file holding one race's features."""
+        race_date = race_date or race_date_from_id(race_id)
+        partition = self.store_path / f"race_date={race_date.isoformat()}"
+        return partition / f"{race_id}.parquet"
+
+    def write_race(
+        self, race_id: str, rows: list[dict[str, Any]], race_date: date | None = None
+    ) -> Path:
+        """
+        Write (or overwrite) the feature partition file for one race.
+
+        Args:
+            race_id: Race identifier
+            rows: Feature rows from compute_race_features()
+            race_date: Race date (default: parsed from race_id)
+
+        Returns:
+            Path of the written Parquet file
+        """
+        path = self.race_file(race_id, race_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".parquet.tmp")
+
+        table = pa.Table.from_pylist(rows, schema=FEATURE_SCHEMA)
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)  # Atomic swap: readers never see partial files
+
+        return path
+
+    def update_race(self, race_id: str) -> int:
+        """
+        Recompute and persist features for one race.
+
+        This is the post-ingest hook used by RacingETL.
+
+        Args:
+            race_id: Race identifier
+
+        Returns:
+            Number of feature rows written
+        """
+        rows = self.compute_race_features(race_id)
+        if not rows:
+            return 0
+
+        path = self.write_race(race_id, rows)
+        logger.info(f"✓ Stored {len(rows)} feature rows for {race_id} ({path})")
+        return len(rows)
+
+    def update_date(self, race_date: date | str) -> int:
+        """
+        Recompute features for every race on a date.
+
+        Args:
+            race_date: Race date
+
+        Returns:
+            Number of feature rows written
+        """
+        if isinstance(race_date, str):
+            race_date = date.fromisoformat(race_date)
+
+        race_ids = [
+            row[0]
+            for row in self.connections.cursor()
+            .execute(
+                "SELECT race_id FROM races WHERE date = ? ORDER BY race_id",
+                [race_date],
+            )
+            .fetchall()
+        ]
+
+        total = 0
+        for race_id in race_ids:
+            try:
+                total += self.update_race(race_id)
+            except Exception as e:
+                logger.error(f"Failed to compute features for {race_id}: {e}")
+
+        logger.info(f"✓ Stored {total} feature rows for {len(race_ids)} races")
+        return total
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def _dataset_glob(self) -> str:
+        """Glob covering every partition file."""
+        return str(self.store_path / "race_date=*" / "*.parquet")
+
+    def read_race(self, race_id: str) -> pd.DataFrame:
+        """
+        Read stored features for one race (single file scan).
+
+        Args:
+            race_id: Race identifier
+
+        Returns:
+            DataFrame of feature rows (empty if not stored)
+        """
+        path = self.race_file(race_id)
+        if not path.exists():
+            return FEATURE_SCHEMA.empty_table().to_pandas()
+
+        return pq.read_table(path).to_pandas()
+
+    def read_runs(self, run_ids: list[str]) -> pd.DataFrame:
+        """
+        Read stored features for specific runs across all partitions.
+
+        Args:
+            run_ids: Run identifiers
+
+        Returns:
+            DataFrame of feature rows (runs without stored features are omitted)
+        """
+        if not run_ids or not any(self.store_path.glob("race_date=*/*.parquet")):
+            return FEATURE_SCHEMA.empty_table().to_pandas()
+
+        con = self.connections.cursor()
+        return con.execute(
+            """
+            SELECT * EXCLUDE (race_date)
+            FROM read_parquet(?, hive_partitioning = true)
+            WHERE run_id IN (SELECT UNNEST(?))
+            """,
+            [self._dataset_glob(), list(run_ids)],
+        ).df()
+
+    def read_range(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Read stored features for a date range (e.g. to build a training set).
+
+        Partition pruning on race_date means only matching files are scanned.
+
+        Args:
+            start_date: First race date (inclusive)
+            end_date: Last race date (inclusive)
+
+        Returns:
+            DataFrame of feature rows including race_date
+        """
+        if not any(self.store_path.glob("race_date=*/*.parquet")):
+            return FEATURE_SCHEMA.empty_table().to_pandas()
+
+        con = self.connections.cursor()
+        return con.execute(
+            """
+            SELECT *
+            FROM read_parquet(?, hive_partitioning = true)
+            WHERE CAST(race_date AS DATE) BETWEEN ? AND ?
+            """,
+            [self._dataset_glob(), start_date, end_date],
+        ).df()
+
+    def get_feature_vector(self, run_id: str) -> list[float] | None:
+        """
+        Get the numeric model input vector for one run.
+
+        Missing values are encoded as NaN so tree models can handle them.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            Feature values ordered as MODEL_FEATURES, or None if not stored
+        """
+        race_id = run_id_to_race_id(run_id)
+        frame = self.read_race(race_id) if race_id else self.read_runs([run_id])
+        frame = frame[frame["run_id"] == run_id]
+
+        if frame.empty:
+            return None
+
+        row = frame.iloc[0]
+        return [
+            float(row[name]) if pd.notna(row[name]) else float("nan")
+            for name in MODEL_FEATURES
+        ]
+
+
+def race_date_from_id(race_id: str) -> date:
+    """Parse the race date from a race_id like 'FLE-2025-11-12-R1'."""
+    parts = race_id.split("-")
+    if len(parts) < 5:
+        raise ValueError(f"Invalid race_id format: {race_id}")
+    return date(int(parts[1]), int(parts[2]), int(parts[3]))
+
+
+def run_id_to_race_id(run_id: str) -> str | None:
+    """Extract race_id from a run_id like 'FLE-2025-11-12-R1-H1001'."""
+    parts = run_id.split("-")
+    if len(parts) < 5 or not parts[4].startswith("R"):
+        return None
+    return "-".join(parts[:5])
+
+
+def _to_float(value: Any) -> float | None:
+    """Convert Decimal/int values to float, preserving None."""
+    return float(value) if value is not None else None
+
+
+def main() -> int:
+    """Compute features for all races on a date."""
+    parser = argparse.ArgumentParser(description="Populate the feature store")
+    parser.add_argument("--date", required=True, help="Race date (YYYY-MM-DD)")
+    parser.add_argument("--db-path", default="data/racing.duckdb")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    store = FeatureStore(db_path=args.db_path)
+    store.update_date(args.date)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -30,10 +30,17 @@ class Settings(BaseSettings):
 
     # ============================================================================
     # DATABASE
-    # ============================================================================    db_path: Path = Field(default=Path("./data/racing.duckdb"), alias="DB_PATH")
+    # ============================================================================
+
+    db_path: Path = Field(default=Path("./data/racing.duckdb"), alias="DB_PATH")
+    db_threads: Optional[int] = Field(default=None, alias="DB_THREADS")
+    db_memory_limit: Optional[str] = Field(default=None, alias="DB_MEMORY_LIMIT")
     feature_store_path: Path = Field(
         default=Path("./data/features"), alias="FEATURE_STORE_PATH"
     )
+    odds_history_path: Path = Field(
+        default=Path("./data/odds_history"), alias="ODDS_HISTORY_PATH"
+    )
     model_path: Path = Field(default=Path("./data/models"), alias="MODEL_PATH")
 
     # ============================================================================
@@ -85,6 +92,8 @@ class Settings(BaseSettings):
     test_mode: bool = Field(default=False, alias="TEST_MODE")
     cache_dir: Path = Field(default=Path("./data/cache"), alias="CACHE_DIR")
     cache_ttl: int = Field(default=3600, alias="CACHE_TTL")
+    http_cache_max_mb: int = Field(default=1024, alias="HTTP_CACHE_MAX_MB")
+    http_cache_replay: bool = Field(default=False, alias="HTTP_CACHE_REPLAY")
 
     class Config:
         env_file = ".env"
@@ -96,6 +105,7 @@ class Settings(BaseSettings):
         directories = [
             self.db_path.parent,
             self.feature_store_path,
+            self.odds_history_path,
             self.model_path,
             self.log_file.parent,
             self.cache_dir,
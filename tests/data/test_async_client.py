@@ -0,0 +1,177 @@
+"""
+Tests for the async rate-limited scraping client.
+
+Tests cover:
+- Token bucket pacing and per-host buckets
+- Retries with backoff on 5xx/429 and connection errors
+- Concurrent fetches with failures returned in place
+- Concurrent GraphQL meeting scrapes against a local stand-in
+"""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+
+from src.data.scrapers.async_client import AsyncScraper, TokenBucket
+from src.data.scrapers.racing_com_graphql import RacingComGraphQLScraper
+
+
+def _client(handler, **kwargs) -> AsyncScraper:
+    """Client over an in-process transport with no backoff delay."""
+    kwargs.setdefault("rate_limit", 1000)
+    kwargs.setdefault("max_retries", 2)
+    return AsyncScraper(backoff=0, transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_paces_to_rate(self):
+        """Test acquires beyond the burst wait for refills."""
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+
+        assert time.monotonic() - start >= 5 / 50 * 0.9
+
+    def test_invalid_rate(self):
+        """Test non-positive rates are rejected."""
+        with pytest.raises(ValueError, match="rate"):
+            TokenBucket(rate=0)
+
+
+class TestAsyncScraper:
+    """Test suite for AsyncScraper."""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_status(self):
+        """Test 503/429 responses are retried until a success."""
+        statuses = iter([503, 429, 200])
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(next(statuses), text="ok")
+
+        async with _client(handler) as client:
+            response = await client.get("https://racing.test/form")
+
+        assert response.text == "ok"
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        """Test the last failure is raised once retries run out."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        async with _client(handler, max_retries=1) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get("https://racing.test/form")
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """Test 404s fail immediately."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        async with _client(handler) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get("https://racing.test/missing")
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_connection_errors(self):
+        """Test connection failures are retried."""
+        failures = [httpx.ConnectError("refused")]
+
+        def handler(request):
+            if failures:
+                raise failures.pop()
+            return httpx.Response(200)
+
+        async with _client(handler) as client:
+            response = await client.get("https://racing.test/form")
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_fetch_all(self):
+        """Test many URLs with failures returned in input order."""
+
+        def handler(request):
+            if request.url.path == "/bad":
+                return httpx.Response(404)
+            return httpx.Response(200, text=request.url.path)
+
+        async with _client(handler) as client:
+            results = await client.fetch_all(
+                [f"https://racing.test/{path}" for path in ("a", "bad", "b")]
+            )
+
+        assert results[0].text == "/a"
+        assert isinstance(results[1], httpx.HTTPStatusError)
+        assert results[2].text == "/b"
+
+    @pytest.mark.asyncio
+    async def test_buckets_per_host(self):
+        """Test each host gets its own rate limit."""
+        async with _client(lambda request: httpx.Response(200)) as client:
+            await client.fetch_all(
+                ["https://a.test/1", "https://b.test/1", "https://a.test/2"]
+            )
+
+        assert set(client.buckets) == {"a.test", "b.test"}
+
+
+class TestScrapeMeetingsAsync:
+    """Test suite for RacingComGraphQLScraper.scrape_meetings_async."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_meetings(self):
+        """Test meetings are scraped concurrently with failures kept per meeting."""
+
+        def handler(request):
+            if b"randwick" in request.read():
+                return httpx.Response(200, json={"errors": [{"message": "none"}]})
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "GetMeetingByVenue": {
+                            "venueName": "flemington",
+                            "venueCode": "FLE",
+                            "races": [
+                                {"raceNumber": n, "raceEntries": []} for n in (2, 1)
+                            ],
+                        }
+                    }
+                },
+            )
+
+        scraper = RacingComGraphQLScraper(delay_between_requests=0)
+        async with _client(handler) as client:
+            flemington, randwick = await scraper.scrape_meetings_async(
+                [("flemington", "2025-01-01"), ("randwick", "2025-01-01")], client
+            )
+
+        assert [card.race.race_id for card in flemington] == [
+            "FLE-2025-01-01-R1",
+            "FLE-2025-01-01-R2",
+        ]
+        assert isinstance(randwick, ValueError)
@@ -0,0 +1,223 @@
+"""
+Tests for the shared DuckDB connection manager.
+
+Tests cover:
+- Per-thread read cursors on one database instance
+- Pruning finished threads' cursors; reopen waiting for busy threads
+- Single shared writer with commit/rollback
+- Process-wide registry and read-only -> read-write upgrade
+- Engine injection
+"""
+
+from __future__ import annotations
+
+import threading
+
+import duckdb
+import pytest
+
+from src.data.db import (
+    DuckDBConnectionManager,
+    close_all_connections,
+    get_connection_manager,
+)
+from src.features.speed_ratings import SpeedRatingsEngine
+
+
+@pytest.fixture
+def db_path(temp_dir):
+    """Create a small database file."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute("CREATE TABLE races (race_id VARCHAR PRIMARY KEY, distance INTEGER)")
+    con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R1', 1200)")
+    con.close()
+    yield path
+    close_all_connections()
+
+
+class TestDuckDBConnectionManager:
+    """Test suite for DuckDBConnectionManager."""
+
+    def test_connection_is_lazy(self, db_path):
+        """Test the database is not opened until first use."""
+        manager = DuckDBConnectionManager(db_path)
+        assert manager._connection is None
+
+        manager.cursor().execute("SELECT 1").fetchone()
+        assert manager._connection is not None
+        manager.close()
+
+    def test_cursor_reused_within_thread(self, db_path):
+        """Test the same thread always gets the same cursor."""
+        with DuckDBConnectionManager(db_path) as manager:
+            assert manager.cursor() is manager.cursor()
+
+    def test_cursor_per_thread(self, db_path):
+        """Test each thread gets its own cursor."""
+        with DuckDBConnectionManager(db_path) as manager:
+            main_cursor = manager.cursor()
+            other = {}
+
+            def read():
+                other["cursor"] = manager.cursor()
+                other["count"] = (
+                    other["cursor"].execute("SELECT COUNT(*) FROM races").fetchone()[0]
+                )
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+
+            assert other["cursor"] is not main_cursor
+            assert other["count"] == 1
+
+    def test_config_passes_threads_and_memory_limit(self, db_path):
+        """Test DuckDB settings are applied to the connection."""
+        with DuckDBConnectionManager(db_path, threads=2, memory_limit="256MB") as m:
+            assert m.config == {"threads": 2, "memory_limit": "256MB"}
+            threads = m.cursor().execute(
+                "SELECT current_setting('threads')"
+            ).fetchone()[0]
+            assert int(threads) == 2
+
+    def test_read_only_manager_has_no_writer(self, db_path):
+        """Test requesting a writer on a read-only manager fails."""
+        with DuckDBConnectionManager(db_path, read_only=True) as manager:
+            with pytest.raises(RuntimeError, match="read-only"):
+                manager.writer()
+
+    def test_write_transaction_commits(self, db_path):
+        """Test writes are visible to readers after commit."""
+        with DuckDBConnectionManager(db_path, read_only=False) as manager:
+            with manager.write_transaction() as con:
+                con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R2', 1400)")
+
+            count = manager.cursor().execute("SELECT COUNT(*) FROM races").fetchone()[0]
+            assert count == 2
+
+    def test_write_transaction_rolls_back_on_error(self, db_path):
+        """Test a failing block leaves the database unchanged."""
+        with DuckDBConnectionManager(db_path, read_only=False) as manager:
+            with pytest.raises(ValueError):
+                with manager.write_transaction() as con:
+                    con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R2', 1400)")
+                    raise ValueError("boom")
+
+            count = manager.cursor().execute("SELECT COUNT(*) FROM races").fetchone()[0]
+            assert count == 1
+
+    def test_close_invalidates_cached_cursors(self, db_path):
+        """Test cursors are recreated after the manager is reopened."""
+        manager = DuckDBConnectionManager(db_path)
+        first = manager.cursor()
+        manager.close()
+
+        second = manager.cursor()
+        assert second is not first
+        assert second.execute("SELECT COUNT(*) FROM races").fetchone()[0] == 1
+        manager.close()
+
+
+    def test_finished_threads_cursors_pruned(self, db_path):
+        """Test cursors of finished threads are closed on the next checkout."""
+        with DuckDBConnectionManager(db_path) as manager:
+            thread = threading.Thread(target=manager.cursor)
+            thread.start()
+            thread.join()
+            assert thread in manager._cursors
+
+            manager.cursor()
+
+            assert list(manager._cursors) == [threading.current_thread()]
+
+    def test_reopen_waits_for_other_threads(self, db_path):
+        """Test reopen leaves a busy thread's cursor open until it is released."""
+        manager = DuckDBConnectionManager(db_path)
+        checked_out = threading.Event()
+        query = threading.Event()
+        result = {}
+
+        def read():
+            stale = manager.cursor()
+            checked_out.set()
+            query.wait()
+            # Still usable: reopen has not closed it under this thread
+            result["stale"] = stale.execute("SELECT COUNT(*) FROM races").fetchone()
+            fresh = manager.cursor()
+            result["fresh"] = fresh is not stale
+            result["fresh_count"] = fresh.execute(
+                "SELECT COUNT(*) FROM races"
+            ).fetchone()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        checked_out.wait()
+        timer = threading.Timer(0.2, query.set)
+        timer.start()
+
+        manager.reopen(read_only=False)
+        thread.join()
+
+        assert result == {"stale": (1,), "fresh": True, "fresh_count": (1,)}
+        assert manager.read_only is False
+        with manager.write_transaction() as con:
+            con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R2', 1400)")
+        manager.close()
+
+    def test_reopen_times_out(self, db_path):
+        """Test an idle thread's cursor is closed once the wait times out."""
+        manager = DuckDBConnectionManager(db_path)
+        checked_out = threading.Event()
+        done = threading.Event()
+
+        def hold():
+            manager.cursor()
+            checked_out.set()
+            done.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        checked_out.wait()
+
+        manager.reopen(read_only=False, timeout=0.1)
+        done.set()
+        thread.join()
+
+        assert manager.read_only is False
+        assert manager.cursor().execute("SELECT 1").fetchone() == (1,)
+        manager.close()
+
+
+class TestConnectionRegistry:
+    """Test suite for the process-wide manager registry."""
+
+    def test_same_path_returns_same_manager(self, db_path):
+        """Test one manager is shared per database file."""
+        assert get_connection_manager(db_path) is get_connection_manager(str(db_path))
+
+    def test_read_write_request_upgrades_manager(self, db_path):
+        """Test a writer request reopens an existing read-only manager in place."""
+        manager = get_connection_manager(db_path)
+        manager.cursor().execute("SELECT 1").fetchone()
+
+        upgraded = get_connection_manager(db_path, read_only=False)
+
+        assert upgraded is manager
+        assert manager.read_only is False
+        with manager.write_transaction() as con:
+            con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R2', 1400)")
+
+    def test_engine_uses_injected_manager(self, db_path):
+        """Test feature engines borrow cursors from the injected manager."""
+        manager = DuckDBConnectionManager(db_path)
+        engine = SpeedRatingsEngine(str(db_path), connections=manager)
+
+        assert engine.connections is manager
+        manager.close()
+
+    def test_engine_defaults_to_shared_manager(self, db_path):
+        """Test engines fall back to the process-wide manager lazily."""
+        engine = SpeedRatingsEngine(str(db_path))
+        assert engine._connections is None
+        assert engine.connections is get_connection_manager(db_path)
@@ -0,0 +1,302 @@
+"""
+Tests for RacingETL set-based loads.
+
+Tests cover:
+- Loading many race cards with one upsert per table
+- Shared jockeys/trainers collapsed across cards
+- Idempotent re-loads and rollback on failure
+- Rider changes and scratchings applied on reload, created_at kept
+- Unchanged horses, jockeys and trainers skipped via content hashes
+- Post-ingest hooks per loaded race
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.data.init_db import create_database
+from src.data.models import (
+    Gear,
+    GearType,
+    Horse,
+    Jockey,
+    Race,
+    RaceCard,
+    ReportType,
+    Run,
+    StewardsReport,
+    Trainer,
+)
+
+
+def _card(race_number: int, barrier_offset: int = 0) -> RaceCard:
+    """Two-runner card; every card shares jockeys J1/J2 and trainer T1."""
+    race_id = f"FLE-2025-01-01-R{race_number}"
+    horses = [
+        Horse(horse_id=f"H{race_number}{i}", name=f"Horse {race_number}{i}")
+        for i in (1, 2)
+    ]
+    runs = [
+        Run(
+            run_id=f"{race_id}-{horse.horse_id}",
+            race_id=race_id,
+            horse_id=horse.horse_id,
+            jockey_id=f"J{i}",
+            trainer_id="T1",
+            barrier=i + barrier_offset,
+            weight_carried=Decimal("57.5"),
+        )
+        for i, horse in enumerate(horses, start=1)
+    ]
+    return RaceCard(
+        race=Race(
+            race_id=race_id,
+            date=date(2025, 1, 1),
+            venue="FLE",
+            race_number=race_number,
+            distance=1200,
+            field_size=2,
+            data_source="test",
+        ),
+        runs=runs,
+        horses=horses,
+        jockeys=[Jockey(jockey_id=f"J{i}", name=f"Jockey {i}") for i in (1, 2)],
+        trainers=[Trainer(trainer_id="T1", name="Trainer 1")],
+        gear=[
+            Gear(
+                gear_id=f"{runs[0].run_id}-blinkers",
+                run_id=runs[0].run_id,
+                gear_type=GearType.BLINKERS,
+                first_time=True,
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Empty database with the full schema."""
+    path = temp_dir / "racing.duckdb"
+    create_database(path)
+    manager = DuckDBConnectionManager(path, read_only=False)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def etl(connections):
+    """ETL pipeline without live scrapers."""
+    with (
+        patch("src.data.etl_pipeline.RacingComScraper"),
+        patch("src.data.etl_pipeline.StewardsScraper"),
+        patch("src.data.etl_pipeline.MarketOddsCollector"),
+    ):
+        yield RacingETL(connections.db_path, connections=connections)
+
+
+def _count(connections, table: str) -> int:
+    """Row count of a table."""
+    return connections.cursor().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestLoadRaceCards:
+    """Test suite for RacingETL.load_race_cards."""
+
+    def test_loads_every_table(self, etl, connections):
+        """Test all cards land with shared people written once."""
+        report = StewardsReport(
+            steward_id="FLE-2025-01-01-R1-S1",
+            race_id="FLE-2025-01-01-R1",
+            report_type=ReportType.INQUIRY,
+            horses_involved=["Horse 11", "Horse 12"],
+            jockeys_involved=[],
+        )
+
+        metrics = etl.load_race_cards(
+            [_card(1), _card(2), _card(3)], stewards_reports=[report]
+        )
+
+        assert metrics["status"] == "success", metrics["errors"]
+        assert metrics["inserted"] == {
+            "races": 3,
+            "horses": 6,
+            "jockeys": 2,
+            "trainers": 1,
+            "runs": 6,
+            "gear": 3,
+            "stewards": 1,
+        }
+        assert _count(connections, "runs") == 6
+
+        horses, jockeys = (
+            connections.cursor()
+            .execute("SELECT horses_involved, jockeys_involved FROM stewards")
+            .fetchone()
+        )
+        assert horses == ["Horse 11", "Horse 12"]
+        assert jockeys is None
+
+        gear_types = (
+            connections.cursor()
+            .execute("SELECT DISTINCT gear_type FROM gear")
+            .fetchall()
+        )
+        assert gear_types == [("blinkers",)]
+
+    def test_reload_replaces_rows(self, etl, connections):
+        """Test re-loading a card updates rows in place (safe re-runs)."""
+        etl.load_race_cards([_card(1)])
+        metrics = etl.load_race_cards([_card(1, barrier_offset=5)])
+
+        assert metrics["status"] == "success", metrics["errors"]
+        assert _count(connections, "runs") == 2
+        barriers = (
+            connections.cursor()
+            .execute("SELECT barrier FROM runs ORDER BY barrier")
+            .fetchall()
+        )
+        assert barriers == [(6,), (7,)]
+
+    def test_reload_applies_rider_changes(self, etl, connections):
+        """Test a referenced run takes a new jockey and scratching on reload."""
+        etl.load_race_cards([_card(1)])
+        run_id = _card(1).runs[0].run_id
+        created_at = (
+            connections.cursor()
+            .execute("SELECT created_at FROM runs WHERE run_id = ?", [run_id])
+            .fetchone()[0]
+        )
+
+        changed = _card(1)
+        changed.runs[0].jockey_id = "J2"
+        changed.runs[0].scratched = True
+        metrics = etl.load_race_cards([changed])
+
+        assert metrics["status"] == "success", metrics["errors"]
+        row = (
+            connections.cursor()
+            .execute(
+                "SELECT jockey_id, scratched, created_at FROM runs WHERE run_id = ?",
+                [run_id],
+            )
+            .fetchone()
+        )
+        assert row == ("J2", True, created_at)
+        assert _count(connections, "gear") == 1
+
+    def test_reload_on_legacy_indexes(self, etl, connections):
+        """Test an older database with indexed run flags still reloads."""
+        connections.cursor().execute(
+            "CREATE INDEX idx_runs_scratched ON runs(scratched)"
+        )
+        etl.load_race_cards([_card(1)])
+
+        changed = _card(1, barrier_offset=5)
+        changed.runs[0].scratched = True
+        metrics = etl.load_race_cards([changed])
+
+        assert metrics["status"] == "success", metrics["errors"]
+        rows = (
+            connections.cursor()
+            .execute("SELECT barrier, scratched FROM runs ORDER BY barrier")
+            .fetchall()
+        )
+        assert rows == [(6, False), (7, False)]
+
+    def test_failure_rolls_back(self, etl, connections):
+        """Test a foreign-key failure leaves nothing behind."""
+        broken = _card(2)
+        broken.horses = broken.horses[:1]  # second run now references no horse
+
+        metrics = etl.load_race_cards([_card(1), broken])
+
+        assert metrics["status"] == "failed"
+        assert metrics["errors"]
+        assert _count(connections, "races") == 0
+        assert _count(connections, "entity_hashes") == 0
+
+        # The rolled-back horses are not mistaken for already-loaded ones
+        metrics = etl.load_race_cards([_card(1)])
+        assert metrics["inserted"]["horses"] == 2
+
+    def test_post_ingest_hooks(self, etl):
+        """Test hooks run once per loaded race unless disabled."""
+        hook = Mock()
+        etl.post_ingest_hooks.append(hook)
+
+        etl.load_race_cards([_card(1), _card(2)], run_hooks=False)
+        hook.assert_not_called()
+
+        etl.load_race_cards([_card(1), _card(2)])
+        assert [c.args[0] for c in hook.call_args_list] == [
+            "FLE-2025-01-01-R1",
+            "FLE-2025-01-01-R2",
+        ]
+
+
+class TestMasterDataChanges:
+    """Test suite for content-hash change detection on master data."""
+
+    def test_unchanged_rows_skipped(self, etl, connections):
+        """Test re-loaded horses, jockeys and trainers are not rewritten."""
+        etl.load_race_cards([_card(1), _card(2)])
+        updated = (
+            connections.cursor()
+            .execute("SELECT horse_id, updated_at FROM horses ORDER BY horse_id")
+            .fetchall()
+        )
+
+        metrics = etl.load_race_cards([_card(1), _card(2), _card(3)])
+
+        assert metrics["status"] == "success", metrics["errors"]
+        assert metrics["inserted"]["horses"] == 2  # only race 3's horses
+        assert metrics["inserted"]["jockeys"] == 0
+        assert metrics["inserted"]["trainers"] == 0
+        assert metrics["inserted"]["runs"] == 6
+        assert (
+            connections.cursor()
+            .execute(
+                "SELECT horse_id, updated_at FROM horses "
+                "WHERE horse_id < 'H3' ORDER BY horse_id"
+            )
+            .fetchall()
+            == updated
+        )
+        assert _count(connections, "entity_hashes") == 6 + 2 + 1
+
+    def test_changed_rows_written(self, etl, connections):
+        """Test only the horse whose content changed is upserted."""
+        etl.load_race_cards([_card(1)])
+        card = _card(1)
+        card.horses[0].color = "bay"
+
+        metrics = etl.load_race_cards([card])
+
+        assert metrics["inserted"]["horses"] == 1
+        color = (
+            connections.cursor()
+            .execute("SELECT color FROM horses WHERE horse_id = 'H11'")
+            .fetchone()[0]
+        )
+        assert color == "bay"
+
+    def test_hashes_persist(self, etl, connections):
+        """Test a new pipeline skips rows recorded by an earlier one."""
+        etl.load_race_cards([_card(1)])
+        with (
+            patch("src.data.etl_pipeline.RacingComScraper"),
+            patch("src.data.etl_pipeline.StewardsScraper"),
+            patch("src.data.etl_pipeline.MarketOddsCollector"),
+        ):
+            fresh = RacingETL(connections.db_path, connections=connections)
+
+        metrics = fresh.load_race_cards([_card(1)])
+
+        assert metrics["status"] == "success", metrics["errors"]
+        assert metrics["inserted"]["horses"] == 0
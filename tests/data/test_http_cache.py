@@ -0,0 +1,229 @@
+"""
+Tests for the on-disk HTTP response cache.
+
+Tests cover:
+- Fresh hits served without the network (requests sessions and httpx)
+- Async hits read from disk once
+- ETag revalidation of stale entries
+- Replay-only mode
+- Store vetoes: GraphQL error bodies, caller hooks, Cache-Control
+- Compressed storage and LRU eviction
+"""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.data.scrapers.async_client import AsyncScraper
+from src.data.scrapers.http_cache import CacheMiss, ResponseCache
+
+URL = "https://racing.test/form/2025-01-01/flemington"
+
+
+def _responder(status: int = 200, body: bytes = b"<html>form</html>", **headers):
+    """HTTPAdapter.send stand-in that records the requests it receives."""
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        sent.append(request)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    return send, sent
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Empty cache with a one-hour TTL."""
+    return ResponseCache(temp_dir / "http", ttl=3600, max_bytes=10_000_000)
+
+
+def _session(cache: ResponseCache) -> requests.Session:
+    """Session routed through the cache."""
+    return cache.install(requests.Session())
+
+
+class TestCachingAdapter:
+    """Test suite for requests sessions with a ResponseCache installed."""
+
+    def test_fresh_hit_skips_network(self, cache):
+        """Test a repeated GET is served from disk."""
+        send, sent = _responder()
+        session = _session(cache)
+
+        with patch.object(HTTPAdapter, "send", send):
+            first = session.get(URL)
+            second = session.get(URL)
+
+        assert len(sent) == 1
+        assert second.status_code == 200
+        assert second.text == first.text == "<html>form</html>"
+
+    def test_post_bodies_are_distinct(self, cache):
+        """Test GraphQL queries with different variables do not collide."""
+        send, sent = _responder()
+        session = _session(cache)
+
+        with patch.object(HTTPAdapter, "send", send):
+            session.post(URL, json={"venueName": "flemington"})
+            session.post(URL, json={"venueName": "randwick"})
+            session.post(URL, json={"venueName": "flemington"})
+
+        assert len(sent) == 2
+
+    def test_errors_not_cached(self, cache):
+        """Test failed responses are fetched again."""
+        send, sent = _responder(status=500)
+        session = _session(cache)
+
+        with patch.object(HTTPAdapter, "send", send):
+            session.get(URL)
+            session.get(URL)
+
+        assert len(sent) == 2
+
+    def test_graphql_errors_not_cached(self, cache):
+        """Test 200 responses carrying GraphQL errors are fetched again."""
+        send, sent = _responder(body=b'{"errors": [{"message": "rate limited"}]}')
+        session = _session(cache)
+
+        with patch.object(HTTPAdapter, "send", send):
+            session.post(URL, json={"venueName": "flemington"})
+            session.post(URL, json={"venueName": "flemington"})
+
+        assert len(sent) == 2
+
+    def test_caller_veto(self, temp_dir):
+        """Test a should_store hook decides what is kept."""
+        cache = ResponseCache(
+            temp_dir / "http", should_store=lambda entry: b"form" not in entry.body
+        )
+        send, sent = _responder()
+
+        with patch.object(HTTPAdapter, "send", send):
+            _session(cache).get(URL)
+            _session(cache).get(URL)
+
+        assert len(sent) == 2
+
+    def test_cache_control(self, cache):
+        """Test no-store responses are not kept and no-cache ones revalidate."""
+        session = _session(cache)
+
+        send, sent = _responder(**{"Cache-Control": "private, no-store"})
+        with patch.object(HTTPAdapter, "send", send):
+            session.get(URL)
+            session.get(URL)
+        assert len(sent) == 2
+
+        send, sent = _responder(**{"Cache-Control": "no-cache", "ETag": '"v1"'})
+        with patch.object(HTTPAdapter, "send", send):
+            session.get(URL + "/R2")
+            session.get(URL + "/R2")
+        assert len(sent) == 2
+        assert sent[1].headers["If-None-Match"] == '"v1"'
+
+    def test_stale_entry_revalidated(self, temp_dir):
+        """Test a 304 re-serves the stored body after a conditional GET."""
+        cache = ResponseCache(temp_dir / "http", ttl=0)
+        session = _session(cache)
+
+        send, _ = _responder(ETag='"v1"')
+        with patch.object(HTTPAdapter, "send", send):
+            session.get(URL)
+
+        send, sent = _responder(status=304, body=b"")
+        with patch.object(HTTPAdapter, "send", send):
+            response = session.get(URL)
+
+        assert sent[0].headers["If-None-Match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.text == "<html>form</html>"
+
+    def test_replay_only(self, temp_dir):
+        """Test replay mode serves stale entries and never fetches."""
+        send, sent = _responder()
+        with patch.object(HTTPAdapter, "send", send):
+            _session(ResponseCache(temp_dir / "http", ttl=0)).get(URL)
+
+        replay = _session(ResponseCache(temp_dir / "http", ttl=0, replay_only=True))
+        with patch.object(HTTPAdapter, "send", send):
+            assert replay.get(URL).text == "<html>form</html>"
+            with pytest.raises(CacheMiss):
+                replay.get(URL + "/R2")
+
+        assert len(sent) == 1
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache storage."""
+
+    def test_compressed(self, cache):
+        """Test entries are stored compressed."""
+        body = b"<tr><td>runner</td></tr>" * 1000
+        cache.put(cache.key("GET", URL), URL, 200, {}, body)
+
+        assert cache.size < len(body) / 10
+        assert cache.get(cache.key("GET", URL)).body == body
+
+    def test_lru_eviction(self, temp_dir):
+        """Test the least recently used entries go first when over budget."""
+        cache = ResponseCache(temp_dir / "http", max_bytes=10_000)
+        keys = [cache.key("GET", f"{URL}/R{i}") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, URL, 200, {}, os.urandom(3_000))
+            os.utime(cache._path(key), (i, i))
+
+        cache.get(keys[0])  # now most recently used
+        cache.put(cache.key("GET", URL), URL, 200, {}, os.urandom(3_000))
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.size <= 10_000
+
+
+class TestAsyncCache:
+    """Test suite for the httpx transport."""
+
+    @pytest.mark.asyncio
+    async def test_async_hits(self, cache):
+        """Test AsyncScraper serves repeated fetches from the cache."""
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, text="form")
+
+        async with AsyncScraper(
+            rate_limit=1000, transport=httpx.MockTransport(handler), cache=cache
+        ) as client:
+            first = await client.get(URL)
+            second = await client.get(URL)
+
+        assert len(sent) == 1
+        assert second.text == first.text == "form"
+
+    @pytest.mark.asyncio
+    async def test_hit_read_once(self, cache):
+        """Test a hit is read from disk once, not again by the transport."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        async with AsyncScraper(
+            rate_limit=1000, transport=transport, cache=cache
+        ) as client:
+            await client.get(URL)
+            with patch.object(cache, "get", wraps=cache.get) as get:
+                await client.get(URL)
+
+        assert get.call_count == 1
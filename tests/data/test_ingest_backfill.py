@@ -0,0 +1,221 @@
+"""
+Tests for the resumable historical backfill.
+
+Tests cover:
+- Every listed meeting loaded through the single writer thread
+- Journal skipping completed races on resume
+- Widening a venue-restricted backfill without re-listing days
+- Refetched meetings loading only their planned races
+- Days without meetings journaled once
+- Failed meetings journaled and retried up to max_attempts
+- The racing backfill-races command
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli import main
+from src.data.backfill import BackfillRunner
+from src.data.db import DuckDBConnectionManager, close_all_connections
+from src.data.etl_pipeline import RacingETL
+from src.data.fake_racing_server import FakeRacingServer
+from src.data.init_db import create_database
+from src.data.scrapers.racing_com_graphql import RacingComGraphQLScraper
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 2)
+
+# 6 venues x 2 days x 2 races
+TOTAL_RACES = 24
+
+
+@pytest.fixture
+def server():
+    """Local racing.com stand-in with small synthetic meetings."""
+    with FakeRacingServer(races_per_meeting=2, runners_per_race=4) as server:
+        yield server
+
+
+@pytest.fixture
+def etl(temp_dir, server):
+    """Pipeline on a fresh database, scraping the stand-in."""
+    db_path = temp_dir / "backfill.duckdb"
+    create_database(db_path)
+    connections = DuckDBConnectionManager(db_path, read_only=False)
+    with RacingETL(db_path, connections=connections) as etl:
+        etl.meeting_scraper.GRAPHQL_URL = server.graphql_url
+        yield etl
+    connections.close()
+
+
+def _runner(etl: RacingETL, **kwargs) -> BackfillRunner:
+    """Runner without a meaningful rate limit."""
+    return BackfillRunner(etl, rate_limit=1000, **kwargs)
+
+
+def _count(etl: RacingETL, table: str) -> int:
+    """Rows in a table."""
+    cursor = etl.connections.cursor()
+    return cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestBackfillRunner:
+    """Test suite for BackfillRunner."""
+
+    def test_loads_every_meeting(self, etl):
+        """Test every listed race is loaded and journaled as done."""
+        writers = set()
+        etl.post_ingest_hooks.append(
+            lambda race_id: writers.add(threading.current_thread().name)
+        )
+
+        report = _runner(etl, window_days=1).run(START, END)
+
+        assert report.days_listed == 2
+        assert report.meetings == 12
+        assert report.races == TOTAL_RACES
+        assert report.failed_races == 0
+        assert report.runs == TOTAL_RACES * 4
+        assert _count(etl, "races") == TOTAL_RACES
+        assert _runner(etl).journal_summary(START, END) == {
+            "pending": 0,
+            "done": TOTAL_RACES,
+            "failed": 0,
+        }
+        assert writers == {"backfill-writer"}
+        assert "races/sec" in report.format()
+
+    def test_resume_skips_done_races(self, etl, server):
+        """Test a second run over the same range makes no requests."""
+        _runner(etl).run(START, END)
+        requests = server.requests["graphql"]
+
+        report = _runner(etl).run(START, END)
+
+        assert server.requests["graphql"] == requests
+        assert report.races == 0
+        assert report.skipped_races == TOTAL_RACES
+
+    def test_widen_venues(self, etl):
+        """Test other venues' races stay pending and load without re-listing."""
+        runner = _runner(etl)
+        first = runner.run(START, END, venues=["Flemington"])
+
+        assert first.races == 4
+        assert runner.journal_summary()["pending"] == TOTAL_RACES - 4
+
+        second = runner.run(START, END)
+
+        assert second.days_listed == 0
+        assert second.races == TOTAL_RACES - 4
+        assert second.skipped_races == 4
+        assert _count(etl, "races") == TOTAL_RACES
+
+    def test_failed_meetings_retried(self, etl, monkeypatch):
+        """Test fetch failures are journaled and retried up to max_attempts."""
+        scraper = etl.meeting_scraper
+        scrape = scraper.scrape_meetings_async
+
+        async def flaky(meetings, client):
+            if meetings[0][0] == "randwick":
+                return [ConnectionError("connection reset")]
+            return await scrape(meetings, client)
+
+        monkeypatch.setattr(scraper, "scrape_meetings_async", flaky)
+        report = _runner(etl).run(START, END)
+
+        assert report.failed_meetings == 2
+        assert report.failed_races == 4
+        failed = (
+            etl.connections.cursor()
+            .execute(
+                "SELECT DISTINCT venue, attempts, error FROM ingest_journal "
+                "WHERE status = 'failed'"
+            )
+            .fetchall()
+        )
+        assert failed == [("randwick", 1, "Fetch error: connection reset")]
+
+        # Attempts exhausted: left failed
+        assert _runner(etl, max_attempts=1).run(START, END).races == 0
+
+        monkeypatch.undo()
+        retry = _runner(etl).run(START, END)
+
+        assert retry.races == 4
+        assert retry.skipped_races == TOTAL_RACES - 4
+        assert _runner(etl).journal_summary()["done"] == TOTAL_RACES
+
+    def test_loads_only_planned_races(self, etl):
+        """Test races already done in a refetched meeting are not reloaded."""
+        _runner(etl).run(START, START, venues=["Flemington"])
+        etl.connections.cursor().execute(
+            "UPDATE ingest_journal SET status = 'pending' "
+            "WHERE venue = 'flemington' AND race_number = 2"
+        )
+        loaded = []
+        etl.post_ingest_hooks.append(loaded.append)
+
+        report = _runner(etl).run(START, START, venues=["Flemington"])
+
+        assert (report.races, report.skipped_races) == (1, 1)
+        assert [race_id.endswith("-R2") for race_id in loaded] == [True]
+
+    def test_empty_days_not_relisted(self, etl, server):
+        """Test a day without meetings is journaled and not listed again."""
+        server.venues = ()
+        first = _runner(etl).run(START, END)
+        requests = server.requests["graphql"]
+
+        second = _runner(etl).run(START, END)
+
+        assert (first.days_listed, second.days_listed) == (2, 0)
+        assert server.requests["graphql"] == requests
+        assert _runner(etl).journal_summary() == {"pending": 0, "done": 0, "failed": 0}
+
+    def test_invalid_range(self, etl):
+        """Test an end date before the start date is rejected."""
+        with pytest.raises(ValueError, match="before start_date"):
+            _runner(etl).run(END, START)
+
+
+class TestBackfillRacesCommand:
+    """Test suite for the racing backfill-races command."""
+
+    def test_backfill_races(self, temp_dir, server, monkeypatch):
+        """Test the command loads one venue and reports throughput."""
+        monkeypatch.setattr(RacingComGraphQLScraper, "GRAPHQL_URL", server.graphql_url)
+        db_path = temp_dir / "cli.duckdb"
+        create_database(db_path)
+
+        try:
+            result = CliRunner().invoke(
+                main,
+                [
+                    "backfill-races",
+                    "--db-path",
+                    str(db_path),
+                    "--start",
+                    START.isoformat(),
+                    "--end",
+                    END.isoformat(),
+                    "--venue",
+                    "flemington",
+                    "--rate-limit",
+                    "1000",
+                ],
+            )
+        finally:
+            close_all_connections()
+
+        assert result.exit_code == 0, result.output
+        assert "races/sec" in result.output
+        with DuckDBConnectionManager(db_path) as connections:
+            cursor = connections.cursor()
+            races = cursor.execute("SELECT COUNT(*) FROM races").fetchone()[0]
+        assert races == 4
@@ -0,0 +1,103 @@
+"""
+Tests for the local racing.com stand-in and the ingestion benchmark.
+
+Tests cover:
+- Synthetic and recorded GraphQL payloads served to the real scraper
+- Injected errors
+- Benchmark throughput and per-stage timings
+- Shared stage timing summary and table
+"""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from src.data.fake_racing_server import FakeRacingServer
+from src.data.ingest_benchmark import format_stages, run_benchmark, stage_summary
+from src.data.scrapers.racing_com_graphql import RacingComGraphQLScraper
+
+
+@pytest.fixture
+def scraper():
+    """GraphQL scraper without politeness delay."""
+    scraper = RacingComGraphQLScraper(delay_between_requests=0)
+    yield scraper
+    scraper.close()
+
+
+class TestFakeRacingServer:
+    """Test suite for FakeRacingServer."""
+
+    def test_synthetic_meeting(self, scraper):
+        """Test the scraper parses a full synthetic meeting."""
+        with FakeRacingServer(races_per_meeting=3, runners_per_race=5) as server:
+            scraper.GRAPHQL_URL = server.graphql_url
+            cards = scraper.scrape_meeting("flemington", "2025-01-01")
+
+        assert [card.race.race_id for card in cards] == [
+            "FLE-2025-01-01-R1",
+            "FLE-2025-01-01-R2",
+            "FLE-2025-01-01-R3",
+        ]
+        assert all(len(card.runs) == 5 for card in cards)
+        assert server.requests["graphql"] == 1
+
+    def test_recorded_meetings(self, scraper):
+        """Test the recorded meeting list is served for its date."""
+        with FakeRacingServer() as server:
+            scraper.GRAPHQL_URL = server.graphql_url
+            meetings = scraper.get_meetings_by_date("2025-11-14")
+
+        assert len(meetings) == 14
+        assert meetings[0]["venueName"] == "dubbo"
+
+    def test_injected_errors(self, scraper):
+        """Test error_rate=1 fails every request with a 503."""
+        with FakeRacingServer(error_rate=1.0) as server:
+            scraper.GRAPHQL_URL = server.graphql_url
+            with pytest.raises(requests.HTTPError, match="503"):
+                scraper.scrape_meeting("flemington", "2025-01-01")
+
+
+class TestIngestBenchmark:
+    """Test suite for run_benchmark."""
+
+    def test_reports_stages(self):
+        """Test every race is loaded and every stage timed."""
+        report = run_benchmark(
+            meetings=3, races_per_meeting=2, runners_per_race=4, form_pages=1
+        )
+        summary = report.summary()
+
+        assert summary["races"] == 6
+        assert summary["runs"] == 24
+        assert summary["failed_meetings"] == 0
+        assert summary["races_per_sec"] > 0
+        assert set(summary["stages"]) == {
+            "fetch",
+            "parse",
+            "convert",
+            "db_write",
+            "form",
+        }
+        assert summary["stages"]["db_write"]["count"] == 3
+        assert "races/sec" in report.format()
+
+    def test_failed_meetings_counted(self):
+        """Test server errors count as failed meetings."""
+        report = run_benchmark(meetings=2, error_rate=1.0)
+
+        assert report.failed_meetings == 2
+        assert report.races == 0
+
+    def test_stage_summary(self):
+        """Test empty stages are dropped and percentiles are in milliseconds."""
+        summary = stage_summary({"fetch": [0.001, 0.003], "form": []})
+
+        assert summary == {
+            "fetch": {"count": 2, "p50_ms": 2.0, "p99_ms": 2.98, "total_s": 0.004}
+        }
+        header, row = format_stages(summary)
+        assert header.split()[:2] == ["stage", "count"]
+        assert row.split() == ["fetch", "2", "2.00", "2.98", "0.004"]
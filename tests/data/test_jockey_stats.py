@@ -7,6 +7,7 @@ Tests cover:
 - Venue specialization detection
 - Distance performance analysis
 - Jockey-trainer combinations
+- Grouped bulk statistics
 """
 
 from __future__ import annotations
@@ -17,6 +18,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from src.data.db import close_all_connections
 from src.data.models import JockeyStat, TrainerStat
 from src.data.scrapers.jockey_stats import JockeyStatsBuilder
 
@@ -40,16 +42,18 @@ class TestJockeyStatsBuilder:
         reason="DuckDB not available"
     )
     def test_context_manager(self):
-        """Test context manager opens and closes database connection."""
-        with patch("src.data.scrapers.jockey_stats.duckdb") as mock_duckdb:
+        """Test context manager borrows the shared read-only manager's cursor."""
+        with patch("src.data.db.get_connection_manager") as mock_manager:
             mock_conn = Mock()
-            mock_duckdb.connect.return_value = mock_conn
+            mock_manager.return_value.cursor.return_value = mock_conn
             
             with JockeyStatsBuilder() as builder:
                 assert builder.conn == mock_conn
             
-            # Connection should be closed on exit
-            mock_conn.close.assert_called_once()
+            mock_manager.assert_called_once_with("racing.db")
+            # The manager owns the cursor: released, not closed, on exit
+            assert builder.conn is None
+            mock_conn.close.assert_not_called()
 
     def test_calculate_jockey_stats_no_connection(self):
         """Test that calculating stats without connection raises error."""
@@ -58,12 +62,12 @@ class TestJockeyStatsBuilder:
         with pytest.raises(RuntimeError, match="Database not connected"):
             builder.calculate_jockey_stats("JOCKEY123")
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_jockey_stats_basic(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_jockey_stats_basic(self, mock_manager):
         """Test basic jockey stats calculation."""
         # Setup mock database connection
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock query results
         # Overall stats: (total_rides, total_wins, total_places)
@@ -91,11 +95,11 @@ class TestJockeyStatsBuilder:
         # Place rate = 40/100 = 0.40
         assert stats.place_rate == Decimal("0.40")
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_jockey_stats_zero_rides(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_jockey_stats_zero_rides(self, mock_manager):
         """Test jockey stats calculation with zero rides."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock zero rides
         mock_conn.execute.return_value.fetchone.side_effect = [
@@ -113,11 +117,11 @@ class TestJockeyStatsBuilder:
         assert stats.win_rate == Decimal("0")
         assert stats.place_rate == Decimal("0")
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_trainer_stats_basic(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_trainer_stats_basic(self, mock_manager):
         """Test basic trainer stats calculation."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock query results
         mock_conn.execute.return_value.fetchone.side_effect = [
@@ -138,11 +142,11 @@ class TestJockeyStatsBuilder:
         # Win rate = 30/200 = 0.15
         assert stats.win_rate == Decimal("0.15")
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_venue_stats(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_venue_stats(self, mock_manager):
         """Test venue-specific statistics calculation."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock venue stats query result
         mock_conn.execute.return_value.fetchall.return_value = [
@@ -168,11 +172,11 @@ class TestJockeyStatsBuilder:
         assert "Randwick" in venue_stats
         assert venue_stats["Randwick"]["win_rate"] == 0.3
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_distance_stats(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_distance_stats(self, mock_manager):
         """Test distance-specific statistics calculation."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock distance stats query result
         mock_conn.execute.return_value.fetchall.return_value = [
@@ -196,11 +200,11 @@ class TestJockeyStatsBuilder:
         assert distance_stats["sprint"]["wins"] == 8
         assert distance_stats["sprint"]["win_rate"] == 0.2
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_calculate_jockey_combos(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_calculate_jockey_combos(self, mock_manager):
         """Test jockey-trainer combination statistics."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock jockey combo query result
         mock_conn.execute.return_value.fetchall.return_value = [
@@ -223,11 +227,11 @@ class TestJockeyStatsBuilder:
         assert combos["JOCKEY1"]["wins"] == 8
         assert combos["JOCKEY1"]["win_rate"] == 0.32  # 8/25
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_batch_calculate_jockey_stats(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_batch_calculate_jockey_stats(self, mock_manager):
         """Test batch calculation of jockey statistics."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock successful stats calculation
         def mock_stats_calc(jockey_id, lookback_days):
@@ -257,11 +261,11 @@ class TestJockeyStatsBuilder:
         assert stats_list[1].jockey_id == "JOCKEY2"
         assert stats_list[2].jockey_id == "JOCKEY3"
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_batch_calculate_trainer_stats(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_batch_calculate_trainer_stats(self, mock_manager):
         """Test batch calculation of trainer statistics."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         def mock_trainer_calc(trainer_id, lookback_days):
             return TrainerStat(
@@ -287,11 +291,11 @@ class TestJockeyStatsBuilder:
         assert len(stats_list) == 2
         assert all(isinstance(s, TrainerStat) for s in stats_list)
 
-    @patch("src.data.scrapers.jockey_stats.duckdb")
-    def test_specialist_venue_detection(self, mock_duckdb):
+    @patch("src.data.db.get_connection_manager")
+    def test_specialist_venue_detection(self, mock_manager):
         """Test detection of specialist venues."""
         mock_conn = Mock()
-        mock_duckdb.connect.return_value = mock_conn
+        mock_manager.return_value.cursor.return_value = mock_conn
         
         # Mock overall stats with 15% win rate
         mock_conn.execute.return_value.fetchone.side_effect = [
@@ -318,6 +322,103 @@ class TestJockeyStatsBuilder:
         assert "Randwick" not in stats.specialist_venues
 
 
+def _comparable(stat: JockeyStat | TrainerStat) -> dict:
+    """Model fields without the timestamp (venue order is unspecified)."""
+    fields = stat.model_dump(exclude={"calculated_at"})
+    fields["specialist_venues"] = sorted(fields["specialist_venues"] or [])
+    return fields
+
+
+class TestBulkStats:
+    """Test grouped statistics against the per-person queries."""
+
+    @pytest.fixture
+    def db_path(self, temp_dir):
+        """Two jockeys and two trainers over 40 days at two venues."""
+        duckdb = pytest.importorskip("duckdb")
+        path = temp_dir / "racing.duckdb"
+        con = duckdb.connect(str(path))
+        con.execute(
+            "CREATE TABLE races (race_id VARCHAR, date DATE, venue VARCHAR, "
+            "distance INTEGER, field_size INTEGER)"
+        )
+        con.execute(
+            "CREATE TABLE runs (run_id VARCHAR, race_id VARCHAR, "
+            "jockey_id VARCHAR, trainer_id VARCHAR, scratched BOOLEAN)"
+        )
+        con.execute("CREATE TABLE results (run_id VARCHAR, finish_position INTEGER)")
+        con.execute("CREATE TABLE jockeys (jockey_id VARCHAR, name VARCHAR)")
+        con.execute(
+            "INSERT INTO jockeys VALUES ('J1', 'J. McDonald'), ('J2', 'K. McEvoy')"
+        )
+
+        stat_date = date(2025, 11, 12)
+        for day in range(40):
+            race_id = f"R{day}"
+            con.execute(
+                "INSERT INTO races VALUES (?, ?, ?, ?, 10)",
+                [
+                    race_id,
+                    stat_date - timedelta(days=day),
+                    "FLE" if day % 3 else "RAN",
+                    1200 if day % 2 else 2000,
+                ],
+            )
+            runners = [
+                ("J1", "T1", 1 if day % 4 == 0 else 4),
+                ("J2", "T1", 2 if day % 4 == 0 else 1),
+                ("J1", "T2", 8),
+            ]
+            for i, (jockey, trainer, position) in enumerate(runners):
+                run_id = f"{race_id}-{i}"
+                con.execute(
+                    "INSERT INTO runs VALUES (?, ?, ?, ?, FALSE)",
+                    [run_id, race_id, jockey, trainer],
+                )
+                con.execute("INSERT INTO results VALUES (?, ?)", [run_id, position])
+        con.close()
+        yield str(path)
+        close_all_connections()
+
+    @pytest.mark.parametrize("lookback_days", [7, 30])
+    def test_jockeys_match_single_queries(self, db_path, lookback_days):
+        """Test bulk jockey stats equal calculate_jockey_stats()."""
+        stat_date = date(2025, 11, 12)
+        with JockeyStatsBuilder(db_path) as builder:
+            bulk = builder.calculate_jockey_stats_bulk(
+                lookback_days=lookback_days, stat_date=stat_date
+            )
+            for jockey_id in ("J1", "J2"):
+                single = builder.calculate_jockey_stats(
+                    jockey_id, lookback_days, stat_date
+                )
+                assert _comparable(bulk[jockey_id]) == _comparable(single)
+
+    def test_trainers_match_single_queries(self, db_path):
+        """Test bulk trainer stats (with jockey combos) equal the single path."""
+        stat_date = date(2025, 11, 12)
+        with JockeyStatsBuilder(db_path) as builder:
+            bulk = builder.calculate_trainer_stats_bulk(
+                ["T1", "T2"], lookback_days=30, stat_date=stat_date
+            )
+            for trainer_id in ("T1", "T2"):
+                single = builder.calculate_trainer_stats(trainer_id, 30, stat_date)
+                assert _comparable(bulk[trainer_id]) == _comparable(single)
+
+        assert bulk["T1"].jockey_combos["J2"]["name"] == "K. McEvoy"
+
+    def test_requested_without_rides(self, db_path):
+        """Test requested people without rides get zero statistics."""
+        with JockeyStatsBuilder(db_path) as builder:
+            bulk = builder.calculate_jockey_stats_bulk(
+                ["J1", "NOBODY"], stat_date=date(2025, 11, 12)
+            )
+
+        assert list(bulk) == ["J1", "NOBODY"]
+        assert bulk["NOBODY"].total_rides == 0
+        assert bulk["NOBODY"].win_rate == Decimal(0)
+
+
 @pytest.mark.integration
 class TestJockeyStatsBuilderIntegration:
     """Integration tests requiring actual database."""
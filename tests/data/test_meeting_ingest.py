@@ -0,0 +1,245 @@
+"""
+Tests for meeting-level GraphQL ingestion.
+
+Tests cover:
+- One GraphQL request per meeting, every race parsed
+- Date ranges across venues from the meeting list
+- Stable name-derived ids for scraped cards
+- Batch model validation and column-wise completeness scores
+- RacingETL.ingest_meeting loading a whole meeting in one transaction
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.data.init_db import create_database
+from src.data.models import ScrapedRun, build_models, completeness_scores
+from src.data.scrapers.racing_com_graphql import RacingComGraphQLScraper
+
+RACE_DATE = date(2025, 1, 1)
+
+
+def _entry(horse: str, jockey: str, barrier: int | None, gear: str = "") -> dict:
+    """GraphQL race entry."""
+    return {
+        "barrierNumber": barrier,
+        "weight": "57.5",
+        "gearList": gear,
+        "gearHasChanges": bool(gear),
+        "emergency": barrier is None,
+        "horse": {"name": horse, "sex": "G", "age": 4},
+        "jockey": {"name": jockey},
+        "trainer": {"name": "Chris Waller"},
+    }
+
+
+def _meeting(venue: str = "flemington", races: int = 3) -> dict:
+    """Meeting payload with `races` two-runner races and one emergency."""
+    return {
+        "venueName": venue,
+        "venueCode": venue[:3].upper(),
+        "track": "Turf",
+        "trackCondition": "Good 4",
+        "races": [
+            {
+                "raceNumber": number,
+                "name": f"Race {number}",
+                "distance": "1200m",
+                "class": "BM78",
+                "raceEntries": [
+                    _entry(f"Horse {number}A", "Jamie Kah", 1, gear="Blinkers"),
+                    _entry(f"Horse {number}B", "James McDonald", 2),
+                    _entry(f"Horse {number}C", "Craig Williams", None),
+                ],
+            }
+            for number in range(races, 0, -1)
+        ],
+    }
+
+
+def _response(payload: dict) -> Mock:
+    """requests.Response stand-in."""
+    response = Mock()
+    response.json.return_value = payload
+    return response
+
+
+@pytest.fixture
+def scraper():
+    """GraphQL scraper with a mocked session and no delay."""
+    scraper = RacingComGraphQLScraper(delay_between_requests=0)
+    scraper.session.post = Mock(
+        return_value=_response({"data": {"GetMeetingByVenue": _meeting()}})
+    )
+    return scraper
+
+
+class TestScrapeMeeting:
+    """Test suite for RacingComGraphQLScraper.scrape_meeting."""
+
+    def test_one_request_per_meeting(self, scraper):
+        """Test every race comes from a single request, in race order."""
+        cards = scraper.scrape_meeting("Flemington", RACE_DATE)
+
+        assert scraper.session.post.call_count == 1
+        assert [card.race.race_id for card in cards] == [
+            "FLE-2025-01-01-R1",
+            "FLE-2025-01-01-R2",
+            "FLE-2025-01-01-R3",
+        ]
+        assert len(cards[0].runs) == 3
+
+    def test_scrape_race_uses_meeting(self, scraper):
+        """Test scrape_race still returns the requested race."""
+        card = scraper.scrape_race("flemington", "2025-01-01", race_number=2)
+
+        assert card.race.race_id == "FLE-2025-01-01-R2"
+
+    def test_unparseable_race_skipped(self, scraper):
+        """Test a bad race is skipped without losing the meeting."""
+        meeting = _meeting()
+        meeting["races"][0]["raceEntries"][0]["weight"] = "99"  # over 72kg
+        scraper.session.post.return_value = _response(
+            {"data": {"GetMeetingByVenue": meeting}}
+        )
+
+        cards = scraper.scrape_meeting("flemington", RACE_DATE)
+
+        assert [card.race.race_number for card in cards] == [1, 2]
+
+    def test_date_range(self, scraper):
+        """Test a date range scrapes each listed venue once per day."""
+        scraper.get_meetings_by_date = Mock(
+            return_value=[{"venueName": "Flemington"}, {"venueName": "Randwick"}]
+        )
+
+        meetings = list(
+            scraper.scrape_meetings("2025-01-01", "2025-01-02", venues=["flemington"])
+        )
+
+        assert [(venue, day) for venue, day, _ in meetings] == [
+            ("flemington", date(2025, 1, 1)),
+            ("flemington", date(2025, 1, 2)),
+        ]
+        assert scraper.session.post.call_count == 2
+
+
+class TestToRaceCard:
+    """Test suite for ScrapedRaceCard.to_race_card."""
+
+    def test_ids_from_names(self, scraper):
+        """Test ids are stable across races and emergencies are dropped."""
+        first, second, _ = (
+            card.to_race_card()
+            for card in scraper.scrape_meeting("flemington", RACE_DATE)
+        )
+
+        assert [run.jockey_id for run in first.runs] == [
+            "J-JAMIE-KAH",
+            "J-JAMES-MCDONALD",
+        ]
+        assert first.trainers[0].trainer_id == second.trainers[0].trainer_id
+        assert len(first.horses) == 2
+        assert first.gear[0].run_id == "FLE-2025-01-01-R1-H-HORSE-1A"
+
+
+class TestBulkConstruction:
+    """Test suite for build_models and completeness_scores."""
+
+    def test_build_models(self):
+        """Test rows are validated into models, in order."""
+        rows = [
+            {
+                "race_id": "FLE-2025-01-01-R1",
+                "horse_name": name,
+                "jockey_name": "Jamie Kah",
+                "trainer_name": "Chris Waller",
+                "weight": "57.5",
+            }
+            for name in ("  Alpha ", "Beta")
+        ]
+
+        runs = build_models(ScrapedRun, rows)
+
+        assert [run.horse_name for run in runs] == ["Alpha", "Beta"]
+        assert str(runs[0].weight) == "57.5"
+
+    def test_build_models_invalid(self):
+        """Test any invalid row fails the batch."""
+        rows = [{"race_id": "FLE-2025-01-01-R1", "horse_name": "Alpha"}]
+
+        with pytest.raises(ValidationError):
+            build_models(ScrapedRun, rows)
+
+    def test_completeness_scores(self, scraper):
+        """Test scores match validate_completeness for both card types."""
+        meeting = _meeting()
+        meeting["races"][0]["raceEntries"][0]["weight"] = None
+        meeting["races"][1]["class"] = None
+        scraper.session.post.return_value = _response(
+            {"data": {"GetMeetingByVenue": meeting}}
+        )
+        scraped = scraper.scrape_meeting("flemington", RACE_DATE)
+        resolved = [card.to_race_card() for card in scraped]
+
+        for cards in (scraped, resolved):
+            assert completeness_scores(cards).tolist() == pytest.approx(
+                [card.validate_completeness() for card in cards]
+            )
+        assert [card.race.is_complete for card in scraped] == [True, True, True]
+        assert completeness_scores([]).size == 0
+
+
+class TestIngestMeeting:
+    """Test suite for RacingETL.ingest_meeting."""
+
+    @pytest.fixture
+    def etl(self, temp_dir, scraper):
+        """ETL pipeline over an empty database and the mocked scraper."""
+        path = temp_dir / "racing.duckdb"
+        create_database(path)
+        connections = DuckDBConnectionManager(path, read_only=False)
+        with (
+            patch("src.data.etl_pipeline.RacingComScraper"),
+            patch("src.data.etl_pipeline.StewardsScraper"),
+            patch("src.data.etl_pipeline.MarketOddsCollector"),
+        ):
+            etl = RacingETL(path, connections=connections)
+        etl.meeting_scraper = scraper
+        yield etl
+        connections.close()
+
+    def test_loads_whole_meeting(self, etl):
+        """Test every race lands from one request and one load."""
+        hook = Mock()
+        etl.post_ingest_hooks.append(hook)
+
+        metrics = etl.ingest_meeting("flemington", RACE_DATE)
+
+        assert metrics["status"] == "success", metrics["errors"]
+        assert metrics["inserted"]["races"] == 3
+        assert metrics["inserted"]["jockeys"] == 2
+        assert metrics["inserted"]["runs"] == 6
+        assert etl.meeting_scraper.session.post.call_count == 1
+        assert hook.call_count == 3
+
+        runs = etl.connections.cursor().execute("SELECT COUNT(*) FROM runs")
+        assert runs.fetchone()[0] == 6
+
+    def test_failed_fetch(self, etl):
+        """Test a failed request is reported, not raised."""
+        etl.meeting_scraper.session.post.return_value = _response(
+            {"errors": [{"message": "boom"}]}
+        )
+
+        metrics = etl.ingest_meeting("flemington", RACE_DATE)
+
+        assert metrics["status"] == "failed"
+        assert "boom" in metrics["errors"][0]
@@ -0,0 +1,186 @@
+"""
+Tests for the compressed odds history store.
+
+Tests cover:
+- Resolution selection for requested bar widths
+- Tick archive round trip, encoding and compression
+- OHLC/VWAP rollups and re-aggregation from coarser levels
+- Pruning market_odds and merging later ticks into the archive
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.fake_price_feed import FakePriceFeed
+from src.data.init_db import create_database
+from src.data.odds_history import TICKS, OddsHistoryStore
+from src.data.odds_stream import OddsStreamWriter, PriceTick
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Read-write connection manager on a database with two fake markets."""
+    db_path = temp_dir / "odds.duckdb"
+    create_database(db_path)
+    manager = DuckDBConnectionManager(db_path, read_only=False)
+    FakePriceFeed(markets=2, runners=3).seed_database(manager)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def history(temp_dir, connections):
+    """Odds history store on the test database."""
+    return OddsHistoryStore(temp_dir / "history", connections=connections)
+
+
+def _load(connections, ticks: list[PriceTick]) -> None:
+    """Write ticks to market_odds through the stream writer."""
+    with OddsStreamWriter(connections=connections, flush_interval=0.01) as stream:
+        stream.push_many(ticks)
+
+
+def _ticks(race: int, runner: int, prices: list[float], step: float = 1.0) -> list:
+    """Ticks for one runner, `step` seconds apart, with volume 10 each."""
+    race_id = f"FEED-2025-01-01-R{race}"
+    return [
+        PriceTick(
+            run_id=f"{race_id}-H{runner}",
+            race_id=race_id,
+            timestamp=START + timedelta(seconds=i * step),
+            odds_decimal=price,
+            volume=10.0,
+        )
+        for i, price in enumerate(prices)
+    ]
+
+
+class TestChooseResolution:
+    """Test suite for OddsHistoryStore.choose_resolution."""
+
+    @pytest.mark.parametrize(
+        "interval, level",
+        [
+            (None, TICKS),
+            (0.5, TICKS),
+            (1, "ohlc_1s"),
+            (15, "ohlc_1s"),
+            (30, "ohlc_10s"),
+            (60, "ohlc_1m"),
+            (timedelta(minutes=5), "ohlc_1m"),
+        ],
+    )
+    def test_coarsest_dividing_level(self, interval, level):
+        """Test the coarsest level that evenly divides the interval is used."""
+        assert OddsHistoryStore.choose_resolution(interval) == level
+
+    def test_invalid_interval(self):
+        """Test non-positive intervals are rejected."""
+        with pytest.raises(ValueError, match="interval"):
+            OddsHistoryStore.choose_resolution(0)
+
+
+class TestOddsHistoryStore:
+    """Test suite for OddsHistoryStore."""
+
+    def test_tick_round_trip(self, connections, history):
+        """Test archived ticks read back with their original prices."""
+        prices = [3.5, 3.45, 3.6, 3.55]
+        _load(connections, _ticks(1, 1, prices))
+
+        assert history.archive_race("FEED-2025-01-01-R1") == 4
+        ticks = history.read(race_id="FEED-2025-01-01-R1")
+
+        assert ticks["odds_decimal"].tolist() == prices
+        assert ticks["volume"].tolist() == [10.0] * 4
+        assert ticks["timestamp"].is_monotonic_increasing
+
+    def test_tick_file_encoding(self, connections, history):
+        """Test tick files are zstd-compressed with delta-encoded prices."""
+        _load(connections, _ticks(1, 1, [3.5, 3.45, 3.6]))
+        history.archive_race("FEED-2025-01-01-R1")
+
+        path = history.race_file(TICKS, "FEED-2025-01-01-R1", START.date())
+        metadata = pq.ParquetFile(path).metadata.row_group(0)
+        columns = {
+            metadata.column(i).path_in_schema: metadata.column(i)
+            for i in range(metadata.num_columns)
+        }
+
+        assert columns["price_x100"].compression == "ZSTD"
+        assert "DELTA_BINARY_PACKED" in columns["price_x100"].encodings
+        assert "DELTA_BINARY_PACKED" in columns["timestamp"].encodings
+
+    def test_ohlc_rollup(self, connections, history):
+        """Test 10s bars from the 10s rollup."""
+        _load(connections, _ticks(1, 1, [4.0, 5.0, 3.0, 4.5, 6.0], step=3))
+        history.archive_race("FEED-2025-01-01-R1")
+
+        bars = history.read(race_id="FEED-2025-01-01-R1", interval=10)
+
+        first, second = bars.to_dict("records")
+        assert (first["open"], first["high"], first["low"], first["close"]) == (
+            4.0,
+            5.0,
+            3.0,
+            4.5,
+        )
+        assert first["vwap"] == pytest.approx(4.125)
+        assert first["ticks"] == 4
+        assert second["open"] == second["close"] == 6.0
+
+    def test_reaggregated_bars_match_ticks(self, connections, history):
+        """Test 5-minute bars read from the 1m rollup equal bars from ticks."""
+        prices = [2.0 + (i % 37) / 10 for i in range(900)]
+        _load(connections, _ticks(1, 2, prices, step=1.3))
+        history.archive_race("FEED-2025-01-01-R1")
+
+        bars = history.read(
+            run_ids=["FEED-2025-01-01-R1-H2"], interval=timedelta(minutes=5)
+        )
+        from_ticks = history.read(race_id="FEED-2025-01-01-R1", interval=300.000001)
+
+        assert len(bars) == 4
+        assert bars["ticks"].sum() == 900
+        assert bars["high"].max() == max(prices)
+        assert bars["open"].iloc[0] == prices[0]
+        assert bars["close"].iloc[-1] == prices[-1]
+        assert from_ticks["ticks"].sum() == 900
+
+    def test_prune_and_merge(self, connections, history):
+        """Test pruned ticks stay archived when later ticks are merged in."""
+        _load(connections, _ticks(2, 1, [3.0, 3.1]))
+        history.archive_race("FEED-2025-01-01-R2", prune=True)
+
+        remaining = connections.cursor().execute("SELECT COUNT(*) FROM market_odds")
+        assert remaining.fetchone()[0] == 0
+
+        later = _ticks(2, 1, [3.0, 3.1, 3.2])[2:]
+        _load(connections, later)
+
+        assert history.archive_race("FEED-2025-01-01-R2", prune=True) == 3
+        ticks = history.read(race_id="FEED-2025-01-01-R2")
+        assert ticks["odds_decimal"].tolist() == [3.0, 3.1, 3.2]
+
+    def test_archive_date_and_time_filter(self, connections, history):
+        """Test archive_date covers every race and reads honour start/end."""
+        _load(connections, _ticks(1, 1, [3.0, 3.1, 3.2]) + _ticks(2, 3, [8.0, 7.5]))
+
+        assert history.archive_date("2025-01-01") == 5
+        ticks = history.read(
+            run_ids=["FEED-2025-01-01-R1-H1"],
+            start=START + timedelta(seconds=1),
+            end=START + timedelta(seconds=2),
+        )
+        assert ticks["odds_decimal"].tolist() == [3.1]
+
+    def test_missing_history(self, history):
+        """Test reads without archived data return an empty frame."""
+        assert history.read(race_id="FEED-2025-01-01-R1").empty
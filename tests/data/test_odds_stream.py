@@ -0,0 +1,196 @@
+"""
+Tests for streaming market odds ingestion.
+
+Tests cover:
+- Ring buffer ordering, wrap-around and batched drains
+- Overflow policies (backpressure and drop-oldest) and their metrics
+- Batched writes to market_odds from a concurrent fake price feed
+- Failed batches bisected so only bad ticks are lost
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.fake_price_feed import FakePriceFeed, run_stream_benchmark
+from src.data.init_db import create_database
+from src.data.odds_stream import OddsStreamWriter, PriceTick, TickRingBuffer
+
+
+def _tick(i: int) -> PriceTick:
+    """Tick identified by its price."""
+    return PriceTick("RUN", "RACE", datetime(2025, 1, 1, 12, 0, i), 2.0 + i)
+
+
+def _prices(ticks: list[PriceTick]) -> list[float]:
+    """Prices of ticks, for order checks."""
+    return [tick.odds_decimal for tick in ticks]
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Read-write connection manager on a fresh database."""
+    db_path = temp_dir / "odds.duckdb"
+    create_database(db_path)
+    manager = DuckDBConnectionManager(db_path, read_only=False)
+    yield manager
+    manager.close()
+
+
+class TestTickRingBuffer:
+    """Test suite for TickRingBuffer."""
+
+    def test_fifo_across_wrap(self):
+        """Test ticks drain in arrival order after the ring wraps."""
+        buffer = TickRingBuffer(capacity=4)
+        buffer.put_many([_tick(i) for i in range(3)])
+        assert _prices(buffer.drain(2)) == [2.0, 3.0]
+
+        buffer.put_many([_tick(i) for i in range(3, 6)])
+
+        assert _prices(buffer.drain(10)) == [4.0, 5.0, 6.0, 7.0]
+        assert len(buffer) == 0
+
+    def test_drain_waits_for_batch_or_timeout(self):
+        """Test a drain returns a partial batch once the timeout expires."""
+        buffer = TickRingBuffer(capacity=10)
+        buffer.put(_tick(0))
+
+        assert len(buffer.drain(5, min_items=5, timeout=0.05)) == 1
+        assert buffer.drain(5, timeout=0.01) == []
+
+    def test_drop_oldest(self):
+        """Test a full drop_oldest buffer overwrites and counts the oldest ticks."""
+        buffer = TickRingBuffer(capacity=3, overflow="drop_oldest")
+        buffer.put_many([_tick(i) for i in range(5)])
+
+        assert _prices(buffer.drain(10)) == [4.0, 5.0, 6.0]
+        assert buffer.metrics.dropped == 2
+        assert buffer.metrics.max_depth == 3
+
+    def test_block_times_out(self):
+        """Test a full blocking buffer raises queue.Full after the timeout."""
+        buffer = TickRingBuffer(capacity=2)
+        buffer.put_many([_tick(0), _tick(1)])
+
+        with pytest.raises(queue.Full):
+            buffer.put(_tick(2), timeout=0.05)
+
+        assert buffer.metrics.producer_waits == 1
+        assert buffer.metrics.producer_wait_seconds >= 0.04
+
+    def test_block_resumes_after_drain(self):
+        """Test a blocked producer continues once the consumer frees space."""
+        buffer = TickRingBuffer(capacity=2)
+        producer = threading.Thread(
+            target=buffer.put_many, args=([_tick(i) for i in range(4)],)
+        )
+        producer.start()
+
+        drained = []
+        while len(drained) < 4:
+            drained += buffer.drain(2, timeout=1)
+        producer.join(timeout=1)
+
+        assert _prices(drained) == [2.0, 3.0, 4.0, 5.0]
+        assert buffer.metrics.producer_waits >= 1
+
+    def test_closed_rejects_ticks(self):
+        """Test pushes fail after close while buffered ticks stay drainable."""
+        buffer = TickRingBuffer(capacity=2)
+        buffer.put(_tick(0))
+        buffer.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            buffer.put(_tick(1))
+        assert len(buffer.drain(2, min_items=2)) == 1
+
+    def test_invalid_overflow(self):
+        """Test unknown overflow policies are rejected."""
+        with pytest.raises(ValueError, match="overflow"):
+            TickRingBuffer(overflow="grow")
+
+
+class TestOddsStreamWriter:
+    """Test suite for OddsStreamWriter."""
+
+    def test_concurrent_feed_written(self, connections):
+        """Test every tick from concurrent markets lands in market_odds."""
+        feed = FakePriceFeed(markets=8, runners=6, updates_per_sec=0)
+        feed.seed_database(connections)
+
+        stream = OddsStreamWriter(
+            connections=connections, batch_size=200, flush_interval=0.05, capacity=500
+        )
+        with stream:
+            produced = feed.run(stream.push_many, updates=100)
+
+        rows = connections.cursor().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT race_id), MIN(odds_decimal) "
+            "FROM market_odds"
+        ).fetchone()
+        assert produced == 8 * 100 * 4
+        assert stream.metrics.written == rows[0] == produced
+        assert stream.metrics.failed_ticks == 0
+        assert rows[1] == 8
+        assert rows[2] >= 1.01
+        assert stream.metrics.max_depth <= 500
+
+    def test_flush_interval(self, connections):
+        """Test a partial batch is written once the flush interval passes."""
+        feed = FakePriceFeed(markets=1, runners=4, updates_per_sec=0)
+        feed.seed_database(connections)
+
+        with OddsStreamWriter(
+            connections=connections, batch_size=10_000, flush_interval=0.01
+        ) as stream:
+            feed.run(stream.push_many, updates=1)
+            for _ in range(100):
+                if stream.metrics.written:
+                    break
+                time.sleep(0.01)
+
+            assert stream.metrics.written == 4
+
+    def test_failed_batch_counted(self, connections):
+        """Test ticks for unknown runs fail their batch without stopping the stream."""
+        with OddsStreamWriter(connections=connections, flush_interval=0.01) as stream:
+            stream.push(_tick(0))
+
+        assert stream.metrics.failed_batches == 1
+        assert stream.metrics.failed_ticks == 1
+
+    def test_bad_ticks_lose_only_themselves(self, connections):
+        """Test unknown runs and out-of-range prices fail alone, not their batch."""
+        feed = FakePriceFeed(markets=1, runners=4, updates_per_sec=0)
+        feed.seed_database(connections)
+        race_id, run_ids = next(iter(feed.run_ids.items()))
+        at = datetime(2025, 1, 1, 12)
+        ticks = [PriceTick(run_id, race_id, at, 3.5) for run_id in run_ids]
+        ticks.insert(1, PriceTick("UNKNOWN", race_id, at, 3.5))
+        ticks.insert(3, PriceTick(run_ids[0], race_id, at, 0.5, source="tab"))
+
+        stream = OddsStreamWriter(connections=connections, batch_size=len(ticks))
+        stream._write(ticks)
+
+        count = connections.cursor().execute("SELECT COUNT(*) FROM market_odds")
+        assert count.fetchone()[0] == stream.metrics.written == 4
+        assert stream.metrics.failed_ticks == 2
+        assert stream.metrics.failed_batches == 1
+
+
+class TestStreamBenchmark:
+    """Test suite for run_stream_benchmark."""
+
+    def test_sustains_thousands_of_ticks(self):
+        """Test the fake feed streams thousands of ticks per second."""
+        metrics = run_stream_benchmark(markets=10, duration=1.0, flush_interval=0.05)
+
+        assert metrics["rows"] == metrics["written"] == metrics["produced"]
+        assert metrics["ticks_per_sec"] > 1000
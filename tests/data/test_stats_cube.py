@@ -0,0 +1,190 @@
+"""
+Tests for the jockey/trainer daily aggregate cube.
+
+Tests cover:
+- Cube-backed bulk statistics against the raw grouped queries
+- Incremental race-day refresh against a full rebuild
+- In-memory prefix index windows
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.scrapers.jockey_stats import JockeyStatsBuilder
+from src.data.stats_cube import StatsCube
+
+SCHEMA_PATH = Path(__file__).parents[2] / "src" / "data" / "schema.sql"
+STAT_DATE = date(2025, 11, 12)
+
+
+def _cube_ddl() -> str:
+    """CREATE statement for person_daily_stats, taken from schema.sql."""
+    statements = SCHEMA_PATH.read_text().split(";")
+    return next(s for s in statements if "person_daily_stats (" in s)
+
+
+def _add_race(con, day: int, runners: list[tuple[str, str, int]]) -> str:
+    """Insert a race `day` days before STAT_DATE and its runners."""
+    race_id = f"R{day}-{len(runners)}"
+    con.execute(
+        "INSERT INTO races VALUES (?, ?, ?, ?, 10)",
+        [
+            race_id,
+            STAT_DATE - timedelta(days=day),
+            "FLE" if day % 3 else "RAN",
+            1200 if day % 2 else 2000,
+        ],
+    )
+    for i, (jockey, trainer, position) in enumerate(runners):
+        run_id = f"{race_id}-{i}"
+        con.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, FALSE)",
+            [run_id, race_id, jockey, trainer],
+        )
+        con.execute("INSERT INTO results VALUES (?, ?)", [run_id, position])
+    return race_id
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Two jockeys and two trainers over 40 days at two venues."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute(
+        "CREATE TABLE races (race_id VARCHAR, date DATE, venue VARCHAR, "
+        "distance INTEGER, field_size INTEGER)"
+    )
+    con.execute(
+        "CREATE TABLE runs (run_id VARCHAR, race_id VARCHAR, "
+        "jockey_id VARCHAR, trainer_id VARCHAR, scratched BOOLEAN)"
+    )
+    con.execute("CREATE TABLE results (run_id VARCHAR, finish_position INTEGER)")
+    con.execute("CREATE TABLE jockeys (jockey_id VARCHAR, name VARCHAR)")
+    con.execute(_cube_ddl())
+
+    for day in range(40):
+        _add_race(
+            con,
+            day,
+            [
+                ("J1", "T1", 1 if day % 4 == 0 else 4),
+                ("J2", "T1", 2 if day % 4 == 0 else 1),
+                ("J1", "T2", 8),
+            ],
+        )
+    con.close()
+
+    manager = DuckDBConnectionManager(path, read_only=False)
+    yield manager
+    manager.close()
+
+
+def _cube_rows(connections) -> list[tuple]:
+    """Every cube row in key order."""
+    return (
+        connections.cursor()
+        .execute(
+            "SELECT * FROM person_daily_stats "
+            "ORDER BY person_role, person_id, venue, distance_range, date"
+        )
+        .fetchall()
+    )
+
+
+def _comparable(stat) -> dict:
+    """Model fields without the timestamp (venue order is unspecified)."""
+    fields = stat.model_dump(exclude={"calculated_at"})
+    fields["specialist_venues"] = sorted(fields["specialist_venues"] or [])
+    return fields
+
+
+class TestStatsCube:
+    """Test suite for StatsCube."""
+
+    @pytest.mark.parametrize("lookback_days", [7, 30, 365])
+    def test_jockeys_match_grouped_queries(self, connections, lookback_days):
+        """Test cube-backed bulk jockey stats equal the raw grouped queries."""
+        cube = StatsCube(connections=connections)
+        cube.refresh()
+
+        with JockeyStatsBuilder(connections=connections) as builder:
+            expected = builder.calculate_jockey_stats_bulk(
+                lookback_days=lookback_days, stat_date=STAT_DATE
+            )
+        with JockeyStatsBuilder(connections=connections, cube=cube) as builder:
+            actual = builder.calculate_jockey_stats_bulk(
+                lookback_days=lookback_days, stat_date=STAT_DATE
+            )
+
+        assert {k: _comparable(v) for k, v in actual.items()} == {
+            k: _comparable(v) for k, v in expected.items()
+        }
+
+    def test_trainers_match_grouped_queries(self, connections):
+        """Test cube-backed trainer counts equal the raw grouped queries."""
+        cube = StatsCube(connections=connections)
+        cube.refresh()
+        stat_date = STAT_DATE - timedelta(days=5)
+
+        with JockeyStatsBuilder(connections=connections) as builder:
+            expected = builder.calculate_trainer_stats_bulk(
+                ["T1", "T2", "NOBODY"], lookback_days=20, stat_date=stat_date
+            )
+        with JockeyStatsBuilder(connections=connections, cube=cube) as builder:
+            actual = builder.calculate_trainer_stats_bulk(
+                ["T1", "T2", "NOBODY"], lookback_days=20, stat_date=stat_date
+            )
+
+        for trainer_id in ("T1", "T2", "NOBODY"):
+            assert actual[trainer_id].total_runners == (
+                expected[trainer_id].total_runners
+            )
+            assert actual[trainer_id].strike_rate == expected[trainer_id].strike_rate
+            assert actual[trainer_id].recent_wins == expected[trainer_id].recent_wins
+            assert actual[trainer_id].venue_stats == expected[trainer_id].venue_stats
+
+    def test_incremental_matches_full_rebuild(self, connections):
+        """Test update_race recounts its day and shifts later running totals."""
+        cube = StatsCube(connections=connections)
+        cube.refresh()
+
+        with connections.write_transaction() as con:
+            new_day = _add_race(con, 45, [("J2", "T2", 1), ("J3", "T2", 2)])
+            same_day = _add_race(con, 10, [("J1", "T1", 1)])
+
+        assert cube.update_race(new_day) == 3  # J2, J3, T2
+        cube.update_race(same_day)
+        incremental = _cube_rows(connections)
+
+        cube.refresh()
+        assert incremental == _cube_rows(connections)
+
+    def test_prefix_index_windows(self, connections):
+        """Test in-memory windows equal prefix-row query windows."""
+        cube = StatsCube(connections=connections)
+        cube.refresh()
+        index = cube.prefix_index("jockey")
+
+        for start, end in [
+            (STAT_DATE - timedelta(days=30), STAT_DATE),
+            (STAT_DATE - timedelta(days=12), STAT_DATE - timedelta(days=3)),
+        ]:
+            overall, _, _ = cube.window_counts("jockey", ["J1", "J2"], start, end)
+            for jockey_id in ("J1", "J2"):
+                assert index.counts(jockey_id, start, end) == overall[jockey_id][:5]
+
+        assert index.lookback("J2", STAT_DATE, 0)[:2] == (1, 0)
+        assert index.counts("NOBODY", STAT_DATE, STAT_DATE) == (0, 0, 0, 0, 0)
+
+    def test_invalid_role(self, connections):
+        """Test unknown roles are rejected."""
+        with pytest.raises(ValueError, match="role"):
+            StatsCube(connections=connections).window_counts(
+                "owner", None, STAT_DATE, STAT_DATE
+            )
@@ -6,6 +6,7 @@ Tests cover:
 - Data extraction (vet checks, incidents, rail position)
 - Error handling for malformed PDFs
 - Confidence scoring
+- Batch parsing with extracted-text caching
 """
 
 from __future__ import annotations
@@ -13,6 +14,7 @@ from __future__ import annotations
 import tempfile
 from datetime import date
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -249,6 +251,101 @@ class TestStewardsReportParser:
             )
 
 
+class TestParsePdfReports:
+    """Test suite for StewardsReportParser.parse_pdf_reports."""
+
+    TEXT = "Venue: Flemington\nRace 1\nRail Position: +6m\nTrack Condition: Good 4"
+
+    def _extraction(self, confidence: float) -> dict:
+        """Extractor result with the given confidence."""
+        return {
+            "raw_text": self.TEXT,
+            "page_count": 1,
+            "confidence": confidence,
+            "method": "pdfplumber",
+        }
+
+    def _pdfs(self, directory: Path, count: int) -> list[Path]:
+        """Write distinct placeholder PDF files."""
+        paths = []
+        for i in range(count):
+            path = directory / f"report_{i}.pdf"
+            path.write_bytes(b"%PDF-1.4 report " + bytes([i]))
+            paths.append(path)
+        return paths
+
+    def test_fallback_skipped_at_high_confidence(self, temp_dir):
+        """Test PyPDF2 only runs when pdfplumber confidence is low."""
+        good, poor = self._pdfs(temp_dir, 2)
+        parser = StewardsReportParser()
+        confidences = {good.name: 0.9, poor.name: 0.1}
+
+        with (
+            patch.object(
+                StewardsReportParser,
+                "_extract_with_pdfplumber",
+                side_effect=lambda path: self._extraction(confidences[path.name]),
+            ),
+            patch.object(
+                StewardsReportParser,
+                "_extract_with_pypdf2",
+                return_value=self._extraction(0.5),
+            ) as pypdf2,
+        ):
+            results = parser.parse_pdf_reports(
+                [good, poor], max_workers=1, text_cache_dir=temp_dir / "text"
+            )
+
+        assert pypdf2.call_count == 1
+        assert pypdf2.call_args.args[0] == poor
+        assert results[good]["venue"] == "Flemington"
+
+    def test_cached_text_skips_extraction(self, temp_dir):
+        """Test a second run over unchanged files reuses the extracted text."""
+        paths = self._pdfs(temp_dir, 3)
+        parser = StewardsReportParser()
+
+        with patch.object(
+            StewardsReportParser,
+            "_extract_with_pdfplumber",
+            return_value=self._extraction(0.9),
+        ) as pdfplumber:
+            first = parser.parse_pdf_reports(
+                temp_dir, max_workers=1, text_cache_dir=temp_dir / "text"
+            )
+            second = parser.parse_pdf_reports(
+                temp_dir, max_workers=1, text_cache_dir=temp_dir / "text"
+            )
+
+        assert pdfplumber.call_count == 3
+        assert list(first) == list(second) == paths
+        assert second[paths[0]]["rail_position"] == "+6m"
+
+    def test_failures_not_cached(self, temp_dir):
+        """Test extraction errors are returned per file and retried next run."""
+        (path,) = self._pdfs(temp_dir, 1)
+        missing = temp_dir / "missing.pdf"
+        parser = StewardsReportParser()
+        failed = {**self._extraction(0.0), "raw_text": "", "error": "corrupt"}
+
+        with (
+            patch.object(
+                StewardsReportParser, "_extract_with_pdfplumber", return_value=failed
+            ) as pdfplumber,
+            patch.object(
+                StewardsReportParser, "_extract_with_pypdf2", return_value=failed
+            ),
+        ):
+            for _ in range(2):
+                results = parser.parse_pdf_reports(
+                    [path, missing], max_workers=1, text_cache_dir=temp_dir / "text"
+                )
+
+        assert pdfplumber.call_count == 2
+        assert "error" in results[path]
+        assert "PDF not found" in results[missing]["error"]
+
+
 @pytest.mark.integration
 class TestStewardsReportParserIntegration:
     """Integration tests requiring actual PDF files or network access."""
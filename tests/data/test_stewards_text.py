@@ -0,0 +1,79 @@
+"""
+Tests for the line-oriented stewards report text extractor.
+
+Tests cover:
+- Header fields confined to their own line
+- Vet scratchings and incidents in document order
+- Pattern priority and validation fallbacks
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from src.data.scrapers.stewards_text import StewardsTextExtractor
+
+REPORT = """RACING VICTORIA STEWARDS REPORT
+Flemington Race Meeting
+Date: 05/11/2024
+Rail Position: Out 6m entire circuit
+Track Condition: Good 4
+Weather: Fine and sunny
+Track bias favouring leaders on the inside
+Vet: Prior to the race Star Runner was scratched on veterinary advice.
+Race 1 - MAIDEN PLATE
+J Smith (Fast Horse) was checked near the 600m.
+Race 2 - BM64
+Interference at the start involving several runners in race 2.
+Bold Spirit was scratched at 10:05am by vet direction.
+"""
+
+
+class TestStewardsTextExtractor:
+    """Test suite for StewardsTextExtractor."""
+
+    def test_header_fields(self):
+        """Test header fields are read from their own lines."""
+        fields = StewardsTextExtractor(REPORT).extract()
+
+        assert fields["venue"].startswith("Flemington")
+        assert fields["date"] == date(2024, 11, 5)
+        assert fields["rail_position"] == "6m"
+        assert fields["track_condition"] == "Good 4"
+        assert fields["weather"] == "Fine and sunny"
+        assert "favouring leaders" in fields["track_bias"]
+
+    def test_vet_checks(self):
+        """Test scratchings with vet mentions before or after are both found."""
+        fields = StewardsTextExtractor(REPORT).extract()
+
+        horses = [check["horse"] for check in fields["vet_checks"]]
+        assert "Bold Spirit" in horses
+        assert all(check["confidence"] == 0.6 for check in fields["vet_checks"])
+
+    def test_incidents(self):
+        """Test incidents carry surrounding context."""
+        fields = StewardsTextExtractor(REPORT).extract()
+
+        descriptions = [incident["description"] for incident in fields["incidents"]]
+        assert any("Interference at the start" in d for d in descriptions)
+
+    def test_condition_falls_back_to_going(self):
+        """Test an invalid track condition falls through to the going line."""
+        text = "Track Condition: TBA\nOfficial going: Soft 6"
+
+        assert StewardsTextExtractor(text).extract()["track_condition"] == "Soft 6"
+
+    def test_invalid_date_skipped(self):
+        """Test an impossible DD-MM-YYYY date falls back to ISO format."""
+        text = "Ref 45/13/2024\nMeeting 2024-11-05"
+
+        assert StewardsTextExtractor(text).extract()["date"] == date(2024, 11, 5)
+
+    def test_empty_text(self):
+        """Test empty text yields the empty structure."""
+        fields = StewardsTextExtractor("").extract()
+
+        assert fields["venue"] is None
+        assert fields["vet_checks"] == []
+        assert fields["incidents"] == []
@@ -0,0 +1,191 @@
+"""
+Tests for the point-in-time feature builder.
+
+Tests cover:
+- Rolling jockey/trainer win-rate windows
+- No same-day or future leakage into a runner's features
+- Warm-up before start_date and Arrow batch boundaries
+- Streaming output to Parquet
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+import duckdb
+import pyarrow.parquet as pq
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.features.asof import AsOfFeatureBuilder, RollingRate
+
+# (race_id, date, horse_id, jockey_id, trainer_id, scratched, finish, speed,
+#  class, L400, L200)
+RUNS = [
+    ("FLE-2025-01-01-R1", date(2025, 1, 1), "H1", "J1", "T1", False, 1, 100, 90,
+     None, None),
+    ("FLE-2025-01-01-R1", date(2025, 1, 1), "H2", "J2", "T1", False, 2, 80, 85,
+     23.0, 11.5),
+    ("FLE-2025-01-01-R2", date(2025, 1, 1), "H3", "J1", "T2", False, 1, 95, 88,
+     None, None),
+    ("FLE-2025-01-10-R1", date(2025, 1, 10), "H1", "J1", "T1", False, None, None,
+     None, None, None),
+    ("FLE-2025-01-10-R1", date(2025, 1, 10), "H2", "J2", "T1", False, None, None,
+     None, None, None),
+    ("FLE-2025-01-10-R1", date(2025, 1, 10), "H4", "J1", "T1", True, None, None,
+     None, None, None),
+    ("FLE-2025-02-01-R1", date(2025, 2, 1), "H1", "J1", "T1", False, None, None,
+     None, None, None),
+]
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Three race days: results on day one, upcoming fields afterwards."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute(
+        """
+        CREATE TABLE races (
+            race_id VARCHAR, date DATE, distance INTEGER, track_type VARCHAR,
+            track_condition VARCHAR, class_level VARCHAR, prize_money INTEGER
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE runs (
+            run_id VARCHAR, race_id VARCHAR, horse_id VARCHAR, jockey_id VARCHAR,
+            trainer_id VARCHAR, barrier INTEGER, weight_carried DECIMAL(4,1),
+            scratched BOOLEAN
+        )
+        """
+    )
+    con.execute(
+        "CREATE TABLE horses "
+        "(horse_id VARCHAR, sire VARCHAR, dam VARCHAR, dam_sire VARCHAR)"
+    )
+    con.execute(
+        """
+        CREATE TABLE results (
+            run_id VARCHAR, race_id VARCHAR, finish_position INTEGER,
+            race_time DECIMAL(6,3), sectional_600m DECIMAL(5,2),
+            sectional_400m DECIMAL(5,2), sectional_200m DECIMAL(5,2),
+            speed_rating INTEGER, class_rating INTEGER
+        )
+        """
+    )
+
+    for barrier, run in enumerate(RUNS, start=1):
+        race_id, race_date, horse_id, jockey, trainer, scratched = run[:6]
+        finish, speed, klass, l400, l200 = run[6:]
+        run_id = f"{race_id}-{horse_id}"
+        con.execute(
+            "INSERT INTO races SELECT ?, ?, 1200, 'turf', 'Good 4', 'BM78', 50000 "
+            "WHERE NOT EXISTS (SELECT 1 FROM races WHERE race_id = ?)",
+            [race_id, race_date, race_id],
+        )
+        con.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, 57.0, ?)",
+            [run_id, race_id, horse_id, jockey, trainer, barrier, scratched],
+        )
+        if finish is not None:
+            con.execute(
+                "INSERT INTO results VALUES (?, ?, ?, 71.0, NULL, ?, ?, ?, ?)",
+                [run_id, race_id, finish, l400, l200, speed, klass],
+            )
+    con.close()
+
+    manager = DuckDBConnectionManager(path)
+    yield manager
+    manager.close()
+
+
+def _rows(connections, **kwargs) -> dict[str, dict]:
+    """All emitted rows keyed by run_id."""
+    builder = AsOfFeatureBuilder(connections=connections, **kwargs)
+    return {
+        row["run_id"]: row
+        for batch in builder.iter_batches()
+        for row in batch
+    }
+
+
+class TestRollingRate:
+    """Test the trailing-window win rate."""
+
+    def test_window_eviction(self):
+        """Test days older than the window drop out of the rate."""
+        rate = RollingRate(14)
+        rate.add(date(2025, 1, 1), 4, 2)
+        rate.add(date(2025, 1, 10), 2, 0)
+
+        assert rate.rate(date(2025, 1, 15)) == pytest.approx(2 / 6)
+        assert rate.rate(date(2025, 1, 16)) == 0.0
+        assert rate.rate(date(2025, 2, 1)) == 0.0
+
+
+class TestAsOfFeatureBuilder:
+    """Test suite for AsOfFeatureBuilder."""
+
+    def test_no_same_day_leakage(self, connections):
+        """Test day-one runners see no form, even from earlier races that day."""
+        rows = _rows(connections)
+
+        first = rows["FLE-2025-01-01-R2-H3"]
+        assert first["speed_starts"] == 0
+        assert first["speed_avg"] is None
+        assert first["jockey_win_rate"] == 0.0
+
+    def test_features_from_prior_days(self, connections):
+        """Test later runners see earlier results through the engine formulas."""
+        rows = _rows(connections)
+
+        h1 = rows["FLE-2025-01-10-R1-H1"]
+        assert (h1["speed_avg"], h1["speed_starts"], h1["class_best"]) == (
+            100.0,
+            1,
+            90.0,
+        )
+        assert h1["jockey_win_rate"] == 1.0  # J1 won both day-one rides
+        assert h1["trainer_win_rate"] == 0.5  # T1 one win from two runners
+        assert h1["pedigree_score"] is None  # progeny totals are not as-of
+
+        h2 = rows["FLE-2025-01-10-R1-H2"]
+        assert h2["sectional_style"] != "unknown"
+        assert h2["jockey_win_rate"] == 0.0
+
+    def test_recent_window(self, connections):
+        """Test the 14-day recent rate ignores older rides."""
+        h1 = _rows(connections)["FLE-2025-02-01-R1-H1"]
+
+        assert h1["jockey_win_rate"] == 1.0
+        assert h1["jockey_recent_win_rate"] == 0.0
+
+    def test_scratched_runners_skipped(self, connections):
+        """Test only declared runners are emitted."""
+        rows = _rows(connections)
+
+        assert "FLE-2025-01-10-R1-H4" not in rows
+        assert len(rows) == 6
+
+    def test_batch_boundaries(self, connections):
+        """Test tiny Arrow batches give identical features."""
+        expected = _rows(connections)
+        actual = _rows(connections, batch_size=1)
+
+        for run_id, row in expected.items():
+            row.pop("computed_at")
+            actual[run_id].pop("computed_at")
+            assert actual[run_id] == row
+
+    def test_build_writes_parquet(self, connections, temp_dir):
+        """Test start_date limits output but history still warms up state."""
+        path = temp_dir / "training" / "features.parquet"
+        builder = AsOfFeatureBuilder(connections=connections)
+
+        written = builder.build(path, start_date=date(2025, 1, 10))
+
+        table = pq.read_table(path).to_pandas().set_index("run_id")
+        assert written == len(table) == 3
+        assert table.loc["FLE-2025-01-10-R1-H1", "speed_avg"] == 100.0
@@ -0,0 +1,262 @@
+"""
+Tests for the parallel feature backfill.
+
+Tests cover:
+- Month and venue partition planning
+- Staging and merging into the feature store
+- Resume (merged partitions skipped, staged partitions merged, failed
+  races retried)
+- Pedigree features off by default
+- The backfill-features CLI command
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from unittest.mock import patch
+
+import duckdb
+import pytest
+from click.testing import CliRunner
+
+from src.cli import main
+from src.data.db import DuckDBConnectionManager
+from src.features.backfill import BackfillSummary, FeatureBackfill
+from src.features.store import MODEL_FEATURES, FeatureStore
+
+RACES = [
+    ("FLE-2025-10-30-R1", date(2025, 10, 30), "FLE"),
+    ("RAN-2025-10-31-R1", date(2025, 10, 31), "RAN"),
+    ("FLE-2025-11-01-R1", date(2025, 11, 1), "FLE"),
+    ("FLE-2025-11-01-R2", date(2025, 11, 1), "FLE"),
+]
+
+
+def _features(race_id: str) -> list[dict]:
+    """Two feature rows for a race (stands in for the engines)."""
+    rows = []
+    for horse_id in ("H1", "H2"):
+        row = {name: 1.0 for name in MODEL_FEATURES}
+        row.update(
+            {
+                "run_id": f"{race_id}-{horse_id}",
+                "race_id": race_id,
+                "horse_id": horse_id,
+                "distance": 1200,
+                "barrier": 1,
+                "speed_starts": 3,
+                "computed_at": datetime(2025, 11, 12),
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Database with four races over two months and two venues."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute("CREATE TABLE races (race_id VARCHAR, date DATE, venue VARCHAR)")
+    con.executemany("INSERT INTO races VALUES (?, ?, ?)", RACES)
+    con.close()
+
+    manager = DuckDBConnectionManager(path)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def backfill(temp_dir, connections):
+    """In-process backfill writing to a temporary feature store."""
+    return FeatureBackfill(
+        store_path=temp_dir / "features",
+        db_path=str(connections.db_path),
+        workers=1,
+        connections=connections,
+    )
+
+
+@pytest.fixture
+def engines():
+    """Patch feature computation so no engine tables are needed."""
+    with patch.object(
+        FeatureStore, "compute_race_features", side_effect=_features
+    ) as mock:
+        yield mock
+
+
+class TestPlan:
+    """Test partition planning."""
+
+    def test_month_partitions(self, backfill):
+        """Test races are grouped by month in date order."""
+        partitions = backfill.plan()
+
+        assert [p.key for p in partitions] == ["2025-10", "2025-11"]
+        assert partitions[1].race_ids == ["FLE-2025-11-01-R1", "FLE-2025-11-01-R2"]
+
+    def test_venue_partitions_with_range(self, backfill):
+        """Test venue partitioning honours the date range."""
+        backfill.partition_by = "venue"
+        partitions = backfill.plan(start_date=date(2025, 10, 31))
+
+        assert {p.key: len(p.race_ids) for p in partitions} == {"FLE": 2, "RAN": 1}
+
+    def test_invalid_scheme(self, temp_dir):
+        """Test unknown partition schemes are rejected."""
+        with pytest.raises(ValueError, match="partition_by"):
+            FeatureBackfill(store_path=temp_dir, partition_by="week")
+
+
+class TestRun:
+    """Test staging, merging and resume."""
+
+    def test_writes_feature_store(self, backfill, engines):
+        """Test every race lands in its date partition."""
+        summary = backfill.run(progress=False)
+
+        assert (summary.partitions, summary.races, summary.rows) == (2, 4, 8)
+        assert len(backfill.store.read_race("FLE-2025-11-01-R2")) == 2
+        assert not any(backfill.staging_dir.iterdir())
+
+        manifest = json.loads(backfill.manifest_path.read_text())
+        assert manifest["completed"] == {"2025-10": 4, "2025-11": 4}
+
+    def test_pedigree_off_by_default(self, temp_dir, connections):
+        """Test workers leave pedigree empty unless it is switched on."""
+        switches = []
+
+        def compute(store, race_id):
+            switches.append(store.pedigree)
+            return _features(race_id)
+
+        with patch.object(
+            FeatureStore, "compute_race_features", autospec=True, side_effect=compute
+        ):
+            for name, options in (("default", {}), ("on", {"pedigree": True})):
+                FeatureBackfill(
+                    store_path=temp_dir / name,
+                    db_path=str(connections.db_path),
+                    workers=1,
+                    connections=connections,
+                    **options,
+                ).run(progress=False)
+
+        assert switches == [False] * 4 + [True] * 4
+
+    def test_resume_skips_merged_partitions(self, backfill, engines):
+        """Test a resumed run recomputes nothing that was merged."""
+        backfill.run(progress=False)
+        engines.reset_mock()
+
+        summary = backfill.run(resume=True, progress=False)
+
+        assert summary.skipped == 2
+        engines.assert_not_called()
+
+    def test_resume_merges_staged_partition(self, backfill, engines):
+        """Test a staged-but-unmerged partition is merged without recompute."""
+        backfill.run(end_date=date(2025, 10, 31), progress=False)
+
+        # Simulate a crash after November was staged but before it was merged
+        list(backfill._compute(backfill.plan(start_date=date(2025, 11, 1))))
+        engines.reset_mock()
+
+        summary = backfill.run(resume=True, progress=False)
+
+        engines.assert_not_called()
+        assert (summary.skipped, summary.races) == (1, 2)
+        assert len(backfill.store.read_race("FLE-2025-11-01-R1")) == 2
+
+    def test_fresh_run_clears_manifest(self, backfill, engines):
+        """Test a run without resume recomputes everything."""
+        backfill.run(progress=False)
+        summary = backfill.run(progress=False)
+
+        assert summary.skipped == 0
+        assert summary.races == 4
+
+    def test_race_errors_collected(self, backfill, engines):
+        """Test a failing race is reported without failing its partition."""
+        engines.side_effect = lambda race_id: (
+            _features(race_id) if race_id != "RAN-2025-10-31-R1" else 1 / 0
+        )
+
+        summary = backfill.run(progress=False)
+
+        assert summary.races == 3
+        assert summary.errors == ["RAN-2025-10-31-R1: division by zero"]
+
+    def test_resume_retries_failed_races(self, backfill, engines):
+        """Test a partition with failed races is finished on resume."""
+        engines.side_effect = lambda race_id: (
+            _features(race_id) if race_id != "RAN-2025-10-31-R1" else 1 / 0
+        )
+        backfill.run(progress=False)
+
+        manifest = json.loads(backfill.manifest_path.read_text())
+        assert manifest["completed"] == {"2025-11": 4}
+        assert manifest["failed"] == {
+            "2025-10": {"rows": 2, "race_ids": ["RAN-2025-10-31-R1"]}
+        }
+
+        engines.reset_mock()
+        engines.side_effect = _features
+        summary = backfill.run(resume=True, progress=False)
+
+        assert [c.args[0] for c in engines.call_args_list] == ["RAN-2025-10-31-R1"]
+        assert (summary.skipped, summary.races, summary.errors) == (1, 1, [])
+        manifest = json.loads(backfill.manifest_path.read_text())
+        assert manifest["completed"] == {"2025-10": 4, "2025-11": 4}
+        assert manifest["failed"] == {}
+
+
+class TestCli:
+    """Test the backfill-features command."""
+
+    def test_options_passed_through(self):
+        """Test dates, partitioning, resume and pedigree reach FeatureBackfill."""
+        with patch("src.cli.FeatureBackfill") as backfill_cls:
+            backfill_cls.return_value.run.return_value = BackfillSummary(
+                partitions=1, races=2, rows=20
+            )
+            result = CliRunner().invoke(
+                main,
+                [
+                    "backfill-features",
+                    "--start",
+                    "2025-01-01",
+                    "--partition-by",
+                    "venue",
+                    "--workers",
+                    "4",
+                    "--resume",
+                    "--no-progress",
+                    "--pedigree",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "20 rows for 2 races" in result.output
+        backfill_cls.assert_called_once_with(
+            store_path=None,
+            db_path="data/racing.duckdb",
+            workers=4,
+            partition_by="venue",
+            pedigree=True,
+        )
+        backfill_cls.return_value.run.assert_called_once_with(
+            start_date=date(2025, 1, 1), end_date=None, resume=True, progress=False
+        )
+
+    def test_errors_exit_nonzero(self):
+        """Test a run with errors exits with status 1."""
+        with patch("src.cli.FeatureBackfill") as backfill_cls:
+            backfill_cls.return_value.run.return_value = BackfillSummary(
+                errors=["R1: boom"]
+            )
+            result = CliRunner().invoke(main, ["backfill-features"])
+
+        assert result.exit_code == 1
@@ -0,0 +1,107 @@
+"""
+Tests for race-level class ratings.
+
+Tests cover:
+- One query for a whole card / several races
+- Field quality memoized per race
+- Agreement with the per-runner path
+- Vectorized scores for a frame of performances
+"""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from src.features.class_ratings import ClassRatingsEngine
+
+
+@pytest.fixture
+def connections():
+    """Connection manager whose cursor returns two races of runners."""
+    cursor = Mock()
+    cursor.execute.return_value.fetchall.return_value = [
+        ("FLE-2025-11-12-R1", "H1", "BM78", 100000),
+        ("FLE-2025-11-12-R1", "H2", "BM78", 100000),
+        ("RAN-2025-11-15-R7", "H3", "Group 1", 1000000),
+    ]
+    manager = Mock()
+    manager.cursor.return_value = cursor
+    return manager
+
+
+class TestRaceClassRatings:
+    """Test suite for batch class ratings."""
+
+    def test_single_query_for_several_races(self, connections):
+        """Test every runner of every race comes from one query."""
+        engine = ClassRatingsEngine(connections=connections)
+
+        ratings = engine.calculate_class_ratings_for_races(
+            ["FLE-2025-11-12-R1", "RAN-2025-11-15-R7"]
+        )
+
+        assert connections.cursor.return_value.execute.call_count == 1
+        assert [r.horse_id for r in ratings["FLE-2025-11-12-R1"]] == ["H1", "H2"]
+        assert ratings["RAN-2025-11-15-R7"][0].class_score == 150
+
+    def test_field_quality_computed_once_per_race(self, connections):
+        """Test field quality is cached per race_id."""
+        engine = ClassRatingsEngine(connections=connections)
+        engine._calculate_field_quality = Mock(return_value=0.5)
+
+        engine.calculate_class_ratings_for_races(["FLE-2025-11-12-R1"])
+        engine.calculate_race_class_ratings("FLE-2025-11-12-R1")
+
+        assert engine._calculate_field_quality.call_count == 2  # one per race
+        engine.clear_cache()
+        engine.calculate_race_class_ratings("FLE-2025-11-12-R1")
+        assert engine._calculate_field_quality.call_count == 4
+
+    def test_matches_per_runner_rating(self, connections):
+        """Test batch scores equal calculate_class_rating()."""
+        engine = ClassRatingsEngine(connections=connections)
+        batch = engine.calculate_race_class_ratings("FLE-2025-11-12-R1")[0]
+
+        cursor = connections.cursor.return_value
+        cursor.execute.return_value.fetchone.return_value = ("BM78", 100000, 12, 3)
+        single = engine.calculate_class_rating("FLE-2025-11-12-R1", "H1")
+
+        assert batch == single
+
+    def test_empty_race_list(self, connections):
+        """Test no query is issued for an empty list."""
+        engine = ClassRatingsEngine(connections=connections)
+        assert engine.calculate_class_ratings_for_races([]) == {}
+        connections.cursor.assert_not_called()
+
+
+class TestClassScoresBulk:
+    """Test suite for calculate_class_scores_bulk."""
+
+    def test_matches_score_class(self):
+        """Test vectorized scores equal _score_class() row by row."""
+        frame = pd.DataFrame(
+            {
+                "race_id": ["R1", "R1", "R2", "R3", "R4", "R5", "R6"],
+                "class_level": ["BM78", "BM78", "Group 1", None, "Maiden", "bm64", ""],
+                "prize_money": [100000, 100000, 1000000, None, 15000, 55000.0, 250000],
+            }
+        )
+        engine = ClassRatingsEngine()
+
+        scores = engine.calculate_class_scores_bulk(frame)
+
+        expected = [
+            engine._score_class(
+                row.race_id,
+                "H",
+                row.class_level if pd.notna(row.class_level) else None,
+                int(row.prize_money) if pd.notna(row.prize_money) else None,
+            ).class_score
+            for row in frame.itertuples(index=False)
+        ]
+        assert scores.tolist() == expected
+        assert len(engine._field_quality_cache) == 6  # once per race
@@ -0,0 +1,179 @@
+"""
+Tests for the sparse jockey combination index.
+
+Tests cover:
+- Counts against a GROUP BY over the same results
+- Vectorized lookups with unknown pairs
+- Incremental, idempotent race updates
+- Race-card features and save/load round trip
+- update_race as a RacingETL post-ingest hook
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import patch
+
+import duckdb
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.features.combinations import COMBINATIONS, CombinationIndex
+
+# (race_id, date, horse_id, jockey_id, trainer_id, finish_position)
+RUNS = [
+    ("FLE-2025-01-01-R1", date(2025, 1, 1), "H1", "J1", "T1", 1),
+    ("FLE-2025-01-01-R1", date(2025, 1, 1), "H2", "J2", "T1", 2),
+    ("FLE-2025-01-01-R2", date(2025, 1, 1), "H3", "J1", "T2", 3),
+    ("FLE-2025-01-08-R1", date(2025, 1, 8), "H1", "J1", "T1", 2),
+    ("FLE-2025-01-08-R1", date(2025, 1, 8), "H2", "J1", "T1", None),
+    ("FLE-2025-01-15-R1", date(2025, 1, 15), "H1", "J1", "T1", 1),
+    ("FLE-2025-01-15-R1", date(2025, 1, 15), "H3", "J2", "T2", 4),
+]
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Three race days; one runner without a result."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute("CREATE TABLE races (race_id VARCHAR, date DATE)")
+    con.execute(
+        "CREATE TABLE runs (run_id VARCHAR, race_id VARCHAR, horse_id VARCHAR, "
+        "jockey_id VARCHAR, trainer_id VARCHAR, scratched BOOLEAN)"
+    )
+    con.execute("CREATE TABLE results (run_id VARCHAR, finish_position INTEGER)")
+
+    for race_id, race_date, horse_id, jockey, trainer, position in RUNS:
+        run_id = f"{race_id}-{horse_id}"
+        con.execute(
+            "INSERT INTO races SELECT ?, ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM races WHERE race_id = ?)",
+            [race_id, race_date, race_id],
+        )
+        con.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, FALSE)",
+            [run_id, race_id, horse_id, jockey, trainer],
+        )
+        if position is not None:
+            con.execute("INSERT INTO results VALUES (?, ?)", [run_id, position])
+    con.close()
+
+    manager = DuckDBConnectionManager(path)
+    yield manager
+    manager.close()
+
+
+class TestCombinationIndex:
+    """Test suite for CombinationIndex."""
+
+    def test_counts_match_group_by(self, connections):
+        """Test every pairing equals a GROUP BY over the results table."""
+        index = CombinationIndex.build(connections=connections)
+
+        for kind, column in COMBINATIONS.items():
+            expected = (
+                connections.cursor()
+                .execute(
+                    f"""
+                    SELECT r.jockey_id, r.{column}, COUNT(*),
+                           COUNT(*) FILTER (WHERE res.finish_position = 1)
+                    FROM runs r JOIN results res ON res.run_id = r.run_id
+                    GROUP BY ALL
+                    """
+                )
+                .fetchall()
+            )
+            jockeys, partners, rides, wins = zip(*expected)
+            actual_rides, actual_wins = index.lookup(kind, jockeys, partners)
+            assert actual_rides.tolist() == list(rides)
+            assert actual_wins.tolist() == list(wins)
+
+        assert index.total == 6
+
+    def test_unknown_pairs_are_zero(self, connections):
+        """Test unseen jockeys, partners and None ids count as no rides."""
+        index = CombinationIndex.build(connections=connections)
+
+        rides, wins = index.lookup(
+            "jockey_trainer", ["J2", "NEW", None, "J1"], ["T2", "T1", "T1", "T1"]
+        )
+
+        assert rides.tolist() == [1, 0, 0, 3]
+        assert wins.tolist() == [0, 0, 0, 2]
+
+    def test_incremental_updates(self, connections):
+        """Test point-in-time build plus update_race equals a full build."""
+        full = CombinationIndex.build(connections=connections)
+        index = CombinationIndex.build(
+            connections=connections, before=date(2025, 1, 8)
+        )
+
+        assert index.update_race("FLE-2025-01-08-R1", connections) == 1
+        assert index.update_race("FLE-2025-01-15-R1", connections) == 2
+        assert index.update_race("FLE-2025-01-15-R1", connections) == 0
+        assert index.update_race("NO-RESULTS-YET", connections) == 0
+        assert "NO-RESULTS-YET" not in index.race_ids
+
+        pairs = (["J1", "J2", "J1"], ["H1", "H3", "H3"])
+        for actual, expected in zip(
+            index.lookup("jockey_horse", *pairs), full.lookup("jockey_horse", *pairs)
+        ):
+            assert actual.tolist() == expected.tolist()
+
+    def test_race_card(self, connections):
+        """Test per-runner features for a whole card in one lookup."""
+        index = CombinationIndex.build(
+            connections=connections, before=date(2025, 1, 15)
+        )
+
+        features = index.race_card("FLE-2025-01-15-R1", connections)
+
+        h1 = features["FLE-2025-01-15-R1-H1"]
+        assert (h1["jockey_trainer_rides"], h1["jockey_trainer_wins"]) == (2, 1)
+        assert h1["jockey_trainer_win_rate"] == 0.5
+        assert h1["jockey_horse_rides"] == 2
+
+        h3 = features["FLE-2025-01-15-R1-H3"]
+        assert h3["jockey_horse_rides"] == 0
+        assert h3["jockey_horse_win_rate"] is None
+
+    def test_save_load(self, connections, temp_dir):
+        """Test a saved index answers lookups identically."""
+        index = CombinationIndex.build(connections=connections)
+        path = index.save(temp_dir / "combinations.npz")
+
+        loaded = CombinationIndex.load(path, connections=connections)
+
+        assert loaded.race_ids == index.race_ids
+        assert loaded.lookup("jockey_trainer", ["J1"], ["T1"])[0].tolist() == [3]
+        assert loaded.update_race("FLE-2025-01-01-R1") == 0
+
+    def test_post_ingest_hook(self, connections):
+        """Test update_race runs as an ETL hook with only the race_id."""
+        index = CombinationIndex.build(
+            connections=connections, before=date(2025, 1, 15)
+        )
+        with (
+            patch("src.data.etl_pipeline.RacingComScraper"),
+            patch("src.data.etl_pipeline.StewardsScraper"),
+            patch("src.data.etl_pipeline.MarketOddsCollector"),
+        ):
+            etl = RacingETL(
+                connections.db_path,
+                connections=connections,
+                post_ingest_hooks=[index.update_race],
+            )
+        metrics = {"errors": []}
+
+        etl._run_post_ingest_hooks("FLE-2025-01-15-R1", metrics)
+
+        assert metrics["errors"] == []
+        assert "FLE-2025-01-15-R1" in index.race_ids
+        assert index.lookup("jockey_trainer", ["J1"], ["T1"])[0].tolist() == [3]
+
+    def test_invalid_kind(self):
+        """Test unknown combinations are rejected."""
+        with pytest.raises(ValueError, match="kind"):
+            CombinationIndex().lookup("trainer_horse", [], [])
@@ -0,0 +1,252 @@
+"""
+Tests for the Parquet feature store.
+
+Tests cover:
+- Race/run identifier parsing
+- Atomic per-race partition writes and overwrites
+- Reads by race, run and date range
+- Feature vector ordering for the prediction API
+- Point-in-time jockey/trainer statistics in computed features
+- One pedigree analyzer (and aggregate load) per store
+- Pedigree left empty for historical races unless switched on
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+from unittest.mock import patch
+
+import duckdb
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.data.etl_pipeline import RacingETL
+from src.data.init_db import create_database
+from src.data.models import Horse, Jockey, Race, RaceCard, Run, Trainer
+from src.features.pedigree_analyzer import PedigreeAnalyzer
+from src.features.store import (
+    MODEL_FEATURES,
+    FeatureStore,
+    race_date_from_id,
+    run_id_to_race_id,
+)
+
+
+def _row(run_id: str, race_id: str, speed_avg: float | None = 95.0) -> dict:
+    """Build a feature row with every numeric feature populated."""
+    row = {name: 1.0 for name in MODEL_FEATURES}
+    row.update(
+        {
+            "run_id": run_id,
+            "race_id": race_id,
+            "horse_id": run_id.rsplit("-", 1)[-1],
+            "jockey_id": "J-1",
+            "trainer_id": "T-1",
+            "distance": 1200,
+            "barrier": 3,
+            "speed_starts": 5,
+            "speed_avg": speed_avg,
+            "sectional_style": "closer",
+            "computed_at": datetime(2025, 11, 12, 12, 0),
+        }
+    )
+    return row
+
+
+@pytest.fixture
+def store(temp_dir):
+    """Feature store writing to a temporary directory."""
+    db_path = temp_dir / "racing.duckdb"
+    duckdb.connect(str(db_path)).close()
+    connections = DuckDBConnectionManager(db_path)
+    yield FeatureStore(
+        store_path=temp_dir / "features",
+        db_path=str(db_path),
+        connections=connections,
+    )
+    connections.close()
+
+
+class TestIdentifiers:
+    """Test race/run identifier helpers."""
+
+    def test_race_date_from_id(self):
+        """Test race date is parsed from the race_id."""
+        assert race_date_from_id("FLE-2025-11-12-R1") == date(2025, 11, 12)
+
+    def test_race_date_from_invalid_id(self):
+        """Test malformed race_ids are rejected."""
+        with pytest.raises(ValueError, match="Invalid race_id"):
+            race_date_from_id("FLE-R1")
+
+    def test_run_id_to_race_id(self):
+        """Test race_id is recovered from a run_id."""
+        assert run_id_to_race_id("FLE-2025-11-12-R1-H1001") == "FLE-2025-11-12-R1"
+        assert run_id_to_race_id("RUN-1") is None
+
+
+class TestFeatureStore:
+    """Test suite for FeatureStore."""
+
+    def test_write_race_uses_date_partition(self, store):
+        """Test one file is written per race under its date partition."""
+        race_id = "FLE-2025-11-12-R1"
+        path = store.write_race(race_id, [_row(f"{race_id}-H1001", race_id)])
+
+        assert path == store.store_path / "race_date=2025-11-12" / f"{race_id}.parquet"
+        assert path.exists()
+        assert not path.with_suffix(".parquet.tmp").exists()
+
+    def test_rewrite_replaces_race(self, store):
+        """Test re-writing a race overwrites rather than appends."""
+        race_id = "FLE-2025-11-12-R1"
+        store.write_race(race_id, [_row(f"{race_id}-H1001", race_id, 90.0)])
+        store.write_race(race_id, [_row(f"{race_id}-H1001", race_id, 101.0)])
+
+        frame = store.read_race(race_id)
+        assert len(frame) == 1
+        assert frame.iloc[0]["speed_avg"] == 101.0
+
+    def test_read_missing_race_is_empty(self, store):
+        """Test reading an unknown race returns an empty frame with columns."""
+        frame = store.read_race("FLE-2025-11-12-R9")
+        assert frame.empty
+        assert "run_id" in frame.columns
+
+    def test_read_runs_and_range(self, store):
+        """Test reads across partitions through DuckDB."""
+        first = "FLE-2025-11-12-R1"
+        second = "RAN-2025-11-15-R2"
+        store.write_race(
+            first, [_row(f"{first}-H1", first), _row(f"{first}-H2", first)]
+        )
+        store.write_race(second, [_row(f"{second}-H3", second)])
+
+        runs = store.read_runs([f"{first}-H2", f"{second}-H3"])
+        assert sorted(runs["run_id"]) == [f"{first}-H2", f"{second}-H3"]
+
+        in_range = store.read_range(date(2025, 11, 14), date(2025, 11, 30))
+        assert list(in_range["race_id"]) == [second]
+
+    def test_feature_vector_order_and_missing_values(self, store):
+        """Test vectors follow MODEL_FEATURES and encode missing as NaN."""
+        race_id = "FLE-2025-11-12-R1"
+        run_id = f"{race_id}-H1001"
+        store.write_race(race_id, [_row(run_id, race_id, speed_avg=None)])
+
+        vector = store.get_feature_vector(run_id)
+
+        assert len(vector) == len(MODEL_FEATURES)
+        assert vector[MODEL_FEATURES.index("distance")] == 1200.0
+        assert math.isnan(vector[MODEL_FEATURES.index("speed_avg")])
+        assert store.get_feature_vector(f"{race_id}-H9999") is None
+
+
+def _card(race_id: str, race_date: date) -> RaceCard:
+    """One-runner card ridden by J-1 for T-1."""
+    return RaceCard(
+        race=Race(
+            race_id=race_id,
+            date=race_date,
+            venue="FLE",
+            race_number=int(race_id.rsplit("R", 1)[-1]),
+            distance=1200,
+            data_source="test",
+        ),
+        runs=[
+            Run(
+                run_id=f"{race_id}-H-1",
+                race_id=race_id,
+                horse_id="H-1",
+                jockey_id="J-1",
+                trainer_id="T-1",
+                barrier=1,
+            )
+        ],
+        horses=[Horse(horse_id="H-1", name="Horse 1", sire="Snitzel")],
+        jockeys=[Jockey(jockey_id="J-1", name="Jockey 1")],
+        trainers=[Trainer(trainer_id="T-1", name="Trainer 1")],
+    )
+
+
+class TestComputeRaceFeatures:
+    """Test point-in-time features from the full schema."""
+
+    EARLY = "FLE-2025-01-01-R1"
+    LATE = "FLE-2025-01-08-R2"
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        """Store over a database with two races a week apart."""
+        db_path = temp_dir / "racing.duckdb"
+        create_database(db_path)
+        connections = DuckDBConnectionManager(db_path, read_only=False)
+        with (
+            patch("src.data.etl_pipeline.RacingComScraper"),
+            patch("src.data.etl_pipeline.StewardsScraper"),
+            patch("src.data.etl_pipeline.MarketOddsCollector"),
+        ):
+            etl = RacingETL(db_path, connections=connections)
+        etl.load_race_cards(
+            [_card(self.EARLY, date(2025, 1, 1)), _card(self.LATE, date(2025, 1, 8))]
+        )
+        yield FeatureStore(
+            store_path=temp_dir / "features",
+            db_path=str(db_path),
+            connections=connections,
+        )
+        connections.close()
+
+    def _win(self, store: FeatureStore, race_id: str) -> None:
+        """Record a win for the race's only runner."""
+        with store.connections.write_transaction() as con:
+            con.execute(
+                "INSERT INTO results (result_id, run_id, race_id, finish_position) "
+                "VALUES (?, ?, ?, 1)",
+                [f"{race_id}-RES", f"{race_id}-H-1", race_id],
+            )
+
+    def test_stats_exclude_race_and_later_results(self, store):
+        """Test a race's own and later wins never reach its features."""
+        self._win(store, self.EARLY)
+        before = store.compute_race_features(self.EARLY)[0]
+
+        self._win(store, self.LATE)
+        after = store.compute_race_features(self.EARLY)[0]
+
+        assert before["jockey_win_rate"] == 0.0
+        assert before["trainer_win_rate"] == 0.0
+        for name in ("jockey_win_rate", "trainer_win_rate", "jockey_recent_win_rate"):
+            assert after[name] == before[name]
+
+        late = store.compute_race_features(self.LATE)[0]
+        assert late["jockey_win_rate"] == 1.0
+        assert late["trainer_win_rate"] == 1.0
+
+    def test_historical_pedigree_empty_by_default(self, store):
+        """Test past races skip pedigree (current totals would leak results)."""
+        with patch.object(PedigreeAnalyzer, "analyze_pedigree") as analyze:
+            row = store.compute_race_features(self.EARLY)[0]
+
+        analyze.assert_not_called()
+        assert row["pedigree_score"] is None
+        assert row["distance_suitability"] is None
+        assert store.fills_pedigree(date.today())
+
+        store.pedigree = True
+        assert store.compute_race_features(self.EARLY)[0]["pedigree_score"] is not None
+
+    def test_pedigree_aggregates_loaded_once(self, store):
+        """Test races share one analyzer and one progeny aggregate load."""
+        store.pedigree = True
+        with patch.object(
+            PedigreeAnalyzer,
+            "_load_progeny_aggregates",
+            autospec=True,
+            side_effect=PedigreeAnalyzer._load_progeny_aggregates,
+        ) as load:
+            store.compute_race_features(self.EARLY)
+            store.compute_race_features(self.LATE)
+
+        assert load.call_count == 1
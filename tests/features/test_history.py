@@ -0,0 +1,156 @@
+"""
+Tests for the shared form-history loader.
+
+Tests cover:
+- Per-filter ranks (all starts, timed starts, sectional starts)
+- Point-in-time cut-off
+- Engines summarizing the shared frame
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+import duckdb
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.features.class_ratings import ClassRatingsEngine
+from src.features.history import (
+    SECTIONAL_RANK,
+    START_RANK,
+    TIMED_RANK,
+    FormHistoryLoader,
+)
+from src.features.sectional_analyzer import SectionalAnalyzer
+from src.features.speed_ratings import SpeedRatingsEngine
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Database with six starts for H1 and one for H2."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute(
+        """
+        CREATE TABLE races (
+            race_id VARCHAR, date DATE, distance INTEGER, track_condition VARCHAR,
+            class_level VARCHAR, prize_money INTEGER
+        )
+        """
+    )
+    con.execute("CREATE TABLE runs (run_id VARCHAR, race_id VARCHAR, horse_id VARCHAR)")
+    con.execute(
+        """
+        CREATE TABLE results (
+            run_id VARCHAR, race_id VARCHAR, finish_position INTEGER,
+            race_time DECIMAL(6,3), sectional_600m DECIMAL(5,2),
+            sectional_400m DECIMAL(5,2), sectional_200m DECIMAL(5,2),
+            speed_rating INTEGER, class_rating INTEGER
+        )
+        """
+    )
+
+    # H1: newest first -> day 6 (no time), day 5 (timed, sectionals), ...
+    starts = [
+        (6, None, None, None),
+        (5, 72.0, 23.0, 11.5),
+        (4, 71.5, None, None),
+        (3, 72.5, 23.2, 11.6),
+        (2, 73.0, 23.5, 11.8),
+        (1, 70.9, 22.8, 11.3),
+    ]
+    for day, race_time, s400, s200 in starts:
+        race_id = f"FLE-2025-01-0{day}-R1"
+        con.execute(
+            "INSERT INTO races VALUES (?, ?, 1200, 'Good 4', 'BM78', 50000)",
+            [race_id, date(2025, 1, day)],
+        )
+        con.execute("INSERT INTO runs VALUES (?, ?, 'H1')", [f"{race_id}-H1", race_id])
+        con.execute(
+            "INSERT INTO results VALUES (?, ?, 1, ?, NULL, ?, ?, NULL, NULL)",
+            [f"{race_id}-H1", race_id, race_time, s400, s200],
+        )
+    con.execute(
+        "INSERT INTO runs VALUES ('FLE-2025-01-05-R1-H2', 'FLE-2025-01-05-R1', 'H2')"
+    )
+    con.execute(
+        """
+        INSERT INTO results VALUES
+            ('FLE-2025-01-05-R1-H2', 'FLE-2025-01-05-R1', 2, 72.3, NULL, NULL, NULL,
+             98, 80)
+        """
+    )
+    con.close()
+
+    manager = DuckDBConnectionManager(path)
+    yield manager
+    manager.close()
+
+
+class TestFormHistoryLoader:
+    """Test suite for FormHistoryLoader."""
+
+    def test_ranks_per_filter(self, connections):
+        """Test each filter ranks its own newest-first subset."""
+        history = FormHistoryLoader(connections=connections).load(["H1"], 3)
+
+        h1 = history.set_index("race_id")
+        assert h1.loc["FLE-2025-01-06-R1", START_RANK] == 1
+        assert h1.loc["FLE-2025-01-05-R1", TIMED_RANK] == 1
+        assert h1.loc["FLE-2025-01-03-R1", TIMED_RANK] == 3
+        assert h1.loc["FLE-2025-01-02-R1", SECTIONAL_RANK] == 3
+        # Outside every window
+        assert "FLE-2025-01-01-R1" not in h1.index
+
+    def test_before_excludes_race_day(self, connections):
+        """Test point-in-time loads ignore the race date and later."""
+        history = FormHistoryLoader(connections=connections).load(
+            ["H1"], 5, before=date(2025, 1, 5)
+        )
+        assert history["date"].max().date() == date(2025, 1, 4)
+
+    def test_empty_horse_list(self, connections):
+        """Test no query is needed for an empty field."""
+        history = FormHistoryLoader(connections=connections).load([])
+        assert history.empty
+        assert START_RANK in history.columns
+
+
+class TestEnginesShareHistory:
+    """Test engines produce per-horse results from one shared frame."""
+
+    def test_batch_matches_single_horse(self, connections):
+        """Test batch summaries equal the single-horse methods."""
+        history = FormHistoryLoader(connections=connections).load(["H1", "H2"], 3)
+
+        speed = SpeedRatingsEngine(connections=connections)
+        klass = ClassRatingsEngine(connections=connections)
+        sectionals = SectionalAnalyzer(connections=connections)
+
+        for horse_id in ("H1", "H2"):
+            assert speed.get_average_ratings(["H1", "H2"], 3, history)[
+                horse_id
+            ] == speed.get_horse_average_rating(horse_id, 3)
+            assert klass.get_average_classes(["H1", "H2"], 3, history)[
+                horse_id
+            ] == klass.get_horse_average_class(horse_id, 3)
+            assert sectionals.get_sectional_patterns(["H1", "H2"], 3, history)[
+                horse_id
+            ] == sectionals.get_horse_sectional_pattern(horse_id, 3)
+
+    def test_windows_respected(self, connections):
+        """Test each engine only counts starts inside its own window."""
+        history = FormHistoryLoader(connections=connections).load(["H1", "H2"], 3)
+
+        speed = SpeedRatingsEngine(connections=connections).get_average_ratings(
+            ["H1", "H2", "H3"], 3, history
+        )
+        patterns = SectionalAnalyzer(connections=connections).get_sectional_patterns(
+            ["H1"], 3, history
+        )
+
+        assert speed["H1"]["starts"] == 3
+        assert speed["H2"]["average"] == 98  # stored rating used as-is
+        assert speed["H3"]["starts"] == 0
+        assert patterns["H1"]["starts_analyzed"] == 3
@@ -0,0 +1,212 @@
+"""
+Tests for the materialized progeny aggregates.
+
+Tests cover:
+- Full rebuild of progeny_stats and progeny_distance_stats
+- Incremental refresh of one race's parents
+- PedigreeAnalyzer ratings from the aggregate lookups
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.data.db import DuckDBConnectionManager
+from src.features.pedigree_aggregates import ProgenyAggregates
+from src.features.pedigree_analyzer import PedigreeAnalyzer
+
+SCHEMA_PATH = Path(__file__).parents[2] / "src" / "data" / "schema.sql"
+
+
+def _aggregate_ddl() -> list[str]:
+    """CREATE statements for the progeny tables, taken from schema.sql."""
+    statements = SCHEMA_PATH.read_text().split(";")
+    return [s for s in statements if "CREATE TABLE IF NOT EXISTS progeny" in s]
+
+
+@pytest.fixture
+def connections(temp_dir):
+    """Two Snitzel foals (one a G1 winner) and one Written Tycoon foal."""
+    path = temp_dir / "racing.duckdb"
+    con = duckdb.connect(str(path))
+    con.execute(
+        """
+        CREATE TABLE races (
+            race_id VARCHAR, date DATE, distance INTEGER, track_type VARCHAR,
+            class_level VARCHAR
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE horses (
+            horse_id VARCHAR, sire VARCHAR, dam VARCHAR, dam_sire VARCHAR
+        )
+        """
+    )
+    con.execute("CREATE TABLE runs (run_id VARCHAR, race_id VARCHAR, horse_id VARCHAR)")
+    con.execute(
+        """
+        CREATE TABLE results (
+            result_id VARCHAR, run_id VARCHAR, race_id VARCHAR,
+            finish_position INTEGER, prize_money DECIMAL(12,2)
+        )
+        """
+    )
+    for statement in _aggregate_ddl():
+        con.execute(statement)
+
+    con.execute(
+        """
+        INSERT INTO horses VALUES
+            ('H1', 'Snitzel', 'Mare A', 'Redoute''s Choice'),
+            ('H2', 'Snitzel', 'Mare B', 'Encosta De Lago'),
+            ('H3', 'Written Tycoon', 'Mare A', 'Redoute''s Choice')
+        """
+    )
+    races = [
+        ("FLE-2025-01-01-R1", 1, 1200, "Turf", "G1"),
+        ("FLE-2025-01-02-R1", 2, 1200, "Turf", "BM78"),
+        ("FLE-2025-01-03-R1", 3, 1600, "Synthetic", "BM64"),
+    ]
+    for race_id, day, distance, track_type, class_level in races:
+        con.execute(
+            "INSERT INTO races VALUES (?, ?, ?, ?, ?)",
+            [race_id, date(2025, 1, day), distance, track_type, class_level],
+        )
+
+    finishes = [
+        ("FLE-2025-01-01-R1", "H1", 1, 500000),
+        ("FLE-2025-01-01-R1", "H2", 2, 100000),
+        ("FLE-2025-01-02-R1", "H2", 1, 30000),
+        ("FLE-2025-01-03-R1", "H3", 4, 0),
+    ]
+    for race_id, horse_id, position, prize in finishes:
+        run_id = f"{race_id}-{horse_id}"
+        con.execute("INSERT INTO runs VALUES (?, ?, ?)", [run_id, race_id, horse_id])
+        con.execute(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+            [run_id, run_id, race_id, position, prize],
+        )
+    con.close()
+
+    manager = DuckDBConnectionManager(path, read_only=False)
+    yield manager
+    manager.close()
+
+
+def _stats(connections, role: str, name: str) -> tuple:
+    """(progeny, runners, winners, stakes_winners, g1_winners, starts, wins)."""
+    return (
+        connections.cursor()
+        .execute(
+            """
+            SELECT progeny, runners, winners, stakes_winners, g1_winners,
+                   starts, wins
+            FROM progeny_stats
+            WHERE parent_role = ? AND parent_name = ?
+            """,
+            [role, name],
+        )
+        .fetchone()
+    )
+
+
+class TestProgenyAggregates:
+    """Test suite for ProgenyAggregates."""
+
+    def test_full_rebuild(self, connections):
+        """Test every parent role is aggregated from actual results."""
+        refreshed = ProgenyAggregates(connections=connections).refresh()
+
+        # 2 sires + 2 dams + 2 dam sires
+        assert refreshed == 6
+        assert _stats(connections, "sire", "Snitzel") == (2, 2, 2, 1, 1, 3, 2)
+        assert _stats(connections, "sire", "Written Tycoon") == (1, 1, 0, 0, 0, 1, 0)
+        assert _stats(connections, "dam", "Mare A") == (2, 2, 1, 1, 1, 2, 1)
+        assert _stats(connections, "dam_sire", "Redoute's Choice")[0] == 2
+
+    def test_distance_rows(self, connections):
+        """Test distance/surface rows carry starts, wins and top-3 counts."""
+        ProgenyAggregates(connections=connections).refresh()
+
+        rows = (
+            connections.cursor()
+            .execute(
+                """
+                SELECT distance, track_type, starts, wins, top3
+                FROM progeny_distance_stats
+                WHERE parent_role = 'sire' AND parent_name = 'Snitzel'
+                """
+            )
+            .fetchall()
+        )
+        assert rows == [(1200, "turf", 3, 2, 3)]
+
+    def test_incremental_refresh(self, connections):
+        """Test a race refresh only rewrites its runners' parents."""
+        aggregates = ProgenyAggregates(connections=connections)
+        aggregates.refresh()
+
+        with connections.write_transaction() as con:
+            con.execute(
+                "UPDATE results SET finish_position = 1 "
+                "WHERE run_id = 'FLE-2025-01-03-R1-H3'"
+            )
+            con.execute(
+                "INSERT INTO progeny_stats (parent_role, parent_name, progeny, "
+                "runners, winners, stakes_winners, g1_winners, starts, wins) "
+                "VALUES ('sire', 'Untouched', 1, 1, 1, 0, 0, 1, 1)"
+            )
+
+        refreshed = aggregates.update_race("FLE-2025-01-03-R1")
+
+        # H3's sire, dam and dam's sire
+        assert refreshed == 3
+        assert _stats(connections, "sire", "Written Tycoon")[2] == 1
+        assert _stats(connections, "sire", "Untouched") is not None
+
+
+class TestPedigreeAnalyzerLookups:
+    """Test PedigreeAnalyzer reads the materialized aggregates."""
+
+    def test_ratings_from_aggregates(self, connections):
+        """Test sire/dam ratings and suitability come from the tables."""
+        ProgenyAggregates(connections=connections).refresh()
+        analyzer = PedigreeAnalyzer(connections=connections)
+
+        rating = analyzer.analyze_pedigree("H1", 1200)
+
+        # 100% winners (60 + 100) + G1 bonus + avg win prize > 100k, capped
+        assert rating.sire_rating == 150
+        # Dam produced a G1 (stakes) winner
+        assert rating.dam_rating == 130
+        assert rating.surface_suitability == 85.0
+
+        stats = analyzer.get_sire_statistics("Snitzel")
+        assert stats["progeny_count"] == 2
+        assert stats["win_rate"] == 100.0
+        assert stats["best_distance"] == "sprint"
+
+    def test_unknown_parent_is_neutral(self, connections):
+        """Test parents without aggregates get the neutral rating."""
+        analyzer = PedigreeAnalyzer(connections=connections)
+
+        assert analyzer._rate_stallion("Nobody") == 70
+        assert analyzer._rate_broodmare("Nobody") == 70
+        assert analyzer.get_sire_statistics("Nobody")["best_distance"] == "unknown"
+
+    def test_reload_picks_up_refresh(self, connections):
+        """Test cached aggregates are replaced after reload()."""
+        analyzer = PedigreeAnalyzer(connections=connections)
+        assert analyzer._rate_stallion("Snitzel") == 70
+
+        ProgenyAggregates(connections=connections).refresh()
+        assert analyzer._rate_stallion("Snitzel") == 70
+
+        analyzer.reload()
+        assert analyzer._rate_stallion("Snitzel") == 150
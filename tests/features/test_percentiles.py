@@ -0,0 +1,177 @@
+"""
+Tests for the speed-rating population percentile index.
+
+Tests cover:
+- Distance bands and condition buckets
+- Percentile lookups (scalar and vectorized)
+- Incremental adds and save/load round trip
+- Post-ingest updates that skip races without results
+- Post-ingest hook on an index built from a non-default database
+- Engine integration
+"""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.db import close_all_connections
+from src.features.percentiles import (
+    SpeedPercentileIndex,
+    condition_bucket,
+    distance_band,
+)
+from src.features.speed_ratings import SpeedRatingsEngine
+
+
+@pytest.fixture
+def index():
+    """Index with sprint/good ratings 91-100 and one heavy staying rating."""
+    index = SpeedPercentileIndex()
+    index.add([1200] * 10, ["Good 4"] * 10, list(range(91, 101)))
+    index.add([3200], ["Heavy 10"], [80])
+    return index
+
+
+class TestBuckets:
+    """Test cell assignment."""
+
+    def test_distance_bands(self):
+        """Test band limits are inclusive."""
+        bands = distance_band([1000, 1200, 1201, 1600, 2000, 2400])
+        assert bands.tolist() == [0, 0, 1, 1, 2, 3]
+
+    def test_condition_buckets(self):
+        """Test first word decides the bucket; unknown/missing -> good."""
+        buckets = condition_bucket(
+            ["Soft 7", "heavy 9", "Firm", "Synthetic", None, "", "Good 3"]
+        )
+        assert buckets.tolist() == [2, 3, 0, 1, 1, 1, 1]
+
+
+class TestSpeedPercentileIndex:
+    """Test suite for SpeedPercentileIndex."""
+
+    def test_percentile_at_or_below(self, index):
+        """Test percentile is the share rated at or below."""
+        assert index.percentile(1200, "Good 4", 100) == 100.0
+        assert index.percentile(1100, "good 3", 95) == 50.0
+        assert index.percentile(1200, "Good", 50) == 0.0
+        assert index.percentile(3200, "Heavy 8", 80) == 100.0
+
+    def test_empty_cell_is_none(self, index):
+        """Test cells without history give no percentile."""
+        assert index.percentile(1600, "Soft 5", 100) is None
+
+    def test_vectorized_matches_scalar(self, index):
+        """Test percentiles() agrees with percentile()."""
+        values = index.percentiles(
+            [1200, 1200, 1600], ["Good 4", None, "Soft 5"], [93, 99, 1]
+        )
+        assert values[0] == index.percentile(1200, "Good 4", 93)
+        assert values[1] == index.percentile(1200, None, 99)
+        assert np.isnan(values[2])
+
+    def test_incremental_add_invalidates_cdf(self, index):
+        """Test adding ratings updates subsequent lookups."""
+        assert index.percentile(1200, "Good 4", 95) == 50.0
+        index.add([1200] * 10, ["Good 4"] * 10, [150] * 10)
+        assert index.percentile(1200, "Good 4", 95) == 25.0
+        assert index.total == 21
+
+    def test_save_and_load(self, index, temp_dir):
+        """Test counts and counted races survive a round trip."""
+        index.race_ids.add("FLE-2025-11-12-R1")
+        path = index.save(temp_dir / "speed_percentiles.npz")
+
+        loaded = SpeedPercentileIndex.load(path)
+
+        assert np.array_equal(loaded.counts, index.counts)
+        assert loaded.race_ids == {"FLE-2025-11-12-R1"}
+
+    def test_update_race_counts_once(self, index):
+        """Test a race already in the index is skipped without a query."""
+        index.race_ids.add("FLE-2025-11-12-R1")
+        assert index.update_race("FLE-2025-11-12-R1") == 0
+
+    def test_update_race_waits_for_results(self, index):
+        """Test a card-only race is counted once its results arrive."""
+        results = pd.DataFrame(
+            {
+                "race_id": ["FLE-2025-11-12-R1"],
+                "distance": [1200],
+                "track_condition": ["Good 4"],
+                "race_time": [70.5],
+                "speed_rating": [95.0],
+            }
+        )
+        connections = Mock()
+        query = connections.cursor.return_value.execute.return_value
+        query.df.side_effect = [results.iloc[:0], results]
+        total = index.counts.sum()
+
+        assert index.update_race("FLE-2025-11-12-R1", Mock(), connections) == 0
+        assert "FLE-2025-11-12-R1" not in index.race_ids
+
+        assert index.update_race("FLE-2025-11-12-R1", Mock(), connections) == 1
+        assert "FLE-2025-11-12-R1" in index.race_ids
+        assert index.counts.sum() == total + 1
+
+
+    def test_hook_uses_index_database(self, temp_dir):
+        """Test update_race with only a race_id reads the index's database."""
+        path = temp_dir / "my.duckdb"
+        con = duckdb.connect(str(path))
+        con.execute(
+            "CREATE TABLE races (race_id VARCHAR, distance INTEGER, "
+            "track_condition VARCHAR)"
+        )
+        con.execute(
+            "CREATE TABLE results (race_id VARCHAR, race_time DOUBLE, "
+            "sectional_600m DOUBLE, sectional_400m DOUBLE, "
+            "sectional_200m DOUBLE, speed_rating INTEGER)"
+        )
+        con.execute("INSERT INTO races VALUES ('FLE-2025-11-12-R1', 1200, 'Good 4')")
+        con.execute(
+            "INSERT INTO results VALUES ('FLE-2025-11-12-R1', 70.5, NULL, NULL, "
+            "NULL, 95)"
+        )
+        con.close()
+
+        try:
+            built = SpeedPercentileIndex.build(db_path=str(path))
+            assert built.total == 1
+
+            empty = SpeedPercentileIndex().save(temp_dir / "empty.npz")
+            loaded = SpeedPercentileIndex.load(empty, db_path=str(path))
+            assert loaded.update_race("FLE-2025-11-12-R1") == 1
+            assert loaded.percentile(1200, "Good 4", 95) == 100.0
+        finally:
+            close_all_connections()
+
+class TestEngineIntegration:
+    """Test SpeedRatingsEngine fills population_percentile."""
+
+    def test_single_and_bulk(self, index):
+        """Test both rating paths look up the population percentile."""
+        engine = SpeedRatingsEngine(percentile_index=index)
+
+        rating = engine.calculate_speed_rating("R", "H", 72.0, 1200, "Good 4")
+        bulk = engine.calculate_ratings_bulk(
+            {"race_time": [72.0], "distance": [1200], "track_condition": ["Good 4"]}
+        )
+
+        expected = index.percentile(1200, "Good 4", rating.final_rating)
+        assert rating.population_percentile == expected
+        assert bulk["population_percentile"].iloc[0] == expected
+
+    def test_without_index(self):
+        """Test population percentile stays empty without an index."""
+        rating = SpeedRatingsEngine().calculate_speed_rating(
+            "R", "H", 72.0, 1200, "Good 4"
+        )
+        assert rating.population_percentile is None
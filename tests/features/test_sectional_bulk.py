@@ -0,0 +1,115 @@
+"""
+Tests for the vectorized sectional profile path.
+
+Tests cover:
+- Agreement with analyze_sectionals() / _calculate_percentile() per runner
+- Grouped field percentiles (ties, missing splits, several races)
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.sectional_analyzer import (
+    PROFILE_COLUMNS,
+    SectionalAnalyzer,
+    field_percentiles,
+)
+
+
+@pytest.fixture
+def analyzer():
+    """Analyzer without a database (bulk scoring needs none)."""
+    return SectionalAnalyzer()
+
+
+@pytest.fixture
+def results():
+    """Twenty randomized fields of 4-16 runners with some missing splits."""
+    rng = random.Random(7)
+    rows = []
+    for race in range(20):
+        distance = rng.choice([1000, 1200, 1400, 1600, 2000, 2400])
+        for runner in range(rng.randint(4, 16)):
+            rows.append(
+                {
+                    "race_id": f"FLE-2025-01-01-R{race + 1}",
+                    "horse_id": f"H{runner}",
+                    "distance": distance,
+                    "sectional_600m": rng.choice([None, 0.0, rng.uniform(33, 38)]),
+                    "sectional_400m": rng.choice([None, round(rng.uniform(22, 25), 1)]),
+                    "sectional_200m": rng.choice([None, round(rng.uniform(9, 13), 1)]),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+class TestAnalyzeSectionalsBulk:
+    """Test suite for analyze_sectionals_bulk()."""
+
+    def test_matches_per_runner_path(self, analyzer, results):
+        """Test every column agrees with the scalar implementation."""
+        bulk = analyzer.analyze_sectionals_bulk(results)
+        assert list(bulk.columns) == PROFILE_COLUMNS
+
+        for race_id, field in results.groupby("race_id"):
+            profiles = [
+                analyzer.analyze_sectionals(
+                    race_id=row.race_id,
+                    horse_id=row.horse_id,
+                    distance=row.distance,
+                    L600_time=row.sectional_600m,
+                    L400_time=row.sectional_400m,
+                    L200_time=row.sectional_200m,
+                )
+                for row in field.itertuples()
+            ]
+            for split in ("L600", "L400", "L200"):
+                speeds = [getattr(p, f"{split}_speed") for p in profiles]
+                field_speeds = [s for s in speeds if s]
+                expected = [
+                    analyzer._calculate_percentile(s, field_speeds) if s else None
+                    for s in speeds
+                ]
+                actual = bulk.loc[field.index, f"{split}_percentile"].tolist()
+                assert [None if np.isnan(v) else v for v in actual] == expected
+
+            rows = bulk.loc[field.index]
+            assert rows["finish_speed_rating"].tolist() == [
+                p.finish_speed_rating for p in profiles
+            ]
+            assert rows["pace_profile"].tolist() == [p.pace_profile for p in profiles]
+            assert rows["sectional_balance"].tolist() == pytest.approx(
+                [p.sectional_balance for p in profiles], abs=0.011
+            )
+
+    def test_keeps_input_index(self, analyzer, results):
+        """Test rows line up with a non-default input index."""
+        shuffled = results.sample(frac=1, random_state=1)
+        bulk = analyzer.analyze_sectionals_bulk(shuffled)
+        assert bulk.index.equals(shuffled.index)
+
+
+class TestFieldPercentiles:
+    """Test the grouped percentile ranking."""
+
+    def test_ties_and_missing(self):
+        """Test ties share the best rank and missing values are excluded."""
+        frame = pd.DataFrame(
+            {
+                "race_id": ["R1", "R1", "R1", "R1", "R2", "R2"],
+                "L200_speed": [18.0, 17.0, 18.0, np.nan, 16.0, 17.0],
+            }
+        )
+
+        percentiles = field_percentiles(frame, ["L200_speed"])["L200_speed"]
+
+        # R1 field of 3: both 18.0s rank 1 -> 100%, 17.0 ranks 3 -> 33.3%
+        assert percentiles.tolist()[:3] == [100.0, 33.3, 100.0]
+        assert np.isnan(percentiles.iloc[3])
+        # R2 ranked independently
+        assert percentiles.tolist()[4:] == [50.0, 100.0]
@@ -0,0 +1,149 @@
+"""
+Tests for the vectorized speed-rating path.
+
+Tests cover:
+- Exact agreement with calculate_speed_rating() row by row
+- Input formats (pyarrow Table, DataFrame, dict of arrays)
+- Track condition codes and missing values
+- Null and non-positive race times left unrated
+- Stored (fractional) ratings averaged as-is
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.features.history import TIMED_RANK
+from src.features.speed_ratings import SpeedRatingsEngine
+
+
+@pytest.fixture
+def engine():
+    """Engine without a database (bulk rating needs none)."""
+    return SpeedRatingsEngine()
+
+
+@pytest.fixture
+def performances():
+    """Randomized performances covering all sectional combinations."""
+    rng = random.Random(42)
+    conditions = ["Good 4", "Soft 7", "heavy 10", "Firm", "Good", None, ""]
+    rows = []
+    for _ in range(500):
+        distance = rng.choice([900, 1000, 1100, 1200, 1300, 1500, 1800, 2000, 3200])
+        rows.append(
+            {
+                "race_time": distance / rng.uniform(14.0, 18.5),
+                "distance": distance,
+                "track_condition": rng.choice(conditions),
+                "sectional_600m": rng.choice([None, 0.0, rng.uniform(33, 38)]),
+                "sectional_400m": rng.choice([None, rng.uniform(22, 25)]),
+                "sectional_200m": rng.choice([None, 0.0, rng.uniform(10.5, 13)]),
+            }
+        )
+    return rows
+
+
+def _per_row(engine: SpeedRatingsEngine, row: dict):
+    """Rate one performance the way the database callers do."""
+    sectional_times = {}
+    for key in ("600m", "400m", "200m"):
+        if row[f"sectional_{key}"]:
+            sectional_times[key] = float(row[f"sectional_{key}"])
+
+    return engine.calculate_speed_rating(
+        race_id="R",
+        horse_id="H",
+        race_time=row["race_time"],
+        distance=row["distance"],
+        track_condition=row["track_condition"] or "good 4",
+        sectional_times=sectional_times or None,
+    )
+
+
+class TestCalculateRatingsBulk:
+    """Test suite for SpeedRatingsEngine.calculate_ratings_bulk."""
+
+    def test_matches_per_row(self, engine, performances):
+        """Test every column matches the scalar implementation."""
+        bulk = engine.calculate_ratings_bulk(pd.DataFrame(performances))
+
+        for row, rated in zip(performances, bulk.itertuples(index=False)):
+            expected = _per_row(engine, row)
+            assert rated.final_rating == expected.final_rating
+            assert rated.base_speed == expected.base_speed
+            assert rated.track_adjustment == expected.track_adjustment
+            assert rated.distance_adjustment == expected.distance_adjustment
+            if expected.sectional_rating is None:
+                assert math.isnan(rated.sectional_rating)
+            else:
+                assert rated.sectional_rating == expected.sectional_rating
+
+    def test_accepts_arrow_and_mappings(self, engine, performances):
+        """Test Arrow tables and dicts of arrays give identical results."""
+        frame = pd.DataFrame(performances)
+        expected = engine.calculate_ratings_bulk(frame)["final_rating"].tolist()
+
+        table = pa.Table.from_pandas(frame)
+        columns = {name: frame[name].tolist() for name in frame.columns}
+
+        from_table = engine.calculate_ratings_bulk(table)["final_rating"].tolist()
+        from_dict = engine.calculate_ratings_bulk(columns)["final_rating"].tolist()
+
+        assert from_table == expected
+        assert from_dict == expected
+
+    def test_track_condition_codes(self, engine):
+        """Test integer condition codes index TRACK_CONDITION_CODES."""
+        codes = SpeedRatingsEngine.TRACK_CONDITION_CODES
+        result = engine.calculate_ratings_bulk(
+            {
+                "race_time": [72.0, 72.0, 72.0],
+                "distance": [1200, 1200, 1200],
+                "track_condition_code": [codes.index("soft 7"), -1, None],
+            }
+        )
+
+        assert result["track_adjustment"].tolist() == [1.07, 1.01, 1.01]
+
+    def test_clamps_and_truncates(self, engine):
+        """Test ratings are truncated like int() and clamped to 0-150."""
+        result = engine.calculate_ratings_bulk(
+            {"race_time": [20.0, 500.0], "distance": [1200, 1200]}
+        )
+
+        assert result["final_rating"].tolist() == [150, 0]
+        assert result["final_rating"].dtype == "Int64"
+
+    def test_invalid_times_unrated(self, engine):
+        """Test null, zero and negative times get no rating."""
+        result = engine.calculate_ratings_bulk(
+            {"race_time": [None, 0.0, -1.0, 72.0], "distance": [1200] * 4}
+        )
+
+        assert result["final_rating"].isna().tolist() == [True, True, True, False]
+
+
+class TestAverageRatings:
+    """Test suite for get_average_ratings over a history frame."""
+
+    def test_stored_ratings_not_truncated(self, engine):
+        """Test stored fractional ratings are averaged without int()."""
+        history = pd.DataFrame(
+            {
+                "horse_id": ["H1", "H1"],
+                TIMED_RANK: [1, 2],
+                "speed_rating": [97.6, 98.4],
+            }
+        )
+
+        averages = engine.get_average_ratings(["H1"], 5, history)["H1"]
+
+        assert averages["average"] == pytest.approx(98.0)
+        assert averages["best"] == 98.4
+        assert averages["worst"] == 97.6